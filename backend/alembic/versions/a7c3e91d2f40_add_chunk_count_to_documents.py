@@ -0,0 +1,39 @@
+"""add_chunk_count_to_documents
+
+Revision ID: a7c3e91d2f40
+Revises: add_scraped_at_timestamp
+Create Date: 2025-12-02 10:14:27.311842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d2f40'
+down_revision: Union[str, Sequence[str], None] = 'add_scraped_at_timestamp'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('chunk_count', sa.Integer(), nullable=False, server_default='0'))
+    # Backfill from the existing chunk rows so listings no longer need to load them
+    op.execute("""
+        UPDATE documents
+        SET chunk_count = counts.n
+        FROM (
+            SELECT document_id, COUNT(*) AS n
+            FROM document_chunks
+            GROUP BY document_id
+        ) AS counts
+        WHERE documents.id = counts.document_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'chunk_count')
@@ -0,0 +1,32 @@
+"""add_chat_listing_indexes
+
+Revision ID: b81f04c6e5d2
+Revises: a7c3e91d2f40
+Create Date: 2025-12-02 15:42:09.584113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f04c6e5d2'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chats_updated_at_id', 'chats', ['updated_at', 'id'], unique=False)
+    op.create_index(op.f('ix_messages_chat_id'), 'messages', ['chat_id'], unique=False)
+    op.create_index(op.f('ix_chat_document_association_chat_id'), 'chat_document_association', ['chat_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chat_document_association_chat_id'), table_name='chat_document_association')
+    op.drop_index(op.f('ix_messages_chat_id'), table_name='messages')
+    op.drop_index('ix_chats_updated_at_id', table_name='chats')
@@ -0,0 +1,35 @@
+"""add_imap_sync_state
+
+Revision ID: c4d1e8a93b27
+Revises: b81f04c6e5d2
+Create Date: 2025-12-03 10:12:44.318702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d1e8a93b27'
+down_revision: Union[str, Sequence[str], None] = 'b81f04c6e5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'imap_sync_state',
+        sa.Column('mailbox', sa.String(), nullable=False),
+        sa.Column('uid_validity', sa.BigInteger(), nullable=False),
+        sa.Column('last_uid', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('mailbox'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('imap_sync_state')
@@ -0,0 +1,172 @@
+"""add_tender_versions
+
+Revision ID: d7a2f4c91e06
+Revises: c4d1e8a93b27
+Create Date: 2025-12-05 09:41:17.502214
+
+"""
+import uuid
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2f4c91e06'
+down_revision: Union[str, Sequence[str], None] = 'c4d1e8a93b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Corrigendum notes were written as "• <Field Label>: <old> → <new>" lines
+LABEL_FIELDS = {
+    'Tender Value': 'tender_value', 'Estimated Cost': 'estimated_cost', 'EMD Amount': 'emd',
+    'Document Fees': 'document_fees', 'Submission Deadline': 'submission_deadline', 'Due Date': 'due_date',
+    'Last Date of Bid Submission': 'last_date_of_bid_submission', 'Pre-bid Meeting Date': 'prebid_meeting_date',
+    'Site Visit Deadline': 'site_visit_deadline', 'Tender Brief': 'tender_brief', 'Scope of Work': 'scope_of_work',
+    'Product Category': 'product_category', 'Eligibility Criteria': 'eligibility_criteria',
+    'Technical Requirements': 'technical_requirements', 'Tendering Authority': 'tendering_authority',
+    'Issuing Authority': 'issuing_authority', 'City': 'city', 'State': 'state', 'Location': 'location',
+}
+DATE_HISTORY_TYPES = {
+    'submission_deadline': 'bid_deadline_extension',
+    'due_date': 'due_date_extension',
+    'last_date_of_bid_submission': 'bid_deadline_extension',
+}
+DATE_FIELDS = set(DATE_HISTORY_TYPES) | {'prebid_meeting_date', 'site_visit_deadline'}
+
+
+def parse_note(note):
+    changes = []
+    if not note or "Changes" not in note:
+        return changes
+    for line in note.split('\n'):
+        if not line.startswith('•'):
+            continue
+        parts = line[2:].split(':', 1)
+        if len(parts) < 2:
+            continue
+        values = parts[1].split('→')
+        old_value = values[0].strip()
+        new_value = values[1].strip() if len(values) > 1 else None
+        label = parts[0].strip()
+        changes.append({
+            'field': LABEL_FIELDS.get(label, label),
+            'old_value': None if old_value == "Not set" else old_value,
+            'new_value': None if new_value in (None, "Removed") else new_value,
+        })
+    return changes
+
+
+def parse_date(value):
+    from dateutil import parser
+    if not value:
+        return None
+    try:
+        return parser.parse(value)
+    except (parser.ParserError, ValueError, OverflowError):
+        return None
+
+
+def history_of(changes):
+    """(history_type, from_date, to_date) as CorrigendumTrackingService derived them from notes"""
+    history_type = 'corrigendum'
+    for change in changes:
+        if change['field'] in DATE_HISTORY_TYPES:
+            return DATE_HISTORY_TYPES[change['field']], parse_date(change['old_value']), parse_date(change['new_value'])
+        if change['field'] in ('tender_value', 'estimated_cost', 'emd'):
+            history_type = 'amendment'
+    return history_type, None, None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tender_versions = op.create_table(
+        'tender_versions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tender_ref_number', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('snapshot', sa.JSON(), nullable=True),
+        sa.Column('scraped_tender_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('change_count', sa.Integer(), nullable=False),
+        sa.Column('history_type', sa.String(length=50), nullable=True),
+        sa.Column('from_date', sa.DateTime(), nullable=True),
+        sa.Column('to_date', sa.DateTime(), nullable=True),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['scraped_tender_id'], ['scraped_tenders.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tender_ref_number', 'version', name='uq_tender_versions_ref_version'),
+    )
+    tender_field_changes = op.create_table(
+        'tender_field_changes',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tender_version_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tender_ref_number', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=100), nullable=False),
+        sa.Column('change_type', sa.String(length=20), nullable=False),
+        sa.Column('value_kind', sa.String(length=20), nullable=False),
+        sa.Column('old_value', sa.Text(), nullable=True),
+        sa.Column('new_value', sa.Text(), nullable=True),
+        sa.Column('old_amount', sa.Numeric(), nullable=True),
+        sa.Column('new_amount', sa.Numeric(), nullable=True),
+        sa.Column('old_date', sa.DateTime(), nullable=True),
+        sa.Column('new_date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tender_version_id'], ['tender_versions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tender_field_changes_ref_version', 'tender_field_changes', ['tender_ref_number', 'version'])
+    op.create_index('ix_tender_field_changes_ref_field', 'tender_field_changes', ['tender_ref_number', 'field'])
+
+    # Move the note-only corrigendum history into the store, parsed one last time.
+    # These versions have no snapshot; the next scrape of the tender is a new baseline.
+    rows = op.get_bind().execute(sa.text(
+        "SELECT h.notes, h.timestamp, t.tender_ref_number FROM tender_action_history h "
+        "JOIN tenders t ON t.id = h.tender_id "
+        "WHERE h.action = 'corrigendum_updated' AND t.tender_ref_number IS NOT NULL "
+        "ORDER BY t.tender_ref_number, h.timestamp"
+    )).fetchall()
+    versions, changes, numbers = [], [], {}
+    for notes, timestamp, tender_ref in rows:
+        numbers[tender_ref] = numbers.get(tender_ref, 0) + 1
+        parsed = parse_note(notes)
+        history_type, from_date, to_date = history_of(parsed)
+        version = {
+            'id': uuid.uuid4(), 'tender_ref_number': tender_ref, 'version': numbers[tender_ref],
+            'content_hash': None, 'snapshot': None, 'scraped_tender_id': None,
+            # Kept visible in the history even when nothing could be parsed from the note
+            'change_count': max(len(parsed), 1),
+            'history_type': history_type, 'from_date': from_date, 'to_date': to_date,
+            'note': notes, 'created_at': timestamp or datetime.utcnow(),
+        }
+        for change in parsed:
+            is_date = change['field'] in DATE_FIELDS
+            old_date = parse_date(change['old_value']) if is_date else None
+            new_date = parse_date(change['new_value']) if is_date else None
+            changes.append({
+                'id': uuid.uuid4(), 'tender_version_id': version['id'], 'tender_ref_number': tender_ref,
+                'version': version['version'], 'field': change['field'],
+                'change_type': 'added' if change['old_value'] is None else 'removed' if change['new_value'] is None else 'updated',
+                'value_kind': 'date' if is_date else 'text', 'old_value': change['old_value'], 'new_value': change['new_value'],
+                'old_amount': None, 'new_amount': None, 'old_date': old_date, 'new_date': new_date,
+                'created_at': version['created_at'],
+            })
+        versions.append(version)
+    if versions:
+        op.bulk_insert(tender_versions, versions)
+    if changes:
+        op.bulk_insert(tender_field_changes, changes)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tender_field_changes_ref_field', table_name='tender_field_changes')
+    op.drop_index('ix_tender_field_changes_ref_version', table_name='tender_field_changes')
+    op.drop_table('tender_field_changes')
+    op.drop_table('tender_versions')
@@ -2,6 +2,7 @@
 Global Celery application instance.
 """
 from celery import Celery
+from celery.signals import worker_process_init
 from app.config import settings
 
 celery_app = Celery(
@@ -14,3 +15,27 @@ celery_app = Celery(
 celery_app.conf.update(
     task_track_started=True,
 )
+
+
+@worker_process_init.connect
+def warm_up_worker_embeddings(**kwargs):
+    """Each worker process owns one embedding model; load it before the first task."""
+    from app.core.embeddings import warm_up_embeddings
+    warm_up_embeddings()
+
+
+@worker_process_init.connect
+def serve_worker_metrics(**kwargs):
+    """
+    Tasks record their metrics in the pool process that runs them, so each
+    pool process serves its own registry, on CELERY_METRICS_PORT plus its
+    pool index (stable across process restarts).
+    """
+    if not settings.CELERY_METRICS_PORT:
+        return
+    from billiard.process import current_process
+    from app.core import metrics
+
+    port = settings.CELERY_METRICS_PORT + (getattr(current_process(), "index", None) or 0)
+    metrics.start_metrics_server(port)
+    print(f"📈 Serving worker metrics on port {port}")
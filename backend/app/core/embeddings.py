@@ -0,0 +1,182 @@
+"""
+Process-wide embedding provider.
+
+Owns the single sentence-transformers model instance for the process. The
+VectorStoreManager, the document processors and LangChain (through the
+adapter in langchain_config) all embed through it, so a worker never holds
+two copies of the weights.
+
+Backends (EMBEDDING_BACKEND):
+- "torch": sentence-transformers on PyTorch; with EMBEDDING_QUANTIZED the
+  Linear layers are dynamically quantised to int8 after loading
+- "onnx": ONNX Runtime on CPU; with EMBEDDING_QUANTIZED the int8-quantised
+  export (EMBEDDING_ONNX_QUANTIZED_FILE) is loaded instead of fp32
+
+EMBEDDING_NUM_THREADS caps the intra-op threads of either backend
+(0 keeps the library default).
+
+Usage:
+    from app.core.embeddings import get_embedding_provider
+
+    provider = get_embedding_provider()
+    provider.warm_up()  # optional: load weights and run one batch
+    vectors = provider.encode(["first chunk", "second chunk"], batch_size=32)
+"""
+
+import copy
+import threading
+import time
+from typing import List, Optional, Sequence, Union
+
+from app.config import settings
+from app.core import metrics
+
+
+class EmbeddingProvider:
+    """Lazily loads one embedding model and exposes SentenceTransformer-style and LangChain-style calls"""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        quantized: Optional[bool] = None,
+        cache_folder: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.model_name = model_name or settings.EMBEDDING_MODEL_NAME
+        self.backend = (backend or settings.EMBEDDING_BACKEND).lower()
+        self.num_threads = settings.EMBEDDING_NUM_THREADS if num_threads is None else num_threads
+        self.quantized = settings.EMBEDDING_QUANTIZED if quantized is None else quantized
+        self.cache_folder = cache_folder or str(settings.EMBEDDING_CACHE_DIR)
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        if self.backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown EMBEDDING_BACKEND: {self.backend}")
+        self._model = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @property
+    def model(self):
+        """The underlying SentenceTransformer, loaded on first use"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    @property
+    def tokenizer(self):
+        """
+        A copy of the model's own tokenizer (a Hugging Face fast tokenizer), the
+        one its max_seq_length counts. Chunking uses the copy so that it never
+        changes the truncation settings of the tokenizer encode() runs.
+        """
+        if self._tokenizer is None:
+            model = self.model
+            with self._lock:
+                if self._tokenizer is None:
+                    self._tokenizer = copy.deepcopy(model.tokenizer)
+        return self._tokenizer
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+
+        start = time.perf_counter()
+        print(f"Loading embedding model {self.model_name} ({self.backend}{', int8' if self.quantized else ''})...")
+        kwargs = {"cache_folder": self.cache_folder, "device": "cpu"}
+        if self.backend == "onnx":
+            kwargs.update(backend="onnx", model_kwargs=self._onnx_model_kwargs())
+        model = SentenceTransformer(self.model_name, **kwargs)
+        if self.backend == "torch":
+            self._tune_torch(model)
+        print(f"✅ Embedding model loaded in {time.perf_counter() - start:.1f}s")
+        return model
+
+    def _tune_torch(self, model) -> None:
+        import torch
+
+        if self.num_threads > 0:
+            torch.set_num_threads(self.num_threads)
+        if self.quantized:
+            transformer = model[0].auto_model
+            model[0].auto_model = torch.quantization.quantize_dynamic(transformer, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def _onnx_model_kwargs(self) -> dict:
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        if self.num_threads > 0:
+            session_options.intra_op_num_threads = self.num_threads
+            session_options.inter_op_num_threads = 1
+        model_kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+        if self.quantized:
+            model_kwargs["file_name"] = settings.EMBEDDING_ONNX_QUANTIZED_FILE
+        return model_kwargs
+
+    def warm_up(self) -> None:
+        """Load the weights and run one small batch so the first request pays no start-up cost"""
+        start = time.perf_counter()
+        self.encode(["warm-up"])
+        print(f"✅ Embedding model warmed up in {time.perf_counter() - start:.1f}s")
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: Optional[int] = None,
+               show_progress_bar: bool = False, **kwargs):
+        """SentenceTransformer.encode-compatible; returns a numpy array"""
+        model = self.model  # Loading is not part of the call's latency
+        metrics.EMBEDDING_BATCH_SIZE.observe(1 if isinstance(sentences, str) else len(sentences))
+        with metrics.EMBEDDING_SECONDS.time():
+            return model.encode(
+                sentences,
+                batch_size=batch_size or self.batch_size,
+                show_progress_bar=show_progress_bar,
+                **kwargs,
+            )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+_embedding_provider: Optional[EmbeddingProvider] = None
+_embedding_provider_lock = threading.Lock()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """The process-wide embedding provider (the model itself loads on first use)"""
+    global _embedding_provider
+    if _embedding_provider is None:
+        with _embedding_provider_lock:
+            if _embedding_provider is None:
+                _embedding_provider = EmbeddingProvider()
+    return _embedding_provider
+
+
+def warm_up_embeddings() -> None:
+    """Start-up hook: warm the shared model if EMBEDDING_WARMUP is enabled; never raises"""
+    if not settings.EMBEDDING_WARMUP:
+        return
+    try:
+        get_embedding_provider().warm_up()
+    except Exception as e:
+        print(f"⚠️  Embedding warm-up failed: {e}")
@@ -0,0 +1,202 @@
+"""
+Change-notification bus used to push document/job updates to SSE clients.
+
+Publishers call `publish(topic, event)` from any thread (background tasks,
+Celery workers); subscribers are async and receive JSON-serialisable dicts.
+
+Backends (EVENT_BUS_BACKEND):
+- "memory": in-process fan-out, for a single worker
+- "redis": Redis pub/sub, shared across workers and processes
+- "postgres": Postgres NOTIFY / LISTEN on the application database
+
+Usage:
+    from app.core.events import chat_docs_topic, get_event_bus
+
+    get_event_bus().publish(chat_docs_topic(chat_id), {"type": "job", ...})
+
+    async with get_event_bus().subscribe(chat_docs_topic(chat_id)) as next_event:
+        event = await next_event(timeout=15)  # None on timeout
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+Event = Dict[str, Any]
+
+
+def chat_docs_topic(chat_id: str) -> str:
+    """Topic carrying document and processing-job changes for one chat"""
+    # Also a valid Postgres channel identifier (alphanumerics/underscores, < 64 chars)
+    return "chat_docs_" + re.sub(r'[^0-9A-Za-z]', '', str(chat_id))[:48]
+
+
+class EventBus(ABC):
+    """Interface shared by the event bus backends"""
+
+    @abstractmethod
+    def publish(self, topic: str, event: Event) -> None:
+        """Publish an event; never raises (notifications are best-effort)"""
+
+    @abstractmethod
+    def subscribe(self, topic: str):
+        """Async context manager yielding a `next_event(timeout)` coroutine function"""
+
+
+class InMemoryEventBus(EventBus):
+    """Process-local fan-out; events are delivered on each subscriber's event loop."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, event: Event) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, []))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # Subscriber's event loop already closed
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(subscriber)
+
+        async def next_event(timeout: float) -> Optional[Event]:
+            try:
+                return await asyncio.wait_for(subscriber[1].get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            yield next_event
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(topic, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(topic, None)
+
+
+class RedisEventBus(EventBus):
+    """Redis pub/sub backend"""
+
+    def __init__(self, client=None, url: Optional[str] = None):
+        if client is None:
+            from app.db.redis_client import redis_client as client
+        self.client = client
+        # Subscriptions need an asyncio client; it connects to the same server (auth, TLS included)
+        self.url = url or settings.REDIS_URL
+
+    def publish(self, topic: str, event: Event) -> None:
+        try:
+            self.client.publish(topic, json.dumps(event))
+        except Exception as e:
+            print(f"⚠️  Could not publish event to {topic}: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str):
+        import redis.asyncio as aioredis
+
+        async_client = aioredis.from_url(self.url, decode_responses=True)
+        pubsub = async_client.pubsub()
+        await pubsub.subscribe(topic)
+
+        async def next_event(timeout: float) -> Optional[Event]:
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message and message.get("type") == "message":
+                    return json.loads(message["data"])
+            return None
+
+        try:
+            yield next_event
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await async_client.aclose()
+
+
+class PostgresEventBus(EventBus):
+    """Postgres NOTIFY/LISTEN backend; needs no extra infrastructure beyond the app database."""
+
+    def __init__(self, engine=None, dsn: Optional[str] = None):
+        if engine is None:
+            from app.db.database import engine
+        self.engine = engine
+        self.dsn = dsn or settings.DATABASE_URL
+
+    def publish(self, topic: str, event: Event) -> None:
+        from sqlalchemy import text
+
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": topic, "payload": json.dumps(event)})
+        except Exception as e:
+            print(f"⚠️  Could not publish event to {topic}: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        conn = await asyncio.to_thread(psycopg2.connect, self.dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN "{topic}"')
+
+        def on_readable():
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                queue.put_nowait(json.loads(notify.payload))
+
+        loop.add_reader(conn.fileno(), on_readable)
+
+        async def next_event(timeout: float) -> Optional[Event]:
+            try:
+                return await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            yield next_event
+        finally:
+            loop.remove_reader(conn.fileno())
+            conn.close()
+
+
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Lazy-load the configured event bus (EVENT_BUS_BACKEND: memory | redis | postgres)"""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                backend = settings.EVENT_BUS_BACKEND.lower()
+                if backend == "memory":
+                    _event_bus = InMemoryEventBus()
+                elif backend == "redis":
+                    _event_bus = RedisEventBus()
+                elif backend == "postgres":
+                    _event_bus = PostgresEventBus()
+                else:
+                    raise ValueError(f"Unknown EVENT_BUS_BACKEND: {settings.EVENT_BUS_BACKEND}")
+    return _event_bus
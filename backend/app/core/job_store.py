@@ -0,0 +1,346 @@
+"""
+Shared job-state store for upload and document processing progress.
+
+Jobs are UploadJob records keyed by job_id. Every backend supports:
+- create / get / delete
+- update(job_id, **fields): an atomic partial update that never resurrects
+  an expired or deleted job
+- list_for_chat(chat_id)
+- watch(job_id): an async iterator of job snapshots, used for SSE push
+- TTL eviction (JOB_STORE_TTL_SECONDS, refreshed on every write)
+
+Every write is also announced on the chat's document-change topic
+(app.core.events) so chat document streams receive job deltas.
+
+Backends:
+- "memory": a process-local dict, for development and tests
+- "redis": hashes + per-chat index sets + pub/sub, shared by every uvicorn
+  worker and background process
+
+Usage:
+    from app.core.job_store import get_job_store
+
+    store = get_job_store()
+    store.create(UploadJob(...))
+    store.update(job_id, stage=ProcessingStage.CREATING_CHUNKS, progress=40)
+"""
+
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.events import chat_docs_topic, get_event_bus
+from app.modules.askai.models.document import ProcessingJob, ProcessingStatus, UploadJob
+
+TERMINAL_STATUSES = (ProcessingStatus.FINISHED, ProcessingStatus.FAILED)
+
+
+class JobStore(ABC):
+    """Interface shared by the job-state backends"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.JOB_STORE_TTL_SECONDS
+
+    @abstractmethod
+    def create(self, job: UploadJob) -> UploadJob:
+        """Store a new job (replacing any job with the same id)"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        """Return the job, or None if unknown or expired"""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields: Any) -> Optional[UploadJob]:
+        """Atomically set `fields` on an existing job and publish the result"""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """Remove a job"""
+
+    @abstractmethod
+    def list_for_chat(self, chat_id: str) -> List[UploadJob]:
+        """Return all live jobs belonging to a chat"""
+
+    @abstractmethod
+    def _subscription(self, job_id: str):
+        """Async context manager yielding a `next_update(timeout)` coroutine function"""
+
+    def _announce(self, job: UploadJob) -> None:
+        """Publish the job's state on its chat's document-change topic"""
+        processing_job = ProcessingJob(name=job.filename, job_id=job.job_id, status=job.status, stage=job.stage, progress=job.progress)
+        get_event_bus().publish(chat_docs_topic(job.chat_id), {"type": "job", "job": processing_job.model_dump(mode="json")})
+
+    async def watch(self, job_id: str, poll_interval: Optional[float] = None) -> AsyncIterator[UploadJob]:
+        """
+        Yield the current job, then every published update until the job
+        finishes, fails or expires. If no update arrives within
+        `poll_interval` seconds the job is re-read, so a missed message or an
+        evicted job cannot hang the stream.
+        """
+        poll_interval = poll_interval or settings.JOB_STORE_WATCH_POLL_SECONDS
+        async with self._subscription(job_id) as next_update:
+            job = await asyncio.to_thread(self.get, job_id)
+            while job is not None:
+                yield job
+                if job.status in TERMINAL_STATUSES:
+                    return
+                job = await next_update(poll_interval) or await asyncio.to_thread(self.get, job_id)
+
+
+def _validate_fields(fields: Dict[str, Any]) -> None:
+    invalid = set(fields) - (set(UploadJob.model_fields) - {"job_id"})
+    if invalid:
+        raise ValueError(f"Cannot update job fields: {sorted(invalid)}")
+
+
+# ============================================================================
+# IN-PROCESS BACKEND
+# ============================================================================
+
+class InMemoryJobStore(JobStore):
+    """Process-local store. Updates are pushed to watchers on their event loop."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        super().__init__(ttl_seconds)
+        self._jobs: Dict[str, Tuple[UploadJob, float]] = {}
+        self._watchers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [job_id for job_id, (_, expires_at) in self._jobs.items() if expires_at <= now]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _publish(self, job: UploadJob) -> None:
+        for loop, queue in self._watchers.get(job.job_id, []):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, job)
+            except RuntimeError:
+                pass  # Watcher's event loop already closed
+
+    def create(self, job: UploadJob) -> UploadJob:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            self._jobs[job.job_id] = (job, now + self.ttl_seconds)
+            self._publish(job)
+        self._announce(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[0]
+
+    def update(self, job_id: str, **fields: Any) -> Optional[UploadJob]:
+        _validate_fields(fields)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry[1] <= now:
+                return None
+            # Jobs are replaced, never mutated, so readers always see a consistent snapshot
+            job = entry[0].model_copy(update=fields)
+            self._jobs[job_id] = (job, now + self.ttl_seconds)
+            self._publish(job)
+        self._announce(job)
+        return job
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def list_for_chat(self, chat_id: str) -> List[UploadJob]:
+        now = time.monotonic()
+        with self._lock:
+            return [job for job, expires_at in self._jobs.values() if job.chat_id == chat_id and expires_at > now]
+
+    @asynccontextmanager
+    async def _subscription(self, job_id: str):
+        watcher = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._watchers.setdefault(job_id, []).append(watcher)
+
+        async def next_update(timeout: float) -> Optional[UploadJob]:
+            try:
+                return await asyncio.wait_for(watcher[1].get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            yield next_update
+        finally:
+            with self._lock:
+                watchers = self._watchers.get(job_id, [])
+                if watcher in watchers:
+                    watchers.remove(watcher)
+                if not watchers:
+                    self._watchers.pop(job_id, None)
+
+
+# ============================================================================
+# REDIS BACKEND
+# ============================================================================
+
+# Partial update that is a no-op for missing (expired/deleted) jobs. Also
+# refreshes the TTL of the chat's job index so it outlives its jobs.
+# KEYS[1] = job hash, ARGV[1] = ttl, ARGV[2] = chat index key prefix,
+# ARGV[3..] = field/value pairs
+_UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+local chat_id = cjson.decode(redis.call('HGET', KEYS[1], 'chat_id'))
+redis.call('EXPIRE', ARGV[2] .. chat_id, ARGV[1])
+return redis.call('HGETALL', KEYS[1])
+"""
+
+
+def _encode_fields(fields: Dict[str, Any]) -> Dict[str, str]:
+    """JSON-encode each field so types (None, floats, enums) survive the hash"""
+    return {k: json.dumps(v.value if isinstance(v, Enum) else v) for k, v in fields.items()}
+
+
+def _decode_job(raw: Dict[str, str]) -> Optional[UploadJob]:
+    if not raw:
+        return None
+    return UploadJob.model_validate({k: json.loads(v) for k, v in raw.items()})
+
+
+class RedisJobStore(JobStore):
+    """Redis-backed store shared across workers; updates are published on a per-job channel."""
+
+    KEY_PREFIX = "upload_job"
+
+    def __init__(self, client=None, ttl_seconds: Optional[int] = None, url: Optional[str] = None):
+        super().__init__(ttl_seconds)
+        if client is None:
+            from app.db.redis_client import redis_client as client
+        self.client = client
+        # Subscriptions need an asyncio client; it connects to the same server (auth, TLS included)
+        self.url = url or settings.REDIS_URL
+        self._update_script = client.register_script(_UPDATE_SCRIPT)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def _chat_key(self, chat_id: str) -> str:
+        return f"{self.KEY_PREFIX}:chat:{chat_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:events:{job_id}"
+
+    def create(self, job: UploadJob) -> UploadJob:
+        key = self._job_key(job.job_id)
+        chat_key = self._chat_key(job.chat_id)
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=_encode_fields(job.model_dump()))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.sadd(chat_key, job.job_id)
+            pipe.expire(chat_key, self.ttl_seconds)
+            pipe.publish(self._channel(job.job_id), job.model_dump_json())
+            pipe.execute()
+        self._announce(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        return _decode_job(self.client.hgetall(self._job_key(job_id)))
+
+    def update(self, job_id: str, **fields: Any) -> Optional[UploadJob]:
+        _validate_fields(fields)
+        args = [self.ttl_seconds, self._chat_key("")]
+        for k, v in _encode_fields(fields).items():
+            args.extend((k, v))
+        flat = self._update_script(keys=[self._job_key(job_id)], args=args)
+        if not flat:
+            return None
+        job = _decode_job(dict(zip(flat[::2], flat[1::2])))
+        self.client.publish(self._channel(job_id), job.model_dump_json())
+        self._announce(job)
+        return job
+
+    def delete(self, job_id: str) -> None:
+        job = self.get(job_id)
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._job_key(job_id))
+            if job:
+                pipe.srem(self._chat_key(job.chat_id), job_id)
+            pipe.execute()
+
+    def list_for_chat(self, chat_id: str) -> List[UploadJob]:
+        chat_key = self._chat_key(chat_id)
+        job_ids = sorted(self.client.smembers(chat_key))
+        if not job_ids:
+            return []
+        with self.client.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._job_key(job_id))
+            raws = pipe.execute()
+        jobs, expired = [], []
+        for job_id, raw in zip(job_ids, raws):
+            job = _decode_job(raw)
+            if job:
+                jobs.append(job)
+            else:
+                expired.append(job_id)
+        if expired:
+            self.client.srem(chat_key, *expired)
+        return jobs
+
+    @asynccontextmanager
+    async def _subscription(self, job_id: str):
+        import redis.asyncio as aioredis
+
+        async_client = aioredis.from_url(self.url, decode_responses=True)
+        pubsub = async_client.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+
+        async def next_update(timeout: float) -> Optional[UploadJob]:
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message and message.get("type") == "message":
+                    return UploadJob.model_validate_json(message["data"])
+            return None
+
+        try:
+            yield next_update
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await async_client.aclose()
+
+
+# ============================================================================
+# FACTORY
+# ============================================================================
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Lazy-load the configured job store (JOB_STORE_BACKEND: memory | redis)"""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                backend = settings.JOB_STORE_BACKEND.lower()
+                if backend == "redis":
+                    _job_store = RedisJobStore()
+                elif backend == "memory":
+                    _job_store = InMemoryJobStore()
+                else:
+                    raise ValueError(f"Unknown JOB_STORE_BACKEND: {settings.JOB_STORE_BACKEND}")
+    return _job_store
@@ -4,18 +4,23 @@ LangChain Configuration and Setup
 Phase 1: Foundation setup for LangChain integration
 """
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from typing import TYPE_CHECKING, List
+
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from app.config import settings
+from app.core.embeddings import EmbeddingProvider, get_embedding_provider
 
-print("🔗 Initializing LangChain configuration...")
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 # ==================== LLM Configuration ====================
 
-def get_langchain_llm() -> ChatGoogleGenerativeAI:
+def get_langchain_llm() -> "ChatGoogleGenerativeAI":
     """Initialize and return the LangChain ChatGoogleGenerativeAI model."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     if not settings.GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY not configured")
 
@@ -34,19 +39,26 @@ def get_langchain_llm() -> ChatGoogleGenerativeAI:
 
 # ==================== Embeddings Configuration ====================
 
-def get_langchain_embeddings() -> HuggingFaceEmbeddings:
-    """Initialize HuggingFace embeddings model (all-MiniLM-L6-v2)."""
-    embeddings = HuggingFaceEmbeddings(
-        model_name="all-MiniLM-L6-v2",
-        model_kwargs={"device": "cpu"},
-        encode_kwargs={
-            "show_progress_bar": True,
-            "batch_size": 32,
-        },
-    )
+class SharedEmbeddings(Embeddings):
+    """LangChain Embeddings backed by the process-wide EmbeddingProvider (no second model load)."""
+
+    def __init__(self, provider: EmbeddingProvider):
+        self.provider = provider
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
 
-    print("✅ LangChain Embeddings initialized (HuggingFace all-MiniLM-L6-v2)")
-    return embeddings
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.provider.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.provider.embed_query(text)
+
+
+def get_langchain_embeddings() -> SharedEmbeddings:
+    """Return LangChain embeddings sharing the process-wide model (all-MiniLM-L6-v2)."""
+    return SharedEmbeddings(get_embedding_provider())
 
 
 # ==================== Prompt Templates ====================
@@ -75,5 +87,3 @@ TITLE_GENERATION_PROMPT = PromptTemplate(
 User: {user_message}
 Assistant: {assistant_response}""",
 )
-
-print("✅ LangChain configuration loaded successfully")
@@ -0,0 +1,496 @@
+"""
+Process-wide pipeline metrics in the Prometheus text exposition format.
+
+A small, thread-safe registry with the prometheus_client calling
+conventions (Counter / Gauge / Histogram, `.labels(...)`, `.inc()`,
+`.observe()`, `.time()`), so instrumented code reads the same and the
+module can be swapped for prometheus_client without touching call sites.
+`render()` produces text format 0.0.4 for the health module's /metrics
+endpoint. Processes without the API (the scraper's email listener) can
+serve the same text on METRICS_PORT with `start_metrics_server()`.
+
+Every process keeps its own registry, and counters start at zero when a
+process starts, so every process must be its own scrape target:
+- API: /api/v1/metrics reports the worker that answers it. Run the API
+  with one uvicorn worker per container (the Dockerfile's default) and
+  scale by containers, scraping each container. With `--workers N` the
+  scrapes land on different workers and counters appear to reset.
+- Celery: tasks run in the pool's child processes, so with
+  CELERY_METRICS_PORT set each child serves its registry on
+  CELERY_METRICS_PORT + its pool index (app.celery_app); scrape that range.
+- The scraper's email listener serves its registry on METRICS_PORT.
+Prometheus sums the series across targets (`sum without (instance)`).
+
+The pipeline metrics are declared at the bottom of this module, so the
+whole catalogue is in one place:
+- scrape sections, per-tender detail fetch and the DB save steps
+- analysis stages and analyses in progress
+- text extraction per parser (llamaparse, pymupdf, tesseract)
+- embedding batch sizes and latency
+- vector store query latency
+- LLM call latency and token counts
+- SQL statements and time per request, slow statements and likely N+1s
+- queue depths (Celery broker, scrape jobs, corrigendum checks)
+
+Usage:
+    from app.core import metrics
+
+    with metrics.ANALYSIS_STAGE_SECONDS.labels(stage="download").time():
+        download()
+    metrics.EXTRACTION_PAGES_TOTAL.labels(parser="tesseract").inc(12)
+    metrics.QUEUE_DEPTH.labels(queue="celery").set_function(lambda: broker_length())
+    metrics.render()  # "# HELP tenderiq_... \n# TYPE ..."
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers a fast DB write up to a slow LlamaParse job
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class CollectorRegistry:
+    """The metrics of one process, rendered in registration order"""
+
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = CollectorRegistry()
+
+
+def render(registry: Optional[CollectorRegistry] = None) -> str:
+    """Every metric of the registry (default: the process registry) in text format 0.0.4"""
+    return (registry or REGISTRY).render()
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class Metric:
+    """A metric family: one child per combination of label values"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[CollectorRegistry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values, **labels):
+        """The child for these label values, created on first use"""
+        if labels:
+            if values:
+                raise ValueError("Pass label values either positionally or by name")
+            try:
+                values = tuple(labels[name] for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"{self.name} is missing label {e}") from e
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} has labels {self.labelnames}, got {sorted(labels)}")
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} has labels {self.labelnames}, got {len(values)} values")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self, key: Tuple[str, ...], child) -> List[str]:
+        raise NotImplementedError
+
+    def expose(self) -> List[str]:
+        help_text = self.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {help_text}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            lines.extend(self._samples(key, child))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(Metric):
+    """A monotonically increasing count; exposed with the _total suffix"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[CollectorRegistry] = REGISTRY):
+        super().__init__(name[:-len("_total")] if name.endswith("_total") else name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def _samples(self, key, child) -> List[str]:
+        return [f"{self.name}_total{_label_text(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from `function` at render time instead"""
+        self._function = function
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    @property
+    def value(self) -> Optional[float]:
+        """The current value; None when the callback fails (the sample is then left out)"""
+        if self._function is None:
+            return self._value
+        try:
+            return float(self._function())
+        except Exception:
+            return None
+
+
+class Gauge(Metric):
+    """A value that goes up and down, or is read from a callback at render time"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default().set_function(function)
+
+    def track_inprogress(self):
+        return self._default().track_inprogress()
+
+    def _samples(self, key, child) -> List[str]:
+        value = child.value
+        if value is None:
+            return []
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"]
+
+
+class _HistogramChild:
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * len(upper_bounds)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            for index, bound in enumerate(self._upper_bounds):
+                if value <= bound:
+                    self._counts[index] += 1
+                    break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block in seconds, also when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """(cumulative bucket counts, sum)"""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = [], 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total
+
+    @property
+    def count(self) -> int:
+        return self.snapshot()[0][-1]
+
+    @property
+    def sum(self) -> float:
+        return self.snapshot()[1]
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets, plus their sum and count"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[CollectorRegistry] = REGISTRY):
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.upper_bounds = tuple(bounds)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def _samples(self, key, child) -> List[str]:
+        cumulative, total = child.snapshot()
+        lines = [
+            f"{self.name}_bucket{_label_text(self.labelnames, key, [('le', _format_value(bound))])} {count}"
+            for bound, count in zip(self.upper_bounds, cumulative)
+        ]
+        labels = _label_text(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative[-1]}")
+        return lines
+
+
+def timed_iter(iterable: Iterable, histogram) -> Iterator:
+    """
+    Yield from `iterable`, observing the time spent producing items (not
+    the time the consumer spends on them) once it is exhausted or closed.
+    """
+    elapsed = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                return
+            elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        histogram.observe(elapsed)
+
+
+def redis_list_length(key: str, url: Optional[str] = None) -> Callable[[], int]:
+    """
+    A gauge callback returning the length of a Redis list, e.g. a Celery
+    broker queue. Short timeouts keep a down broker from stalling /metrics;
+    the sample is then left out.
+    """
+    client = None
+
+    def length() -> int:
+        nonlocal client
+        if client is None:
+            import redis
+            from app.config import settings
+
+            client = redis.Redis.from_url(url or settings.CELERY_BROKER_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return client.llen(key)
+
+    return length
+
+
+# ============================================================================
+# STANDALONE ENDPOINT
+# ============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0", registry: Optional[CollectorRegistry] = None) -> ThreadingHTTPServer:
+    """Serve the registry on http://addr:port/ from a daemon thread (for processes without the API)"""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry or REGISTRY})
+    server = ThreadingHTTPServer((addr, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+# ============================================================================
+# PIPELINE METRICS
+# ============================================================================
+
+# Scraper
+SCRAPE_SECTION_SECONDS = Histogram(
+    "tenderiq_scrape_section_seconds", "Duration of scrape pipeline sections (ScrapeSection)", ["section", "status"],
+)
+SCRAPE_DETAIL_FETCH_SECONDS = Histogram(
+    "tenderiq_scrape_detail_fetch_seconds", "Download of one tenderdetail.com detail page", ["status"],
+)
+SCRAPE_DB_SAVE_SECONDS = Histogram(
+    "tenderiq_scrape_db_save_seconds", "Per-tender database writes of a scrape", ["step"],
+)
+
+# Analysis
+ANALYSIS_STAGE_SECONDS = Histogram(
+    "tenderiq_analysis_stage_seconds", "Duration of analyze_tender stages", ["stage"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+ANALYSES_IN_PROGRESS = Gauge("tenderiq_analyses_in_progress", "Tender analyses currently running")
+
+# Document extraction
+EXTRACTION_SECONDS = Histogram(
+    "tenderiq_extraction_seconds", "Text extraction time per document and parser", ["parser"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+EXTRACTION_PAGES_TOTAL = Counter("tenderiq_extraction_pages_total", "Pages with text, per parser", ["parser"])
+
+# Embeddings
+EMBEDDING_BATCH_SIZE = Histogram(
+    "tenderiq_embedding_batch_size", "Texts per embedding call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
+EMBEDDING_SECONDS = Histogram("tenderiq_embedding_seconds", "Duration of one embedding call")
+
+# Vector store
+VECTOR_QUERY_SECONDS = Histogram(
+    "tenderiq_vector_query_seconds", "Vector store query latency (embedding excluded)", ["backend", "mode"],
+)
+
+# LLM
+LLM_REQUEST_SECONDS = Histogram(
+    "tenderiq_llm_request_seconds", "LLM call latency", ["model", "operation", "status"],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
+LLM_TOKENS_TOTAL = Counter(
+    "tenderiq_llm_tokens_total", "LLM tokens reported by the API", ["model", "operation", "kind"],
+)
+
+# Database (per sampled request, see app.db.query_instrumentation)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "tenderiq_db_queries_per_request", "SQL statements per request", ["route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+DB_SECONDS_PER_REQUEST = Histogram("tenderiq_db_seconds_per_request", "Time in SQL statements per request", ["route"])
+DB_SLOW_QUERIES_TOTAL = Counter("tenderiq_db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_SECONDS")
+DB_N_PLUS_ONE_TOTAL = Counter("tenderiq_db_n_plus_one_total", "Statements repeated DB_N_PLUS_ONE_THRESHOLD times in one request (likely N+1)")
+
+# Queues
+QUEUE_DEPTH = Gauge("tenderiq_queue_depth", "Work items waiting per queue", ["queue"])
+
+
+def record_llm_usage(model: str, operation: str, response) -> None:
+    """Count the prompt and completion tokens of a Gemini response, if it reports them"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, attribute in (("prompt", "prompt_token_count"), ("completion", "candidates_token_count")):
+        tokens = getattr(usage, attribute, None)
+        if isinstance(tokens, int) and tokens > 0:
+            LLM_TOKENS_TOTAL.labels(model, operation, kind).inc(tokens)
@@ -1,136 +1,404 @@
-from typing import Optional
-from google import genai 
-from google.genai.errors import APIError
-import tiktoken
-import weaviate
-from weaviate.client import WeaviateClient
+"""
+Core service clients: Gemini, Weaviate, the tokenizer, the shared embedding
+model and the document processors.
+
+Nothing here touches the network at import time. Each external client is
+created on first use through its get_*() accessor, and `start_services()`
+(called from the FastAPI startup event) initialises all of them concurrently
+in the background. A dependency that fails is recorded as "failed" instead
+of exiting the process; a background loop probes healthy clients and retries
+failed ones every SERVICE_RECONNECT_INTERVAL_SECONDS. `service_status()` and
+`readiness()` feed the health module's /health and /ready endpoints.
+
+Usage:
+    from app.core import services
+
+    services.start_services()                   # non-blocking
+    vector_store = services.get_vector_store()  # None while Weaviate is unavailable (VECTOR_STORE_BACKEND="weaviate")
+    services.readiness()                        # {"ready": bool, "services": {...}}
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
 
 from app.config import settings
-from app.modules.askai.models.document import UploadJob
+from app.core import metrics
 from app.db.vector_store import VectorStoreManager
 
-print("--- Initializing Core Services ---")
+GEMINI_MODEL_NAME = "gemini-2.0-flash-exp"
+
+
+class ServiceUnavailable(RuntimeError):
+    """Raised when a dependency could not be initialised"""
+
+
+class ServiceState(str, Enum):
+    PENDING = "pending"
+    STARTING = "starting"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class ServiceHealth:
+    state: ServiceState = ServiceState.PENDING
+    error: Optional[str] = None
+    last_attempt: Optional[float] = None  # time.time() of the last initialisation attempt
+    init_seconds: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "error": self.error,
+            "last_attempt": self.last_attempt,
+            "init_seconds": round(self.init_seconds, 3) if self.init_seconds is not None else None,
+        }
+
+
+# ============================================================================
+# LAZY SERVICE
+# ============================================================================
+
+class LazyService:
+    """
+    One lazily-initialised dependency with recorded health.
+
+    `get()` initialises on first use (one caller at a time; the others wait
+    and share the result). After a failure, callers get ServiceUnavailable
+    straight away until `retry_interval` has passed, so a dead dependency
+    does not add its connect timeout to every request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        probe: Optional[Callable[[Any], None]] = None,
+        close: Optional[Callable[[Any], None]] = None,
+        required: bool = True,
+    ):
+        self.name = name
+        self.factory = factory
+        self.probe = probe
+        self.close = close
+        self.required = required
+        self.health = ServiceHealth()
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def retry_interval(self) -> float:
+        return settings.SERVICE_RECONNECT_INTERVAL_SECONDS
+
+    def peek(self) -> Any:
+        """The initialised value, or None; never initialises"""
+        return self._value
+
+    def get(self) -> Any:
+        if self._value is not None:
+            return self._value
+        with self._lock:
+            if self._value is not None:
+                return self._value
+            health = self.health
+            if (health.state == ServiceState.FAILED and health.last_attempt is not None
+                    and time.time() - health.last_attempt < self.retry_interval):
+                raise ServiceUnavailable(f"{self.name} unavailable: {health.error}")
+            return self._initialise()
+
+    def try_get(self) -> Any:
+        """Like get(), but returns None when the dependency is unavailable"""
+        try:
+            return self.get()
+        except Exception:
+            return None
+
+    def _initialise(self) -> Any:
+        self.health.state = ServiceState.STARTING
+        self.health.last_attempt = time.time()
+        start = time.perf_counter()
+        try:
+            value = self.factory()
+        except Exception as e:
+            self.health.state = ServiceState.FAILED
+            self.health.error = f"{type(e).__name__}: {e}"
+            print(f"❌ {self.name} unavailable: {self.health.error}")
+            raise ServiceUnavailable(f"{self.name} unavailable: {self.health.error}") from e
+        self.health.init_seconds = time.perf_counter() - start
+        self.health.state = ServiceState.READY
+        self.health.error = None
+        self._value = value
+        print(f"✅ {self.name} ready ({self.health.init_seconds:.2f}s)")
+        return value
+
+    def check(self) -> None:
+        """Background health check: probe a ready client, retry a failed one"""
+        value = self._value
+        if value is None:
+            if self.health.state == ServiceState.FAILED:
+                self.try_get()
+            return
+        if self.probe is None:
+            return
+        try:
+            self.probe(value)
+        except Exception as e:
+            print(f"⚠️  {self.name} failed its health check, reconnecting: {e}")
+            self.reset(error=f"{type(e).__name__}: {e}")
+            self.try_get()
+
+    def reset(self, error: Optional[str] = None) -> None:
+        """Drop (and close) the current value; the next get() initialises again"""
+        with self._lock:
+            value, self._value = self._value, None
+            self.health.state = ServiceState.FAILED if error else ServiceState.PENDING
+            self.health.error = error
+            # Allow an immediate retry
+            self.health.last_attempt = None
+        if value is not None and self.close is not None:
+            try:
+                self.close(value)
+            except Exception:
+                pass
+
+
+# ============================================================================
+# FACTORIES
+# ============================================================================
+
+def _create_gemini_client():
+    from google import genai
+
+    if not settings.GOOGLE_API_KEY:
+        raise ValueError("GOOGLE_API_KEY not configured")
+    return genai.Client(api_key=settings.GOOGLE_API_KEY)
+
+
+def _probe_gemini(client) -> None:
+    # One page of the model list confirms the key and connectivity
+    next(iter(client.models.list()), None)
+
+
+def _connect_weaviate():
+    import weaviate
+
+    client = weaviate.connect_to_local()
+    if not client.is_ready():
+        client.close()
+        raise ConnectionError("Weaviate is not ready")
+    return client
+
+
+def _probe_weaviate(client) -> None:
+    if not client.is_ready():
+        raise ConnectionError("Weaviate is not ready")
+
+
+def _create_tokenizer():
+    import tiktoken
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _warm_embeddings():
+    from app.core.embeddings import get_embedding_provider
+
+    provider = get_embedding_provider()
+    provider.warm_up()
+    return provider
+
+
+gemini = LazyService("gemini", _create_gemini_client, probe=_probe_gemini)
+weaviate_service = LazyService(
+    "weaviate", _connect_weaviate, probe=_probe_weaviate, close=lambda client: client.close(),
+    # The embedded local backend needs no Weaviate
+    required=settings.VECTOR_STORE_BACKEND == "weaviate",
+)
+tokenizer_service = LazyService("tokenizer", _create_tokenizer)
+# Informational: the model also loads on first use, warming only saves that latency
+embeddings_service = LazyService("embeddings", _warm_embeddings, required=False)
+
+SERVICES: Dict[str, LazyService] = {
+    service.name: service for service in (gemini, weaviate_service, tokenizer_service, embeddings_service)
+}
+
+
+# ============================================================================
+# ACCESSORS
+# ============================================================================
 
-# Lazy-loaded globals
-_embedding_model = None
 _pdf_processor = None
 _excel_processor = None
-llm_client: Optional[genai.Client] = None
-llm_model = None # The GenerativeModel object instance
+_processor_lock = threading.Lock()
+vector_store: Optional[VectorStoreManager] = None  # Or a LocalVectorStoreManager
+
 
 def get_embedding_model():
-    """Lazy-load the embedding model only when needed"""
-    global _embedding_model
-    if _embedding_model is None:
-        print("Loading SentenceTransformer model...")
-        from sentence_transformers import SentenceTransformer
-        # Note: If 'all-MiniLM-L6-v2' is too large, consider a smaller one or
-        # using Google's embeddings API via the 'google-genai' client.
-        _embedding_model = SentenceTransformer("all-MiniLM-L6-v2", cache_folder="./model_cache")
-        print("✅ SentenceTransformer loaded")
-    return _embedding_model
-
-def get_vector_store():
-    """Lazy-load the vector store"""
+    """The process-wide embedding provider (SentenceTransformer-compatible `encode`)"""
+    from app.core.embeddings import get_embedding_provider
+    return get_embedding_provider()
+
+
+def get_tokenizer():
+    """The cl100k_base tiktoken encoder (LLM prompt budgets)"""
+    return tokenizer_service.get()
+
+
+def get_chunk_tokenizer():
+    """The embedder's own tokenizer: chunks are sized in the tokens of its input limit"""
+    return get_embedding_model().tokenizer
+
+
+def get_weaviate_client():
+    """The connected Weaviate client, or None while Weaviate is unavailable"""
+    return weaviate_service.try_get()
+
+
+def get_vector_store() -> Optional[VectorStoreManager]:
+    """
+    The configured vector store: over the current Weaviate client (None while
+    Weaviate is unavailable), or the embedded store when VECTOR_STORE_BACKEND
+    is "local".
+    """
     global vector_store
-    if vector_store is None and weaviate_client is not None:
-        # Assumes VectorStoreManager accepts the embedding model directly
-        vector_store = VectorStoreManager(weaviate_client, get_embedding_model())
+    if settings.VECTOR_STORE_BACKEND == "local":
+        if vector_store is None:
+            with _processor_lock:
+                if vector_store is None:
+                    from app.db.local_vector_store import LocalVectorStoreManager
+                    vector_store = LocalVectorStoreManager(embedding_model=get_embedding_model())
+        return vector_store
+    client = get_weaviate_client()
+    if client is None:
+        return None
+    if vector_store is None or vector_store.client is not client:
+        vector_store = VectorStoreManager(client, get_embedding_model())
     return vector_store
 
+
 def get_pdf_processor():
     """Lazy-load the PDF processor"""
     global _pdf_processor
     if _pdf_processor is None:
-        from app.modules.askai.services.document_service import PDFProcessor
-        _pdf_processor = PDFProcessor(get_embedding_model(), tokenizer)
+        with _processor_lock:
+            if _pdf_processor is None:
+                from app.modules.askai.services.document_service import PDFProcessor
+                _pdf_processor = PDFProcessor(get_embedding_model(), get_chunk_tokenizer())
     return _pdf_processor
 
-GEMINI_MODEL_NAME = "gemini-2.0-flash-exp"
 
 def get_excel_processor():
     """Lazy-load the Excel processor"""
     global _excel_processor
     if _excel_processor is None:
-        from app.modules.askai.services.document_service import ExcelProcessor
-        _excel_processor = ExcelProcessor(get_embedding_model(), tokenizer)
+        with _processor_lock:
+            if _excel_processor is None:
+                from app.modules.askai.services.document_service import ExcelProcessor
+                _excel_processor = ExcelProcessor(get_embedding_model(), get_chunk_tokenizer())
     return _excel_processor
 
+
+def llamaparse_available() -> bool:
+    """Whether PDF parsing can use LlamaParse (without loading the processor just to ask)"""
+    if _pdf_processor is not None:
+        return _pdf_processor.has_llamaparse
+    return bool(settings.LLAMA_CLOUD_API_KEY)
+
+
 def get_llm_client():
-    """Get the initialized Gemini client"""
-    if llm_client is None:
-        raise RuntimeError("Gemini client not initialized")
-    return llm_client
-
-try:
-    # --- New Google GenAI SDK initialization ---
-    # The new SDK uses Client initialization instead of configure()
-    llm_client = genai.Client(api_key=settings.GOOGLE_API_KEY)
-    
-    # You don't initialize a separate GenerativeModel object directly; 
-    # you often reference the model string via the client or integration.
-    # However, if you need a persistent model instance, you can use a placeholder
-    # or rely on the integration to handle the model name.
-    
-    # FIX: Replaced llm_client.models.get(...) with llm_client.models.list() 
-    # This is a safer way to confirm connectivity as it takes no explicit arguments.
-    # We iterate once to ensure the call succeeds.
-    list(llm_client.models.list())
-    print("✅ Gemini 2.0 Flash client configured and connected")
-
-    # embedding_model will be loaded lazily when first needed
-    embedding_model = None  # Placeholder for backward compatibility
-
-    # This will be initialized in the startup event.
-    weaviate_client: Optional[WeaviateClient] = None
-    vector_store: Optional[VectorStoreManager] = None
+    """Get the Gemini client (created on first use)"""
+    try:
+        return gemini.get()
+    except ServiceUnavailable as e:
+        raise RuntimeError(f"Gemini client not initialized: {e}") from e
+
 
+def generate_content(client, model_name: str, contents: Any, operation: str = "generate"):
+    """client.models.generate_content, recording latency and token counts per `operation`"""
+    start = time.perf_counter()
     try:
-        # Ensure weaviate connection is set up correctly (e.g., local or remote)
-        weaviate_client = weaviate.connect_to_local()
-        if not weaviate_client.is_ready():
-            raise Exception("Weaviate is not ready")
-        print("✅ Weaviate client connected")
-        # vector_store will be initialized lazily when embedding model is loaded
-        vector_store = None
-    except Exception as e:
-        print(f"❌ Could not connect to Weaviate: {e}")
-        weaviate_client = None
-        vector_store = None
-    
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-
-    # pdf_processor and excel_processor will be loaded lazily
-    pdf_processor = None  # Use get_pdf_processor() instead
-    excel_processor = None  # Use get_excel_processor() instead
-    
-    print("--- Core Services Initialized Successfully (AI models will load on first use) ---")
-
-# We specifically catch the new API error class if the key or model fails
-except APIError as e:
-    print(f"❌ Gemini API Error: Check GOOGLE_API_KEY and model availability. Details: {e}")
-    exit(1)
-except ImportError as e:
-    print(f"❌ Missing package: {e}")
-    exit(1)
-    print(f"❌ Failed to initialize core services: {e}")
-    exit(1)
+        response = client.models.generate_content(model=model_name, contents=contents)
+    except Exception:
+        metrics.LLM_REQUEST_SECONDS.labels(model_name, operation, "error").observe(time.perf_counter() - start)
+        raise
+    metrics.LLM_REQUEST_SECONDS.labels(model_name, operation, "ok").observe(time.perf_counter() - start)
+    metrics.record_llm_usage(model_name, operation, response)
+    return response
+
 
 class GenerativeModelWrapper:
     """Wrapper for Google GenAI Client to mimic legacy GenerativeModel interface"""
-    def __init__(self, client: genai.Client, model_name: str):
+    def __init__(self, client, model_name: str):
         self.client = client
         self.model_name = model_name
 
-    def generate_content(self, prompt: str):
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt
-        )
-        return response
+    def generate_content(self, prompt: str, operation: str = "generate"):
+        return generate_content(self.client, self.model_name, prompt, operation)
+
 
 def get_llm_model():
     """Get the initialized LLM model wrapper"""
-    if llm_client is None:
-        raise RuntimeError("LLM client not initialized")
-    return GenerativeModelWrapper(llm_client, GEMINI_MODEL_NAME)
\ No newline at end of file
+    return GenerativeModelWrapper(get_llm_client(), GEMINI_MODEL_NAME)
+
+
+# ============================================================================
+# STARTUP / HEALTH
+# ============================================================================
+
+_monitor_thread: Optional[threading.Thread] = None
+_monitor_stop = threading.Event()
+
+
+def start_services(wait: bool = False) -> None:
+    """
+    Initialise every dependency concurrently and start the reconnect loop.
+
+    Returns immediately unless `wait` is set; failures are recorded in the
+    service health, never raised.
+    """
+    global _monitor_thread
+    services = [
+        s for s in SERVICES.values()
+        if (s is not embeddings_service or settings.EMBEDDING_WARMUP) and (s is not weaviate_service or s.required)
+    ]
+    executor = ThreadPoolExecutor(max_workers=len(services), thread_name_prefix="service-init")
+    futures = [executor.submit(service.try_get) for service in services]
+    executor.shutdown(wait=wait)
+    if wait:
+        for future in futures:
+            future.result()
+
+    if _monitor_thread is None or not _monitor_thread.is_alive():
+        _monitor_stop.clear()
+        _monitor_thread = threading.Thread(target=_monitor_loop, name="service-monitor", daemon=True)
+        _monitor_thread.start()
+
+
+def _monitor_loop() -> None:
+    while not _monitor_stop.wait(settings.SERVICE_RECONNECT_INTERVAL_SECONDS):
+        for service in SERVICES.values():
+            if service.health.state != ServiceState.PENDING:
+                service.check()
+
+
+def shutdown_services() -> None:
+    """Stop the reconnect loop and close open clients"""
+    _monitor_stop.set()
+    for service in SERVICES.values():
+        if service.peek() is not None and service.close is not None:
+            service.reset()
+
+
+def service_status() -> Dict[str, Dict[str, Any]]:
+    """Per-dependency health, e.g. {"weaviate": {"state": "ready", ...}}"""
+    return {name: {**service.health.as_dict(), "required": service.required} for name, service in SERVICES.items()}
+
+
+def readiness() -> Dict[str, Any]:
+    """Ready once every required dependency is initialised"""
+    status = service_status()
+    ready = all(s["state"] == ServiceState.READY.value for s in status.values() if s["required"])
+    return {"ready": ready, "services": status}
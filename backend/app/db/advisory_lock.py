@@ -0,0 +1,75 @@
+"""
+Named locks that hold across threads and processes.
+
+On PostgreSQL, `advisory_lock(name)` takes a session-level pg_advisory_lock on
+a dedicated connection, keyed by a signed 64-bit hash of the name. The lock is
+held for the whole `with` block, even when the work inside opens and commits
+its own sessions. It is released on exit, or by the server if the connection
+drops. Threads of one process first queue on an in-process lock for the
+same name, so only one of them holds a pooled connection while waiting. On
+other databases (SQLite in tests) only the in-process lock applies.
+
+Usage:
+    from app.db.advisory_lock import advisory_lock
+
+    with advisory_lock(f"scrape:{url}"):
+        ...  # check for duplicates, scrape, log the outcome
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+def lock_key(name: str) -> int:
+    """Signed 64-bit key for pg_advisory_lock"""
+    return int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+
+
+# name -> [lock, number of threads holding or waiting for it]
+_local_locks: Dict[str, List] = {}
+_local_locks_guard = threading.Lock()
+
+
+def _acquire_local(name: str) -> threading.Lock:
+    with _local_locks_guard:
+        entry = _local_locks.setdefault(name, [threading.Lock(), 0])
+        entry[1] += 1
+    entry[0].acquire()
+    return entry[0]
+
+
+def _release_local(name: str) -> None:
+    with _local_locks_guard:
+        entry = _local_locks[name]
+        entry[0].release()
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _local_locks[name]
+
+
+@contextmanager
+def advisory_lock(name: str, engine: Optional[Engine] = None):
+    """Hold the lock called `name` for the duration of the block"""
+    if engine is None:
+        from app.db.database import engine
+    _acquire_local(name)
+    try:
+        if engine.dialect.name != "postgresql":
+            yield
+            return
+        key = lock_key(name)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            connection.commit()
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
+    finally:
+        _release_local(name)
@@ -1,9 +1,38 @@
+import threading
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.db.query_instrumentation import instrument_engine
+
+
+def pool_options(url: str, pool_size: int, max_overflow: int) -> dict:
+    """
+    Connection pool settings for an engine on `url`. Pre-ping replaces
+    connections the server has dropped before a request gets them, and
+    recycle retires them ahead of server/proxy idle timeouts. SQLite URLs
+    (tests, scripts) keep SQLAlchemy's default pool.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
-# Create the SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+
+# Create the SQLAlchemy engine; every statement is timed, and counted per
+# request by QueryTimingMiddleware (see app.db.query_instrumentation)
+engine = instrument_engine(create_engine(
+    settings.DATABASE_URL,
+    **pool_options(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+))
 
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,10 +53,62 @@ def create_db_and_tables():
     Base.metadata.create_all(bind=engine)
     print("Database tables created.")
 
-# FastAPI dependency to get a DB session for a single request
+# FastAPI dependency to get a DB session for a single request.
+# Use it from `def` routes: FastAPI runs those in its threadpool, so a slow
+# query only holds one thread. `async def` routes use get_async_db_session.
 def get_db_session():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# ============================================================================
+# ASYNC ENGINE (asyncpg)
+# ============================================================================
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    The asyncpg engine for ASYNC_DATABASE_URL, created on first use so that
+    workers and scripts that never serve async routes do not open its pool.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_lock:
+            if _async_engine is None:
+                async_engine = create_async_engine(
+                    settings.ASYNC_DATABASE_URL,
+                    **pool_options(settings.ASYNC_DATABASE_URL, settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW),
+                )
+                instrument_engine(async_engine.sync_engine)
+                _async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+                _async_engine = async_engine
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """A new AsyncSession on the asyncpg engine (use as `async with AsyncSessionLocal() as db`)"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+# FastAPI dependency for `async def` routes: queries are awaited, so they
+# never block the event loop. Relationships are not lazy-loaded on an
+# AsyncSession; load them in the query (selectinload) or via AsyncAttrs.
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close the asyncpg pool (application shutdown)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
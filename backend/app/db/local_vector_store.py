@@ -0,0 +1,733 @@
+"""
+Embedded vector store: the VectorStoreManager interface without a Weaviate service.
+
+For development, CI and single-node sites (VECTOR_STORE_BACKEND="local").
+Every collection is a directory under LOCAL_VECTOR_STORE_DIR:
+
+- vectors.f32   unit-normalised float32 rows, appended and read through np.memmap
+- objects.jsonl one {"uuid", "properties"} line per row; a later row with the
+                same uuid replaces the earlier one (upserts)
+- meta.json     vector dimension and a generation id, new each time the
+                collection is created
+- ivf.npz       IVF index (centroids + row assignments), rebuilt as the
+                collection grows
+
+Search is exact (one matrix-vector product over the memmap) below
+LOCAL_VECTOR_IVF_MIN_VECTORS rows. Larger collections use an inverted-file
+index: spherical k-means centroids, the LOCAL_VECTOR_IVF_NPROBE closest lists
+are scanned, plus any rows appended since the index was built. Hybrid
+queries fuse a BM25 score over `content` with the vector score the way
+Weaviate's relative-score fusion does. Filters are property equality (e.g.
+doc_id, type) and numeric/date ranges.
+
+Writers take an exclusive flock on the collection and readers pick up rows
+appended by other processes (API workers, Celery) before each query. A
+reader whose collection was dropped and recreated elsewhere (a changed
+generation, or a shrunken objects file) discards its rows and reloads.
+
+Usage:
+    from app.db.local_vector_store import LocalVectorStoreManager
+
+    store = LocalVectorStoreManager()
+    collection = store.get_or_create_collection(chat_id)
+    store.add_chunks(collection, chunks)
+    store.query(collection, "What is the EMD?", filters={"doc_id": doc_id})
+"""
+
+import fcntl
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import uuid as uuid_module
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from weaviate.util import generate_uuid5
+
+from app.config import settings
+from app.core import metrics
+from app.db.vector_store import TENDER_SIMILARITY_COLLECTION, VectorStoreManager
+
+_TOKEN_RE = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass
+class LocalObject:
+    uuid: str
+    properties: Dict[str, Any]
+    score: float
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _comparable(value: Any) -> Any:
+    """Dates (datetime or ISO strings) compare as timestamps, everything else as is"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return value
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# ============================================================================
+# IVF INDEX
+# ============================================================================
+
+class IVFIndex:
+    """Inverted-file index over unit vectors: spherical k-means lists, scanned nprobe at a time"""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray):
+        self.centroids = centroids
+        self.indexed_rows = len(assignments)
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=len(centroids))
+        self._rows = order
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        n = len(vectors)
+        n_lists = min(n, n_lists or int(min(1024, max(16, math.sqrt(n)))))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, n_lists * 64), replace=False)]
+        centroids = np.array(sample[rng.choice(len(sample), size=n_lists, replace=False)])
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            # Re-seed empty lists from random sample points
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = _normalise(sums)
+        return cls(centroids, cls.assign(vectors, centroids))
+
+    @staticmethod
+    def assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), block)
+        ]).astype(np.int32)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        lists = _top_k(self.centroids @ query, nprobe)
+        return np.concatenate([self._rows[self._offsets[i]:self._offsets[i + 1]] for i in lists])
+
+    def save(self, path: Path) -> None:
+        assignments = np.empty(self.indexed_rows, dtype=np.int32)
+        for list_id in range(len(self.centroids)):
+            assignments[self._rows[self._offsets[list_id]:self._offsets[list_id + 1]]] = list_id
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, centroids=self.centroids, assignments=assignments)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(data["centroids"], data["assignments"])
+
+
+# ============================================================================
+# COLLECTION
+# ============================================================================
+
+class LocalCollection:
+    """One on-disk collection: memory-mapped vectors, JSONL objects, IVF and BM25 indexes"""
+
+    def __init__(self, path: Path, dimension: Optional[int] = None):
+        self.path = path
+        self.name = path.name
+        self._lock = threading.RLock()
+        self._meta_signature: Optional[Tuple[int, int]] = None
+        self._generation: Optional[str] = None
+        self.dimension: Optional[int] = None
+        self._reset()
+
+        path.mkdir(parents=True, exist_ok=True)
+        if not self._meta_path.exists() and dimension is not None:
+            self._write_meta(dimension)
+        self.refresh()
+
+    def _reset(self) -> None:
+        """Forget every loaded row"""
+        self._objects_offset = 0
+        self._vectors: Optional[np.ndarray] = None
+        self.properties: List[Dict[str, Any]] = []
+        self.uuids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._ivf: Optional[IVFIndex] = None
+        self._columns: Dict[str, List[Any]] = {}
+        self._bm25_rows = 0
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._doc_lengths: List[int] = []
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def _objects_path(self) -> Path:
+        return self.path / "objects.jsonl"
+
+    @property
+    def _ivf_path(self) -> Path:
+        return self.path / "ivf.npz"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    def _write_meta(self, dimension: int) -> None:
+        """Start a new generation of the collection (caller creates it)"""
+        self.dimension = dimension
+        self._generation = uuid_module.uuid4().hex
+        self._meta_path.write_text(json.dumps({"dimension": dimension, "generation": self._generation}))
+
+    def _check_generation(self) -> None:
+        """Reset when the collection was dropped and recreated since the last read"""
+        try:
+            stat = self._meta_path.stat()
+            signature = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            signature = None
+        if signature == self._meta_signature:
+            return
+        self._meta_signature = signature
+        meta = json.loads(self._meta_path.read_text()) if signature else {}
+        if meta.get("generation") != self._generation or meta.get("dimension") != self.dimension:
+            if self.uuids:
+                print(f"ℹ️  Collection {self.name} was recreated, reloading")
+            self._reset()
+            self._generation = meta.get("generation")
+            self.dimension = meta.get("dimension")
+
+    def __len__(self) -> int:
+        return int(self._live.sum())
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self.path / ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def refresh(self) -> None:
+        """Load rows appended since the last read (possibly by another process)"""
+        with self._lock:
+            self._check_generation()
+            size = self._objects_path.stat().st_size if self._objects_path.exists() else 0
+            if size < self._objects_offset:
+                # Truncated or replaced under the same meta.json
+                self._reset()
+            if size == self._objects_offset:
+                return
+            if self.dimension is None:
+                self.dimension = json.loads(self._meta_path.read_text())["dimension"]
+            with open(self._objects_path, "rb") as handle:
+                handle.seek(self._objects_offset)
+                data = handle.read()
+            # Only complete lines: a writer may be mid-append
+            end = data.rfind(b"\n") + 1
+            lines = data[:end].splitlines()
+            self._objects_offset += end
+
+            row_bytes = self.dimension * 4
+            vector_rows = self._vectors_path.stat().st_size // row_bytes
+            first = len(self.uuids)
+            lines = lines[:max(0, vector_rows - first)]
+            live = np.ones(first + len(lines), dtype=bool)
+            live[:first] = self._live
+            for offset, line in enumerate(lines):
+                record = json.loads(line)
+                row = first + offset
+                previous = self._row_of.get(record["uuid"])
+                if previous is not None:
+                    live[previous] = False
+                self._row_of[record["uuid"]] = row
+                self.uuids.append(record["uuid"])
+                self.properties.append(record["properties"])
+            self._live = live
+            total = len(self.uuids)
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(total, self.dimension)) if total else None
+            self._maybe_rebuild_ivf()
+
+    def add(self, vectors: np.ndarray, properties: Sequence[Dict[str, Any]], uuids: Optional[Sequence[str]] = None) -> int:
+        """Append (or, for a known uuid, replace) objects"""
+        if not len(properties):
+            return 0
+        vectors = _normalise(vectors)
+        # Another process may have dropped the directory since this handle was opened
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._repair()
+            if self.dimension is None:
+                self._write_meta(int(vectors.shape[1]))
+            if vectors.shape[1] != self.dimension:
+                raise ValueError(f"Vector dimension {vectors.shape[1]} does not match collection dimension {self.dimension}")
+            uuids = list(uuids) if uuids is not None else [str(uuid_module.uuid4()) for _ in properties]
+            lines = b"".join(
+                json.dumps({"uuid": str(object_id), "properties": props}, default=_json_default).encode() + b"\n"
+                for object_id, props in zip(uuids, properties)
+            )
+            # Vectors first: readers only count rows present in both files
+            with open(self._vectors_path, "ab") as handle:
+                handle.write(vectors.tobytes())
+            with open(self._objects_path, "ab") as handle:
+                handle.write(lines)
+        self.refresh()
+        return len(properties)
+
+    def _repair(self) -> None:
+        """Drop the torn tail of an append interrupted by a crash (caller holds the file lock)"""
+        if self._objects_path.exists():
+            size = self._objects_path.stat().st_size
+            with open(self._objects_path, "rb+") as handle:
+                handle.seek(max(0, size - 1))
+                if size and handle.read(1) != b"\n":
+                    handle.seek(0)
+                    handle.truncate(handle.read().rfind(b"\n") + 1)
+        self.refresh()
+        if self.dimension and self._vectors_path.exists():
+            expected = len(self.uuids) * self.dimension * 4
+            if self._vectors_path.stat().st_size > expected:
+                os.truncate(self._vectors_path, expected)
+
+    def get(self, object_id: str) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+        self.refresh()
+        row = self._row_of.get(str(object_id))
+        if row is None:
+            return None
+        return self.properties[row], np.array(self._vectors[row])
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _maybe_rebuild_ivf(self) -> None:
+        total = len(self.uuids)
+        if total < settings.LOCAL_VECTOR_IVF_MIN_VECTORS:
+            self._ivf = None
+            return
+        if self._ivf is None and self._ivf_path.exists():
+            try:
+                index = IVFIndex.load(self._ivf_path)
+                if index.indexed_rows <= total:
+                    self._ivf = index
+            except Exception as e:
+                print(f"⚠️  Rebuilding unreadable IVF index for {self.name}: {e}")
+        # Rows appended after the build are scanned exactly; rebuild once they are a third of the collection
+        if self._ivf is None or total - self._ivf.indexed_rows > total // 3:
+            self._ivf = IVFIndex.build(self._vectors)
+            self._ivf.save(self._ivf_path)
+            print(f"✅ Built IVF index for {self.name}: {total} vectors, {len(self._ivf.centroids)} lists")
+
+    def _update_bm25(self) -> None:
+        for row in range(self._bm25_rows, len(self.properties)):
+            terms = Counter(_tokenize(str(self.properties[row].get("content", ""))))
+            for term, count in terms.items():
+                self._postings[term][row] = count
+            self._doc_lengths.append(sum(terms.values()))
+        self._bm25_rows = len(self.properties)
+
+    def _bm25_scores(self, query: str, mask: np.ndarray) -> np.ndarray:
+        self._update_bm25()
+        lengths = np.asarray(self._doc_lengths, dtype=np.float32)
+        average_length = float(lengths[mask].mean()) if mask.any() else 1.0
+        live_count = int(mask.sum())
+        scores = np.zeros(len(lengths), dtype=np.float32)
+        for term in set(_tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            rows = np.fromiter(postings.keys(), dtype=np.int64)
+            tf = np.fromiter(postings.values(), dtype=np.float32)
+            keep = mask[rows]
+            rows, tf = rows[keep], tf[keep]
+            if not len(rows):
+                continue
+            idf = math.log(1 + (live_count - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / average_length)
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _column(self, prop: str, comparable: bool = False) -> np.ndarray:
+        """One property across all rows, extended incrementally as rows arrive"""
+        key = f"{prop}:cmp" if comparable else prop
+        values = self._columns.setdefault(key, [])
+        for props in self.properties[len(values):]:
+            value = props.get(prop)
+            values.append(_comparable(value) if comparable and value is not None else value)
+        return np.array(values, dtype=object)
+
+    def filter_mask(
+        self,
+        equal: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        exclude_uuids: Iterable[str] = (),
+    ) -> np.ndarray:
+        """Live rows matching every equality (a list value matches any of it) and inclusive range"""
+        mask = self._live.copy()
+        for prop, expected in (equal or {}).items():
+            allowed = list(expected) if isinstance(expected, (list, tuple, set)) else [expected]
+            mask &= np.isin(self._column(prop), allowed)
+        for prop, (low, high) in (ranges or {}).items():
+            column = self._column(prop, comparable=True)
+            present = np.array([value is not None for value in column], dtype=bool)
+            mask &= present
+            if low is not None:
+                mask[present] &= column[present] >= _comparable(low)
+            if high is not None:
+                mask[present] &= column[present] <= _comparable(high)
+        for object_id in exclude_uuids:
+            row = self._row_of.get(str(object_id))
+            if row is not None:
+                mask[row] = False
+        return mask
+
+    def _vector_scores(self, query_vector: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows in ascending order, cosine scores) of the searched rows that pass `mask`"""
+        if self._ivf is None:
+            if mask.all():
+                return np.arange(len(mask)), np.asarray(self._vectors @ query_vector)
+            rows = np.flatnonzero(mask)
+        else:
+            nprobe = min(settings.LOCAL_VECTOR_IVF_NPROBE, len(self._ivf.centroids))
+            tail = np.arange(self._ivf.indexed_rows, len(self.uuids))
+            rows = np.concatenate([self._ivf.candidates(query_vector, nprobe), tail])
+            rows = np.sort(rows[mask[rows]])
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        return rows, np.asarray(self._vectors[rows] @ query_vector)
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        limit: int,
+        mask: Optional[np.ndarray] = None,
+        query_text: Optional[str] = None,
+        alpha: float = 1.0,
+    ) -> List[LocalObject]:
+        """Vector search, or hybrid when `query_text` is given and alpha < 1"""
+        self.refresh()
+        if self._vectors is None or limit <= 0:
+            return []
+        mask = self._live if mask is None else mask
+        query_vector = _normalise(query_vector)
+        rows, scores = self._vector_scores(query_vector, mask)
+
+        if query_text is None or alpha >= 1:
+            top = _top_k(scores, limit)
+            return [LocalObject(self.uuids[r], self.properties[r], float(s)) for r, s in zip(rows[top], scores[top])]
+
+        # Relative-score fusion: each result list min-max scaled to [0, 1], then weighted by alpha
+        bm25 = self._bm25_scores(query_text, mask)
+        pool = max(limit, 100)
+        vector_top = _top_k(scores, pool)
+        keyword_rows = np.flatnonzero(bm25 > 0)
+        keyword_rows = keyword_rows[_top_k(bm25[keyword_rows], pool)]
+        fused: Dict[int, float] = defaultdict(float)
+        for weight, candidate_rows, candidate_scores in (
+            (alpha, rows[vector_top], scores[vector_top]),
+            (1 - alpha, keyword_rows, bm25[keyword_rows]),
+        ):
+            if not len(candidate_rows):
+                continue
+            low, high = float(candidate_scores.min()), float(candidate_scores.max())
+            scaled = (candidate_scores - low) / (high - low) if high > low else np.ones(len(candidate_scores))
+            for row, value in zip(candidate_rows, scaled):
+                fused[int(row)] += weight * float(value)
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [LocalObject(self.uuids[r], self.properties[r], score) for r, score in ranked]
+
+
+# ============================================================================
+# MANAGER
+# ============================================================================
+
+class LocalVectorStoreManager:
+    """Drop-in for VectorStoreManager backed by LocalCollection directories"""
+
+    def __init__(self, root_dir: Optional[Path] = None, embedding_model=None):
+        from app.core.embeddings import get_embedding_provider
+
+        self.root_dir = Path(root_dir or settings.LOCAL_VECTOR_STORE_DIR)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.embedding_model = embedding_model if embedding_model is not None else get_embedding_provider()
+        # Truthy stand-in for callers that check `vector_store.client`
+        self.client = self
+        self._collections: Dict[str, LocalCollection] = {}
+        self._lock = threading.Lock()
+        print(f"✅ LocalVectorStoreManager initialized at {self.root_dir}")
+
+    # ------------------------------------------------------------------
+    # Collections
+    # ------------------------------------------------------------------
+
+    def exists(self, name: str) -> bool:
+        return name in self._collections or (self.root_dir / name).is_dir()
+
+    def collection(self, name: str) -> LocalCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = LocalCollection(self.root_dir / name)
+            return self._collections[name]
+
+    def drop(self, name: str) -> None:
+        with self._lock:
+            self._collections.pop(name, None)
+            shutil.rmtree(self.root_dir / name, ignore_errors=True)
+
+    @staticmethod
+    def _chat_collection_name(chat_id: str) -> str:
+        return f"Chat_{chat_id.replace('-', '')}"
+
+    @staticmethod
+    def _tender_collection_name(tender_id: str) -> str:
+        return f"Tender_{re.sub(r'[^a-zA-Z0-9_]', '_', tender_id)}"
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.embedding_model.encode(texts, show_progress_bar=False, batch_size=32), dtype=np.float32)
+
+    def _search(self, collection: LocalCollection, query: str, n_results: int, mode: Optional[str],
+                alpha: Optional[float], filters: Optional[Dict[str, Any]]) -> List[Tuple]:
+        mode = (mode or settings.RAG_RETRIEVAL_MODE).lower()
+        if mode not in ("vector", "hybrid"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        collection.refresh()
+        query_vector = self._encode([query])[0]
+        mask = collection.filter_mask(equal=filters) if filters else None
+        with metrics.VECTOR_QUERY_SECONDS.labels("local", mode).time():
+            objects = collection.search(
+                query_vector, n_results, mask,
+                query_text=query if mode == "hybrid" else None,
+                alpha=settings.RAG_HYBRID_ALPHA if alpha is None else alpha,
+            )
+        return VectorStoreManager._dedupe_results(objects, lambda obj: obj.score)
+
+    # ------------------------------------------------------------------
+    # Chat collections
+    # ------------------------------------------------------------------
+
+    def similarity_search(self, collection_name: str, query_text: str, limit: int):
+        if not self.exists(collection_name):
+            print(f"⚠️  Collection {collection_name} does not exist for similarity search.")
+            return []
+        try:
+            return self.query(self.collection(collection_name), query_text, limit)
+        except Exception as e:
+            print(f"❌ Error in similarity_search for collection {collection_name}: {e}")
+            return []
+
+    def get_or_create_collection(self, chat_id: str) -> LocalCollection:
+        return self.collection(self._chat_collection_name(chat_id))
+
+    def add_chunks(self, collection: LocalCollection, chunks: List[Dict]) -> int:
+        if not chunks:
+            return 0
+        properties = [
+            {
+                "content": chunk["content"],
+                "source": chunk["metadata"].get("source", "unknown"),
+                "page": str(chunk["metadata"].get("page", "0")),
+                "doc_id": chunk["metadata"].get("doc_id", "unknown"),
+                "doc_type": chunk["metadata"].get("doc_type", "unknown"),
+                "type": chunk["metadata"].get("type", "unknown"),
+            }
+            for chunk in chunks
+        ]
+        added = collection.add(self._encode([p["content"] for p in properties]), properties)
+        print(f"✅ Added {added} chunks to local collection {collection.name}")
+        return added
+
+    def query(
+        self,
+        collection: LocalCollection,
+        query: str,
+        n_results: int = settings.RAG_TOP_K,
+        mode: Optional[str] = None,
+        alpha: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple]:
+        """Same contract as VectorStoreManager.query: (content, properties, score), best first"""
+        try:
+            return self._search(collection, query, n_results, mode, alpha, filters)
+        except Exception as e:
+            print(f"❌ Local vector query error: {e}")
+            return []
+
+    def delete_collection(self, chat_id: str):
+        self.drop(self._chat_collection_name(chat_id))
+        print(f"🗑️  Deleted local collection for chat {chat_id}")
+
+    # ------------------------------------------------------------------
+    # Tender collections
+    # ------------------------------------------------------------------
+
+    def create_tender_collection(self, tender_id: str) -> LocalCollection:
+        name = self._tender_collection_name(tender_id)
+        if self.exists(name):
+            self.drop(name)
+        return self.collection(name)
+
+    def add_tender_chunks(self, collection: LocalCollection, chunks: List[Dict]) -> int:
+        if not chunks:
+            return 0
+        properties = []
+        for chunk in chunks:
+            metadata = chunk.get("metadata", {})
+            try:
+                chunk_idx = int(metadata.get("chunk_index", metadata.get("table_index", "0")))
+            except (ValueError, TypeError):
+                chunk_idx = 0
+            properties.append({
+                "content": chunk.get("content", ""),
+                "document_name": metadata.get("source", "unknown"),
+                "document_type": metadata.get("doc_type", "unknown"),
+                "chunk_type": metadata.get("type", "unknown"),
+                "page_number": str(metadata.get("page", "0")),
+                "chunk_index": chunk_idx,
+            })
+        added = collection.add(self._encode([p["content"] for p in properties]), properties)
+        print(f"✅ Added {added} chunks to local collection {collection.name}")
+        return added
+
+    def query_tender(
+        self,
+        tender_id: str,
+        query: str,
+        n_results: int = settings.RAG_TOP_K,
+        mode: Optional[str] = None,
+        alpha: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple]:
+        name = self._tender_collection_name(tender_id)
+        if not self.exists(name):
+            print(f"⚠️  Collection {name} does not exist for querying.")
+            return []
+        try:
+            return self._search(self.collection(name), query, n_results, mode, alpha, filters)
+        except Exception as e:
+            print(f"❌ Local tender query error: {e}")
+            return []
+
+    def delete_tender_collection(self, tender_id: str):
+        self.drop(self._tender_collection_name(tender_id))
+
+    # ------------------------------------------------------------------
+    # Tender similarity
+    # ------------------------------------------------------------------
+
+    def get_or_create_tender_similarity_collection(self) -> LocalCollection:
+        return self.collection(TENDER_SIMILARITY_COLLECTION)
+
+    def upsert_tender_vectors(self, records: List[Dict]) -> int:
+        if not records:
+            return 0
+        try:
+            collection = self.get_or_create_tender_similarity_collection()
+            properties = []
+            for record in records:
+                props = {
+                    "tender_id_str": record["tender_id_str"],
+                    "scraped_tender_id": record.get("scraped_tender_id", ""),
+                    "tender_name": record.get("tender_name", ""),
+                    "tendering_authority": record.get("tendering_authority", ""),
+                    "state": record.get("state", ""),
+                    "tender_value": float(record.get("tender_value") or 0.0),
+                }
+                if record.get("publish_date") is not None:
+                    props["publish_date"] = record["publish_date"]
+                properties.append(props)
+            uuids = [generate_uuid5(r["tender_id_str"]) for r in records]
+            collection.add(self._encode([r["content"] for r in records]), properties, uuids)
+            print(f"✅ Indexed {len(records)} tenders in local {TENDER_SIMILARITY_COLLECTION}")
+            return len(records)
+        except Exception as e:
+            print(f"❌ Error indexing tenders for similarity search: {e}")
+            return 0
+
+    def get_tender_vector(self, tender_id_str: str) -> Optional[List[float]]:
+        if not self.exists(TENDER_SIMILARITY_COLLECTION):
+            return None
+        found = self.collection(TENDER_SIMILARITY_COLLECTION).get(generate_uuid5(tender_id_str))
+        return found[1].tolist() if found else None
+
+    def query_similar_tenders(
+        self,
+        query: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+        n_results: int = settings.TENDER_SIMILARITY_TOP_K,
+        state: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        exclude_tender_id_str: Optional[str] = None,
+    ) -> List[Tuple]:
+        """Same contract as VectorStoreManager.query_similar_tenders: (properties, similarity)"""
+        if not self.exists(TENDER_SIMILARITY_COLLECTION):
+            return []
+        if vector is None:
+            if not query:
+                return []
+            vector = self._encode([query])[0]
+
+        collection = self.collection(TENDER_SIMILARITY_COLLECTION)
+        collection.refresh()
+        ranges = {}
+        if min_value is not None or max_value is not None:
+            ranges["tender_value"] = (min_value, max_value)
+        if published_after is not None or published_before is not None:
+            ranges["publish_date"] = (published_after, published_before)
+        excluded = [generate_uuid5(exclude_tender_id_str)] if exclude_tender_id_str else []
+        mask = collection.filter_mask(equal={"state": state} if state else None, ranges=ranges, exclude_uuids=excluded)
+        with metrics.VECTOR_QUERY_SECONDS.labels("local", "similar_tenders").time():
+            objects = collection.search(np.asarray(vector, dtype=np.float32), n_results, mask)
+        return [(obj.properties, obj.score) for obj in objects]
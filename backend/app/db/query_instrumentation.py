@@ -0,0 +1,265 @@
+"""
+Per-request SQL instrumentation.
+
+`instrument_engine()` hooks SQLAlchemy's cursor events on an engine
+(app.db.database instruments the application engine):
+- Every statement is timed. Statements slower than DB_SLOW_QUERY_SECONDS
+  are logged with the code that issued them; parameter values are
+  redacted to their types.
+- Inside `track_queries()` the statements are also counted and timed per
+  unit of work. Statements are grouped by their text (bound values are
+  parameters, and IN lists are collapsed), so a lazy relationship loaded
+  in a loop shows up as one statement repeated many times. The
+  DB_N_PLUS_ONE_THRESHOLD-th repetition is logged once as a likely N+1,
+  with the call site of the repeat.
+
+`QueryTimingMiddleware` opens `track_queries()` for a
+DB_INSTRUMENTATION_SAMPLE_RATE share of HTTP requests, adds
+`Server-Timing: db;dur=<ms>;desc="<n> queries"` to their responses and
+records the per-route counts in app.core.metrics. Requests that are not
+sampled only pay for the timing.
+
+`query_budget()` is the test helper: it fails when a block, or any request
+served by a QueryTimingMiddleware app while it is open, runs more
+statements than allowed.
+
+Usage:
+    from app.db.query_instrumentation import QueryTimingMiddleware, instrument_engine, query_budget
+
+    instrument_engine(engine)
+    app.add_middleware(QueryTimingMiddleware)
+
+    with query_budget(3):
+        client.get("/api/v1/chats")
+"""
+
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """The statement with whitespace folded and placeholder lists of any length written as (...)"""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def call_site() -> str:
+    """file:line in function of the innermost project frame outside this module and its dependencies"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and filename != __file__ and "site-packages" not in filename:
+            return f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Parameter types only, never values"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+# ============================================================================
+# PER-REQUEST STATISTICS
+# ============================================================================
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    seconds: float = 0.0
+    call_site: Optional[str] = None  # Recorded when the statement looks like an N+1
+
+
+@dataclass
+class QueryStats:
+    """Statements run inside one track_queries() block"""
+
+    n_plus_one_threshold: int = field(default_factory=lambda: settings.DB_N_PLUS_ONE_THRESHOLD)
+    count: int = 0
+    seconds: float = 0.0
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = normalize_statement(statement)
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            stats = self.statements.setdefault(key, StatementStats())
+            stats.count += 1
+            stats.seconds += seconds
+            reported = stats.count == self.n_plus_one_threshold
+            if reported:
+                stats.call_site = call_site()
+        if reported:
+            metrics.DB_N_PLUS_ONE_TOTAL.inc()
+            logger.warning(
+                f"Likely N+1: statement run {stats.count} times in one request, "
+                f"repeated at {stats.call_site}: {key[:300]}"
+            )
+
+    @property
+    def repeated(self) -> List[tuple]:
+        """(statement, stats) for statements at or over the N+1 threshold, most frequent first"""
+        with self._lock:
+            items = [(key, stats) for key, stats in self.statements.items() if stats.count >= self.n_plus_one_threshold]
+        return sorted(items, key=lambda item: -item[1].count)
+
+    def describe(self, limit: int = 10) -> str:
+        """The most frequent statements, one per line"""
+        with self._lock:
+            items = sorted(self.statements.items(), key=lambda item: -item[1].count)[:limit]
+        return "\n".join(f"  {stats.count}x {stats.seconds * 1000:.1f} ms  {key[:200]}" for key, stats in items)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_request_observers: List[Callable[[QueryStats], None]] = []
+
+
+@contextmanager
+def track_queries(n_plus_one_threshold: Optional[int] = None) -> Iterator[QueryStats]:
+    """Count and time the statements run in this context (threadpool calls inherit it)"""
+    stats = QueryStats() if n_plus_one_threshold is None else QueryStats(n_plus_one_threshold=n_plus_one_threshold)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+# ============================================================================
+# ENGINE HOOKS
+# ============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    slow_after = settings.DB_SLOW_QUERY_SECONDS
+    if slow_after and elapsed >= slow_after:
+        metrics.DB_SLOW_QUERIES_TOTAL.inc()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) at {call_site()}: {normalize_statement(statement)[:1000]} "
+            f"parameters={redact_parameters(parameters, executemany)}"
+        )
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Install the timing hooks on `engine` (idempotent); returns the engine"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+# ============================================================================
+# HTTP MIDDLEWARE
+# ============================================================================
+
+class QueryTimingMiddleware:
+    """
+    ASGI middleware: tracks the queries of sampled requests and reports
+    them in a Server-Timing header and the per-route metrics.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so streamed
+    responses (SSE) pass through unbuffered.
+    """
+
+    def __init__(self, app, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        rate = settings.DB_INSTRUMENTATION_SAMPLE_RATE if self.sample_rate is None else self.sample_rate
+        # Budgets under test see every request
+        if scope["type"] != "http" or not (_request_observers or random.random() < rate):
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    header = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                route_label = getattr(route, "path", None) or "unmatched"
+                metrics.DB_QUERIES_PER_REQUEST.labels(route_label).observe(stats.count)
+                metrics.DB_SECONDS_PER_REQUEST.labels(route_label).observe(stats.seconds)
+                for observer in list(_request_observers):
+                    observer(stats)
+
+
+# ============================================================================
+# TEST HELPER
+# ============================================================================
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[List[QueryStats]]:
+    """
+    Fail with AssertionError when the block, or any single request served
+    by a QueryTimingMiddleware app while the block runs, executes more than
+    `max_queries` statements. Yields the QueryStats collected so far: the
+    block's own first, then one per request.
+    """
+    collected: List[QueryStats] = []
+    _request_observers.append(collected.append)
+    try:
+        with track_queries() as own:
+            collected.insert(0, own)
+            yield collected
+    finally:
+        _request_observers.remove(collected.append)
+
+    for stats in collected:
+        if stats.count > max_queries:
+            raise AssertionError(
+                f"{stats.count} queries exceed the budget of {max_queries}:\n{stats.describe()}"
+            )
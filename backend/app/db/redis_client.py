@@ -6,12 +6,11 @@ from app.config import settings
 
 def get_redis_client() -> redis.Redis:
     """
-    Returns a Redis client instance connected to the configured Redis server.
+    Returns a Redis client instance connected to the configured Redis server
+    (REDIS_URL, which async subscribers connect to as well).
     """
-    return redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        db=settings.REDIS_DB,
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
         decode_responses=True  # Decode responses to strings by default
     )
 
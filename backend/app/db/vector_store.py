@@ -1,20 +1,29 @@
 import re
 import uuid
 import traceback
-from typing import List, Tuple, Dict
+from datetime import datetime
+from typing import Any, List, Tuple, Dict, Optional
 
 import weaviate
 import weaviate.classes.config as wvc
+from weaviate.classes.query import Filter, MetadataQuery
 from weaviate.client import WeaviateClient
 from weaviate.collections.collection import Collection
+from weaviate.util import generate_uuid5
 from app.config import settings
+from app.core import metrics
+from app.core.embeddings import get_embedding_provider
+
+# Global collection with one vector per tender, used for "find similar tenders".
+TENDER_SIMILARITY_COLLECTION = "TenderSimilarity"
 
 class VectorStoreManager:
     """Manages Weaviate collections"""
     
-    def __init__(self, weaviate_client: WeaviateClient, embedding_model):
+    def __init__(self, weaviate_client: WeaviateClient, embedding_model=None):
         self.client = weaviate_client
-        self.embedding_model = embedding_model
+        # Defaults to the process-wide provider so callers never load a second copy
+        self.embedding_model = embedding_model if embedding_model is not None else get_embedding_provider()
         print("✅ VectorStoreManager initialized")
     
     def similarity_search(self, collection_name: str, query_text: str, limit: int):
@@ -96,43 +105,93 @@ class VectorStoreManager:
             traceback.print_exc()
             return 0
 
-    def query(self, collection: Collection, query: str, n_results: int = settings.RAG_TOP_K) -> List[Tuple]:
-        """Query Weaviate collection"""
+    def query(
+        self,
+        collection: Collection,
+        query: str,
+        n_results: int = settings.RAG_TOP_K,
+        mode: Optional[str] = None,
+        alpha: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple]:
+        """
+        Query Weaviate collection.
+
+        mode "vector" runs near_vector and scores by cosine similarity; mode
+        "hybrid" fuses BM25 over the text properties with the vector search
+        (`alpha` weights them: 0 = pure BM25, 1 = pure vector) and scores by
+        the fused hybrid score. Defaults come from RAG_RETRIEVAL_MODE and
+        RAG_HYBRID_ALPHA. `filters` restricts results by property equality,
+        e.g. {"doc_id": ..., "type": "table"} (a list value matches any).
+        """
         if not self.client:
             return []
             
         try:
-            query_embedding = self.embedding_model.encode([query]).tolist()
+            response, score_of = self._search(collection, query, n_results, mode, alpha, filters)
+            return self._dedupe_results(response.objects, score_of)
             
+        except Exception as e:
+            print(f"❌ Weaviate query error: {e}")
+            traceback.print_exc()
+            return []
+
+    @staticmethod
+    def _property_filters(filters: Optional[Dict[str, Any]]):
+        conditions = [
+            Filter.by_property(prop).contains_any(list(value)) if isinstance(value, (list, tuple, set))
+            else Filter.by_property(prop).equal(value)
+            for prop, value in (filters or {}).items()
+        ]
+        return Filter.all_of(conditions) if conditions else None
+
+    def _search(self, collection: Collection, query: str, n_results: int, mode: Optional[str],
+                alpha: Optional[float], filters: Optional[Dict[str, Any]] = None):
+        """Run the search for `mode`; returns the response and a per-object score function"""
+        mode = (mode or settings.RAG_RETRIEVAL_MODE).lower()
+        query_embedding = self.embedding_model.encode([query]).tolist()
+        where = self._property_filters(filters)
+
+        if mode == "hybrid":
+            with metrics.VECTOR_QUERY_SECONDS.labels("weaviate", mode).time():
+                response = collection.query.hybrid(
+                    query=query,
+                    vector=query_embedding[0],
+                    alpha=settings.RAG_HYBRID_ALPHA if alpha is None else alpha,
+                    limit=n_results,
+                    filters=where,
+                    include_vector=False,
+                    return_metadata=MetadataQuery(score=True),
+                )
+            return response, lambda obj: obj.metadata.score if obj.metadata and obj.metadata.score is not None else 0
+        if mode != "vector":
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
+        with metrics.VECTOR_QUERY_SECONDS.labels("weaviate", mode).time():
             response = collection.query.near_vector(
                 near_vector=query_embedding[0],
                 limit=n_results,
+                filters=where,
                 include_vector=False
             )
-            
-            results_list = []
-            seen_content = set()
-            
-            for obj in response.objects:
-                doc = obj.properties.get("content", "")
-                content_hash = doc[:100]
-                if content_hash in seen_content: continue
-                seen_content.add(content_hash)
-                
-                # Weaviate `distance` is cosine distance. Similarity = 1 - distance.
-                similarity = 0
-                if obj.metadata and obj.metadata.distance is not None:
-                    similarity = 1 - obj.metadata.distance
-                
-                results_list.append((doc, obj.properties, similarity))
+        # Weaviate `distance` is cosine distance. Similarity = 1 - distance.
+        return response, lambda obj: 1 - obj.metadata.distance if obj.metadata and obj.metadata.distance is not None else 0
 
-            results_list.sort(key=lambda x: x[2], reverse=True)
-            return results_list
-            
-        except Exception as e:
-            print(f"❌ Weaviate query error: {e}")
-            traceback.print_exc()
-            return []
+    @staticmethod
+    def _dedupe_results(objects, score_of) -> List[Tuple]:
+        """(content, properties, score) per object, dropping repeated content, best score first"""
+        results_list = []
+        seen_content = set()
+
+        for obj in objects:
+            doc = obj.properties.get("content", "")
+            content_hash = doc[:100]
+            if content_hash in seen_content: continue
+            seen_content.add(content_hash)
+            results_list.append((doc, obj.properties, score_of(obj)))
+
+        results_list.sort(key=lambda x: x[2], reverse=True)
+        return results_list
     
     def delete_collection(self, chat_id: str):
         """Delete Weaviate collection"""
@@ -226,7 +285,15 @@ class VectorStoreManager:
             traceback.print_exc()
             return 0
 
-    def query_tender(self, tender_id: str, query: str, n_results: int = settings.RAG_TOP_K) -> List[Tuple]:
+    def query_tender(
+        self,
+        tender_id: str,
+        query: str,
+        n_results: int = settings.RAG_TOP_K,
+        mode: Optional[str] = None,
+        alpha: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple]:
         """Queries a tender's specific Weaviate collection."""
         if not self.client:
             return []
@@ -242,31 +309,8 @@ class VectorStoreManager:
 
             collection = self.client.collections.get(collection_name)
             
-            query_embedding = self.embedding_model.encode([query]).tolist()
-            
-            response = collection.query.near_vector(
-                near_vector=query_embedding[0],
-                limit=n_results,
-                include_vector=False
-            )
-            
-            results_list = []
-            seen_content = set()
-            
-            for obj in response.objects:
-                doc = obj.properties.get("content", "")
-                content_hash = doc[:100]
-                if content_hash in seen_content: continue
-                seen_content.add(content_hash)
-                
-                similarity = 0
-                if obj.metadata and obj.metadata.distance is not None:
-                    similarity = 1 - obj.metadata.distance
-                
-                results_list.append((doc, obj.properties, similarity))
-
-            results_list.sort(key=lambda x: x[2], reverse=True)
-            return results_list
+            response, score_of = self._search(collection, query, n_results, mode, alpha, filters)
+            return self._dedupe_results(response.objects, score_of)
             
         except Exception as e:
             print(f"❌ Weaviate tender query error: {e}")
@@ -288,6 +332,158 @@ class VectorStoreManager:
                 print(f"🗑️  Deleted Weaviate collection: {collection_name}")
         except Exception as e:
             print(f"⚠️  Error deleting Weaviate tender collection: {e}")
+
+    # --- Cross-Tender Similarity Index ---
+
+    def get_or_create_tender_similarity_collection(self) -> Collection:
+        """
+        Get or create the global collection holding one vector per tender.
+        Unlike the per-tender `Tender_<id>` collections, this one is shared
+        across all tenders and is never recreated.
+        """
+        if not self.client:
+            raise Exception("Weaviate client not initialized")
+
+        if self.client.collections.exists(TENDER_SIMILARITY_COLLECTION):
+            return self.client.collections.get(TENDER_SIMILARITY_COLLECTION)
+
+        print(f"📂 Creating Weaviate collection: {TENDER_SIMILARITY_COLLECTION}")
+        return self.client.collections.create(
+            name=TENDER_SIMILARITY_COLLECTION,
+            properties=[
+                wvc.Property(name="tender_id_str", data_type=wvc.DataType.TEXT, description="Tender ID from the scraper, used for de-duplication."),
+                wvc.Property(name="scraped_tender_id", data_type=wvc.DataType.TEXT, description="UUID of the latest ScrapedTender row for this tender."),
+                wvc.Property(name="tender_name", data_type=wvc.DataType.TEXT),
+                wvc.Property(name="tendering_authority", data_type=wvc.DataType.TEXT),
+                wvc.Property(name="state", data_type=wvc.DataType.TEXT),
+                wvc.Property(name="tender_value", data_type=wvc.DataType.NUMBER, description="Tender value in rupees, 0 when unknown."),
+                wvc.Property(name="publish_date", data_type=wvc.DataType.DATE),
+            ],
+            vectorizer_config=wvc.Configure.Vectorizer.none(),
+        )
+
+    def upsert_tender_vectors(self, records: List[Dict]) -> int:
+        """
+        Embeds and upserts tender-level records into the similarity collection.
+
+        Each record must contain `tender_id_str` and `content`; the object UUID is
+        derived from `tender_id_str`, so re-scrapes of the same tender overwrite
+        the existing vector instead of adding a duplicate.
+        """
+        if not self.client or not records:
+            return 0
+
+        try:
+            collection = self.get_or_create_tender_similarity_collection()
+            contents = [record["content"] for record in records]
+            vectors = self.embedding_model.encode(contents, show_progress_bar=False, batch_size=32)
+
+            with collection.batch.dynamic() as batch:
+                for i, record in enumerate(records):
+                    properties = {
+                        "tender_id_str": record["tender_id_str"],
+                        "scraped_tender_id": record.get("scraped_tender_id", ""),
+                        "tender_name": record.get("tender_name", ""),
+                        "tendering_authority": record.get("tendering_authority", ""),
+                        "state": record.get("state", ""),
+                        "tender_value": float(record.get("tender_value") or 0.0),
+                    }
+                    if record.get("publish_date") is not None:
+                        properties["publish_date"] = record["publish_date"]
+                    batch.add_object(
+                        properties=properties,
+                        vector=vectors[i],
+                        uuid=generate_uuid5(record["tender_id_str"]),
+                    )
+
+            print(f"✅ Indexed {len(records)} tenders in {TENDER_SIMILARITY_COLLECTION}")
+            return len(records)
+
+        except Exception as e:
+            print(f"❌ Error indexing tenders for similarity search: {e}")
+            traceback.print_exc()
+            return 0
+
+    def get_tender_vector(self, tender_id_str: str) -> Optional[List[float]]:
+        """Returns the stored similarity vector for a tender, or None if it is not indexed."""
+        if not self.client or not self.client.collections.exists(TENDER_SIMILARITY_COLLECTION):
+            return None
+
+        try:
+            collection = self.client.collections.get(TENDER_SIMILARITY_COLLECTION)
+            obj = collection.query.fetch_object_by_id(generate_uuid5(tender_id_str), include_vector=True)
+            if obj is None or not obj.vector:
+                return None
+            # Weaviate returns named vectors as a dict; the unnamed one is "default".
+            if isinstance(obj.vector, dict):
+                return obj.vector.get("default")
+            return obj.vector
+        except Exception as e:
+            print(f"⚠️  Could not fetch similarity vector for tender {tender_id_str}: {e}")
+            return None
+
+    def query_similar_tenders(
+        self,
+        query: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+        n_results: int = settings.TENDER_SIMILARITY_TOP_K,
+        state: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        exclude_tender_id_str: Optional[str] = None,
+    ) -> List[Tuple]:
+        """
+        Finds the nearest tenders to a query text or an existing tender vector,
+        applying structured filters on state, value band (rupees) and publish date.
+        Returns (properties, similarity) tuples, best match first.
+        """
+        if not self.client or not self.client.collections.exists(TENDER_SIMILARITY_COLLECTION):
+            return []
+        if vector is None:
+            if not query:
+                return []
+            vector = self.embedding_model.encode([query]).tolist()[0]
+
+        filters = []
+        if state:
+            filters.append(Filter.by_property("state").equal(state))
+        if min_value is not None:
+            filters.append(Filter.by_property("tender_value").greater_or_equal(min_value))
+        if max_value is not None:
+            filters.append(Filter.by_property("tender_value").less_or_equal(max_value))
+        if published_after is not None:
+            filters.append(Filter.by_property("publish_date").greater_or_equal(published_after))
+        if published_before is not None:
+            filters.append(Filter.by_property("publish_date").less_or_equal(published_before))
+        if exclude_tender_id_str:
+            filters.append(Filter.by_id().not_equal(generate_uuid5(exclude_tender_id_str)))
+
+        try:
+            collection = self.client.collections.get(TENDER_SIMILARITY_COLLECTION)
+            with metrics.VECTOR_QUERY_SECONDS.labels("weaviate", "similar_tenders").time():
+                response = collection.query.near_vector(
+                    near_vector=vector,
+                    limit=n_results,
+                    filters=Filter.all_of(filters) if filters else None,
+                    return_metadata=MetadataQuery(distance=True),
+                    include_vector=False,
+                )
+
+            results_list = []
+            for obj in response.objects:
+                similarity = 0
+                if obj.metadata and obj.metadata.distance is not None:
+                    similarity = 1 - obj.metadata.distance
+                results_list.append((obj.properties, similarity))
+            return results_list
+
+        except Exception as e:
+            print(f"❌ Weaviate similar tenders query error: {e}")
+            traceback.print_exc()
+            return []
+
     # --- Renamed ChromaDB Methods for Backup ---
     
     def get_or_create_collection_chroma(self, chat_id: str):
@@ -4,6 +4,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_v1_router
 from app.config import settings
+from app.db.query_instrumentation import QueryTimingMiddleware
 from app.utils import ensure_directory_exists
 
 # --- STABILITY FIXES ---
@@ -31,15 +32,26 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Lets the frontend read the DB timing of cross-origin responses and
+        # the chat list's next-page cursor
+        expose_headers=["Server-Timing", "X-Next-Cursor"],
     )
+    # Per-request query counts, N+1 warnings and the Server-Timing header
+    app.add_middleware(QueryTimingMiddleware)
 
     # --- EVENT HANDLERS (STARTUP/SHUTDOWN) ---
     @app.on_event("startup")
     async def startup_event():
         print("--- Application Startup ---")
         
-        # Initialize database clients within the startup event
+        # Connect external clients (Gemini, Weaviate, tokenizer, embedding
+        # model) concurrently in the background; /ready reports progress
         from app.core import services
+        services.start_services()
+
+        # The Celery broker queue is read when /metrics is scraped
+        from app.core import metrics
+        metrics.QUEUE_DEPTH.labels(queue="celery").set_function(metrics.redis_list_length("celery"))
         
         # Table creation is now managed by Alembic migrations.
         # The create_db_and_tables() function is no longer called on startup.
@@ -49,10 +61,11 @@ def create_app() -> FastAPI:
     @app.on_event("shutdown")
     async def shutdown_event():
         print("--- Application Shutdown ---")
-        from app.core.services import weaviate_client
-        if weaviate_client:
-            weaviate_client.close()
-            print("Weaviate client closed.")
+        from app.core import services
+        services.shutdown_services()
+        print("External clients closed.")
+        from app.db.database import dispose_async_engine
+        await dispose_async_engine()
         print("--- Shutdown Complete ---")
 
     app.include_router(api_v1_router, prefix="/api/v1")
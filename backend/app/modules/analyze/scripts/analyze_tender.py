@@ -23,7 +23,9 @@ from app.modules.analyze.models.pydantic_models import (
     ScopeOfWorkSchema,
     DataSheetSchema,
 )
-from app.core.services import get_llm_model, get_vector_store, pdf_processor
+from app.modules.analyze.services.analysis_report_service import prerender_reports
+from app.core import metrics
+from app.core.services import get_llm_model, get_vector_store
 from app.modules.askai.services.document_service import DocumentService
 
 logger = logging.getLogger(__name__)
@@ -269,6 +271,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
     gc.collect()
     _check_memory_available()
 
+    stage_seconds = metrics.ANALYSIS_STAGE_SECONDS
+    metrics.ANALYSES_IN_PROGRESS.inc()
     try:
         # ====================================================================
         # STEP 1: FETCH TENDER DATA
@@ -353,7 +357,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
         logger.info(f"[{tdr}] Created temp directory: {temp_dir}")
 
         # Download all files with retry logic and timeout for slow files
-        downloaded_files = _download_files_with_retry(files, temp_dir, tdr)
+        with stage_seconds.labels("download").time():
+            downloaded_files = _download_files_with_retry(files, temp_dir, tdr)
 
         if not downloaded_files:
             logger.error(f"[{tdr}] Failed to download any files")
@@ -403,6 +408,7 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
         # IMPORTANT: Process sequentially (not concurrent) to avoid event loop collisions in LlamaParse
         processed_count = 0
         skipped_processing = 0
+        extract_start = time.perf_counter()
 
         for idx, file_path in enumerate(downloaded_files, 1):
             try:
@@ -452,6 +458,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
                 gc.collect()
                 time.sleep(0.1)  # Small delay between files to ensure event loops fully close
 
+        stage_seconds.labels("extract").observe(time.perf_counter() - extract_start)
+
         if skipped_processing > 0:
             logger.info(f"[{tdr}] Processed {processed_count}/{len(downloaded_files)} files ({skipped_processing} skipped during processing)")
 
@@ -499,7 +507,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
 
                 # Add all chunks with vectorization handled internally
                 # This uses batch processing for efficiency (batch_size=32)
-                chunks_added = get_vector_store().add_tender_chunks(tender_collection, all_tender_chunks)
+                with stage_seconds.labels("vector_store").time():
+                    chunks_added = get_vector_store().add_tender_chunks(tender_collection, all_tender_chunks)
                 logger.info(f"[{tdr}] Successfully added {chunks_added} chunks to vector database")
 
                 analysis.progress = 60
@@ -589,7 +598,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
             except Exception as e:
                 logger.warning(f"[{tdr}] Failed to update wishlist progress: {e}")
 
-        one_pager = _generate_executive_summary(tender_context, tdr)
+        with stage_seconds.labels("one_pager").time():
+            one_pager = _generate_executive_summary(tender_context, tdr)
         if one_pager:
             analysis.one_pager_json = one_pager
             logger.info(f"[{tdr}] Executive summary generated successfully")
@@ -613,7 +623,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
             except Exception as e:
                 logger.warning(f"[{tdr}] Failed to update wishlist progress: {e}")
 
-        scope_of_work = _generate_scope_of_work_details(tender_context, scraped_tender, tdr)
+        with stage_seconds.labels("scope_of_work").time():
+            scope_of_work = _generate_scope_of_work_details(tender_context, scraped_tender, tdr)
         if scope_of_work:
             analysis.scope_of_work_json = scope_of_work
             logger.info(f"[{tdr}] Scope of work generated successfully")
@@ -637,7 +648,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
             except Exception as e:
                 logger.warning(f"[{tdr}] Failed to update wishlist progress: {e}")
 
-        data_sheet = _generate_comprehensive_datasheet(tender_context, scraped_tender, tdr)
+        with stage_seconds.labels("data_sheet").time():
+            data_sheet = _generate_comprehensive_datasheet(tender_context, scraped_tender, tdr)
         if data_sheet:
             analysis.data_sheet_json = data_sheet
             logger.info(f"[{tdr}] Data sheet generated successfully")
@@ -650,7 +662,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
         analysis.status_message = "Analyzing RFP sections"
         db.commit()
 
-        rfp_sections = _generate_rfp_sections(tender_context, analysis.id, db, tdr)
+        with stage_seconds.labels("rfp_sections").time():
+            rfp_sections = _generate_rfp_sections(tender_context, analysis.id, db, tdr)
         logger.info(f"[{tdr}] Generated {len(rfp_sections)} RFP sections")
 
         # ====================================================================
@@ -659,7 +672,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
         analysis.status_message = "Extracting document templates"
         db.commit()
 
-        doc_templates = _extract_document_templates(tender_context, analysis.id, db, tdr)
+        with stage_seconds.labels("document_templates").time():
+            doc_templates = _extract_document_templates(tender_context, analysis.id, db, tdr)
         logger.info(f"[{tdr}] Extracted {len(doc_templates)} document templates")
 
         # ====================================================================
@@ -676,7 +690,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
             
             # Generate and save bid synopsis
             import asyncio
-            bid_synopsis = asyncio.run(generate_and_save_bid_synopsis(analysis, scraped_tender_for_synopsis, db))
+            with stage_seconds.labels("bid_synopsis").time():
+                bid_synopsis = asyncio.run(generate_and_save_bid_synopsis(analysis, scraped_tender_for_synopsis, db))
             logger.info(f"[{tdr}] Generated bid synopsis with {len(bid_synopsis.get('qualification_criteria', []))} criteria")
         except Exception as bid_error:
             logger.warning(f"[{tdr}] Failed to generate bid synopsis: {bid_error}")
@@ -704,6 +719,13 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
             except Exception as e:
                 logger.warning(f"[{tdr}] Failed to update wishlist completion: {e}")
 
+        # ====================================================================
+        # STEP 7: PRE-RENDER DOWNLOADABLE REPORTS
+        # ====================================================================
+        # Downloads are then served from DMS storage instead of rendering per request
+        with stage_seconds.labels("reports").time():
+            prerender_reports(db, analysis)
+
         logger.info(f"[{tdr}] Analysis pipeline completed successfully")
 
     except Exception as e:
@@ -726,6 +748,8 @@ def analyze_tender(db: Session, tdr: str, wishlist_id: Optional[str] = None):
                 logger.error(f"[{tdr}] Failed to update wishlist error status: {update_error}")
 
     finally:
+        metrics.ANALYSES_IN_PROGRESS.dec()
+
         # ====================================================================
         # CLEANUP: ALWAYS remove temporary files, even if analysis failed
         # This prevents disk space leaks when errors occur
@@ -922,7 +946,7 @@ CONTEXT:
 Generate JSON only, no explanations:"""
 
         # Call LLM to generate response
-        response = get_llm_model().generate_content(prompt)
+        response = get_llm_model().generate_content(prompt, operation="one_pager")
         response_text = response.text.strip()
 
         # Parse JSON from response (may be wrapped in code fences)
@@ -1035,7 +1059,7 @@ CONTEXT:
 
 Generate JSON only, no explanations:"""
 
-        response = get_llm_model().generate_content(prompt)
+        response = get_llm_model().generate_content(prompt, operation="scope_of_work")
         response_text = response.text.strip()
 
         # Parse JSON from response (may be wrapped in code fences)
@@ -1129,7 +1153,7 @@ TENDER DOCUMENT:
 
 Generate JSON only, no explanations:"""
 
-        response = get_llm_model().generate_content(prompt)
+        response = get_llm_model().generate_content(prompt, operation="data_sheet")
         response_text = response.text.strip()
 
         # Parse JSON from response (may be wrapped in code fences)
@@ -1202,7 +1226,7 @@ def _generate_rfp_sections(context: str, analysis_id, db: Session, tdr: str) ->
         Focus on creating comprehensive sections that cover all important aspects.
         """
 
-        response = get_llm_model().generate_content(prompt)
+        response = get_llm_model().generate_content(prompt, operation="rfp_sections")
         if not response or not response.text:
             logger.error(f"[{tdr}] No response from LLM for RFP sections")
             return []
@@ -1308,7 +1332,7 @@ def _extract_document_templates(context: str, analysis_id, db: Session, tdr: str
         Focus on actual submission requirements and formats that bidders must follow.
         """
 
-        response = get_llm_model().generate_content(prompt)
+        response = get_llm_model().generate_content(prompt, operation="document_templates")
         if not response or not response.text:
             logger.error(f"[{tdr}] No response from LLM for document templates")
             return []
@@ -0,0 +1,612 @@
+"""
+Renderers of the downloadable tender analysis report.
+
+Each builds the whole document from a TenderAnalysis, its RFP sections and
+its templates, and returns (file bytes, filename, media type). They are
+slow for large analyses and are called through analysis_report_service,
+which renders each report once and keeps it in DMS storage.
+"""
+
+
+def generate_pdf_report(analysis, rfp_sections, templates):
+    """Generate a comprehensive PDF report of the tender analysis"""
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+    import io
+    from datetime import datetime
+    import html
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        rightMargin=0.75*inch
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Custom styles with proper spacing
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a56db'),
+        spaceAfter=30,
+        spaceBefore=0,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold',
+        leading=28
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1a56db'),
+        spaceAfter=16,
+        spaceBefore=24,
+        fontName='Helvetica-Bold',
+        leading=20,
+        keepWithNext=True
+    )
+
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#333333'),
+        spaceAfter=10,
+        spaceBefore=14,
+        fontName='Helvetica-Bold',
+        leading=16,
+        keepWithNext=True
+    )
+
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['BodyText'],
+        fontSize=10,
+        spaceAfter=8,
+        spaceBefore=0,
+        leading=14,
+        alignment=TA_JUSTIFY,
+        wordWrap='LTR'
+    )
+    
+    # Cover Page
+    story.append(Spacer(1, 2*inch))
+    story.append(Paragraph("TENDER ANALYSIS REPORT", title_style))
+    story.append(Spacer(1, 0.5*inch))
+    story.append(Paragraph(f"Tender ID: {analysis.tender_id}", styles['Normal']))
+    story.append(Spacer(1, 0.2*inch))
+    if analysis.analysis_completed_at:
+        story.append(Paragraph(f"Analysis Date: {analysis.analysis_completed_at.strftime('%B %d, %Y')}", styles['Normal']))
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"Status: {analysis.status.value.upper()}", styles['Normal']))
+    story.append(PageBreak())
+    
+    # ONE PAGER
+    if analysis.one_pager_json:
+        story.append(Paragraph("1. EXECUTIVE SUMMARY (ONE PAGER)", heading_style))
+        one_pager = analysis.one_pager_json
+        
+        if one_pager.get('project_overview'):
+            story.append(Paragraph("<b>Project Overview:</b>", subheading_style))
+            story.append(Paragraph(one_pager['project_overview'], body_style))
+            story.append(Spacer(1, 0.2*inch))
+
+        if one_pager.get('financial_requirements'):
+            story.append(Paragraph("<b>Financial Requirements:</b>", subheading_style))
+            for req in one_pager['financial_requirements']:
+                story.append(Paragraph(f"• {req}", body_style))
+            story.append(Spacer(1, 0.2*inch))
+
+        if one_pager.get('eligibility_highlights'):
+            story.append(Paragraph("<b>Eligibility Highlights:</b>", subheading_style))
+            for highlight in one_pager['eligibility_highlights']:
+                story.append(Paragraph(f"• {highlight}", body_style))
+            story.append(Spacer(1, 0.2*inch))
+
+        if one_pager.get('important_dates'):
+            story.append(Paragraph("<b>Important Dates:</b>", subheading_style))
+            for date in one_pager['important_dates']:
+                story.append(Paragraph(f"• {date}", body_style))
+            story.append(Spacer(1, 0.2*inch))
+
+        if one_pager.get('risk_analysis'):
+            risk = one_pager['risk_analysis']
+            story.append(Paragraph("<b>Risk Analysis:</b>", subheading_style))
+            if risk.get('summary'):
+                story.append(Paragraph(risk['summary'], body_style))
+        
+        story.append(PageBreak())
+    
+    # SCOPE OF WORK
+    if analysis.scope_of_work_json:
+        story.append(Paragraph("2. SCOPE OF WORK", heading_style))
+        scope = analysis.scope_of_work_json
+        
+        if scope.get('project_details'):
+            details = scope['project_details']
+            story.append(Paragraph("<b>Project Details:</b>", subheading_style))
+            details_data = []
+            if details.get('project_name'):
+                details_data.append(['Project Name', details['project_name']])
+            if details.get('location'):
+                details_data.append(['Location', details['location']])
+            if details.get('duration'):
+                details_data.append(['Duration', details['duration']])
+            if details.get('contract_value'):
+                details_data.append(['Contract Value', details['contract_value']])
+            
+            if details_data:
+                table = Table(details_data, colWidths=[2*inch, 4.5*inch])
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+                    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 10),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('TOPPADDING', (0, 0), (-1, -1), 8),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ]))
+                story.append(table)
+                story.append(Spacer(1, 0.2*inch))
+        
+        if scope.get('work_packages'):
+            story.append(Paragraph("<b>Work Packages:</b>", subheading_style))
+            for i, package in enumerate(scope['work_packages'], 1):
+                story.append(Paragraph(f"<b>{i}. {package.get('name', 'Work Package')}</b>", body_style))
+                if package.get('description'):
+                    story.append(Paragraph(package['description'], body_style))
+                story.append(Spacer(1, 0.1*inch))
+        
+        story.append(PageBreak())
+    
+    # DATA SHEET
+    if analysis.data_sheet_json:
+        story.append(Paragraph("3. DATA SHEET", heading_style))
+        datasheet = analysis.data_sheet_json
+        
+        sections = [
+            ('Project Information', datasheet.get('project_information', [])),
+            ('Contract Details', datasheet.get('contract_details', [])),
+            ('Financial Details', datasheet.get('financial_details', [])),
+            ('Technical Summary', datasheet.get('technical_summary', [])),
+            ('Important Dates', datasheet.get('important_dates', []))
+        ]
+        
+        for section_name, items in sections:
+            if items:
+                story.append(Paragraph(f"<b>{section_name}:</b>", subheading_style))
+                data = [[item['label'], item['value']] for item in items]
+                if data:
+                    table = Table(data, colWidths=[2.5*inch, 4*inch])
+                    table.setStyle(TableStyle([
+                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+                        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                        ('FONTSIZE', (0, 0), (-1, -1), 9),
+                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                        ('TOPPADDING', (0, 0), (-1, -1), 6),
+                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                    ]))
+                    story.append(table)
+                    story.append(Spacer(1, 0.2*inch))
+        
+        story.append(PageBreak())
+    
+    # RFP SECTIONS
+    if rfp_sections and rfp_sections.sections:
+        story.append(Paragraph("4. RFP SECTIONS ANALYSIS", heading_style))
+        for section in rfp_sections.sections:
+            story.append(Paragraph(f"<b>{section.section_name}: {section.section_title}</b>", subheading_style))
+            if section.summary:
+                story.append(Paragraph(section.summary, body_style))
+
+            if section.key_requirements:
+                story.append(Paragraph("<b>Key Requirements:</b>", body_style))
+                for req in section.key_requirements[:5]:  # Limit to 5 for space
+                    story.append(Paragraph(f"• {req}", body_style))
+
+            story.append(Spacer(1, 0.15*inch))
+
+        story.append(PageBreak())
+
+    # TEMPLATES
+    if templates:
+        story.append(Paragraph("5. REQUIRED TEMPLATES", heading_style))
+        all_templates = []
+        all_templates.extend(templates.bid_submission_forms or [])
+        all_templates.extend(templates.financial_formats or [])
+        all_templates.extend(templates.technical_documents or [])
+        all_templates.extend(templates.compliance_formats or [])
+
+        if all_templates:
+            story.append(Paragraph(f"<b>Total Templates: {len(all_templates)}</b>", body_style))
+            story.append(Spacer(1, 0.1*inch))
+
+            template_data = [['Template Name', 'Format', 'Mandatory']]
+            for template in all_templates:
+                template_data.append([
+                    template.name,
+                    template.format.upper(),
+                    'Yes' if template.mandatory else 'No'
+                ])
+
+            table = Table(template_data, colWidths=[3.5*inch, 1.5*inch, 1.5*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a56db')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ]))
+            story.append(table)
+
+    # Build PDF
+    doc.build(story)
+    
+    filename = f"Tender_Analysis_{analysis.tender_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return buffer.getvalue(), filename, "application/pdf"
+
+
+def generate_excel_report(analysis, rfp_sections, templates):
+    """Generate a comprehensive Excel report of the tender analysis"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from datetime import datetime
+    import io
+    
+    wb = Workbook()
+    
+    # Remove default sheet
+    if 'Sheet' in wb.sheetnames:
+        wb.remove(wb['Sheet'])
+    
+    # Header styles
+    header_fill = PatternFill(start_color="1a56db", end_color="1a56db", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    title_font = Font(bold=True, size=16, color="1a56db")
+    subheader_font = Font(bold=True, size=11)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    # SUMMARY SHEET
+    ws_summary = wb.create_sheet("Summary")
+    ws_summary['A1'] = "TENDER ANALYSIS REPORT"
+    ws_summary['A1'].font = title_font
+    ws_summary.merge_cells('A1:D1')
+    
+    row = 3
+    ws_summary[f'A{row}'] = "Tender ID:"
+    ws_summary[f'A{row}'].font = subheader_font
+    ws_summary[f'B{row}'] = analysis.tender_id
+    row += 1
+    
+    ws_summary[f'A{row}'] = "Status:"
+    ws_summary[f'A{row}'].font = subheader_font
+    ws_summary[f'B{row}'] = analysis.status.value
+    row += 1
+    
+    if analysis.analysis_completed_at:
+        ws_summary[f'A{row}'] = "Analysis Date:"
+        ws_summary[f'A{row}'].font = subheader_font
+        ws_summary[f'B{row}'] = analysis.analysis_completed_at.strftime('%Y-%m-%d %H:%M')
+        row += 1
+    
+    ws_summary.column_dimensions['A'].width = 20
+    ws_summary.column_dimensions['B'].width = 40
+    
+    # ONE PAGER SHEET
+    if analysis.one_pager_json:
+        ws_one_pager = wb.create_sheet("One Pager")
+        one_pager = analysis.one_pager_json
+        row = 1
+        
+        ws_one_pager[f'A{row}'] = "EXECUTIVE SUMMARY"
+        ws_one_pager[f'A{row}'].font = title_font
+        ws_one_pager.merge_cells(f'A{row}:C{row}')
+        row += 2
+        
+        if one_pager.get('project_overview'):
+            ws_one_pager[f'A{row}'] = "Project Overview"
+            ws_one_pager[f'A{row}'].font = subheader_font
+            row += 1
+            ws_one_pager[f'A{row}'] = one_pager['project_overview']
+            ws_one_pager[f'A{row}'].alignment = Alignment(wrap_text=True)
+            ws_one_pager.merge_cells(f'A{row}:C{row}')
+            row += 2
+        
+        if one_pager.get('financial_requirements'):
+            ws_one_pager[f'A{row}'] = "Financial Requirements"
+            ws_one_pager[f'A{row}'].font = subheader_font
+            row += 1
+            for req in one_pager['financial_requirements']:
+                ws_one_pager[f'A{row}'] = f"• {req}"
+                row += 1
+            row += 1
+        
+        ws_one_pager.column_dimensions['A'].width = 80
+    
+    # DATA SHEET
+    if analysis.data_sheet_json:
+        ws_datasheet = wb.create_sheet("Data Sheet")
+        datasheet = analysis.data_sheet_json
+        row = 1
+        
+        ws_datasheet[f'A{row}'] = "DATA SHEET"
+        ws_datasheet[f'A{row}'].font = title_font
+        ws_datasheet.merge_cells(f'A{row}:B{row}')
+        row += 2
+        
+        sections = [
+            ('Project Information', datasheet.get('project_information', [])),
+            ('Contract Details', datasheet.get('contract_details', [])),
+            ('Financial Details', datasheet.get('financial_details', [])),
+            ('Technical Summary', datasheet.get('technical_summary', [])),
+            ('Important Dates', datasheet.get('important_dates', []))
+        ]
+        
+        for section_name, items in sections:
+            if items:
+                ws_datasheet[f'A{row}'] = section_name
+                ws_datasheet[f'A{row}'].font = subheader_font
+                ws_datasheet[f'A{row}'].fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                ws_datasheet.merge_cells(f'A{row}:B{row}')
+                row += 1
+                
+                for item in items:
+                    ws_datasheet[f'A{row}'] = item['label']
+                    ws_datasheet[f'B{row}'] = item['value']
+                    ws_datasheet[f'A{row}'].border = border
+                    ws_datasheet[f'B{row}'].border = border
+                    row += 1
+                row += 1
+        
+        ws_datasheet.column_dimensions['A'].width = 30
+        ws_datasheet.column_dimensions['B'].width = 50
+
+    # TEMPLATES SHEET
+    if templates:
+        ws_templates = wb.create_sheet("Templates")
+        row = 1
+
+        ws_templates[f'A{row}'] = "REQUIRED TEMPLATES"
+        ws_templates[f'A{row}'].font = title_font
+        ws_templates.merge_cells(f'A{row}:D{row}')
+        row += 2
+
+        # Headers
+        headers = ['Template Name', 'Category', 'Format', 'Mandatory']
+        for col, header in enumerate(headers, start=1):
+            cell = ws_templates.cell(row=row, column=col, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal='center')
+        row += 1
+
+        # Data
+        categories = [
+            ('Bid Submission Forms', templates.bid_submission_forms or []),
+            ('Financial Formats', templates.financial_formats or []),
+            ('Technical Documents', templates.technical_documents or []),
+            ('Compliance Formats', templates.compliance_formats or [])
+        ]
+
+        for category_name, items in categories:
+            for template in items:
+                ws_templates[f'A{row}'] = template.name
+                ws_templates[f'B{row}'] = category_name
+                ws_templates[f'C{row}'] = template.format.upper()
+                ws_templates[f'D{row}'] = 'Yes' if template.mandatory else 'No'
+                row += 1
+
+        ws_templates.column_dimensions['A'].width = 50
+        ws_templates.column_dimensions['B'].width = 25
+        ws_templates.column_dimensions['C'].width = 15
+        ws_templates.column_dimensions['D'].width = 15
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    
+    filename = f"Tender_Analysis_{analysis.tender_id}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+    return buffer.getvalue(), filename, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def generate_word_report(analysis, rfp_sections, templates):
+    """Generate a comprehensive Word report of the tender analysis"""
+    from docx import Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from datetime import datetime
+    import io
+    
+    doc = Document()
+    
+    # Title Page
+    title = doc.add_heading('TENDER ANALYSIS REPORT', level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title.runs[0]
+    title_run.font.size = Pt(28)
+    title_run.font.color.rgb = RGBColor(26, 86, 219)
+    
+    doc.add_paragraph()
+    doc.add_paragraph()
+    
+    info_para = doc.add_paragraph()
+    info_para.add_run(f"Tender ID: {analysis.tender_id}\n").bold = True
+    info_para.add_run(f"Status: {analysis.status.value}\n")
+    if analysis.analysis_completed_at:
+        info_para.add_run(f"Analysis Date: {analysis.analysis_completed_at.strftime('%B %d, %Y')}")
+    info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    doc.add_page_break()
+    
+    # ONE PAGER
+    if analysis.one_pager_json:
+        doc.add_heading('1. EXECUTIVE SUMMARY (ONE PAGER)', level=1)
+        one_pager = analysis.one_pager_json
+        
+        if one_pager.get('project_overview'):
+            doc.add_heading('Project Overview', level=2)
+            doc.add_paragraph(one_pager['project_overview'])
+        
+        if one_pager.get('financial_requirements'):
+            doc.add_heading('Financial Requirements', level=2)
+            for req in one_pager['financial_requirements']:
+                doc.add_paragraph(req, style='List Bullet')
+        
+        if one_pager.get('eligibility_highlights'):
+            doc.add_heading('Eligibility Highlights', level=2)
+            for highlight in one_pager['eligibility_highlights']:
+                doc.add_paragraph(highlight, style='List Bullet')
+        
+        if one_pager.get('important_dates'):
+            doc.add_heading('Important Dates', level=2)
+            for date in one_pager['important_dates']:
+                doc.add_paragraph(date, style='List Bullet')
+        
+        if one_pager.get('risk_analysis'):
+            risk = one_pager['risk_analysis']
+            doc.add_heading('Risk Analysis', level=2)
+            if risk.get('summary'):
+                doc.add_paragraph(risk['summary'])
+        
+        doc.add_page_break()
+    
+    # SCOPE OF WORK
+    if analysis.scope_of_work_json:
+        doc.add_heading('2. SCOPE OF WORK', level=1)
+        scope = analysis.scope_of_work_json
+        
+        if scope.get('project_details'):
+            details = scope['project_details']
+            doc.add_heading('Project Details', level=2)
+            
+            table = doc.add_table(rows=1, cols=2)
+            table.style = 'Light Grid Accent 1'
+            
+            if details.get('project_name'):
+                row = table.add_row()
+                row.cells[0].text = 'Project Name'
+                row.cells[1].text = details['project_name']
+            if details.get('location'):
+                row = table.add_row()
+                row.cells[0].text = 'Location'
+                row.cells[1].text = details['location']
+            if details.get('duration'):
+                row = table.add_row()
+                row.cells[0].text = 'Duration'
+                row.cells[1].text = details['duration']
+            if details.get('contract_value'):
+                row = table.add_row()
+                row.cells[0].text = 'Contract Value'
+                row.cells[1].text = details['contract_value']
+        
+        if scope.get('work_packages'):
+            doc.add_heading('Work Packages', level=2)
+            for i, package in enumerate(scope['work_packages'], 1):
+                doc.add_heading(f"{i}. {package.get('name', 'Work Package')}", level=3)
+                if package.get('description'):
+                    doc.add_paragraph(package['description'])
+        
+        doc.add_page_break()
+    
+    # DATA SHEET
+    if analysis.data_sheet_json:
+        doc.add_heading('3. DATA SHEET', level=1)
+        datasheet = analysis.data_sheet_json
+        
+        sections = [
+            ('Project Information', datasheet.get('project_information', [])),
+            ('Contract Details', datasheet.get('contract_details', [])),
+            ('Financial Details', datasheet.get('financial_details', [])),
+            ('Technical Summary', datasheet.get('technical_summary', [])),
+            ('Important Dates', datasheet.get('important_dates', []))
+        ]
+        
+        for section_name, items in sections:
+            if items:
+                doc.add_heading(section_name, level=2)
+                table = doc.add_table(rows=1, cols=2)
+                table.style = 'Light Grid Accent 1'
+                
+                hdr_cells = table.rows[0].cells
+                hdr_cells[0].text = 'Field'
+                hdr_cells[1].text = 'Value'
+                
+                for item in items:
+                    row = table.add_row()
+                    row.cells[0].text = item['label']
+                    row.cells[1].text = item['value']
+        
+        doc.add_page_break()
+    
+    # RFP SECTIONS
+    if rfp_sections and rfp_sections.sections:
+        doc.add_heading('4. RFP SECTIONS ANALYSIS', level=1)
+        for section in rfp_sections.sections:
+            doc.add_heading(f"{section.section_name}: {section.section_title}", level=2)
+            if section.summary:
+                doc.add_paragraph(section.summary)
+            
+            if section.key_requirements:
+                doc.add_heading('Key Requirements', level=3)
+                for req in section.key_requirements[:10]:
+                    doc.add_paragraph(req, style='List Bullet')
+        
+        doc.add_page_break()
+
+    # TEMPLATES
+    if templates:
+        doc.add_heading('5. REQUIRED TEMPLATES', level=1)
+        all_templates = []
+        all_templates.extend(templates.bid_submission_forms or [])
+        all_templates.extend(templates.financial_formats or [])
+        all_templates.extend(templates.technical_documents or [])
+        all_templates.extend(templates.compliance_formats or [])
+
+        if all_templates:
+            doc.add_paragraph(f"Total Templates: {len(all_templates)}")
+
+            table = doc.add_table(rows=1, cols=3)
+            table.style = 'Light Grid Accent 1'
+
+            hdr_cells = table.rows[0].cells
+            hdr_cells[0].text = 'Template Name'
+            hdr_cells[1].text = 'Format'
+            hdr_cells[2].text = 'Mandatory'
+
+            for template in all_templates:
+                row = table.add_row()
+                row.cells[0].text = template.name
+                row.cells[1].text = template.format.upper()
+                row.cells[2].text = 'Yes' if template.mandatory else 'No'
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+
+    filename = f"Tender_Analysis_{analysis.tender_id}_{datetime.now().strftime('%Y%m%d')}.docx"
+    return buffer.getvalue(), filename, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -0,0 +1,160 @@
+"""
+Pre-rendered, cached analysis reports.
+
+Each report is rendered once per analysis version and format and kept in
+DMS storage at
+    analysis_reports/<analysis id>/<content hash>.<ext>
+The content hash covers everything the renderers read: the analysis JSON,
+its RFP sections and templates, the format and REPORT_RENDER_VERSION. New
+analysis results therefore get a new file, and the hash doubles as the
+download's ETag.
+
+- prerender_reports() renders every format when an analysis completes.
+  analyze_tender calls it and already runs in the background.
+- get_report() returns the stored file and renders it on a miss. Concurrent
+  misses for one report, from threads or workers, queue on
+  advisory_lock(f"analysis_report:<id>:<hash>"). Only the first one renders;
+  the others serve its file.
+- Files are written under a temporary name and then renamed, so no reader
+  sees a partial report. Older versions of the same report are removed.
+
+Usage:
+    from app.modules.analyze.services import analysis_report_service as report_service
+
+    report = report_service.get_report(db, analysis, "pdf")
+    FileResponse(report.path, media_type=report.media_type, filename=report.filename)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.advisory_lock import advisory_lock
+from app.modules.analyze.db.schema import TenderAnalysis
+from app.modules.analyze.services import analysis_report_renderers as renderers
+from app.modules.analyze.services import analysis_rfp_service as rfp_service
+from app.modules.analyze.services import analysis_template_service as template_service
+from app.modules.dmsiq.services.file_storage import FileStorageService
+
+logger = logging.getLogger(__name__)
+
+REPORT_RENDER_VERSION = 1  # Bump when the renderers change, so stored reports are rendered again
+REPORTS_DIR = "analysis_reports"
+
+
+@dataclass(frozen=True)
+class ReportFormat:
+    extension: str
+    media_type: str
+    render: Callable[..., Tuple[bytes, str, str]]
+
+
+FORMATS: Dict[str, ReportFormat] = {
+    "pdf": ReportFormat("pdf", "application/pdf", renderers.generate_pdf_report),
+    "excel": ReportFormat(
+        "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", renderers.generate_excel_report
+    ),
+    "word": ReportFormat(
+        "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", renderers.generate_word_report
+    ),
+}
+_ALIASES = {"xlsx": "excel", "docx": "word"}
+
+
+@dataclass
+class StoredReport:
+    path: Path
+    etag: str  # Quoted content hash
+    media_type: str
+    filename: str
+
+
+def resolve_format(name: str) -> str:
+    """Format key for a requested format; anything unknown is a PDF"""
+    name = (name or "").lower()
+    name = _ALIASES.get(name, name)
+    return name if name in FORMATS else "pdf"
+
+
+def content_hash(analysis: TenderAnalysis, rfp_sections: Any, templates: Any, format_name: str) -> str:
+    """Hash of everything a report is rendered from"""
+    inputs = {
+        "render_version": REPORT_RENDER_VERSION,
+        "format": format_name,
+        "tender_id": analysis.tender_id,
+        "status": analysis.status.value if analysis.status else None,
+        "completed_at": analysis.analysis_completed_at.isoformat() if analysis.analysis_completed_at else None,
+        "one_pager": analysis.one_pager_json,
+        "scope_of_work": analysis.scope_of_work_json,
+        "data_sheet": analysis.data_sheet_json,
+        "rfp_sections": rfp_sections.model_dump(mode="json") if rfp_sections is not None else None,
+        "templates": templates.model_dump(mode="json") if templates is not None else None,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def storage_path(analysis_id: uuid.UUID, digest: str, extension: str) -> str:
+    return f"{REPORTS_DIR}/{analysis_id}/{digest}.{extension}"
+
+
+def get_report(db: Session, analysis: TenderAnalysis, format_name: str = "pdf") -> StoredReport:
+    """
+    The stored report of an analysis, rendered first if this version has none.
+
+    Raises:
+        Whatever the renderer raises, if the report had to be rendered
+    """
+    format_name = resolve_format(format_name)
+    report_format = FORMATS[format_name]
+    rfp_sections = rfp_service.get_rfp_sections(db, analysis.id)
+    templates = template_service.get_templates(db, analysis.id)
+    digest = content_hash(analysis, rfp_sections, templates, format_name)
+    path = FileStorageService.get_full_path(storage_path(analysis.id, digest, report_format.extension))
+
+    if not path.exists():
+        with advisory_lock(f"analysis_report:{analysis.id}:{digest}", engine=db.get_bind()):
+            # Another request may have rendered it while this one waited
+            if not path.exists():
+                _render(analysis, rfp_sections, templates, report_format, path)
+
+    return StoredReport(
+        path=path,
+        etag=f'"{digest}"',
+        media_type=report_format.media_type,
+        filename=f"Tender_Analysis_{analysis.tender_id}_{datetime.now().strftime('%Y%m%d')}.{report_format.extension}",
+    )
+
+
+def prerender_reports(db: Session, analysis: TenderAnalysis) -> None:
+    """Render every format of a completed analysis; failures are logged, not raised"""
+    for format_name in FORMATS:
+        try:
+            get_report(db, analysis, format_name)
+        except Exception as e:
+            logger.warning(f"[{analysis.tender_id}] Failed to pre-render {format_name} report: {e}")
+
+
+def _render(analysis, rfp_sections, templates, report_format: ReportFormat, path: Path) -> None:
+    start = datetime.now()
+    content, _, _ = report_format.render(analysis, rfp_sections, templates)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+    # Earlier versions of this report are superseded
+    for old in path.parent.glob(f"*.{report_format.extension}"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    logger.info(
+        f"[{analysis.tender_id}] Rendered {report_format.extension} report "
+        f"({len(content) / 1024:.0f} KB) in {(datetime.now() - start).total_seconds():.2f}s"
+    )
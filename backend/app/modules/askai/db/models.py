@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Table, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Table, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -8,12 +8,16 @@ from app.config import settings
 
 # Association table for the many-to-many relationship between Chat and Document
 chat_document_association = Table('chat_document_association', Base.metadata,
-    Column('chat_id', UUID(as_uuid=True), ForeignKey('chats.id')),
+    Column('chat_id', UUID(as_uuid=True), ForeignKey('chats.id'), index=True),
     Column('document_id', UUID(as_uuid=True), ForeignKey('documents.id'))
 )
 
 class Chat(Base):
     __tablename__ = 'chats'
+    __table_args__ = (
+        # Keyset pagination of the chat list (ORDER BY updated_at DESC, id DESC)
+        Index('ix_chats_updated_at_id', 'updated_at', 'id'),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False)
@@ -26,7 +30,7 @@ class Chat(Base):
 class Message(Base):
     __tablename__ = 'messages'
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    chat_id = Column(UUID(as_uuid=True), ForeignKey('chats.id'), nullable=False)
+    chat_id = Column(UUID(as_uuid=True), ForeignKey('chats.id'), nullable=False, index=True)
     sender = Column(String, nullable=False)  # 'user' or 'bot'
     text = Column(Text, nullable=False)
     timestamp = Column(DateTime, nullable=False)
@@ -43,6 +47,7 @@ class Document(Base):
     status = Column(String, default="active")
     uploaded_at = Column(DateTime, nullable=False)
     processing_stats = Column(JSON)
+    chunk_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
     chats = relationship("Chat", secondary=chat_document_association, back_populates="documents")
@@ -1,10 +1,10 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, tuple_
 from datetime import datetime
 
-from .models import Chat, Message, Document
+from .models import Chat, Message, Document, chat_document_association
 
 class ChatRepository:
     def __init__(self, db: Session):
@@ -16,6 +16,25 @@ class ChatRepository:
     def get_by_id(self, chat_id: UUID) -> Optional[Chat]:
         return self.db.get(Chat, chat_id)
 
+    def get_page_with_counts(self, limit: int, before: Optional[Tuple[datetime, UUID]] = None) -> List[Tuple]:
+        """
+        One page of chats, newest first, as (id, title, created_at, updated_at, message_count) rows.
+
+        Keyset pagination: `before` is the (updated_at, id) of the last chat on
+        the previous page. Message counts come from a correlated COUNT, so only
+        the page's chats are aggregated and no Message rows are loaded.
+        """
+        message_count = (
+            self.db.query(func.count(Message.id))
+            .filter(Message.chat_id == Chat.id)
+            .correlate(Chat)
+            .scalar_subquery()
+        )
+        query = self.db.query(Chat.id, Chat.title, Chat.created_at, Chat.updated_at, message_count.label("message_count"))
+        if before is not None:
+            query = query.filter(tuple_(Chat.updated_at, Chat.id) < tuple_(*before))
+        return query.order_by(desc(Chat.updated_at), desc(Chat.id)).limit(limit).all()
+
     def create(self, title: str) -> Chat:
         now = datetime.now()
         new_chat = Chat(
@@ -80,3 +99,20 @@ class DocumentRepository:
 
     def get_by_hash(self, file_hash: str) -> Optional[Document]:
         return self.db.query(Document).filter(Document.file_hash == file_hash).first()
+
+    def get_metadata_for_chats(self, chat_ids: List[UUID]) -> List[Tuple]:
+        """(chat_id, filename, chunk_count, status) rows for every document linked to the given chats"""
+        if not chat_ids:
+            return []
+        return (
+            self.db.query(
+                chat_document_association.c.chat_id,
+                Document.filename,
+                Document.chunk_count,
+                Document.status,
+            )
+            .join(chat_document_association, chat_document_association.c.document_id == Document.id)
+            .filter(chat_document_association.c.chat_id.in_(chat_ids))
+            .order_by(Document.uploaded_at)
+            .all()
+        )
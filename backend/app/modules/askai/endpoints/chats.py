@@ -1,6 +1,6 @@
 from uuid import UUID
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Body, status, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Body, status, Depends, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session
 from app.modules.askai.models.chat import ChatMetadata, Message, NewMessageRequest, NewMessageResponse, RenameChatRequest, CreateNewChatRequest
 from app.modules.askai.services import chat_service, rag_service
@@ -11,9 +11,20 @@ from app.modules.askai.dependencies_langchain import get_langchain_rag_service
 router = APIRouter()
 
 @router.get("/chats", response_model=List[ChatMetadata], tags=["AskAI - Chats"])
-def get_chats(db: Session = Depends(get_db_session)):
-    """Get all chats, sorted by last updated"""
-    return chat_service.get_all_chats(db)
+def get_chats(
+        response: Response,
+        db: Session = Depends(get_db_session),
+        limit: Optional[int] = Query(None, ge=1, description="Page size (defaults to CHAT_LIST_PAGE_SIZE)"),
+        cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    ):
+    """Get chats sorted by last updated. The next page's cursor is returned in the X-Next-Cursor header."""
+    try:
+        chats, next_cursor = chat_service.get_all_chats(db, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return chats
 
 @router.post("/chats", response_model=ChatMetadata, status_code=status.HTTP_201_CREATED, tags=["AskAI - Chats"])
 def create_chat(
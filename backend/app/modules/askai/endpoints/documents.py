@@ -7,12 +7,14 @@ import asyncio
 import json
 from fastapi import APIRouter, HTTPException, Path, UploadFile, File, BackgroundTasks, status, Depends, Request
 from sse_starlette.sse import EventSourceResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from app.modules.askai.models.document import AddDriveRequest, ChatDocumentsResponse, DriveFolder, ProcessingJob, ProcessingStage, ProcessingStatus, UploadAcceptedResponse, DocumentMetadata, UploadJob
 from app.modules.askai.db.models import Chat as SQLChat, Document as SQLDocument
 from app.core import services
-from app.core.global_stores import upload_jobs
-from app.db.database import get_db_session
+from app.core.job_store import get_job_store
+from app.core.events import chat_docs_topic, get_event_bus
+from app.db.database import AsyncSessionLocal, get_async_db_session, get_db_session
 from app.config import settings
 from app.modules.askai.services import drive_service, chat_service
 from app.modules.askai.services.document_processing_service import process_uploaded_pdf
@@ -23,14 +25,14 @@ router = APIRouter()
 async def upload_pdf(
     chat_id: uuid.UUID,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
     pdf: UploadFile = File(..., description="The PDF file to upload", alias="pdf")
 ):
     """Upload a PDF for RAG processing. This is an asynchronous operation."""
     if not (pdf.filename or "unknown").lower().endswith(".pdf"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be a PDF")
 
-    chat = db.get(SQLChat, chat_id)
+    chat = await db.get(SQLChat, chat_id, options=[selectinload(SQLChat.documents)])
     if not chat:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
 
@@ -56,7 +58,7 @@ async def upload_pdf(
 
     # Start background processing
     job_id = str(uuid.uuid4())
-    upload_jobs[job_id] = UploadJob(
+    get_job_store().create(UploadJob(
         job_id = job_id,
         status=ProcessingStatus.QUEUED,
         chat_id=str(chat_id),
@@ -66,7 +68,7 @@ async def upload_pdf(
         finished_at="",
         chunks_added=0,
         error=None
-    )
+    ))
     background_tasks.add_task(process_uploaded_pdf, temp_path, str(chat_id), pdf.filename or "unknown-file.pdf", job_id)
 
     return {"message": "Upload accepted", "job_id": job_id, "processing": True}
@@ -95,25 +97,38 @@ def add_drive_folder(
 @router.get("/upload-status/{job_id}", tags=["AskAI - Documents"])
 def get_upload_status(job_id: str = Path(..., description="The ID of the upload job")):
     """Get the status of an asynchronous upload job"""
-    status = upload_jobs.get(job_id)
+    status = get_job_store().get(job_id)
     if not status:
         raise HTTPException(status_code=404, detail="Job not found")
     return status
 
-def _get_chat_docs_data(chat_id: uuid.UUID, db: Session) -> dict:
-    """Helper function to fetch and structure document data for a chat."""
-    chat = db.get(SQLChat, chat_id)
-    if not chat:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
-    
-    pdfs = [DocumentMetadata(name=doc.filename, chunks=len(doc.chunks), status=doc.status) for doc in chat.documents if doc.doc_type == 'pdf']
-    excel = [DocumentMetadata(name=doc.filename, chunks=len(doc.chunks), status=doc.status) for doc in chat.documents if doc.doc_type == 'excel']
+@router.get("/upload-status/{job_id}/sse", tags=["AskAI - Documents"])
+async def stream_upload_status(request: Request, job_id: str = Path(..., description="The ID of the upload job")):
+    """
+    Streams an upload job's state using Server-Sent Events (SSE).
+    Sends the current state, then every update until the job finishes or fails.
+    """
+    job_store = get_job_store()
+    if not await asyncio.to_thread(job_store.get, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_generator():
+        async for job in job_store.watch(job_id):
+            if await request.is_disconnected():
+                break
+            yield job.model_dump_json()
+
+    return EventSourceResponse(event_generator())
+
+def _chat_docs_payload(chat_id: uuid.UUID, chat: SQLChat, jobs: List[UploadJob]) -> dict:
+    """Structures a chat's documents (loaded) and its upload jobs as a ChatDocumentsResponse."""
+    pdfs = [DocumentMetadata(name=doc.filename, chunks=doc.chunk_count, status=doc.status) for doc in chat.documents if doc.doc_type == 'pdf']
+    excel = [DocumentMetadata(name=doc.filename, chunks=doc.chunk_count, status=doc.status) for doc in chat.documents if doc.doc_type == 'excel']
 
     processing_jobs: List[ProcessingJob] = []
-    for jid, job in upload_jobs.items():
-        if job.chat_id == str(chat_id):
-            processing_job = ProcessingJob(name=job.filename, job_id=jid, status=job.status, stage=job.stage, progress=job.progress)
-            processing_jobs.append(processing_job)
+    for job in jobs:
+        processing_job = ProcessingJob(name=job.filename, job_id=job.job_id, status=job.status, stage=job.stage, progress=job.progress)
+        processing_jobs.append(processing_job)
     
     response_data = ChatDocumentsResponse(
         pdfs=pdfs,
@@ -125,41 +140,53 @@ def _get_chat_docs_data(chat_id: uuid.UUID, db: Session) -> dict:
     )
     return response_data.model_dump(mode='json')
 
+def _get_chat_docs_data(chat_id: uuid.UUID, db: Session) -> dict:
+    """Helper function to fetch and structure document data for a chat."""
+    chat = db.get(SQLChat, chat_id)
+    if not chat:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
+    return _chat_docs_payload(chat_id, chat, get_job_store().list_for_chat(str(chat_id)))
+
 @router.get("/chats/{chat_id}/docs", response_model=ChatDocumentsResponse, tags=["AskAI - Documents"])
 def get_chat_docs(chat_id: uuid.UUID, db: Session = Depends(get_db_session)):
     """Get all active and processing documents for a specific chat"""
     return _get_chat_docs_data(chat_id, db)
 
+async def _load_chat_docs_snapshot(chat_id: uuid.UUID) -> dict:
+    """Builds the chat docs payload on a short-lived async session, released before streaming starts."""
+    async with AsyncSessionLocal() as db:
+        chat = await db.get(SQLChat, chat_id, options=[selectinload(SQLChat.documents)])
+    if not chat:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
+    jobs = await asyncio.to_thread(get_job_store().list_for_chat, str(chat_id))
+    return _chat_docs_payload(chat_id, chat, jobs)
+
 @router.get("/chats/{chat_id}/docs-sse", tags=["AskAI - Documents"])
-async def stream_chat_docs(
-    chat_id: uuid.UUID,
-    request: Request,
-    db: Session = Depends(get_db_session)
-):
+async def stream_chat_docs(chat_id: uuid.UUID, request: Request):
     """
     Streams document status for a chat using Server-Sent Events (SSE).
-    Sends an update whenever the status of a document processing job changes.
+
+    Sends a `snapshot` event with the full ChatDocumentsResponse once, then
+    only deltas as they are published by the processing pipeline:
+    - `job`: {"type": "job", "job": ProcessingJob}
+    - `document`: {"type": "document", "action": "added" | "removed", "doc_type": ..., "document": DocumentMetadata}
     """
+    event_bus = get_event_bus()
+
     async def event_generator():
-        last_data = None
-        while True:
-            if await request.is_disconnected():
-                break
-            
+        # Subscribe before reading the snapshot so no change falls in between
+        async with event_bus.subscribe(chat_docs_topic(str(chat_id))) as next_event:
             try:
-                current_data = _get_chat_docs_data(chat_id, db)
-                if current_data != last_data:
-                    yield json.dumps(current_data)
-                    last_data = current_data
+                snapshot = await _load_chat_docs_snapshot(chat_id)
             except HTTPException:
-                # This can happen if the chat is deleted during an active stream.
-                break
-            except Exception as e:
-                print(f"Error in SSE stream for chat {chat_id}: {e}")
-                break
-                
-            await asyncio.sleep(1)
-            
+                return
+            yield {"event": "snapshot", "data": json.dumps(snapshot)}
+
+            while not await request.is_disconnected():
+                event = await next_event(settings.JOB_STORE_WATCH_POLL_SECONDS)
+                if event is not None:
+                    yield {"event": event["type"], "data": json.dumps(event)}
+
     return EventSourceResponse(event_generator())
 
 @router.delete("/chats/{chat_id}/pdfs/{pdf_name}", tags=["AskAI - Documents"])
@@ -0,0 +1,221 @@
+"""
+Semantic answer cache for chat RAG.
+
+Tender chats ask the same questions of the same documents again and again
+(EMD, completion period, eligibility, pre-bid date). A cached answer is
+served, with the sources it was generated from, when a new question is close
+enough to one already answered over the same documents:
+
+- The document set is keyed by the documents' content hashes (file_hash), so
+  chats of different users over the same tender files share answers.
+- An identical question (after whitespace/case normalisation) hits without
+  embedding; otherwise the question is embedded and compared by cosine
+  similarity with the cached questions of that document set, and the best
+  match at or above RAG_ANSWER_CACHE_THRESHOLD is a hit.
+- Only questions that open a chat are looked up and stored: the answer to a
+  follow-up depends on the chat's history, so it cannot be shared.
+- Entries live in an LRUTTLCache (RAG_ANSWER_CACHE_MAX_ENTRIES /
+  RAG_ANSWER_CACHE_TTL_SECONDS).
+
+Adding or removing a document changes the document-set key, so every worker
+stops serving the old answers for that chat; the worker that made the change
+also drops the answers of that chat's document sets (`invalidate_chat`).
+`stats()` reports hits, misses and the hit rate.
+
+Usage:
+    from app.modules.askai.services.answer_cache import get_answer_cache
+
+    cache = get_answer_cache()
+    hit = cache.lookup(chat.documents, question)
+    if hit is None:
+        answer, sources = generate(question)
+        cache.store(chat.documents, question, answer, sources, chat_id=chat.id)
+"""
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from app.config import settings
+from app.core.cache import LRUTTLCache
+
+
+def document_content_key(documents: Iterable[Any]) -> str:
+    """Order-independent hash of the documents' content hashes (falls back to ids)"""
+    hashes = sorted(str(getattr(doc, "file_hash", None) or getattr(doc, "id", doc)) for doc in documents)
+    return hashlib.sha1("\n".join(hashes).encode()).hexdigest()[:16]
+
+
+def normalise_question(question: str) -> str:
+    return re.sub(r"\s+", " ", question).strip().lower()
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    sources: List[Dict[str, Any]]
+    embedding: Optional[np.ndarray] = field(default=None, repr=False)  # Unit-normalised question embedding
+    similarity: float = 1.0  # Of the question that hit it
+
+
+class SemanticAnswerCache:
+    """Answers keyed by document set and question, matched by embedding similarity"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        threshold: Optional[float] = None,
+        embed: Optional[Callable[[str], np.ndarray]] = None,
+    ):
+        self.entries = LRUTTLCache(
+            max_entries or settings.RAG_ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds or settings.RAG_ANSWER_CACHE_TTL_SECONDS,
+        )
+        self.threshold = settings.RAG_ANSWER_CACHE_THRESHOLD if threshold is None else threshold
+        self._embed = embed
+        # doc key -> question keys stored under it; chat id -> doc keys it wrote
+        self._by_doc_set: Dict[str, Set[str]] = {}
+        self._by_chat: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def embed(self, question: str) -> np.ndarray:
+        if self._embed is None:
+            from app.core.embeddings import get_embedding_provider
+            provider = get_embedding_provider()
+            self._embed = lambda text: provider.encode([text])[0]
+        vector = np.asarray(self._embed(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _question_key(question: str) -> str:
+        return hashlib.sha1(normalise_question(question).encode()).hexdigest()[:16]
+
+    def lookup(self, documents: Iterable[Any], question: str) -> Optional[CachedAnswer]:
+        """The cached answer for `question` over `documents`, or None"""
+        doc_key = document_content_key(documents)
+        exact = self.entries.get((doc_key, self._question_key(question)))
+        if exact is not None:
+            with self._lock:
+                self.hits += 1
+            return CachedAnswer(exact.question, exact.answer, exact.sources, exact.embedding, 1.0)
+
+        candidates = self._live_entries(doc_key)
+        if candidates:
+            try:
+                query = self.embed(question)
+            except Exception as e:
+                print(f"⚠️  Answer cache lookup skipped, could not embed the question: {e}")
+                candidates = []
+        if candidates:
+            matrix = np.stack([entry.embedding for entry in candidates])
+            similarities = matrix @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                entry = candidates[best]
+                with self._lock:
+                    self.hits += 1
+                    self.semantic_hits += 1
+                return CachedAnswer(entry.question, entry.answer, entry.sources, entry.embedding, float(similarities[best]))
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _live_entries(self, doc_key: str) -> List[CachedAnswer]:
+        with self._lock:
+            question_keys = list(self._by_doc_set.get(doc_key, ()))
+        live, expired = [], []
+        for question_key in question_keys:
+            # Scanning is not a use: peek() leaves recency and hit counts alone
+            entry = self.entries.peek((doc_key, question_key))
+            if entry is None:
+                expired.append(question_key)
+            else:
+                live.append(entry)
+        if expired:
+            with self._lock:
+                keys = self._by_doc_set.get(doc_key)
+                if keys is not None:
+                    keys.difference_update(expired)
+                    if not keys:
+                        del self._by_doc_set[doc_key]
+        return live
+
+    def store(
+        self,
+        documents: Iterable[Any],
+        question: str,
+        answer: str,
+        sources: List[Dict[str, Any]],
+        chat_id: Any = None,
+    ) -> None:
+        doc_key = document_content_key(documents)
+        question_key = self._question_key(question)
+        try:
+            embedding = self.embed(question)
+        except Exception as e:
+            print(f"⚠️  Answer not cached, could not embed the question: {e}")
+            return
+        entry = CachedAnswer(question, answer, sources, embedding)
+        self.entries.set((doc_key, question_key), entry)
+        with self._lock:
+            self.stores += 1
+            self._by_doc_set.setdefault(doc_key, set()).add(question_key)
+            if chat_id is not None:
+                self._by_chat.setdefault(str(chat_id), set()).add(doc_key)
+
+    def invalidate_chat(self, chat_id: Any) -> int:
+        """Drop the answers cached for every document set this chat has asked about"""
+        with self._lock:
+            doc_keys = self._by_chat.pop(str(chat_id), set())
+            for doc_key in doc_keys:
+                self._by_doc_set.pop(doc_key, None)
+        if not doc_keys:
+            return 0
+        return self.entries.invalidate(lambda key: key[0] in doc_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_doc_set.clear()
+            self._by_chat.clear()
+        self.entries.invalidate()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        stats.update(entries=len(self.entries), evictions=self.entries.evictions)
+        return stats
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """The process-wide answer cache, or None when RAG_ANSWER_CACHE_ENABLED is off"""
+    global _answer_cache
+    if not settings.RAG_ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = SemanticAnswerCache()
+    return _answer_cache
@@ -12,7 +12,8 @@ Usage:
         detect_archive_type,
         extract_archive,
         is_archive,
-        get_archive_members
+        get_archive_members,
+        iter_extract_members
     )
 
     # Detect archive type
@@ -24,6 +25,10 @@ Usage:
     # Check if file is an archive
     if is_archive(Path("file.rar")):
         # Process as archive
+
+    # Stream only selected members
+    for path in iter_extract_members("file.zip", "/tmp/extract", ["docs/boq.pdf"]):
+        ...
 """
 
 import logging
@@ -31,7 +36,7 @@ import zipfile
 import tarfile
 import gzip
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 import shutil
 
 logger = logging.getLogger(__name__)
@@ -308,20 +313,20 @@ def extract_archive(
 
     try:
         if archive_type == 'zip':
-            extracted_files = _extract_zip(archive_path, extract_to)
+            extracted_files = list(_extract_zip(archive_path, extract_to))
 
         elif archive_type in ['tar', 'tar_gz', 'tar_bz2']:
-            extracted_files = _extract_tar(archive_path, extract_to, archive_type)
+            extracted_files = list(_extract_tar(archive_path, extract_to, archive_type))
 
         elif archive_type == 'rar':
             if not HAS_RARFILE:
                 raise ImportError("rarfile not installed. Install with: pip install rarfile")
-            extracted_files = _extract_rar(archive_path, extract_to)
+            extracted_files = list(_extract_rar(archive_path, extract_to))
 
         elif archive_type == '7z':
             if not HAS_PY7ZR:
                 raise ImportError("py7zr not installed. Install with: pip install py7zr")
-            extracted_files = _extract_7z(archive_path, extract_to)
+            extracted_files = list(_extract_7z(archive_path, extract_to))
 
         else:
             logger.error(f"Archive type {archive_type} not yet implemented")
@@ -335,38 +340,64 @@ def extract_archive(
         return None
 
 
-def _extract_zip(archive_path: str, extract_to: str) -> List[Path]:
+def _safe_member_path(extract_to: str, member_name: str) -> Optional[Path]:
+    """
+    Resolve where a member should be written, or None if its name would
+    escape `extract_to` (absolute paths, '..' components).
+    """
+    base = Path(extract_to).resolve()
+    target = (base / member_name).resolve()
+    if target != base and base in target.parents:
+        return target
+    logger.warning(f"Skipping archive member with unsafe path: {member_name}")
+    return None
+
+
+def _stream_member(src, target: Path) -> Path:
+    """Copy an open archive member stream to `target`"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, length=1024 * 1024)
+    return target
+
+
+def _extract_zip(archive_path: str, extract_to: str, members: Optional[List[str]] = None) -> Iterator[Path]:
     """
     Extract a ZIP archive.
 
     Args:
         archive_path: Path to ZIP file
         extract_to: Directory to extract into
+        members: Member names to stream out one at a time (default: extract all)
 
-    Returns:
-        List of extracted file paths
+    Yields:
+        Extracted file paths
     """
-    extracted_files = []
-
     try:
         with zipfile.ZipFile(archive_path, 'r') as zf:
-            # Extract all files
-            zf.extractall(extract_to)
-
-            # Return list of file paths (exclude directories)
-            for member in zf.namelist():
-                member_path = Path(extract_to) / member
-                if member_path.is_file():
-                    extracted_files.append(member_path)
+            if members is None:
+                # Extract all files
+                zf.extractall(extract_to)
+
+                # Return list of file paths (exclude directories)
+                for member in zf.namelist():
+                    member_path = Path(extract_to) / member
+                    if member_path.is_file():
+                        yield member_path
+                return
+
+            for name in members:
+                target = _safe_member_path(extract_to, name)
+                if target:
+                    with zf.open(name) as src:
+                        yield _stream_member(src, target)
 
     except zipfile.BadZipFile as e:
         logger.error(f"Corrupted ZIP archive {archive_path}: {e}")
         raise
 
-    return extracted_files
-
 
-def _extract_tar(archive_path: str, extract_to: str, archive_type: str) -> List[Path]:
+def _extract_tar(archive_path: str, extract_to: str, archive_type: str, members: Optional[List[str]] = None) -> Iterator[Path]:
     """
     Extract a TAR archive (supports .tar, .tar.gz, .tar.bz2).
 
@@ -374,12 +405,11 @@ def _extract_tar(archive_path: str, extract_to: str, archive_type: str) -> List[
         archive_path: Path to TAR file
         extract_to: Directory to extract into
         archive_type: Type of archive ('tar', 'tar_gz', 'tar_bz2')
+        members: Member names to stream out one at a time (default: extract all)
 
-    Returns:
-        List of extracted file paths
+    Yields:
+        Extracted file paths
     """
-    extracted_files = []
-
     # Determine compression mode
     mode = 'r'
     if archive_type == 'tar_gz':
@@ -389,23 +419,33 @@ def _extract_tar(archive_path: str, extract_to: str, archive_type: str) -> List[
 
     try:
         with tarfile.open(archive_path, mode) as tf:
-            # Extract all files
-            tf.extractall(path=extract_to)
+            if members is None:
+                # Extract all files
+                tf.extractall(path=extract_to)
 
-            # Return list of file paths (exclude directories)
-            for member in tf.getmembers():
-                member_path = Path(extract_to) / member.name
-                if member_path.is_file():
-                    extracted_files.append(member_path)
+                # Return list of file paths (exclude directories)
+                for member in tf.getmembers():
+                    member_path = Path(extract_to) / member.name
+                    if member_path.is_file():
+                        yield member_path
+                return
+
+            # Single sequential pass: compressed tars cannot seek to a member
+            wanted = set(members)
+            for member in tf:
+                if member.name not in wanted or not member.isfile():
+                    continue
+                target = _safe_member_path(extract_to, member.name)
+                if target:
+                    with tf.extractfile(member) as src:
+                        yield _stream_member(src, target)
 
     except tarfile.ReadError as e:
         logger.error(f"Corrupted TAR archive {archive_path}: {e}")
         raise
 
-    return extracted_files
 
-
-def _extract_rar(archive_path: str, extract_to: str) -> List[Path]:
+def _extract_rar(archive_path: str, extract_to: str, members: Optional[List[str]] = None) -> Iterator[Path]:
     """
     Extract a RAR archive.
 
@@ -414,67 +454,109 @@ def _extract_rar(archive_path: str, extract_to: str) -> List[Path]:
     Args:
         archive_path: Path to RAR file
         extract_to: Directory to extract into
+        members: Member names to stream out one at a time (default: extract all)
 
-    Returns:
-        List of extracted file paths
+    Yields:
+        Extracted file paths
     """
     if not HAS_RARFILE:
         raise ImportError("rarfile not installed. Install with: pip install rarfile")
 
-    extracted_files = []
-
     try:
         with rarfile.RarFile(archive_path, 'r') as rf:
-            # Extract all files
-            rf.extractall(path=extract_to)
-
-            # Return list of file paths (exclude directories)
-            for member in rf.namelist():
-                member_path = Path(extract_to) / member
-                if member_path.is_file():
-                    extracted_files.append(member_path)
+            if members is None:
+                # Extract all files
+                rf.extractall(path=extract_to)
+
+                # Return list of file paths (exclude directories)
+                for member in rf.namelist():
+                    member_path = Path(extract_to) / member
+                    if member_path.is_file():
+                        yield member_path
+                return
+
+            for name in members:
+                target = _safe_member_path(extract_to, name)
+                if target:
+                    with rf.open(name) as src:
+                        yield _stream_member(src, target)
 
     except rarfile.BadRarFile as e:
         logger.error(f"Corrupted RAR archive {archive_path}: {e}")
         raise
 
-    return extracted_files
 
-
-def _extract_7z(archive_path: str, extract_to: str) -> List[Path]:
+def _extract_7z(archive_path: str, extract_to: str, members: Optional[List[str]] = None) -> Iterator[Path]:
     """
     Extract a 7-Zip archive.
 
     Requires py7zr package: pip install py7zr
 
+    7z archives are usually solid (one compressed stream), so selected
+    members are extracted in a single pass rather than one at a time.
+
     Args:
         archive_path: Path to 7Z file
         extract_to: Directory to extract into
+        members: Member names to extract (default: extract all)
 
-    Returns:
-        List of extracted file paths
+    Yields:
+        Extracted file paths
     """
     if not HAS_PY7ZR:
         raise ImportError("py7zr not installed. Install with: pip install py7zr")
 
-    extracted_files = []
-
     try:
         with py7zr.SevenZipFile(archive_path, 'r') as zf:
-            # Extract all files
-            zf.extractall(path=extract_to)
-
-            # Return list of file paths (exclude directories)
-            for name, _ in zf.list():
-                member_path = Path(extract_to) / name
-                if member_path.is_file():
-                    extracted_files.append(member_path)
+            if members is None:
+                # Extract all files
+                names = [name for name, _ in zf.list()]
+                zf.extractall(path=extract_to)
+            else:
+                names = [name for name in members if _safe_member_path(extract_to, name)]
+                zf.extract(path=extract_to, targets=names)
+
+        # Return list of file paths (exclude directories)
+        for name in names:
+            member_path = Path(extract_to) / name
+            if member_path.is_file():
+                yield member_path
 
     except py7zr.Bad7zFile as e:
         logger.error(f"Corrupted 7Z archive {archive_path}: {e}")
         raise
 
-    return extracted_files
+
+def iter_extract_members(archive_path: str, extract_to: str, members: List[str]) -> Iterator[Path]:
+    """
+    Stream selected members out of an archive, yielding each file as soon as
+    it has been written.
+
+    Unlike extract_archive(), nothing else in the archive touches the disk,
+    and extraction is lazy: a consumer that stops pulling pauses extraction
+    (except for 7z, which is extracted in one pass).
+
+    Args:
+        archive_path: Path to the archive file
+        extract_to: Directory to write members into
+        members: Member names (as reported by get_archive_members) to extract
+
+    Yields:
+        Paths of extracted members, in archive order
+    """
+    archive_type = detect_archive_type(archive_path)
+    Path(extract_to).mkdir(parents=True, exist_ok=True)
+
+    if archive_type == 'zip':
+        yield from _extract_zip(archive_path, extract_to, members)
+    elif archive_type in ['tar', 'tar_gz', 'tar_bz2']:
+        yield from _extract_tar(archive_path, extract_to, archive_type, members)
+    elif archive_type == 'rar':
+        yield from _extract_rar(archive_path, extract_to, members)
+    elif archive_type == '7z':
+        yield from _extract_7z(archive_path, extract_to, members)
+    else:
+        raise ValueError(f"Archive type {archive_type} not supported for streaming extraction")
 
 
 # ============================================================================
@@ -1,38 +1,69 @@
+import base64
+import json
+from collections import defaultdict
+from datetime import datetime
 from uuid import UUID
 from typing import List, Optional, Tuple
 from fastapi import BackgroundTasks
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.services import get_vector_store
 from app.modules.askai.models.chat import ChatMetadata, Message, CreateNewChatRequest, DocumentMetadata
 from app.modules.askai.db.repository import ChatRepository, DocumentRepository
+from app.modules.askai.services.document_processing_service import announce_document_change
+from app.modules.askai.services.answer_cache import get_answer_cache
+from app.modules.askai.services.rag_cache import get_rag_cache
 from app.modules.askai.services.drive_service import download_files_from_drive
 
-def get_all_chats(db: Session) -> List[ChatMetadata]:
-    """Get all chats from PostgreSQL."""
+def encode_chat_cursor(updated_at: datetime, chat_id: UUID) -> str:
+    """Opaque keyset cursor pointing just past the given chat"""
+    raw = json.dumps([updated_at.isoformat(), str(chat_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_chat_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Inverse of encode_chat_cursor. Raises ValueError on malformed cursors."""
+    try:
+        updated_at, chat_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(updated_at), UUID(chat_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def get_all_chats(db: Session, limit: Optional[int] = None, cursor: Optional[str] = None) -> Tuple[List[ChatMetadata], Optional[str]]:
+    """
+    Get one page of chats from PostgreSQL, sorted by last updated.
+
+    Built from two queries regardless of data size: the chat page with its
+    message counts, and the document metadata for the chats on that page.
+    Returns the chats and the cursor for the next page (None on the last page).
+    """
+    limit = min(limit or settings.CHAT_LIST_PAGE_SIZE, settings.CHAT_LIST_MAX_PAGE_SIZE)
+    before = decode_chat_cursor(cursor) if cursor else None
+
     chat_repo = ChatRepository(db)
-    chats = chat_repo.get_all()
-    response_chats = []
-    for chat in chats:
-        pdf_list = [
-            DocumentMetadata(
-                name=doc.filename,
-                chunks=len(doc.chunks),
-                status=doc.status
-            ) for doc in chat.documents
-        ]
-        response_chats.append(
-            ChatMetadata(
-                id=chat.id,
-                title=chat.title,
-                created_at=chat.created_at.isoformat(),
-                updated_at=chat.updated_at.isoformat(),
-                message_count=len(chat.messages),
-                pdf_count=len(chat.documents),
-                pdf_list=pdf_list,
-            )
+    doc_repo = DocumentRepository(db)
+    rows = chat_repo.get_page_with_counts(limit + 1, before)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    docs_by_chat = defaultdict(list)
+    for chat_id, filename, chunk_count, doc_status in doc_repo.get_metadata_for_chats([row.id for row in rows]):
+        docs_by_chat[chat_id].append(DocumentMetadata(name=filename, chunks=chunk_count, status=doc_status))
+
+    response_chats = [
+        ChatMetadata(
+            id=row.id,
+            title=row.title,
+            created_at=row.created_at.isoformat(),
+            updated_at=row.updated_at.isoformat(),
+            message_count=row.message_count,
+            pdf_count=len(docs_by_chat[row.id]),
+            pdf_list=docs_by_chat[row.id],
         )
-    return response_chats
+        for row in rows
+    ]
+    next_cursor = encode_chat_cursor(rows[-1].updated_at, rows[-1].id) if has_more else None
+    return response_chats, next_cursor
 
 def create_new_chat(db: Session, payload: Optional[CreateNewChatRequest], background_tasks: BackgroundTasks) -> ChatMetadata:
     """Create a new chat session in PostgreSQL."""
@@ -70,6 +101,10 @@ def delete_chat_by_id(db: Session, chat_id: UUID) -> bool:
         return False
     
     chat_repo.delete(chat)
+    get_rag_cache().invalidate_chat(chat_id)
+    answer_cache = get_answer_cache()
+    if answer_cache:
+        answer_cache.invalidate_chat(chat_id)
     
     # Try to delete from vector store if it's available
     vs = get_vector_store()
@@ -104,7 +139,11 @@ def remove_document_from_chat(db: Session, chat_id: UUID, pdf_name: str) -> Tupl
     if not doc_to_delete:
         return False, f"PDF '{pdf_name}' not found in this chat"
 
+    # Captured before removal: the row may be deleted along with the link
+    removed_doc = DocumentMetadata(name=doc_to_delete.filename, chunks=doc_to_delete.chunk_count, status=doc_to_delete.status)
+    removed_doc_type = doc_to_delete.doc_type
     doc_repo.remove_document_from_chat(chat, doc_to_delete)
+    announce_document_change(str(chat_id), "removed", removed_doc_type, removed_doc)
     
     # After commit, the session is expired, so we need to check the updated state.
     # A simple way is to check the length of the relationship.
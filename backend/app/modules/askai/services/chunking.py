@@ -0,0 +1,152 @@
+"""
+Token-aware chunking shared by the PDF, Excel and HTML processors.
+
+Text is encoded once per page/sheet/section and each token's starting
+character offset is recorded. Overlapping windows of CHUNK_SIZE_TOKENS tokens
+are then cut straight out of the original string with one slice per chunk, so
+no word lists are built or re-joined. Chunk sizes are counted in the
+embedder's own tokens (services.get_chunk_tokenizer) so that they line up
+with its input limit.
+
+Progress reporting is throttled here too: processors call update_progress()
+from tight loops, and each report prints and writes the shared job store.
+
+Usage:
+    from app.modules.askai.services.chunking import TokenChunker
+
+    chunker = TokenChunker(tokenizer)
+    chunks = chunker.chunk(page_text, {"doc_id": "...", "page": 3})
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+_METADATA_UNSAFE = re.compile(r'[^\w\s\-\.\,\/]')
+_WHITESPACE_TOKEN = re.compile(r'\S+')
+
+
+def clean_metadata(metadata: Dict) -> Dict:
+    """Clean metadata for vector store compatibility (string values only)"""
+    cleaned = {}
+    for k, v in metadata.items():
+        str_val = _METADATA_UNSAFE.sub('_', str(v)).strip()
+        cleaned[k] = str_val if str_val else "unknown"
+    return cleaned
+
+
+# ============================================================================
+# CHUNKER
+# ============================================================================
+
+class TokenChunker:
+    """Splits text into overlapping token windows by slicing character offsets"""
+
+    def __init__(self, tokenizer=None, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        self.tokenizer = tokenizer
+        self.chunk_size = chunk_size or settings.CHUNK_SIZE_TOKENS
+        self.chunk_overlap = settings.CHUNK_OVERLAP_TOKENS if chunk_overlap is None else chunk_overlap
+        if not 0 <= self.chunk_overlap < self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+    def token_offsets(self, text: str) -> Tuple[str, List[int]]:
+        """
+        Encode `text` once and return (text, start offset of every token).
+
+        Uses tiktoken's decode_with_offsets when available (the returned text
+        is the canonical decoding the offsets refer to), a Hugging Face fast
+        tokenizer's offset mapping, or whitespace tokens as a last resort.
+        """
+        tokenizer = self.tokenizer
+        if tokenizer is not None and hasattr(tokenizer, "decode_with_offsets"):
+            tokens = tokenizer.encode(text, disallowed_special=())
+            decoded, offsets = tokenizer.decode_with_offsets(tokens)
+            return decoded, offsets
+        if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+            encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+            return text, [start for start, _ in encoding["offset_mapping"]]
+        return text, [m.start() for m in _WHITESPACE_TOKEN.finditer(text)]
+
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens in `text`, counted the way chunks are sized"""
+        return len(self.token_offsets(text)[1])
+
+    def split(self, text: str, on_progress: Optional[Callable[[float], None]] = None) -> List[Tuple[str, int]]:
+        """Return (chunk_text, token_count) windows covering `text`"""
+        text, offsets = self.token_offsets(text)
+        n_tokens = len(offsets)
+        if n_tokens <= self.chunk_size:
+            return [(text.strip(), n_tokens)] if n_tokens else []
+
+        step = self.chunk_size - self.chunk_overlap
+        windows = []
+        for start in range(0, n_tokens, step):
+            end = min(start + self.chunk_size, n_tokens)
+            char_end = offsets[end] if end < n_tokens else len(text)
+            windows.append((text[offsets[start]:char_end].strip(), end - start))
+            if on_progress:
+                on_progress(end / n_tokens)
+            if end == n_tokens:
+                break
+        return windows
+
+    def chunk(self, text: str, metadata: Dict, on_progress: Optional[Callable[[float], None]] = None) -> List[Dict]:
+        """
+        Create overlapping chunks with metadata.
+
+        Metadata is cleaned once; every chunk of the text carries a copy of the
+        same cleaned values plus its chunk_index (omitted for single chunks).
+        """
+        windows = self.split(text, on_progress)
+        base_metadata = clean_metadata(metadata)
+        if len(windows) == 1:
+            content, token_count = windows[0]
+            return [{"content": content, "metadata": base_metadata, "token_count": token_count}]
+        return [
+            {"content": content, "metadata": {**base_metadata, "chunk_index": str(idx)}, "token_count": token_count}
+            for idx, (content, token_count) in enumerate(windows)
+        ]
+
+
+# ============================================================================
+# PROGRESS THROTTLE
+# ============================================================================
+
+class ProgressThrottle:
+    """
+    Decides whether a progress update is worth publishing.
+
+    An update goes through when the stage changes, the job finishes, progress
+    moved by at least `min_delta` percent, or `min_interval` seconds passed
+    since the job's last published update.
+    """
+
+    def __init__(self, min_interval: Optional[float] = None, min_delta: Optional[float] = None, max_jobs: int = 1024):
+        self.min_interval = settings.PROGRESS_MIN_INTERVAL_SECONDS if min_interval is None else min_interval
+        self.min_delta = settings.PROGRESS_MIN_DELTA if min_delta is None else min_delta
+        self.max_jobs = max_jobs
+        self._last: "OrderedDict[Optional[str], Tuple[object, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def should_report(self, job_id: Optional[str], stage, progress: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(job_id)
+            if last is not None:
+                last_stage, last_progress, last_time = last
+                if (stage == last_stage and progress < 100
+                        and abs(progress - last_progress) < self.min_delta
+                        and now - last_time < self.min_interval):
+                    return False
+            self._last[job_id] = (stage, progress, now)
+            self._last.move_to_end(job_id)
+            while len(self._last) > self.max_jobs:
+                self._last.popitem(last=False)
+            return True
+
+
+progress_throttle = ProgressThrottle()
@@ -6,24 +6,40 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.core import services
-from app.core.global_stores import upload_jobs
+from app.core.events import chat_docs_topic, get_event_bus
+from app.core.job_store import get_job_store
 from app.db.database import SessionLocal
 from app.modules.askai.db.models import Document as SQLDocument, DocumentChunk
 from app.modules.askai.db.repository import ChatRepository, DocumentRepository
-from app.modules.askai.models.document import ProcessingStage, ProcessingStatus, UploadJob
+from app.modules.askai.models.document import DocumentMetadata, ProcessingStage, ProcessingStatus
+from app.modules.askai.services.answer_cache import get_answer_cache
+from app.modules.askai.services.rag_cache import get_rag_cache
 from app.utils import get_file_hash
 from app.config import settings
 
+def announce_document_change(chat_id: str, action: str, doc_type: str, metadata: DocumentMetadata) -> None:
+    """Publish a document added/removed delta on the chat's document-change topic"""
+    # Other workers see the new document set through its hash in the cache key
+    get_rag_cache().invalidate_chat(chat_id)
+    answer_cache = get_answer_cache()
+    if answer_cache:
+        answer_cache.invalidate_chat(chat_id)
+    get_event_bus().publish(chat_docs_topic(chat_id), {
+        "type": "document",
+        "action": action,
+        "doc_type": doc_type,
+        "document": metadata.model_dump(mode="json"),
+    })
+
+def _document_metadata(document: SQLDocument) -> DocumentMetadata:
+    return DocumentMetadata(name=document.filename, chunks=document.chunk_count or 0, status=document.status or "active")
+
 def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id: str):
     """Background task to process a PDF file using a new DB session."""
-    upload_job = upload_jobs.get(job_id)
-    if not isinstance(upload_job, UploadJob):
+    job_store = get_job_store()
+    if not job_store.update(job_id, status=ProcessingStatus.PROCESSING, stage=ProcessingStage.EXTRACTING_CONTENT, progress=0):
         return
 
-    upload_job.status = ProcessingStatus.PROCESSING
-    upload_job.stage = ProcessingStage.EXTRACTING_CONTENT
-    upload_job.progress = 0
-
     # Get lazy-loaded services
     pdf_processor = services.get_pdf_processor()
     vector_store = services.get_vector_store()
@@ -48,7 +64,8 @@ def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id
             print(f"♻️  Document with hash {file_hash} already exists. Reusing...")
             
             # Check if already linked to this chat
-            if existing_doc not in chat.documents:
+            newly_linked = existing_doc not in chat.documents
+            if newly_linked:
                 chat.documents.append(existing_doc)
                 db.commit()
                 print(f"🔗 Linked existing document {existing_doc.filename} to chat {chat_id}")
@@ -71,20 +88,21 @@ def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id
                 if chunks_to_add:
                     added_count = vector_store.add_chunks(collection, chunks_to_add)
                     print(f"✅ Added {added_count} existing chunks to chat {chat_id} vector store")
-                    upload_job.chunks_added = added_count
+                    job_store.update(job_id, chunks_added=added_count)
                 else:
                     print(f"⚠️ No chunks found in existing document {existing_doc.filename}")
-                    upload_job.chunks_added = 0
+                    job_store.update(job_id, chunks_added=0)
                     
             except Exception as e:
                 print(f"❌ Error adding existing chunks to vector store: {e}")
                 # We don't fail the whole upload if this fails, but it's bad for RAG
-                
-            # Update job status
-            upload_job.status = ProcessingStatus.FINISHED
-            upload_job.progress = 100
-            upload_job.finished_at = datetime.now().isoformat()
-            # upload_job.chunks_added is set above
+
+            # Announce (and drop the chat's cached answers) once the vectors are searchable
+            if newly_linked:
+                announce_document_change(chat_id_str, "added", existing_doc.doc_type, _document_metadata(existing_doc))
+
+            # Update job status (chunks_added is set above)
+            job_store.update(job_id, status=ProcessingStatus.FINISHED, progress=100, finished_at=datetime.now().isoformat())
             return
 
         # 1. Process PDF to get chunks and stats
@@ -94,15 +112,13 @@ def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id
         if not chunks_as_dicts:
             raise Exception("No content extracted from PDF")
 
-        upload_job.stage = ProcessingStage.ADDING_TO_VECTOR_STORE
-        upload_job.progress = 0
+        job_store.update(job_id, stage=ProcessingStage.ADDING_TO_VECTOR_STORE, progress=0)
         
         # 2. Add chunks to vector store
         collection = vector_store.get_or_create_collection(chat_id_str)
         added_count = vector_store.add_chunks(collection, chunks_as_dicts)
         
-        upload_job.stage = ProcessingStage.SAVING_METADATA
-        upload_job.progress = 0
+        job_store.update(job_id, stage=ProcessingStage.SAVING_METADATA, progress=0)
         
         # 3. Save document and chunks to PostgreSQL
         now = datetime.now()
@@ -113,6 +129,7 @@ def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id
             file_size=os.path.getsize(temp_path),
             uploaded_at=now,
             processing_stats=stats,
+            chunk_count=len(chunks_as_dicts),
             chunks=[
                 DocumentChunk(
                     content=chunk["content"],
@@ -121,21 +138,23 @@ def process_uploaded_pdf(temp_path: str, chat_id_str: str, filename: str, job_id
             ]
         )
         doc_repo.add_document_to_chat(chat, new_document)
+        announce_document_change(chat_id_str, "added", new_document.doc_type, _document_metadata(new_document))
         
         # 4. Update job status to 'done'
-        upload_job.status = ProcessingStatus.FINISHED
-        upload_job.progress = 100
-        upload_job.finished_at = now.isoformat()
-        upload_job.chunks_added = added_count
+        job_store.update(
+            job_id,
+            status=ProcessingStatus.FINISHED,
+            progress=100,
+            finished_at=now.isoformat(),
+            chunks_added=added_count,
+        )
         print(f"✅ PDF {filename} processed successfully for job {job_id}")
 
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Processing error for job {job_id}: {error_msg}")
         traceback.print_exc()
-        upload_job.status = ProcessingStatus.FAILED
-        upload_job.error = error_msg
-        upload_job.finished_at = datetime.now().isoformat()
+        job_store.update(job_id, status=ProcessingStatus.FAILED, error=error_msg, finished_at=datetime.now().isoformat())
     
     finally:
         db.close()
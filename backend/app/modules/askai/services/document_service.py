@@ -1,15 +1,15 @@
 
 import re
 import json
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterator
 import os
 import traceback
 import time
 from pathlib import Path
 from enum import Enum
 import logging
-import shutil
-from uuid import uuid4
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,6 @@ except ImportError:
 try:
     import pandas as pd
     import openpyxl
-    from openpyxl.cell.cell import MergedCell
     HAS_EXCEL_LIBS = True
 except ImportError:
     HAS_EXCEL_LIBS = False
@@ -42,8 +41,13 @@ except ImportError:
 
 # Import from your app
 from app.config import settings
-from app.core.global_stores import upload_jobs
+from app.core import metrics
+from app.core.job_store import get_job_store
 from app.modules.askai.models.document import ProcessingStage
+from app.modules.askai.services.chunking import TokenChunker, clean_metadata, progress_throttle
+from app.modules.askai.services.excel_stream import RowBlock, WorkbookBudget, iter_row_blocks
+from app.modules.askai.services.ocr_utils import needs_ocr, ocr_pages
+from app.modules.askai.services.pdf_pipeline import PageExtraction, get_page_count, in_process_parsing, iter_page_extractions
 
 
 # ============================================================================
@@ -58,6 +62,7 @@ class PDFProcessor:
     def __init__(self, embedding_model, tokenizer):
         self.embedding_model = embedding_model
         self.tokenizer = tokenizer
+        self.chunker = TokenChunker(tokenizer)
         self.has_llamaparse = False  # Initialize to False by default
         
         if not HAS_PDF_LIBS:
@@ -90,63 +95,22 @@ class PDFProcessor:
     
     def _clean_metadata(self, metadata: Dict) -> Dict:
         """Clean metadata for ChromaDB compatibility"""
-        cleaned = {}
-        for k, v in metadata.items():
-            str_val = str(v)
-            str_val = re.sub(r'[^\w\s\-\.\,\/]', '_', str_val)
-            str_val = str_val.strip()
-            cleaned[k] = str_val if str_val else "unknown"
-        return cleaned
+        return clean_metadata(metadata)
     
     def update_progress(self, stage: ProcessingStage, progress: float) -> None:
+        if not progress_throttle.should_report(self.job_id, stage, progress):
+            return
         print(f"📄 Progress: {stage} {progress:.1f}%")
         if not self.job_id:
             return
-        if self.job_id in upload_jobs:
-            upload_jobs[self.job_id].stage = stage
-            upload_jobs[self.job_id].progress = progress
+        get_job_store().update(self.job_id, stage=stage, progress=progress)
     
     def create_smart_chunks(self, text: str, curr_page_no: int, no_of_pages: int, metadata: Dict) -> List[Dict]:
-        """Create overlapping chunks with metadata"""
-        words = text.split()
-        chunks = []
-        no_of_words = len(words)
-        
-        if len(words) <= settings.CHUNK_SIZE:
-            return [{
-                "content": text,
-                "metadata": self._clean_metadata(metadata),
-                "word_count": len(words)
-            }]
-        
-        chunk_index = 0
-        start = 0
-        
-        while start < len(words):
-            progress_from_previous_pages = (curr_page_no - 1) / no_of_pages
-            progress_on_current_page = (start / no_of_words) * (1 / no_of_pages)
-            self.update_progress(ProcessingStage.CREATING_CHUNKS, (progress_from_previous_pages + progress_on_current_page) * 100)
-            
-            end = min(start + settings.CHUNK_SIZE, len(words))
-            chunk_words = words[start:end]
-            chunk_text = ' '.join(chunk_words)
-            
-            chunk_meta = metadata.copy()
-            chunk_meta["chunk_index"] = chunk_index
-            
-            chunks.append({
-                "content": chunk_text,
-                "metadata": self._clean_metadata(chunk_meta),
-                "word_count": len(chunk_words)
-            })
-            
-            chunk_index += 1
-            start = end - settings.CHUNK_OVERLAP
-            
-            if start >= len(words) - settings.CHUNK_OVERLAP:
-                break
-        
-        return chunks
+        """Create overlapping token-window chunks with metadata"""
+        def on_progress(fraction: float) -> None:
+            self.update_progress(ProcessingStage.CREATING_CHUNKS, ((curr_page_no - 1) + fraction) / no_of_pages * 100)
+
+        return self.chunker.chunk(text, metadata, on_progress)
     
     def extract_with_llamaparse(self, pdf_path: str) -> Dict[int, str]:
         """Primary extraction using LlamaParse"""
@@ -156,7 +120,8 @@ class PDFProcessor:
         try:
             print(f"🔍 LlamaParse processing for {Path(pdf_path).name}...")
             self.update_progress(ProcessingStage.LLAMA_LOADING, 0)
-            documents = self.llama_parser.load_data(pdf_path)
+            with metrics.EXTRACTION_SECONDS.labels("llamaparse").time():
+                documents = self.llama_parser.load_data(pdf_path)
             
             page_texts = {}
             no_of_pages = len(documents)
@@ -175,6 +140,7 @@ class PDFProcessor:
                 page_texts[page_num].append(doc.text)
             
             result = {p: self.clean_text("\n\n".join(texts)) for p, texts in page_texts.items()}
+            metrics.EXTRACTION_PAGES_TOTAL.labels("llamaparse").inc(len(result))
             print(f"✅ LlamaParse extracted {len(result)} pages.")
             return result
             
@@ -184,89 +150,177 @@ class PDFProcessor:
             return {}
     
     def extract_with_pymupdf(self, pdf_path: str) -> Dict[int, str]:
-        """Fallback extraction using PyMuPDF"""
+        """Fallback extraction using PyMuPDF (text only, via the single-pass pipeline)"""
         page_texts = {}
         if not HAS_PDF_LIBS:
             print("❌ PyMuPDF not available - PDF libraries not installed")
             return page_texts
         try:
             self.update_progress(ProcessingStage.PYMUPDF_LOADING, 0)
-            doc = fitz.open(pdf_path)
-            no_of_pages = doc.page_count
-            for page_num in range(doc.page_count):
-                self.update_progress(ProcessingStage.EXTRACTING_CONTENT, (page_num / no_of_pages) * 100)
-                page = doc[page_num]
-                text = page.get_text()
-                if text and text.strip():
-                    page_texts[page_num + 1] = self.clean_text(text)
-            doc.close()
+            for page in metrics.timed_iter(iter_page_extractions(pdf_path), metrics.EXTRACTION_SECONDS.labels("pymupdf")):
+                if page.text and page.text.strip():
+                    page_texts[page.page_num] = self.clean_text(page.text)
+            page_texts = dict(sorted(page_texts.items()))
+            metrics.EXTRACTION_PAGES_TOTAL.labels("pymupdf").inc(len(page_texts))
             print(f"✅ PyMuPDF extracted {len(page_texts)} pages")
         except Exception as e:
             print(f"❌ PyMuPDF error: {e}")
         return page_texts
     
-    def extract_with_tesseract(self, pdf_path: str) -> Dict[int, str]:
-        """Final fallback OCR using Tesseract"""
+    def extract_with_tesseract(self, pdf_path: str, page_numbers: Optional[List[int]] = None) -> Dict[int, str]:
+        """
+        OCR using Tesseract, run page-parallel across a process pool.
+        OCRs only `page_numbers` (1-based) when given, otherwise every page.
+        """
         page_texts = {}
         if not HAS_PDF_LIBS:
             print("❌ Tesseract OCR not available - PDF libraries not installed")
             return page_texts
         try:
-            print(f"🔎 Tesseract OCR processing...")
+            if page_numbers is None:
+                page_numbers = list(range(1, self._get_page_count(pdf_path) + 1))
+            if not page_numbers:
+                return page_texts
+
+            print(f"🔎 Tesseract OCR processing {len(page_numbers)} pages...")
             self.update_progress(ProcessingStage.TESSERACT_LOADING, 0)
-            doc = fitz.open(pdf_path)
-            no_of_pages = doc.page_count
-            for i, page in enumerate(doc):
-                self.update_progress(ProcessingStage.EXTRACTING_CONTENT, (i / no_of_pages) * 100)
-                pix = page.get_pixmap(dpi=200)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                text = pytesseract.image_to_string(img)
+            with metrics.EXTRACTION_SECONDS.labels("tesseract").time():
+                ocr_texts = ocr_pages(
+                    pdf_path,
+                    page_numbers,
+                    on_page_done=lambda done, total: self.update_progress(
+                        ProcessingStage.EXTRACTING_CONTENT, (done / total) * 100
+                    ),
+                )
+            for page_num, text in ocr_texts.items():
                 if text and text.strip():
-                    page_texts[i + 1] = self.clean_text(text)
+                    page_texts[page_num] = self.clean_text(text)
+            metrics.EXTRACTION_PAGES_TOTAL.labels("tesseract").inc(len(page_texts))
             print(f"✅ Tesseract OCR extracted {len(page_texts)} pages.")
         except Exception as e:
             print(f"❌ Tesseract OCR error: {e}")
             traceback.print_exc()
         return page_texts
-    
+
+    def _get_page_count(self, pdf_path: str) -> int:
+        """Returns the number of pages in a PDF, or 0 if it cannot be opened"""
+        try:
+            return get_page_count(pdf_path)
+        except Exception as e:
+            print(f"⚠️  Could not read page count: {e}")
+            return 0
+
+    def format_table(self, table: List[List], table_idx: int, page_num: int) -> Optional[str]:
+        """Render a pdfplumber table as pipe-separated text, or None if it has no body rows"""
+        if len(table) < 2:
+            return None
+        headers = table[0] if table[0] else []
+        table_text = f"Table {table_idx + 1} on page {page_num}:\n"
+        if headers:
+            table_text += "Headers: " + " | ".join(str(h) for h in headers if h) + "\n"
+        for row in table[1:]:
+            if not any(row):
+                continue
+            row_text = " | ".join(str(cell) if cell else "" for cell in row)
+            table_text += row_text + "\n"
+        return self.clean_text(table_text)
+
     def extract_tables(self, pdf_path: str) -> List[Dict]:
-        """Extract tables using pdfplumber"""
+        """Extract tables using pdfplumber, only on pages with ruling lines"""
         tables = []
         if not HAS_PDF_LIBS:
             print("⚠️  Table extraction not available - PDF libraries not installed")
             return tables
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    page_tables = page.extract_tables() or []
-                    no_of_tables = len(page_tables)
-                    for table_idx, table in enumerate(page_tables):
-                        progress_from_previous_pages = (page_num - 1) / total_pages
-                        progress_on_current_page = ((table_idx + 1) / no_of_tables) * (1 / total_pages)
-                        total_progress = progress_from_previous_pages + progress_on_current_page
-                        self.update_progress(ProcessingStage.EXTRACTING_TABLES, total_progress * 100)
-                        if len(table) < 2:
-                            continue
-                        headers = table[0] if table[0] else []
-                        table_text = f"Table {table_idx + 1} on page {page_num}:\n"
-                        if headers:
-                            table_text += "Headers: " + " | ".join(str(h) for h in headers if h) + "\n"
-                        for row in table[1:]:
-                            if not any(row):
-                                continue
-                            row_text = " | ".join(str(cell) if cell else "" for cell in row)
-                            table_text += row_text + "\n"
-                        tables.append({
-                            "content": self.clean_text(table_text),
-                            "page": page_num,
-                            "type": "table",
-                            "table_index": table_idx
-                        })
+            for page in iter_page_extractions(pdf_path):
+                tables.extend(self._page_tables(page))
+            tables.sort(key=lambda t: (t["page"], t["table_index"]))
             print(f"✅ Extracted {len(tables)} tables")
         except Exception as e:
             print(f"⚠️  Table extraction error: {e}")
         return tables
+
+    def _page_tables(self, page: PageExtraction) -> List[Dict]:
+        tables = []
+        for table_idx, table in enumerate(page.tables):
+            content = self.format_table(table, table_idx, page.page_num)
+            if content:
+                tables.append({"content": content, "page": page.page_num, "type": "table", "table_index": table_idx})
+        return tables
+
+    def _page_text_chunks(self, text: str, page_num: int, no_of_pages: int, doc_id: str, filename: str) -> List[Dict]:
+        if not text.strip():
+            return []
+        base_metadata = {"doc_id": str(doc_id), "source": str(filename), "page": str(page_num), "type": "text", "doc_type": "pdf"}
+        return self.create_smart_chunks(text, page_num, no_of_pages, base_metadata)
+
+    def _table_chunk(self, table: Dict, doc_id: str, filename: str) -> Dict:
+        table_meta = {"doc_id": str(doc_id), "source": str(filename), "page": str(table["page"]), "type": "table", "doc_type": "pdf", "table_index": str(table.get("table_index", 0))}
+        return {"content": table["content"], "metadata": self._clean_metadata(table_meta), "token_count": self.chunker.count_tokens(table["content"])}
+
+    def iter_pdf_chunks(self, pdf_path: str, doc_id: str, filename: str, stats: Dict) -> Iterator[Dict]:
+        """
+        Stream text and table chunks for a PDF as pages are extracted.
+
+        Pages are read once by the page-parallel pipeline (text + tables).
+        LlamaParse text, when available, takes precedence over the PyMuPDF
+        text layer. Pages with no usable text are OCRed at the end, in parallel.
+        `stats` is filled in with page and table counts as a side effect.
+        """
+        llama_texts = self.extract_with_llamaparse(pdf_path)
+        if not llama_texts:
+            print("⚠️  LlamaParse unavailable or failed, using PyMuPDF text layer...")
+            self.update_progress(ProcessingStage.PYMUPDF_LOADING, 0)
+
+        page_count = self._get_page_count(pdf_path)
+        no_of_pages = max(page_count, len(llama_texts), 1)
+        pages_done = 0
+        pages_with_text = set()
+        pages_to_ocr = []
+        stats.update({"pages": 0, "tables": 0, "table_candidate_pages": 0})
+        text_layer_pages = 0
+
+        # Only the time spent reading pages counts as PyMuPDF extraction, not chunking them
+        pages = metrics.timed_iter(iter_page_extractions(pdf_path), metrics.EXTRACTION_SECONDS.labels("pymupdf"))
+        for page in pages:
+            pages_done += 1
+            self.update_progress(ProcessingStage.EXTRACTING_CONTENT, (pages_done / no_of_pages) * 100)
+
+            text = llama_texts.get(page.page_num)
+            if needs_ocr(text):
+                # Judge the raw layer: clean_text blanks the garbage characters needs_ocr looks for
+                text = "" if needs_ocr(page.text) else self.clean_text(page.text)
+                text_layer_pages += not needs_ocr(text)
+            if needs_ocr(text):
+                pages_to_ocr.append(page.page_num)
+            else:
+                pages_with_text.add(page.page_num)
+                yield from self._page_text_chunks(text, page.page_num, no_of_pages, doc_id, filename)
+
+            if page.table_candidate:
+                stats["table_candidate_pages"] += 1
+            for table in self._page_tables(page):
+                stats["tables"] += 1
+                yield self._table_chunk(table, doc_id, filename)
+
+        metrics.EXTRACTION_PAGES_TOTAL.labels("pymupdf").inc(text_layer_pages)
+
+        # LlamaParse page labels can run past the physical page count
+        for page_num, text in llama_texts.items():
+            if page_num > page_count and text.strip():
+                pages_with_text.add(page_num)
+                yield from self._page_text_chunks(text, page_num, no_of_pages, doc_id, filename)
+
+        # Scanned annexures have no text layer even when the rest of the
+        # document does, so OCR is routed per page rather than per document.
+        if pages_to_ocr:
+            print(f"🔎 {len(pages_to_ocr)}/{page_count} pages have no usable text layer, sending to OCR...")
+            ocr_texts = self.extract_with_tesseract(pdf_path, pages_to_ocr)
+            for page_num in sorted(ocr_texts):
+                pages_with_text.add(page_num)
+                yield from self._page_text_chunks(ocr_texts[page_num], page_num, no_of_pages, doc_id, filename)
+
+        stats["pages"] = len(pages_with_text)
     
     def process_pdf(self, job_id: str, pdf_path: str, doc_id: str, filename: str) -> Tuple[List[Dict], Dict]:
         """Main PDF processing pipeline"""
@@ -274,36 +328,19 @@ class PDFProcessor:
         print(f"\n{'='*60}\n📄 Processing PDF: {filename}\n{'='*60}")
         start_time = time.time()
         
-        page_texts = self.extract_with_llamaparse(pdf_path)
-        if not page_texts:
-            print("⚠️  LlamaParse failed, attempting PyMuPDF fallback...")
-            page_texts = self.extract_with_pymupdf(pdf_path)
-        if not page_texts:
-            print("⚠️  PyMuPDF also failed, attempting Tesseract OCR fallback...")
-            page_texts = self.extract_with_tesseract(pdf_path)
-        if not page_texts:
-            raise Exception("Failed to extract any text from PDF")
-        
-        tables = self.extract_tables(pdf_path)
-        
+        stats = {}
         all_chunks = []
-        no_of_pages = len(page_texts)
-        for page_num, text in page_texts.items():
-            if not text.strip():
-                continue
-            base_metadata = {"doc_id": str(doc_id), "source": str(filename), "page": str(page_num), "type": "text", "doc_type": "pdf"}
-            chunks = self.create_smart_chunks(text, page_num, no_of_pages, base_metadata)
-            all_chunks.extend(chunks)
+        for chunk in self.iter_pdf_chunks(pdf_path, doc_id, filename, stats):
+            all_chunks.append(chunk)
         
-        for table in tables:
-            table_meta = {"doc_id": str(doc_id), "source": str(filename), "page": str(table["page"]), "type": "table", "doc_type": "pdf", "table_index": str(table.get("table_index", 0))}
-            all_chunks.append({"content": table["content"], "metadata": self._clean_metadata(table_meta), "word_count": len(table["content"].split())})
+        if not stats.get("pages"):
+            raise Exception("Failed to extract any text from PDF")
         
         if len(all_chunks) > settings.MAX_CHUNKS_PER_DOCUMENT:
             print(f"⚠️  Limiting to {settings.MAX_CHUNKS_PER_DOCUMENT} chunks")
             all_chunks = all_chunks[:settings.MAX_CHUNKS_PER_DOCUMENT]
         
-        stats = {"total_chunks": len(all_chunks), "pages": len(page_texts), "tables": len(tables), "processing_time": time.time() - start_time}
+        stats.update({"total_chunks": len(all_chunks), "processing_time": time.time() - start_time})
         print(f"✅ Created {stats['total_chunks']} chunks from {stats['pages']} pages")
         print(f"⏱️  Processing time: {stats['processing_time']:.2f}s\n")
         
@@ -322,6 +359,7 @@ class ExcelProcessor:
     def __init__(self, embedding_model, tokenizer):
         self.embedding_model = embedding_model
         self.tokenizer = tokenizer
+        self.chunker = TokenChunker(tokenizer)
         
         if not HAS_EXCEL_LIBS:
             self.has_excel_libs = False
@@ -340,242 +378,81 @@ class ExcelProcessor:
     
     def _clean_metadata(self, metadata: Dict) -> Dict:
         """Clean metadata for ChromaDB compatibility"""
-        cleaned = {}
-        for k, v in metadata.items():
-            str_val = str(v)
-            str_val = re.sub(r'[^\w\s\-\.\,\/]', '_', str_val)
-            str_val = str_val.strip()
-            cleaned[k] = str_val if str_val else "unknown"
-        return cleaned
+        return clean_metadata(metadata)
     
     def update_progress(self, stage: ProcessingStage, progress: float) -> None:
+        if not progress_throttle.should_report(self.job_id, stage, progress):
+            return
         print(f"📊 Progress: {stage} {progress:.1f}%")
         if not self.job_id:
             return
-        if self.job_id in upload_jobs:
-            upload_jobs[self.job_id].stage = stage
-            upload_jobs[self.job_id].progress = progress
+        get_job_store().update(self.job_id, stage=stage, progress=progress)
     
     def create_smart_chunks(self, text: str, curr_sheet_idx: int, no_of_sheets: int, metadata: Dict) -> List[Dict]:
-        """Create overlapping chunks with metadata"""
-        words = text.split()
-        chunks = []
-        no_of_words = len(words)
-        
-        if len(words) <= settings.CHUNK_SIZE:
-            return [{
-                "content": text,
-                "metadata": self._clean_metadata(metadata),
-                "word_count": len(words)
-            }]
-        
-        chunk_index = 0
-        start = 0
-        
-        while start < len(words):
-            progress_from_previous_sheets = curr_sheet_idx / no_of_sheets if no_of_sheets > 0 else 0
-            progress_on_current_sheet = (start / no_of_words) * (1 / no_of_sheets) if no_of_sheets > 0 else 0
-            self.update_progress(ProcessingStage.CREATING_CHUNKS, (progress_from_previous_sheets + progress_on_current_sheet) * 100)
-            end = min(start + settings.CHUNK_SIZE, len(words))
-            chunk_words = words[start:end]
-            chunk_text = ' '.join(chunk_words)
-            
-            chunk_meta = metadata.copy()
-            chunk_meta["chunk_index"] = chunk_index
-            
-            chunks.append({
-                "content": chunk_text,
-                "metadata": self._clean_metadata(chunk_meta),
-                "word_count": len(chunk_words)
-            })
-            
-            chunk_index += 1
-            start = end - settings.CHUNK_OVERLAP
-            
-            if start >= len(words) - settings.CHUNK_OVERLAP:
-                break
-        
-        return chunks
+        """Create overlapping token-window chunks with metadata"""
+        def on_progress(fraction: float) -> None:
+            if no_of_sheets > 0:
+                self.update_progress(ProcessingStage.CREATING_CHUNKS, (curr_sheet_idx + fraction) / no_of_sheets * 100)
+
+        return self.chunker.chunk(text, metadata, on_progress)
     
-    def extract_with_pandas(self, excel_path: str) -> Dict[str, str]:
-        """Primary extraction using pandas for all sheets"""
-        if not self.has_excel_libs:
-            return {}
-        
-        try:
-            print(f"🔍 Pandas processing for {Path(excel_path).name}...")
-            self.update_progress(ProcessingStage.EXTRACTING_CONTENT, 0)
-            
-            # Check if it's an old .xls file and we need xlrd
-            if excel_path.lower().endswith('.xls'):
-                try:
-                    # Try with xlrd engine for old Excel files
-                    excel_file = pd.ExcelFile(excel_path, engine='xlrd')
-                except ImportError:
-                    print("❌ xlrd not available for .xls files. Install with: pip install xlrd")
-                    return {}
-                except Exception as e:
-                    print(f"❌ xlrd failed to read .xls file: {e}")
-                    return {}
-            else:
-                # Use default engine for .xlsx files
-                excel_file = pd.ExcelFile(excel_path)
-            
-            sheet_texts = {}
-            
-            no_of_sheets = len(excel_file.sheet_names)
-            print(f"📑 Found {no_of_sheets} sheets: {excel_file.sheet_names}")
-            
-            for idx, sheet_name in enumerate(excel_file.sheet_names):
-                self.update_progress(ProcessingStage.EXTRACTING_CONTENT, (idx / no_of_sheets) * 100)
-                
-                try:
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                    print(f"   Sheet '{sheet_name}': {len(df)} rows, {len(df.columns)} columns")
-                    
-                    df = df.ffill(axis=0)
-                    df = df.bfill().fillna('')
-                    
-                    text_parts = []
-                    text_parts.append(f"Sheet: {sheet_name}\n")
-                    
-                    if not df.empty:
-                        headers = " | ".join(str(col) for col in df.columns)
-                        text_parts.append(f"Headers: {headers}\n")
-                        
-                        for row_idx, row in df.iterrows():
-                            row_text = " | ".join(str(val) for val in row.values if str(val).strip())
-                            if row_text.strip():
-                                text_parts.append(row_text)
-                    
-                    sheet_text = "\n".join(text_parts)
-                    if sheet_text.strip():
-                        sheet_texts[sheet_name] = self.clean_text(sheet_text)
-                
-                except Exception as e:
-                    print(f"⚠️  Error reading sheet '{sheet_name}': {e}")
-                    continue
-            
-            print(f"✅ Pandas extracted {len(sheet_texts)} sheets.")
-            return sheet_texts
-            
-        except ImportError as e:
-            if "xlrd" in str(e):
-                print(f"❌ Pandas extraction error: {e}")
-                print("💡 For .xls files, install: pip install xlrd")
-            else:
-                print(f"❌ Pandas extraction error: {e}")
-                traceback.print_exc()
-            return {}
-        except Exception as e:
-            print(f"❌ Pandas extraction error: {e}")
-            traceback.print_exc()
-            return {}
+    def _block_text_chunks(self, block: RowBlock, doc_id: str, filename: str) -> List[Dict]:
+        text = self.clean_text(f"Sheet: {block.sheet}\nHeaders: {block.header_line}\n" + "\n".join(block.lines))
+        base_metadata = {
+            "doc_id": str(doc_id),
+            "source": str(filename),
+            "sheet": str(block.sheet),
+            "rows": f"{block.first_row}-{block.last_row}",
+            "type": "text",
+            "doc_type": "excel"
+        }
+        return self.create_smart_chunks(text, block.sheet_index, block.sheet_count, base_metadata)
     
-    def extract_with_openpyxl(self, excel_path: str) -> Dict[str, str]:
-        """Fallback extraction using openpyxl for direct cell access"""
-        if not self.has_excel_libs:
-            return {}
-        
-        try:
-            from openpyxl import load_workbook
-            from openpyxl.cell.cell import MergedCell
-            
-            print(f"🔍 OpenPyXL processing for {Path(excel_path).name}...")
-            self.update_progress(ProcessingStage.EXTRACTING_CONTENT, 0)
-            
-            workbook = load_workbook(filename=excel_path, data_only=True)
-            sheet_texts = {}
-            
-            no_of_sheets = len(workbook.sheetnames)
-            print(f"📑 Found {no_of_sheets} sheets: {workbook.sheetnames}")
-            
-            for idx, sheet_name in enumerate(workbook.sheetnames):
-                self.update_progress(ProcessingStage.EXTRACTING_CONTENT, (idx / no_of_sheets) * 100)
-                
-                try:
-                    sheet = workbook[sheet_name]
-                    text_parts = []
-                    text_parts.append(f"Sheet: {sheet_name}\n")
-                    
-                    for row in sheet.iter_rows():
-                        row_values = []
-                        for cell in row:
-                            if isinstance(cell, MergedCell):
-                                continue
-                            if cell.value is not None:
-                                row_values.append(str(cell.value))
-                        
-                        if row_values:
-                            row_text = " | ".join(row_values)
-                            text_parts.append(row_text)
-                    
-                    sheet_text = "\n".join(text_parts)
-                    if sheet_text.strip():
-                        sheet_texts[sheet_name] = self.clean_text(sheet_text)
-                
-                except Exception as e:
-                    print(f"⚠️  Error reading sheet '{sheet_name}': {e}")
-                    continue
-            
-            workbook.close()
-            print(f"✅ OpenPyXL extracted {len(sheet_texts)} sheets.")
-            return sheet_texts
-            
-        except Exception as e:
-            print(f"❌ OpenPyXL extraction error: {e}")
-            traceback.print_exc()
-            return {}
+    def _block_table_chunk(self, block: RowBlock, doc_id: str, filename: str) -> Dict:
+        content = self.clean_text(
+            f"Table from sheet '{block.sheet}':\nHeaders: {block.header_line}\n" + "\n".join(block.raw_lines)
+        )
+        table_meta = {
+            "doc_id": str(doc_id),
+            "source": str(filename),
+            "sheet": str(block.sheet),
+            "type": "table",
+            "doc_type": "excel",
+            "rows": f"{block.first_row}-{block.last_row}",
+            "columns": str(len(block.headers))
+        }
+        return {"content": content, "metadata": self._clean_metadata(table_meta), "token_count": self.chunker.count_tokens(content)}
     
-    def extract_tables(self, excel_path: str) -> List[Dict]:
-        """Extract structured tables from Excel sheets"""
-        tables = []
-        
-        if not self.has_excel_libs:
-            return tables
-        
-        try:
-            excel_file = pd.ExcelFile(excel_path)
-            no_of_sheets = len(excel_file.sheet_names)
-            
-            for sheet_idx, sheet_name in enumerate(excel_file.sheet_names):
-                progress = (sheet_idx / no_of_sheets) * 100
-                self.update_progress(ProcessingStage.EXTRACTING_TABLES, progress)
-                
-                try:
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                    
-                    if df.empty or len(df) < 2:
-                        continue
-                    
-                    table_text = f"Table from sheet '{sheet_name}':\n"
-                    headers = " | ".join(str(col) for col in df.columns)
-                    table_text += f"Headers: {headers}\n"
-                    
-                    for _, row in df.iterrows():
-                        row_text = " | ".join(str(val) if pd.notna(val) else "" for val in row.values)
-                        if row_text.strip():
-                            table_text += row_text + "\n"
-                    
-                    tables.append({
-                        "content": self.clean_text(table_text),
-                        "sheet": sheet_name,
-                        "type": "table",
-                        "rows": len(df),
-                        "columns": len(df.columns)
-                    })
-                    
-                except Exception as e:
-                    print(f"⚠️  Error extracting table from sheet '{sheet_name}': {e}")
-                    continue
-            
-            print(f"✅ Extracted {len(tables)} tables")
-            
-        except Exception as e:
-            print(f"⚠️  Table extraction error: {e}")
-            traceback.print_exc()
-        
-        return tables
+    def iter_excel_chunks(self, excel_path: str, doc_id: str, filename: str, stats: Dict) -> Iterator[Dict]:
+        """
+        Stream text and table chunks for a workbook as rows are read.
+
+        Rows are read in read-only mode and formatted a block at a time
+        (see excel_stream), so memory stays flat however large the sheet is.
+        Each block yields its text chunks followed by one table chunk.
+        `stats` is filled in with sheet/table/row counts as a side effect.
+        """
+        budget = WorkbookBudget(settings.EXCEL_MAX_WORKBOOK_MEMORY_MB * 1024 * 1024)
+        sheets = set()
+        stats.update({"sheets": 0, "tables": 0, "rows": 0, "truncated": False})
+        self.update_progress(ProcessingStage.EXTRACTING_CONTENT, 0)
+
+        for block in iter_row_blocks(excel_path, budget=budget):
+            if block.sheet not in sheets:
+                sheets.add(block.sheet)
+                print(f"   Sheet '{block.sheet}' ({block.sheet_index + 1}/{block.sheet_count}): {len(block.headers)} columns")
+            stats["sheets"] = len(sheets)
+            stats["rows"] += len(block.lines)
+            self.update_progress(ProcessingStage.EXTRACTING_CONTENT, block.progress * 100)
+
+            yield from self._block_text_chunks(block, doc_id, filename)
+            if len(block.raw_lines) >= 2:
+                stats["tables"] += 1
+                yield self._block_table_chunk(block, doc_id, filename)
+
+        if budget.exhausted:
+            stats["truncated"] = True
+            print(f"⚠️  Workbook exceeded {settings.EXCEL_MAX_WORKBOOK_MEMORY_MB}MB of text, remaining rows skipped")
     
     def process_excel(self, job_id: str, excel_path: str, doc_id: str, filename: str) -> Tuple[List[Dict], Dict]:
         """Main Excel processing pipeline"""
@@ -586,76 +463,29 @@ class ExcelProcessor:
         if not self.has_excel_libs:
             raise Exception("Excel processing libraries not available. Install: pip install pandas openpyxl")
         
-        # Check file extension and provide specific guidance
-        if excel_path.lower().endswith('.xls'):
-            print("📝 Processing old Excel format (.xls) - requires xlrd library")
-        
-        # Extract text from all sheets
-        sheet_texts = self.extract_with_pandas(excel_path)
-        if not sheet_texts:
-            print("⚠️  Pandas extraction failed, attempting OpenPyXL fallback...")
-            # Only try OpenPyXL for .xlsx files
-            if not excel_path.lower().endswith('.xls'):
-                sheet_texts = self.extract_with_openpyxl(excel_path)
-            else:
-                print("⚠️  OpenPyXL doesn't support .xls files. Please install xlrd or convert to .xlsx")
-        
-        if not sheet_texts:
-            file_ext = Path(excel_path).suffix.lower()
-            if file_ext == '.xls':
-                raise Exception(f"Failed to extract data from {file_ext} file. Please install xlrd: pip install xlrd")
-            else:
-                raise Exception("Failed to extract any data from Excel file")
-        
-        tables = self.extract_tables(excel_path)
-        
+        stats = {}
         all_chunks = []
-        no_of_sheets = len(sheet_texts)
-        
-        for sheet_idx, (sheet_name, text) in enumerate(sheet_texts.items()):
-            if not text.strip():
-                continue
-            
-            base_metadata = {
-                "doc_id": str(doc_id),
-                "source": str(filename),
-                "sheet": str(sheet_name),
-                "type": "text",
-                "doc_type": "excel"
-            }
-            
-            chunks = self.create_smart_chunks(text, sheet_idx, no_of_sheets, base_metadata)
-            all_chunks.extend(chunks)
-        
-        for table in tables:
-            table_meta = {
-                "doc_id": str(doc_id),
-                "source": str(filename),
-                "sheet": str(table["sheet"]),
-                "type": "table",
-                "doc_type": "excel",
-                "rows": str(table.get("rows", 0)),
-                "columns": str(table.get("columns", 0))
-            }
-            
-            all_chunks.append({
-                "content": table["content"],
-                "metadata": self._clean_metadata(table_meta),
-                "word_count": len(table["content"].split())
-            })
-        
-        if len(all_chunks) > settings.MAX_CHUNKS_PER_DOCUMENT:
-            print(f"⚠️  Limiting to {settings.MAX_CHUNKS_PER_DOCUMENT} chunks")
-            all_chunks = all_chunks[:settings.MAX_CHUNKS_PER_DOCUMENT]
+        try:
+            for chunk in self.iter_excel_chunks(excel_path, doc_id, filename, stats):
+                all_chunks.append(chunk)
+                if len(all_chunks) >= settings.MAX_CHUNKS_PER_DOCUMENT:
+                    print(f"⚠️  Limiting to {settings.MAX_CHUNKS_PER_DOCUMENT} chunks")
+                    stats["truncated"] = True
+                    break
+        except ImportError as e:
+            if excel_path.lower().endswith('.xls'):
+                raise Exception("Failed to extract data from .xls file. Please install xlrd: pip install xlrd") from e
+            raise
+        except Exception as e:
+            print(f"❌ Excel extraction error: {e}")
+            traceback.print_exc()
+            raise Exception(f"Failed to extract data from Excel file: {e}") from e
         
-        stats = {
-            "total_chunks": len(all_chunks),
-            "sheets": len(sheet_texts),
-            "tables": len(tables),
-            "processing_time": time.time() - start_time
-        }
+        if not all_chunks:
+            raise Exception("Failed to extract any data from Excel file")
         
-        print(f"✅ Created {stats['total_chunks']} chunks from {stats['sheets']} sheets")
+        stats.update({"total_chunks": len(all_chunks), "processing_time": time.time() - start_time})
+        print(f"✅ Created {stats['total_chunks']} chunks from {stats['sheets']} sheets ({stats['rows']} rows)")
         print(f"⏱️  Processing time: {stats['processing_time']:.2f}s\n")
         
         return all_chunks, stats
@@ -673,6 +503,7 @@ class HTMLProcessor:
     def __init__(self, embedding_model, tokenizer):
         self.embedding_model = embedding_model
         self.tokenizer = tokenizer
+        self.chunker = TokenChunker(tokenizer)
         
         if not HAS_HTML_LIBS:
             self.has_html_libs = False
@@ -691,21 +522,15 @@ class HTMLProcessor:
     
     def _clean_metadata(self, metadata: Dict) -> Dict:
         """Clean metadata for ChromaDB compatibility"""
-        cleaned = {}
-        for k, v in metadata.items():
-            str_val = str(v)
-            str_val = re.sub(r'[^\w\s\-\.\,\/]', '_', str_val)
-            str_val = str_val.strip()
-            cleaned[k] = str_val if str_val else "unknown"
-        return cleaned
+        return clean_metadata(metadata)
     
     def update_progress(self, stage: ProcessingStage, progress: float) -> None:
+        if not progress_throttle.should_report(self.job_id, stage, progress):
+            return
         print(f"🌐 Progress: {stage} {progress:.1f}%")
         if not self.job_id:
             return
-        if self.job_id in upload_jobs:
-            upload_jobs[self.job_id].stage = stage
-            upload_jobs[self.job_id].progress = progress
+        get_job_store().update(self.job_id, stage=stage, progress=progress)
     
     def extract_title(self, soup) -> str:
         """Extract page title from HTML"""
@@ -835,47 +660,12 @@ class HTMLProcessor:
         return self.clean_text(text)
     
     def create_smart_chunks(self, text: str, curr_section_idx: int, no_of_sections: int, metadata: Dict) -> List[Dict]:
-        """Create overlapping chunks with metadata"""
-        words = text.split()
-        chunks = []
-        
-        no_of_words = len(words)
-        
-        if len(words) <= settings.CHUNK_SIZE:
-            return [{
-                "content": text,
-                "metadata": self._clean_metadata(metadata),
-                "word_count": len(words)
-            }]
-        
-        chunk_index = 0
-        start = 0
-        
-        while start < len(words):
-            progress_from_previous = curr_section_idx / no_of_sections if no_of_sections > 0 else 0
-            progress_on_current = (start / no_of_words) * (1 / no_of_sections) if no_of_sections > 0 else 0
-            self.update_progress(ProcessingStage.CREATING_CHUNKS, (progress_from_previous + progress_on_current) * 100)
-            
-            end = min(start + settings.CHUNK_SIZE, len(words))
-            chunk_words = words[start:end]
-            chunk_text = ' '.join(chunk_words)
-            
-            chunk_meta = metadata.copy()
-            chunk_meta["chunk_index"] = chunk_index
-            
-            chunks.append({
-                "content": chunk_text,
-                "metadata": self._clean_metadata(chunk_meta),
-                "word_count": len(chunk_words)
-            })
-            
-            chunk_index += 1
-            start = end - settings.CHUNK_OVERLAP
-            
-            if start >= len(words) - settings.CHUNK_OVERLAP:
-                break
-        
-        return chunks
+        """Create overlapping token-window chunks with metadata"""
+        def on_progress(fraction: float) -> None:
+            if no_of_sections > 0:
+                self.update_progress(ProcessingStage.CREATING_CHUNKS, (curr_section_idx + fraction) / no_of_sections * 100)
+
+        return self.chunker.chunk(text, metadata, on_progress)
     
     def parse_html_file(self, html_path: str) -> Tuple:
         """Parse HTML file and return BeautifulSoup object"""
@@ -959,7 +749,7 @@ class HTMLProcessor:
             all_chunks.append({
                 "content": table["content"],
                 "metadata": self._clean_metadata(table_meta),
-                "word_count": len(table["content"].split())
+                "token_count": self.chunker.count_tokens(table["content"])
             })
         
         if len(all_chunks) > settings.MAX_CHUNKS_PER_DOCUMENT:
@@ -992,8 +782,11 @@ class ArchiveProcessor:
     Process archive files (ZIP, RAR, TAR, GZIP, 7Z) by extracting and
     recursively processing contained files.
 
-    Archives are extracted to a temporary directory and their contents are
-    processed by the appropriate file-type processor (PDF, Excel, HTML, etc.).
+    Supported members are streamed out of the archive one at a time into a
+    bounded worker pool and processed by the appropriate file-type processor
+    (PDF, Excel, HTML, etc.); results are merged as members finish.
+    Unsupported and oversized members are skipped from the archive listing,
+    before any bytes are written.
 
     Supports:
     - ZIP archives (.zip)
@@ -1010,8 +803,7 @@ class ArchiveProcessor:
     """
 
     job_id = None
-    _recursion_depth = 0
-    _max_recursion_depth = 3
+    _max_recursion_depth = settings.MAX_ARCHIVE_RECURSION_DEPTH
 
     def __init__(self, embedding_model, tokenizer, pdf_processor=None, excel_processor=None, html_processor=None, archive_processor=None):
         """
@@ -1032,12 +824,16 @@ class ArchiveProcessor:
         from app.modules.askai.services.archive_utils import (
             extract_archive,
             detect_archive_type,
+            get_archive_members,
             is_archive,
+            iter_extract_members,
         )
 
         self.extract_archive = extract_archive
         self.detect_archive_type = detect_archive_type
+        self.get_archive_members = get_archive_members
         self.is_archive = is_archive
+        self.iter_extract_members = iter_extract_members
 
         # Initialize dependent processors (lazy initialization to avoid circular deps)
         self.pdf_processor = pdf_processor
@@ -1070,29 +866,98 @@ class ArchiveProcessor:
             )
 
     def update_progress(self, stage: ProcessingStage, progress: float) -> None:
+        if not progress_throttle.should_report(self.job_id, stage, progress):
+            return
         print(f"📦 Progress: {stage} {progress:.1f}%")
         if not self.job_id:
             return
-        if self.job_id in upload_jobs:
-            upload_jobs[self.job_id].stage = stage
-            upload_jobs[self.job_id].progress = progress
+        get_job_store().update(self.job_id, stage=stage, progress=progress)
 
     def _clean_metadata(self, metadata: Dict) -> Dict:
         """Clean metadata for ChromaDB compatibility"""
-        cleaned = {}
-        for k, v in metadata.items():
-            str_val = str(v)
-            str_val = re.sub(r'[^\w\s\-\.\,\/]', '_', str_val)
-            str_val = str_val.strip()
-            cleaned[k] = str_val if str_val else "unknown"
-        return cleaned
-
-    def process_archive(self, job_id: str, archive_path: str, doc_id: str, filename: str) -> Tuple[List[Dict], Dict]:
+        return clean_metadata(metadata)
+
+    def _member_kind(self, name: str) -> Optional[str]:
+        """Processor kind for an archive member, or None if unsupported"""
+        path = Path(name)
+        file_ext = path.suffix.lower()
+        if file_ext == '.pdf':
+            return 'pdf'
+        if file_ext in ['.xls', '.xlsx']:
+            return 'excel'
+        if file_ext == '.html':
+            return 'html'
+        if self.is_archive(path):
+            return 'archive'
+        return None
+
+    def select_members(self, members: List[Dict]) -> Tuple[List[Dict], List[str]]:
         """
-        Process an archive file by extracting and processing its contents.
+        Choose which archive members to process using listing metadata only.
 
-        The archive is extracted to a temporary directory, and contained files
-        are processed recursively based on their type. Supported formats:
+        Returns (selected members, skip reasons). Directories, unsupported
+        file types and members over their type's size limit are skipped.
+        """
+        size_limits_mb = {
+            'pdf': settings.MAX_PDF_SIZE_MB,
+            'excel': settings.MAX_EXCEL_SIZE_MB,
+            'html': settings.MAX_PDF_SIZE_MB,
+            'archive': settings.MAX_EXTRACTED_SIZE_MB,
+        }
+        selected, skipped = [], []
+        for member in members:
+            if member['is_dir']:
+                continue
+            kind = self._member_kind(member['path'])
+            if kind is None:
+                skipped.append(f"{member['path']}: unsupported file type")
+            elif member['size'] > size_limits_mb[kind] * 1024 * 1024:
+                skipped.append(f"{member['path']}: {member['size'] / (1024 * 1024):.1f}MB exceeds {size_limits_mb[kind]}MB limit")
+            else:
+                selected.append({**member, 'kind': kind})
+        return selected, skipped
+
+    def _process_member(self, job_id: str, file_path: Path, relative_path: str, kind: str,
+                        doc_id: str, filename: str, depth: int) -> List[Dict]:
+        """
+        Process one extracted member and tag its chunks; the member file is
+        removed afterwards. Members already run ARCHIVE_MAX_WORKERS at a time,
+        so a PDF member is parsed and OCRed in its own thread rather than
+        opening process pools of its own.
+        """
+        try:
+            logger.info(f"Processing archive member: {relative_path}")
+            with in_process_parsing():
+                if kind == 'pdf':
+                    chunks, _ = self.pdf_processor.process_pdf(job_id, str(file_path), doc_id, file_path.name)
+                elif kind == 'excel':
+                    chunks, _ = self.excel_processor.process_excel(job_id, str(file_path), doc_id, file_path.name)
+                elif kind == 'html':
+                    chunks, _ = self.html_processor.process_html(job_id, str(file_path), doc_id, file_path.name)
+                else:
+                    # Recursively process nested archives
+                    chunks, _ = self.archive_processor.process_archive(job_id, str(file_path), doc_id, file_path.name, depth=depth + 1)
+
+            # Add archive metadata to chunks
+            for chunk in chunks:
+                chunk['metadata']['archive_filename'] = filename
+                chunk['metadata']['archive_path'] = relative_path
+                chunk['metadata']['extraction_depth'] = depth
+            return chunks
+        finally:
+            try:
+                file_path.unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Failed to clean up {file_path}: {e}")
+
+    def process_archive(self, job_id: str, archive_path: str, doc_id: str, filename: str, depth: int = 1) -> Tuple[List[Dict], Dict]:
+        """
+        Process an archive file by streaming and processing its contents.
+
+        Members are chosen from the archive listing (get_archive_members),
+        then streamed out one at a time and handed to a bounded thread pool
+        (ARCHIVE_MAX_WORKERS). Extraction pauses while the pool is full, so at
+        most a few members are on disk at once. Supported formats:
         - PDFs → PDFProcessor
         - Excel files → ExcelProcessor
         - HTML files → HTMLProcessor
@@ -1106,129 +971,114 @@ class ArchiveProcessor:
             archive_path: Path to the archive file
             doc_id: Document ID for metadata
             filename: Original archive filename
+            depth: Nesting depth of this archive (1 for the uploaded file)
 
         Returns:
             Tuple of (chunks, stats) where chunks are aggregated from all files
 
         Raises:
-            Exception: If archive extraction fails or no files can be processed
+            Exception: If the archive cannot be read or exceeds safety limits
         """
         self.job_id = job_id
-        self._recursion_depth += 1
 
         print(f"\n{'='*60}\n📦 Processing Archive: {filename}\n{'='*60}")
-        print(f"Recursion depth: {self._recursion_depth}/{self._max_recursion_depth}")
+        print(f"Recursion depth: {depth}/{self._max_recursion_depth}")
 
         start_time = time.time()
 
         # Safety check: prevent infinite recursion with nested archives
-        if self._recursion_depth > self._max_recursion_depth:
+        if depth > self._max_recursion_depth:
             logger.warning(f"Archive recursion depth exceeded ({self._max_recursion_depth})")
             return [], {"error": "Max recursion depth exceeded", "processing_time": 0}
 
         try:
-            # Create temporary directory for extraction
-            archive_name = Path(filename).stem
-            temp_extract_dir = Path(f"/tmp/archive_extract_{archive_name}_{uuid4()}")
-            temp_extract_dir.mkdir(parents=True, exist_ok=True)
-
             self.update_progress(ProcessingStage.EXTRACTING_CONTENT, 0)
 
-            # Extract archive
-            logger.info(f"Extracting archive: {filename}")
-            extracted_files = self.extract_archive(
-                archive_path,
-                str(temp_extract_dir),
-                max_files=100,
-                max_size_mb=500
-            )
-
-            if not extracted_files:
-                logger.error(f"No files extracted from archive: {filename}")
-                return [], {"error": "Archive extraction produced no files", "processing_time": 0}
-
-            logger.info(f"Extracted {len(extracted_files)} files from archive")
+            members = self.get_archive_members(archive_path)
+            if members is None:
+                logger.error(f"Could not read archive: {filename}")
+                return [], {"error": "Archive could not be read", "processing_time": 0}
+
+            selected, skipped = self.select_members(members)
+            for reason in skipped:
+                logger.warning(f"Skipped archive member {reason}")
+
+            # Safety checks (prevents extraction bombs)
+            if len(selected) > settings.MAX_FILES_PER_ARCHIVE:
+                raise ValueError(
+                    f"Archive contains {len(selected)} processable files, exceeds limit of {settings.MAX_FILES_PER_ARCHIVE}"
+                )
+            total_size_mb = sum(m['size'] for m in selected) / (1024 * 1024)
+            if total_size_mb > settings.MAX_EXTRACTED_SIZE_MB:
+                raise ValueError(
+                    f"Archive would extract to {total_size_mb:.1f}MB, exceeds limit of {settings.MAX_EXTRACTED_SIZE_MB}MB"
+                )
+
+            if not selected:
+                logger.error(f"No processable files in archive: {filename}")
+                return [], {"error": "Archive contains no processable files", "files_skipped": len(skipped), "processing_time": 0}
+
+            self._get_processors()
+            kinds = {m['path']: m['kind'] for m in selected}
 
-            # Process extracted files
             all_chunks = []
             processed_count = 0
             failed_count = 0
-
-            for file_idx, file_path in enumerate(extracted_files):
-                progress = (file_idx / len(extracted_files)) * 100
-                self.update_progress(ProcessingStage.EXTRACTING_CONTENT, progress)
-
-                try:
-                    file_ext = file_path.suffix.lower()
-
-                    # Get file path relative to archive for metadata
-                    relative_path = file_path.relative_to(temp_extract_dir)
-
-                    logger.info(f"Processing extracted file: {relative_path}")
-
-                    self._get_processors()
-
-                    if file_ext == '.pdf':
-                        chunks, _ = self.pdf_processor.process_pdf(
-                            job_id, str(file_path), doc_id, file_path.name
-                        )
-                    elif file_ext in ['.xls', '.xlsx']:
-                        chunks, _ = self.excel_processor.process_excel(
-                            job_id, str(file_path), doc_id, file_path.name
-                        )
-                    elif file_ext == '.html':
-                        chunks, _ = self.html_processor.process_html(
-                            job_id, str(file_path), doc_id, file_path.name
-                        )
-                    elif self.is_archive(file_path):
-                        # Recursively process nested archives
-                        chunks, _ = self.archive_processor.process_archive(
-                            job_id, str(file_path), doc_id, file_path.name
-                        )
-                    else:
-                        logger.warning(f"Skipped unsupported file type: {file_path.name}")
+            max_workers = max(1, settings.ARCHIVE_MAX_WORKERS)
+            in_flight = {}
+
+            def collect(done_futures):
+                nonlocal processed_count, failed_count
+                for future in done_futures:
+                    relative_path = in_flight.pop(future)
+                    try:
+                        all_chunks.extend(future.result())
+                        processed_count += 1
+                    except Exception as e:
+                        # Continue with other members - don't fail entire archive
+                        logger.error(f"Failed to process {relative_path} from archive: {e}")
                         failed_count += 1
-                        continue
-
-                    # Add archive metadata to chunks
-                    for chunk in chunks:
-                        chunk['metadata']['archive_filename'] = filename
-                        chunk['metadata']['archive_path'] = str(relative_path)
-                        chunk['metadata']['extraction_depth'] = self._recursion_depth
-
-                    all_chunks.extend(chunks)
-                    processed_count += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to process {file_path.name} from archive: {e}")
-                    failed_count += 1
-                    # Continue with next file - don't fail entire archive
-
-            # Cleanup extracted files
-            try:
-                shutil.rmtree(temp_extract_dir, ignore_errors=True)
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp directory: {e}")
+                    finished = processed_count + failed_count
+                    self.update_progress(ProcessingStage.EXTRACTING_CONTENT, finished / len(selected) * 100)
+
+            with tempfile.TemporaryDirectory(prefix="archive_stream_") as temp_extract_dir, \
+                    ThreadPoolExecutor(max_workers=max_workers) as executor:
+                extract_root = Path(temp_extract_dir).resolve()
+                extracted = self.iter_extract_members(archive_path, temp_extract_dir, [m['path'] for m in selected])
+                for file_path in extracted:
+                    # Backpressure: don't pull the next member off the archive until a worker is free
+                    if len(in_flight) >= max_workers:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+
+                    relative_path = file_path.resolve().relative_to(extract_root).as_posix()
+                    future = executor.submit(
+                        self._process_member, job_id, file_path, relative_path,
+                        kinds.get(relative_path) or self._member_kind(relative_path),
+                        doc_id, filename, depth,
+                    )
+                    in_flight[future] = relative_path
+
+                collect(as_completed(list(in_flight)))
 
             stats = {
                 "total_chunks": len(all_chunks),
                 "files_processed": processed_count,
                 "files_failed": failed_count,
+                "files_skipped": len(skipped),
                 "archive_filename": filename,
-                "recursion_depth": self._recursion_depth,
+                "recursion_depth": depth,
                 "processing_time": time.time() - start_time
             }
 
-            print(f"✅ Processed {processed_count}/{len(extracted_files)} files from archive")
+            print(f"✅ Processed {processed_count}/{len(selected)} files from archive ({len(skipped)} skipped)")
             print(f"⏱️  Processing time: {stats['processing_time']:.2f}s\n")
 
-            self._recursion_depth -= 1
             return all_chunks, stats
 
         except Exception as e:
             logger.error(f"Failed to process archive {filename}: {e}")
             traceback.print_exc()
-            self._recursion_depth -= 1
             raise
 
 
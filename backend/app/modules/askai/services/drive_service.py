@@ -19,7 +19,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.core.global_stores import upload_jobs
+from app.core.job_store import get_job_store
 from app.modules.askai.models.document import ProcessingJob, ProcessingStage, ProcessingStatus, UploadJob, DriveFile, DriveFolder
 from app.modules.askai.db.repository import ChatRepository
 from app.modules.askai.services.document_processing_service import process_uploaded_pdf
@@ -154,7 +154,8 @@ def download_files_from_drive(drive_url: str, conversation_id: str):
             print(f"⬇️ Downloading {file_name} ({file_id})")
 
             job_id = str(uuid.uuid4())
-            upload_jobs[job_id] = UploadJob(
+            job_store = get_job_store()
+            job_store.create(UploadJob(
                 job_id=job_id,
                 filename=file_name,
                 chat_id=conversation_id,
@@ -164,8 +165,7 @@ def download_files_from_drive(drive_url: str, conversation_id: str):
                 finished_at="",
                 chunks_added=0,
                 error=None
-            )
-            new_upload_job = upload_jobs[job_id]
+            ))
 
             request = service.files().get_media(fileId=file_id)
             
@@ -175,13 +175,13 @@ def download_files_from_drive(drive_url: str, conversation_id: str):
                 while not done:
                     status, done = downloader.next_chunk()
                     print(f"Download {int(status.progress() * 100)}%.")
-                    new_upload_job.progress = int(status.progress() * 100)
+                    job_store.update(job_id, progress=int(status.progress() * 100))
 
                 temp_path = tmp_file.name
 
             print(f"📂 File saved to temporary path: {temp_path}")
             
-            new_upload_job.status = ProcessingStatus.QUEUED
+            job_store.update(job_id, status=ProcessingStatus.QUEUED)
             process_uploaded_pdf(temp_path, conversation_id, file_name, job_id)
 
     except HttpError as error:
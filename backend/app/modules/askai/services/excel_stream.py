@@ -0,0 +1,257 @@
+"""
+Read-only, streaming Excel extraction.
+
+Workbooks are read row by row instead of materialising whole sheets:
+.xlsx files through openpyxl's read-only mode (an iterparse over the sheet
+XML), legacy .xls files through xlrd with sheets loaded on demand. Rows are
+grouped into blocks of EXCEL_ROWS_PER_BLOCK and each block is formatted to
+text with column-wise pandas string operations, so a block can be chunked
+and embedded before the next one is read.
+
+Forward-fill (BOQ workbooks leave repeated item/section cells blank) is
+carried across blocks per column. Extracted text is budgeted per workbook by
+EXCEL_MAX_WORKBOOK_MEMORY_MB; rows past the budget are not read.
+
+Usage:
+    from app.modules.askai.services.excel_stream import iter_row_blocks
+
+    for block in iter_row_blocks("boq.xlsx"):
+        print(block.sheet, block.first_row, block.last_row, len(block.lines))
+"""
+
+import logging
+from dataclasses import dataclass, field
+from functools import reduce
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pandas as pd
+    from openpyxl import load_workbook
+    HAS_EXCEL_LIBS = True
+except ImportError:
+    HAS_EXCEL_LIBS = False
+
+ROW_SEPARATOR = " | "
+
+
+@dataclass
+class RowBlock:
+    """A run of consecutive rows from one sheet, formatted to text"""
+    sheet: str
+    sheet_index: int  # 0-based
+    sheet_count: int
+    headers: List[str]
+    first_row: int  # 1-based worksheet row numbers
+    last_row: int
+    lines: List[str] = field(default_factory=list)  # Forward-filled rows (text chunks)
+    raw_lines: List[str] = field(default_factory=list)  # Rows as stored (table chunks)
+    progress: float = 0.0  # Fraction of the workbook read so far
+
+    @property
+    def header_line(self) -> str:
+        return ROW_SEPARATOR.join(self.headers)
+
+
+@dataclass
+class WorkbookBudget:
+    """Tracks extracted text against the per-workbook memory ceiling"""
+    limit_bytes: int
+    used_bytes: int = 0
+    exhausted: bool = False
+
+    def consume(self, block: RowBlock) -> bool:
+        """Account for a block; returns False once the ceiling is reached"""
+        self.used_bytes += sum(map(len, block.lines)) + sum(map(len, block.raw_lines))
+        if self.used_bytes >= self.limit_bytes:
+            self.exhausted = True
+        return not self.exhausted
+
+
+# ============================================================================
+# READERS
+# ============================================================================
+
+SheetRows = Tuple[str, int, Optional[int], Iterator[tuple]]
+
+
+def _iter_xlsx_sheets(excel_path: str) -> Iterator[SheetRows]:
+    """Yield (sheet name, sheet count, row count hint, row iterator) using openpyxl's read-only mode"""
+    workbook = load_workbook(filename=excel_path, read_only=True, data_only=True)
+    try:
+        worksheets = workbook.worksheets  # Skips chartsheets
+        for worksheet in worksheets:
+            yield worksheet.title, len(worksheets), worksheet.max_row, worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_xls_sheets(excel_path: str) -> Iterator[SheetRows]:
+    """Yield (sheet name, sheet count, row count, row iterator) using xlrd with on-demand sheet loading"""
+    import xlrd
+
+    book = xlrd.open_workbook(excel_path, on_demand=True)
+
+    def convert(cell):
+        if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+            return None
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            try:
+                return xlrd.xldate_as_datetime(cell.value, book.datemode)
+            except Exception:
+                return cell.value
+        if cell.ctype == xlrd.XL_CELL_NUMBER and float(cell.value).is_integer():
+            return int(cell.value)
+        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+            return bool(cell.value)
+        return cell.value
+
+    try:
+        for sheet_idx in range(book.nsheets):
+            sheet = book.sheet_by_index(sheet_idx)
+            rows = (tuple(convert(cell) for cell in row) for row in sheet.get_rows())
+            yield sheet.name, book.nsheets, sheet.nrows, rows
+            book.unload_sheet(sheet_idx)
+    finally:
+        book.release_resources()
+
+
+# ============================================================================
+# FORMATTING
+# ============================================================================
+
+def _to_cells(rows: Sequence[tuple]) -> "pd.DataFrame":
+    """Ragged row tuples -> string frame with blank/whitespace cells as NA"""
+    frame = pd.DataFrame(list(rows), dtype=object).astype("string")
+    return frame.apply(lambda column: column.str.strip().replace("", pd.NA))
+
+
+def _join_columns(cells: "pd.DataFrame", keep_empty: bool = False) -> "pd.Series":
+    """Join each row's cells with ROW_SEPARATOR, column-wise (no per-row Python loop)"""
+    if cells.shape[1] == 0:
+        return pd.Series([""] * len(cells), index=cells.index, dtype="string")
+    if keep_empty:
+        columns = [cells[c].fillna("") for c in cells.columns]
+        return reduce(lambda left, right: left + ROW_SEPARATOR + right, columns)
+    parts = [(cells[c] + ROW_SEPARATOR).fillna("") for c in cells.columns]
+    return reduce(lambda left, right: left + right, parts).str.removesuffix(ROW_SEPARATOR)
+
+
+def format_rows(rows: Sequence[tuple], carry: Optional["pd.Series"] = None) -> Tuple[List[str], List[str], "pd.Series"]:
+    """
+    Format a block of raw rows.
+
+    Fully blank rows are dropped. Blank cells are forward-filled from the
+    last value seen in the same column (`carry` holds that state between
+    blocks of a sheet), then back-filled within the block for columns that
+    have not had a value yet. Returns (filled lines, raw lines, new carry).
+    """
+    cells = _to_cells(rows)
+    cells = cells[cells.notna().any(axis=1)]
+    if cells.empty:
+        return [], [], carry if carry is not None else pd.Series(dtype="string")
+
+    raw_lines = _join_columns(cells, keep_empty=True).tolist()
+    if carry is not None and len(carry):
+        cells = pd.concat([carry.to_frame().T, cells], ignore_index=True).ffill().iloc[1:]
+    else:
+        cells = cells.ffill()
+    cells = cells.bfill()
+    lines = _join_columns(cells).tolist()
+    return lines, raw_lines, cells.iloc[-1]
+
+
+def _header_names(row: tuple) -> List[str]:
+    """Header cells as text; blank headers are named like pandas does ('Unnamed: n')"""
+    names = []
+    for idx, value in enumerate(row):
+        text = "" if value is None else str(value).strip()
+        names.append(text or f"Unnamed: {idx}")
+    while names and names[-1].startswith("Unnamed: "):
+        names.pop()
+    return names
+
+
+# ============================================================================
+# STREAM
+# ============================================================================
+
+def iter_row_blocks(
+    excel_path: str,
+    rows_per_block: Optional[int] = None,
+    budget: Optional[WorkbookBudget] = None,
+) -> Iterator[RowBlock]:
+    """
+    Yield formatted RowBlocks for every worksheet of a workbook.
+
+    The first non-blank row of each sheet is taken as its header row. Reading
+    stops early (mid-sheet if needed) once `budget` is exhausted.
+
+    Args:
+        excel_path: Path to a .xlsx/.xlsm or .xls file
+        rows_per_block: Rows formatted together (defaults to EXCEL_ROWS_PER_BLOCK)
+        budget: Memory ceiling tracker (defaults to EXCEL_MAX_WORKBOOK_MEMORY_MB)
+
+    Raises:
+        ImportError: if the reader for the file format is not installed
+    """
+    if not HAS_EXCEL_LIBS:
+        raise ImportError("Excel processing libraries not available. Install: pip install pandas openpyxl")
+
+    rows_per_block = rows_per_block or settings.EXCEL_ROWS_PER_BLOCK
+    if budget is None:
+        budget = WorkbookBudget(settings.EXCEL_MAX_WORKBOOK_MEMORY_MB * 1024 * 1024)
+    reader = _iter_xls_sheets if excel_path.lower().endswith('.xls') else _iter_xlsx_sheets
+    sheets = reader(excel_path)
+    try:
+        yield from _iter_sheet_blocks(excel_path, sheets, rows_per_block, budget)
+    finally:
+        sheets.close()  # Releases the workbook even when the caller stops early
+
+
+def _iter_sheet_blocks(excel_path: str, sheets: Iterator[SheetRows], rows_per_block: int, budget: WorkbookBudget) -> Iterator[RowBlock]:
+    for sheet_idx, (sheet, sheet_count, row_hint, rows) in enumerate(sheets):
+        headers: Optional[List[str]] = None
+        carry = None
+        pending: List[tuple] = []
+        first_row = row_num = 0
+
+        def flush() -> Optional[RowBlock]:
+            nonlocal carry
+            lines, raw_lines, carry = format_rows(pending, carry)
+            if not lines:
+                return None
+            read_fraction = min(row_num / row_hint, 1.0) if row_hint else 0.0
+            return RowBlock(
+                sheet=sheet, sheet_index=sheet_idx, sheet_count=sheet_count, headers=headers or [],
+                first_row=first_row, last_row=row_num, lines=lines, raw_lines=raw_lines,
+                progress=(sheet_idx + read_fraction) / sheet_count,
+            )
+
+        for row_num, row in enumerate(rows, start=1):
+            if headers is None:
+                if any(value is not None and str(value).strip() for value in row):
+                    headers = _header_names(row)
+                continue
+            if not pending:
+                first_row = row_num
+            pending.append(row)
+            if len(pending) >= rows_per_block:
+                block = flush()
+                pending = []
+                if block:
+                    yield block
+                    if not budget.consume(block):
+                        logger.warning(f"{Path(excel_path).name}: workbook text budget reached at '{sheet}' row {row_num}")
+                        return
+
+        if pending:
+            block = flush()
+            if block:
+                yield block
+                if not budget.consume(block):
+                    return
@@ -9,20 +9,32 @@ the manual implementation, using LangChain's declarative chains (LCEL).
 
 from uuid import UUID
 from typing import Dict, List, Any
-from uuid import UUID
 from sqlalchemy.orm import Session
 from operator import itemgetter
 
 from app.config import settings
-from app.core.langchain_config import get_langchain_llm, get_langchain_embeddings, RAG_PROMPT
+from app.core.langchain_config import get_langchain_embeddings
 from app.db.vector_store import VectorStoreManager
 from app.modules.askai.db.repository import ChatRepository
+from app.modules.askai.services.answer_cache import get_answer_cache
 from app.modules.askai.services.langchain_memory import SQLAlchemyChatMessageHistory
 from app.modules.askai.services.langchain_retriever import create_weaviate_retriever
+from app.modules.askai.services.rag_cache import document_set_key, get_rag_cache
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import ConfigurableFieldSpec
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_core.prompts import MessagesPlaceholder, ChatPromptTemplate
+
+
+def _session_history(session_id: str, db: Session) -> SQLAlchemyChatMessageHistory:
+    """History factory for cached chains: the DB session comes from the invocation config"""
+    return SQLAlchemyChatMessageHistory(db=db, chat_id=UUID(session_id))
+
+
+HISTORY_FACTORY_CONFIG = [
+    ConfigurableFieldSpec(id="session_id", annotation=str, name="Session ID", default="", is_shared=True),
+    ConfigurableFieldSpec(id="db", annotation=Session, name="Database session", default=None, is_shared=True),
+]
 
 
 class LangChainRAGService:
@@ -51,6 +63,10 @@ class LangChainRAGService:
         ↓
     Return Response + Sources
     ```
+
+    The service itself is request-scoped (it holds the request's DB session);
+    the LLM, prompt, retrievers and chains come from the process-wide
+    RAGComponentCache and are shared across requests.
     """
 
     def __init__(self, vector_store: VectorStoreManager, db: Session):
@@ -65,20 +81,13 @@ class LangChainRAGService:
         self.db = db
         self.chat_repo = ChatRepository(db)
 
-        # Lazily initialize LLM and embeddings
-        self._llm = None
+        self.cache = get_rag_cache()
         self._embeddings = None
 
-        # Cache chains per chat session
-        self._chains = {}
-        self._retrievers = {}
-
     @property
     def llm(self):
-        """Lazy-load LLM."""
-        if self._llm is None:
-            self._llm = get_langchain_llm()
-        return self._llm
+        """Shared LLM client."""
+        return self.cache.llm()
 
     @property
     def embeddings(self):
@@ -98,18 +107,30 @@ class LangChainRAGService:
 
             print(f"✅ Processing message for chat {chat_id}")
 
-            chain_with_history = self._get_or_create_chain(chat_id)
-
-            # Invoke the chain. History is managed automatically.
+            # Only a chat's opening question: later answers depend on the chat history
+            answer_cache = get_answer_cache() if chat.documents and not chat.messages else None
+            cached = answer_cache.lookup(chat.documents, user_message) if answer_cache else None
+            if cached is not None:
+                print(f"⚡ Answer cache hit (similarity {cached.similarity:.3f})")
+                # The chain would have recorded the exchange; do it here instead
+                history = _session_history(str(chat_id), self.db)
+                history.add_messages([HumanMessage(content=user_message), AIMessage(content=cached.answer)])
+                return {"response": cached.answer, "sources": cached.sources}
+
+            doc_key = document_set_key(chat.documents)
+            chain_with_history = self._get_or_create_chain(chat_id, doc_key)
+
+            # Invoke the chain. History is managed automatically, through
+            # this request's DB session.
             response = chain_with_history.invoke(
                 {"question": user_message},
-                config={"configurable": {"session_id": str(chat_id)}}
+                config={"configurable": {"session_id": str(chat_id), "db": self.db}}
             )
-            response_text = response.content
+            response_text = response if isinstance(response, str) else response.content
             print(f"✅ Generated response: {response_text[:100]}...")
 
             # Retrieve sources separately for the response payload
-            retriever = self._get_or_create_retriever(chat_id)
+            retriever = self._get_or_create_retriever(chat_id, doc_key)
             retrieved_docs = retriever.invoke(user_message)
             sources = [
                 {
@@ -121,6 +142,9 @@ class LangChainRAGService:
             ]
             print(f"📚 Retrieved {len(sources)} source documents")
 
+            if answer_cache:
+                answer_cache.store(chat.documents, user_message, response_text, sources, chat_id=chat_id)
+
             return {
                 "response": response_text,
                 "sources": sources,
@@ -129,57 +153,51 @@ class LangChainRAGService:
             print(f"❌ Error in RAG pipeline: {e}")
             raise
 
-    def _get_or_create_retriever(self, chat_id: UUID):
+    def _get_or_create_retriever(self, chat_id: UUID, doc_key: str = ""):
         """
         Get or create retriever for a chat.
 
         Args:
             chat_id: Chat session ID
+            doc_key: Hash of the chat's document set (see document_set_key)
 
         Returns:
             WeaviateRetriever instance
         """
-        if chat_id not in self._retrievers:
+        def build():
             print(f"🔍 Creating retriever for chat {chat_id}")
-            self._retrievers[chat_id] = create_weaviate_retriever(
+            return create_weaviate_retriever(
                 vector_store=self.vector_store,
                 chat_id=chat_id,
-                top_k=settings.RAG_TOP_K,
             )
-        return self._retrievers[chat_id]
 
-    def _get_or_create_chain(self, chat_id: UUID) -> RunnableWithMessageHistory:
+        return self.cache.retriever(chat_id, doc_key, self.vector_store, build)
+
+    def _get_or_create_chain(self, chat_id: UUID, doc_key: str = "") -> RunnableWithMessageHistory:
         """
         Get or create a history-aware RAG chain for a chat session.
+
+        The chain is cached process-wide, so it must not capture this
+        request's DB session; the history factory receives it from the
+        invocation config instead.
         """
-        if chat_id not in self._chains:
+        def build():
             print(f"🔗 Building RAG chain with history for chat {chat_id}")
-            
-            base_chain = self._build_base_chain(chat_id)
-            
-            chain_with_history = RunnableWithMessageHistory(
-                runnable=base_chain,
-                get_session_history=lambda session_id: SQLAlchemyChatMessageHistory(
-                    db=self.db,
-                    chat_id=UUID(session_id)
-                ),
+            return RunnableWithMessageHistory(
+                runnable=self._build_base_chain(chat_id, doc_key),
+                get_session_history=_session_history,
                 input_messages_key="question",
                 history_messages_key="chat_history",
+                history_factory_config=HISTORY_FACTORY_CONFIG,
             )
-            self._chains[chat_id] = chain_with_history
-            
-        return self._chains[chat_id]
 
-    def _build_base_chain(self, chat_id: UUID):
+        return self.cache.chain(chat_id, doc_key, self.vector_store, build)
+
+    def _build_base_chain(self, chat_id: UUID, doc_key: str = ""):
         """
         Builds the core RAG chain that expects history.
         """
-        retriever = self._get_or_create_retriever(chat_id)
-
-        # Dynamically insert a placeholder for chat history into the RAG_PROMPT
-        prompt_messages = list(RAG_PROMPT.messages)
-        prompt_messages.insert(1, MessagesPlaceholder(variable_name="chat_history"))
-        prompt_with_history = ChatPromptTemplate.from_messages(prompt_messages)
+        retriever = self._get_or_create_retriever(chat_id, doc_key)
 
         # This part of the chain is responsible for generating the context
         context_chain = itemgetter("question") | retriever | self._format_docs
@@ -191,13 +209,14 @@ class LangChainRAGService:
                 "question": itemgetter("question"),
                 "chat_history": itemgetter("chat_history"),
             }
-            | prompt_with_history
+            | self.cache.prompt()
             | self.llm
             | StrOutputParser()
         )
         return conversational_rag_chain
 
-    def _format_docs(self, docs: List) -> str:
+    @staticmethod
+    def _format_docs(docs: List) -> str:
         """
         Format retrieved documents for prompt context.
 
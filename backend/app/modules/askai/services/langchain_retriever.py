@@ -7,7 +7,7 @@ This module provides a WeaviateRetriever that wraps the existing
 Weaviate vector store and exposes it through LangChain's retriever interface.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 from pydantic import ConfigDict
@@ -16,6 +16,7 @@ from langchain_core.documents import Document
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 
 from app.db.vector_store import VectorStoreManager
+from app.modules.askai.services.retrieval import retrieve
 from app.config import settings
 
 
@@ -28,16 +29,19 @@ class WeaviateRetriever(BaseRetriever):
     - Converts results to LangChain Document objects
     - Preserves metadata from Weaviate
     - Supports configurable top-k results
+    - Searches, reranks and packs through the retrieval pipeline
+      (RAG_RETRIEVAL_MODE, RAG_RERANK_ENABLED, RAG_CONTEXT_TOKEN_BUDGET)
 
     Args:
         vector_store: VectorStoreManager instance
         collection: Weaviate collection object
-        top_k: Number of top results to retrieve (default: RAG_TOP_K from config)
+        top_k: Number of top results to retrieve (default: RAG_RERANK_TOP_K
+            when reranking, else RAG_TOP_K)
     """
 
     vector_store: VectorStoreManager
     collection: Any  # Weaviate collection type
-    top_k: int = settings.RAG_TOP_K
+    top_k: Optional[int] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -64,12 +68,7 @@ class WeaviateRetriever(BaseRetriever):
             return []
 
         try:
-            # Query Weaviate using existing method
-            results = self.vector_store.query(
-                self.collection,
-                query,
-                n_results=self.top_k
-            )
+            results = retrieve(self.vector_store, self.collection, query, top_k=self.top_k)
 
             if not results:
                 print(f"📭 No documents found for query: {query}")
@@ -143,15 +142,17 @@ class WeaviateRetriever(BaseRetriever):
             "type": "vector_store",
             "vector_store": "Weaviate",
             "collection": self.collection.name if hasattr(self.collection, "name") else "unknown",
-            "top_k": self.top_k,
-            "model": "all-MiniLM-L6-v2",
+            "top_k": self.top_k or (settings.RAG_RERANK_TOP_K if settings.RAG_RERANK_ENABLED else settings.RAG_TOP_K),
+            "retrieval_mode": settings.RAG_RETRIEVAL_MODE,
+            "rerank": settings.RAG_RERANK_ENABLED,
+            "model": settings.EMBEDDING_MODEL_NAME,
         }
 
 
 def create_weaviate_retriever(
     vector_store: VectorStoreManager,
     chat_id: UUID,
-    top_k: int = settings.RAG_TOP_K,
+    top_k: Optional[int] = None,
 ) -> WeaviateRetriever:
     """
     Factory function to create a WeaviateRetriever for a chat.
@@ -159,7 +160,7 @@ def create_weaviate_retriever(
     Args:
         vector_store: VectorStoreManager instance
         chat_id: UUID of the chat session
-        top_k: Number of top results (default: RAG_TOP_K)
+        top_k: Number of top results (default: the retrieval pipeline's)
 
     Returns:
         Configured WeaviateRetriever instance
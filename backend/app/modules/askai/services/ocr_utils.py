@@ -0,0 +1,285 @@
+"""
+Page-level OCR utilities for PDF processing.
+
+Tender PDFs are usually mostly text with a few scanned annexures. Instead of
+OCRing a whole document only when every other extractor fails, pages are
+routed individually: pages whose text layer is empty or garbage are sent to
+Tesseract, and those pages are OCRed in parallel across CPU cores.
+
+Features:
+- Garbage text-layer detection (needs_ocr)
+- Adaptive DPI based on page size (choose_ocr_dpi)
+- Process pool with a per-page Tesseract timeout
+- On-disk cache of OCR results keyed by the rendered page image hash,
+  pruned by age and total size (prune_ocr_cache)
+
+Usage:
+    from app.modules.askai.services.ocr_utils import needs_ocr, ocr_pages
+
+    pages_to_ocr = [p for p, text in page_texts.items() if needs_ocr(text)]
+    ocr_texts = ocr_pages("file.pdf", pages_to_ocr)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.modules.askai.services.pdf_pipeline import worker_limit
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+    import pytesseract
+    from PIL import Image
+    HAS_OCR_LIBS = True
+except ImportError:
+    HAS_OCR_LIBS = False
+
+# Characters that legitimately appear in tender text. A page whose text layer
+# is mostly outside this set is a broken font mapping, not real text.
+_READABLE_CHARS = re.compile(r"[\w\s\.\,\;\:\!\?\-\(\)\[\]\"\'\/\@\#\$\%\&\*\+\=₹]")
+_CID_GLYPHS = re.compile(r"\(cid:\d+\)")
+
+# Pages are rasterised so that the longer side lands near this many pixels.
+# A4 at 200 DPI is ~2340px; large drawings are scaled down, small pages up.
+_TARGET_LONG_SIDE_PX = 2400
+
+
+# ============================================================================
+# PAGE ROUTING
+# ============================================================================
+
+def needs_ocr(text: Optional[str]) -> bool:
+    """
+    Decide whether a page's extracted text layer is unusable.
+
+    A page needs OCR when it has (almost) no text, or when most of its
+    characters are not readable text (e.g. `(cid:123)` glyph runs or
+    mojibake from fonts without a Unicode map).
+
+    Args:
+        text: Text extracted from the page's text layer
+
+    Returns:
+        True if the page should be OCRed
+    """
+    if not text:
+        return True
+
+    stripped = _CID_GLYPHS.sub("", text).strip()
+    if len(stripped) < settings.OCR_MIN_TEXT_CHARS:
+        return True
+
+    readable = len(_READABLE_CHARS.findall(stripped))
+    return readable / len(stripped) < settings.OCR_MIN_READABLE_RATIO
+
+
+def choose_ocr_dpi(width_pt: float, height_pt: float) -> int:
+    """
+    Pick a rasterisation DPI for a page from its size in PDF points.
+
+    Small pages are rendered at a higher DPI so Tesseract sees enough pixels
+    per glyph; very large pages (A1/A0 drawings) are rendered lower to keep
+    memory and OCR time bounded.
+
+    Args:
+        width_pt: Page width in points (1/72 inch)
+        height_pt: Page height in points
+
+    Returns:
+        DPI clamped to [OCR_MIN_DPI, OCR_MAX_DPI]
+    """
+    long_side_inches = max(width_pt, height_pt, 1) / 72
+    dpi = int(_TARGET_LONG_SIDE_PX / long_side_inches)
+    return max(settings.OCR_MIN_DPI, min(settings.OCR_MAX_DPI, dpi))
+
+
+# ============================================================================
+# OCR CACHE
+# ============================================================================
+
+def _cache_path(image_hash: str) -> Path:
+    return Path(settings.OCR_CACHE_DIR) / image_hash[:2] / f"{image_hash}.txt"
+
+
+def _read_cache(image_hash: str) -> Optional[str]:
+    path = _cache_path(image_hash)
+    try:
+        text = path.read_text(encoding="utf-8")
+        # A hit counts as a use: eviction goes by modification time
+        os.utime(path)
+        return text
+    except OSError:
+        return None
+
+
+def _write_cache(image_hash: str, text: str) -> None:
+    path = _cache_path(image_hash)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"Failed to write OCR cache entry {image_hash}: {e}")
+
+
+_last_prune = 0.0
+
+
+def prune_ocr_cache(max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None) -> int:
+    """
+    Evict OCR cache entries unused for longer than max_age_seconds, then the
+    least recently used ones until the cache fits in max_bytes. Defaults come
+    from OCR_CACHE_MAX_AGE_DAYS / OCR_CACHE_MAX_MB (0 disables either limit).
+
+    Returns:
+        Number of entries removed
+    """
+    if max_bytes is None:
+        max_bytes = settings.OCR_CACHE_MAX_MB * 1024 * 1024
+    if max_age_seconds is None:
+        max_age_seconds = settings.OCR_CACHE_MAX_AGE_DAYS * 86400
+
+    entries = []
+    for path in Path(settings.OCR_CACHE_DIR).glob("*/*.txt"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - max_age_seconds if max_age_seconds else None
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        expired = cutoff is not None and mtime < cutoff
+        if not expired and (not max_bytes or total <= max_bytes):
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Pruned {removed} OCR cache entries")
+    return removed
+
+
+def _maybe_prune_cache() -> None:
+    """Prune at most once per OCR_CACHE_PRUNE_INTERVAL_SECONDS in this process"""
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune and now - _last_prune < settings.OCR_CACHE_PRUNE_INTERVAL_SECONDS:
+        return
+    _last_prune = now
+    try:
+        prune_ocr_cache()
+    except OSError as e:
+        logger.warning(f"Failed to prune the OCR cache: {e}")
+
+
+# ============================================================================
+# OCR WORKERS
+# ============================================================================
+
+def _ocr_page(pdf_path: str, page_num: int, timeout: int) -> Tuple[int, str]:
+    """
+    OCR a single page (1-based). Runs inside a worker process, so it opens
+    its own document handle; PyMuPDF documents cannot be shared across processes.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc[page_num - 1]
+        dpi = choose_ocr_dpi(page.rect.width, page.rect.height)
+        pix = page.get_pixmap(dpi=dpi)
+        image_hash = hashlib.sha256(pix.samples).hexdigest()
+
+        cached = _read_cache(image_hash)
+        if cached is not None:
+            return page_num, cached
+
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        try:
+            text = pytesseract.image_to_string(img, timeout=timeout)
+        except RuntimeError:
+            # pytesseract raises RuntimeError when the timeout kills tesseract
+            logger.warning(f"Tesseract timed out after {timeout}s on page {page_num} of {Path(pdf_path).name}")
+            return page_num, ""
+
+        _write_cache(image_hash, text)
+        return page_num, text
+    finally:
+        doc.close()
+
+
+def ocr_pages(
+    pdf_path: str,
+    page_numbers: Iterable[int],
+    max_workers: Optional[int] = None,
+    timeout: Optional[int] = None,
+    on_page_done: Optional[Callable[[int, int], None]] = None,
+) -> Dict[int, str]:
+    """
+    OCR the given pages of a PDF in parallel.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based page numbers to OCR
+        max_workers: Worker processes (defaults to OCR_MAX_WORKERS; 1 inside
+            pdf_pipeline.in_process_parsing())
+        timeout: Per-page Tesseract timeout in seconds (defaults to OCR_PAGE_TIMEOUT_SECONDS)
+        on_page_done: Optional callback(done_count, total_count) for progress reporting
+
+    Returns:
+        Dict mapping page number to raw OCR text (pages that failed are omitted)
+    """
+    if not HAS_OCR_LIBS:
+        logger.warning("Tesseract OCR not available - PDF libraries not installed")
+        return {}
+
+    pages = sorted(set(page_numbers))
+    if not pages:
+        return {}
+
+    timeout = timeout or settings.OCR_PAGE_TIMEOUT_SECONDS
+    max_workers = max(1, min(worker_limit(max_workers or settings.OCR_MAX_WORKERS), len(pages)))
+
+    _maybe_prune_cache()
+    results: Dict[int, str] = {}
+
+    # A single page is not worth the cost of spawning a pool
+    if max_workers == 1:
+        for done, page_num in enumerate(pages, start=1):
+            try:
+                _, text = _ocr_page(pdf_path, page_num, timeout)
+                results[page_num] = text
+            except Exception as e:
+                logger.error(f"OCR failed on page {page_num} of {Path(pdf_path).name}: {e}")
+            if on_page_done:
+                on_page_done(done, len(pages))
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_ocr_page, pdf_path, page_num, timeout): page_num for page_num in pages}
+        for done, future in enumerate(as_completed(futures), start=1):
+            page_num = futures[future]
+            try:
+                _, text = future.result()
+                results[page_num] = text
+            except Exception as e:
+                logger.error(f"OCR failed on page {page_num} of {Path(pdf_path).name}: {e}")
+            if on_page_done:
+                on_page_done(done, len(pages))
+
+    return results
@@ -0,0 +1,209 @@
+"""
+Single-pass, page-parallel PDF extraction.
+
+Each page is read once: PyMuPDF extracts the text layer and a cheap scan of
+the page's vector drawings decides whether it can contain a ruled table.
+Only those candidate pages are handed to pdfplumber's (expensive)
+`extract_tables()`. Page ranges are fanned out to a process pool and pages
+are yielded back in page order as the ranges finish, so callers can chunk
+incrementally.
+
+Callers that already process several documents at once (archive members)
+wrap each document in `in_process_parsing()`: parsing and OCR then run in the
+calling thread, instead of every document opening its own process pools.
+
+Usage:
+    from app.modules.askai.services.pdf_pipeline import iter_page_extractions
+
+    for page in iter_page_extractions("file.pdf"):
+        print(page.page_num, len(page.text), len(page.tables))
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+    import pdfplumber
+    HAS_PDF_LIBS = True
+except ImportError:
+    HAS_PDF_LIBS = False
+
+
+_local = threading.local()
+
+
+@contextmanager
+def in_process_parsing():
+    """Within this block, the calling thread parses and OCRs without worker processes"""
+    previous = getattr(_local, "in_process", False)
+    _local.in_process = True
+    try:
+        yield
+    finally:
+        _local.in_process = previous
+
+
+def worker_limit(max_workers: int) -> int:
+    """`max_workers`, or 1 inside in_process_parsing()"""
+    return 1 if getattr(_local, "in_process", False) else max_workers
+
+
+@dataclass
+class PageExtraction:
+    """Everything extracted from one PDF page in a single pass"""
+    page_num: int  # 1-based
+    text: str
+    tables: List[List[List[Optional[str]]]] = field(default_factory=list)
+    table_candidate: bool = False
+
+
+# ============================================================================
+# TABLE PRE-SCREEN
+# ============================================================================
+
+def count_ruling_segments(page, limit: Optional[int] = None) -> int:
+    """
+    Count axis-aligned line segments in a page's vector drawings.
+
+    pdfplumber's default table strategy only finds tables drawn with ruling
+    lines, so a page without enough horizontal/vertical segments cannot yield
+    a table. Rectangles count as four segments (cell borders are often drawn
+    as thin filled rects). Stops counting once `limit` is reached.
+    """
+    segments = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            op = item[0]
+            if op == "re":
+                segments += 4
+            elif op == "l":
+                start, end = item[1], item[2]
+                if abs(start.x - end.x) < 1 or abs(start.y - end.y) < 1:
+                    segments += 1
+            if limit is not None and segments >= limit:
+                return segments
+    return segments
+
+
+def is_table_candidate(page) -> bool:
+    """True if a PyMuPDF page has enough ruling lines to contain a table"""
+    threshold = settings.PDF_TABLE_MIN_RULINGS
+    return count_ruling_segments(page, limit=threshold) >= threshold
+
+
+def get_page_count(pdf_path: str) -> int:
+    """Returns the number of pages in a PDF"""
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def extract_page_range(pdf_path: str, start: int, end: int) -> List[PageExtraction]:
+    """
+    Extract text and tables from pages [start, end) (0-based, end exclusive).
+
+    Runs inside a worker process: opens its own PyMuPDF handle, and opens
+    pdfplumber at most once per range, only if a table candidate was found.
+    """
+    results: List[PageExtraction] = []
+    with fitz.open(pdf_path) as doc:
+        for page_idx in range(start, min(end, doc.page_count)):
+            page = doc[page_idx]
+            results.append(PageExtraction(
+                page_num=page_idx + 1,
+                text=page.get_text(),
+                table_candidate=is_table_candidate(page),
+            ))
+
+    candidates = [r for r in results if r.table_candidate]
+    if candidates:
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                for result in candidates:
+                    try:
+                        result.tables = pdf.pages[result.page_num - 1].extract_tables() or []
+                    except Exception as e:
+                        logger.warning(f"Table extraction failed on page {result.page_num}: {e}")
+        except Exception as e:
+            # Keep the range's text when pdfplumber cannot read the file
+            logger.warning(f"pdfplumber could not open {pdf_path}: {e}")
+    return results
+
+
+def _extract_range_or_skip(pdf_path: str, start: int, end: int) -> List[PageExtraction]:
+    """extract_page_range in the calling process; a range that fails is logged and skipped"""
+    try:
+        return extract_page_range(pdf_path, start, end)
+    except Exception as e:
+        logger.error(f"Skipping pages {start + 1}-{end} of {pdf_path}: {e}")
+        return []
+
+
+def iter_page_extractions(
+    pdf_path: str,
+    max_workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+) -> Iterator[PageExtraction]:
+    """
+    Yield PageExtraction results for every page of a PDF.
+
+    A PDF that PyMuPDF cannot open yields nothing, and a page range that
+    cannot be extracted is skipped, so callers can fall back to other
+    sources (LlamaParse text, OCR) instead of failing the document.
+
+    Small documents are processed inline; larger ones are split into page
+    ranges processed by a process pool. Pages are always yielded in page
+    order: a range that finishes early is held until the ranges before it
+    are done, so callers that cut the output short keep the first pages.
+
+    Args:
+        pdf_path: Path to the PDF file
+        max_workers: Worker processes (defaults to PDF_PARSE_MAX_WORKERS; 1
+            inside in_process_parsing())
+        pages_per_task: Pages per worker task (defaults to PDF_PAGES_PER_TASK)
+    """
+    if not HAS_PDF_LIBS:
+        logger.warning("PDF libraries not installed, cannot extract pages")
+        return
+
+    try:
+        page_count = get_page_count(pdf_path)
+    except Exception as e:
+        logger.warning(f"PyMuPDF could not open {pdf_path}: {e}")
+        return
+    pages_per_task = pages_per_task or settings.PDF_PAGES_PER_TASK
+    max_workers = worker_limit(max_workers or settings.PDF_PARSE_MAX_WORKERS)
+    ranges = [(start, start + pages_per_task) for start in range(0, page_count, pages_per_task)]
+
+    if page_count < settings.PDF_PARALLEL_MIN_PAGES or max_workers <= 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield from _extract_range_or_skip(pdf_path, start, end)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(ranges))) as executor:
+        futures = {executor.submit(extract_page_range, pdf_path, start, end): (start, end) for start, end in ranges}
+        finished = {}
+        next_range = 0
+        for future in as_completed(futures):
+            start, end = futures[future]
+            try:
+                finished[start] = future.result()
+            except Exception as e:
+                # Retry the range inline so one bad worker does not drop pages
+                logger.warning(f"Worker failed on pages {start + 1}-{end}: {e}, retrying inline")
+                finished[start] = _extract_range_or_skip(pdf_path, start, end)
+            while next_range < len(ranges) and ranges[next_range][0] in finished:
+                yield from finished.pop(ranges[next_range][0])
+                next_range += 1
@@ -0,0 +1,109 @@
+"""
+Process-wide cache of LangChain RAG components.
+
+The parts of the RAG pipeline that do not depend on a request are built once
+per process and shared: the Gemini chat model and the history-aware prompt.
+Per-chat retrievers and chains are kept in an LRU+TTL cache keyed by chat
+and by a hash of the chat's document set, so adding or removing a document
+gives the chat fresh components in every worker. The worker that made the
+change also drops the stale entries straight away (`invalidate_chat`).
+
+Cached chains never hold a database session: the request's session is passed
+in the invocation config (`configurable.db`) and read by the history factory.
+
+Usage:
+    from app.modules.askai.services.rag_cache import document_set_key, get_rag_cache
+
+    cache = get_rag_cache()
+    chain = cache.chain(chat_id, document_set_key(chat.documents), vector_store, build_chain)
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.core.cache import LRUTTLCache
+
+
+def document_set_key(documents: Iterable[Any]) -> str:
+    """Order-independent hash of a chat's document ids"""
+    ids = sorted(str(getattr(doc, "id", doc)) for doc in documents)
+    return hashlib.sha1("\n".join(ids).encode()).hexdigest()[:16]
+
+
+class RAGComponentCache:
+    """Shared LLM/prompt plus LRU+TTL caches of per-chat retrievers and chains"""
+
+    def __init__(self, max_chats: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        max_chats = max_chats or settings.RAG_CACHE_MAX_CHATS
+        ttl_seconds = ttl_seconds or settings.RAG_CACHE_TTL_SECONDS
+        self.retrievers = LRUTTLCache(max_chats, ttl_seconds)
+        self.chains = LRUTTLCache(max_chats, ttl_seconds)
+        self._llm = None
+        self._prompt = None
+        self._lock = threading.Lock()
+
+    def llm(self):
+        """The shared ChatGoogleGenerativeAI client"""
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    from app.core.langchain_config import get_langchain_llm
+                    self._llm = get_langchain_llm()
+        return self._llm
+
+    def prompt(self):
+        """RAG_PROMPT with a chat_history placeholder after the system message"""
+        if self._prompt is None:
+            with self._lock:
+                if self._prompt is None:
+                    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+                    from app.core.langchain_config import RAG_PROMPT
+
+                    messages = list(RAG_PROMPT.messages)
+                    messages.insert(1, MessagesPlaceholder(variable_name="chat_history"))
+                    self._prompt = ChatPromptTemplate.from_messages(messages)
+        return self._prompt
+
+    def retriever(self, chat_id: UUID, doc_key: str, vector_store, build: Callable[[], Any]):
+        return self._get(self.retrievers, (str(chat_id), doc_key), vector_store, build)
+
+    def chain(self, chat_id: UUID, doc_key: str, vector_store, build: Callable[[], Any]):
+        return self._get(self.chains, (str(chat_id), doc_key), vector_store, build)
+
+    @staticmethod
+    def _get(cache: LRUTTLCache, key, vector_store, build: Callable[[], Any]):
+        # Entries remember the vector store they were built on: a Weaviate
+        # reconnect replaces it, and retrievers hold collection handles bound
+        # to the old client.
+        built_on, component = cache.get_or_create(key, lambda: (vector_store, build()))
+        if built_on is not vector_store:
+            cache.pop(key)
+            built_on, component = cache.get_or_create(key, lambda: (vector_store, build()))
+        return component
+
+    def invalidate_chat(self, chat_id) -> None:
+        """Drop every cached retriever/chain of a chat (any document set)"""
+        chat_id = str(chat_id)
+        self.retrievers.invalidate(lambda key: key[0] == chat_id)
+        self.chains.invalidate(lambda key: key[0] == chat_id)
+
+    def clear(self) -> None:
+        self.retrievers.invalidate()
+        self.chains.invalidate()
+
+
+_rag_cache: Optional[RAGComponentCache] = None
+_rag_cache_lock = threading.Lock()
+
+
+def get_rag_cache() -> RAGComponentCache:
+    """The process-wide RAG component cache"""
+    global _rag_cache
+    if _rag_cache is None:
+        with _rag_cache_lock:
+            if _rag_cache is None:
+                _rag_cache = RAGComponentCache()
+    return _rag_cache
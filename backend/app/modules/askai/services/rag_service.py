@@ -1,28 +1,24 @@
 from uuid import UUID
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.core.services import get_llm_client, get_vector_store, GEMINI_MODEL_NAME
+from app.core.services import generate_content, get_llm_client, get_vector_store, GEMINI_MODEL_NAME
 from app.modules.askai.db.repository import ChatRepository
+from app.modules.askai.services.answer_cache import get_answer_cache
+from app.modules.askai.services.retrieval import retrieve
 from app.config import settings
 
-def send_message_to_chat(db: Session, chat_id: UUID, user_message: str) -> Dict:
-    """Handles the RAG pipeline using PostgreSQL and Weaviate."""
-    chat_repo = ChatRepository(db)
-    chat = chat_repo.get_by_id(chat_id)
-    if not chat:
-        raise ValueError("Chat not found")
-
+def _generate_answer(chat, user_message: str) -> Tuple[str, List[Dict], bool]:
+    """Retrieve context, build the prompt and call Gemini: (reply, sources, whether Gemini answered)"""
     # 1. Retrieve context
-    chat_docs = chat.documents
     context_text = ""
     sources = []
     
-    if chat_docs:
+    if chat.documents:
         vector_store = get_vector_store()
-        collection = vector_store.get_or_create_collection(str(chat_id))
-        results = vector_store.query(collection, user_message, n_results=settings.RAG_TOP_K)
+        collection = vector_store.get_or_create_collection(str(chat.id))
+        results = retrieve(vector_store, collection, user_message)
         
         if results:
             context_parts = []
@@ -70,21 +66,43 @@ that you are using information from other sources and not the context
         prompt = f"""You are a helpful AI assistant. Please answer: {user_message}"""
         
     # 3. Call LLM
-    is_first_message = len(chat.messages) == 0
     recent_history = sorted(chat.messages, key=lambda m: m.timestamp, reverse=True)[:10]
     gemini_history = [{"role": "model" if msg.sender == "bot" else "user", "parts": [{"text": msg.text}]} for msg in recent_history]
     gemini_history.append({"role": "user", "parts": [{"text": prompt}]})
     
     try:
         client = get_llm_client()
-        response = client.models.generate_content(
-            model=GEMINI_MODEL_NAME,
-            contents=gemini_history
-        )
-        bot_response = response.text if hasattr(response, "text") else "I couldn't generate a response."
+        response = generate_content(client, GEMINI_MODEL_NAME, gemini_history, operation="chat")
+        if hasattr(response, "text"):
+            return response.text, sources, True
+        return "I couldn't generate a response.", sources, False
     except Exception as api_error:
         print(f"❌ Gemini API error: {api_error}")
-        bot_response = f"I encountered an error: {str(api_error)}"
+        return f"I encountered an error: {str(api_error)}", sources, False
+
+
+def send_message_to_chat(db: Session, chat_id: UUID, user_message: str) -> Dict:
+    """Handles the RAG pipeline using PostgreSQL and Weaviate."""
+    chat_repo = ChatRepository(db)
+    chat = chat_repo.get_by_id(chat_id)
+    if not chat:
+        raise ValueError("Chat not found")
+
+    # 0. Serve repeated questions over the same documents from the answer cache.
+    # Only a chat's opening question: later answers depend on the chat history.
+    chat_docs = chat.documents
+    is_first_message = len(chat.messages) == 0
+    answer_cache = get_answer_cache() if chat_docs and is_first_message else None
+    cached = answer_cache.lookup(chat_docs, user_message) if answer_cache else None
+
+    if cached is not None:
+        print(f"⚡ Answer cache hit (similarity {cached.similarity:.3f})")
+        bot_response, sources = cached.answer, cached.sources
+    else:
+        # 1-3. Retrieve, build prompt, call LLM
+        bot_response, sources, answered = _generate_answer(chat, user_message)
+        if answer_cache and answered:
+            answer_cache.store(chat_docs, user_message, bot_response, sources, chat_id=chat_id)
 
     # 4. Save conversation to DB
     chat_repo.add_message(chat, sender="user", text=user_message)
@@ -95,11 +113,9 @@ that you are using information from other sources and not the context
     # Auto-generate a title if this is the first user message
     if is_first_message:
         try:
+            client = get_llm_client()
             title_prompt = f"Generate ONE short, concise title (4-5 words, NO extra text, straight to the title) for the following conversation: \n\nUser: {user_message}\n\nAssistant: {bot_response}"
-            title_response = client.models.generate_content(
-                model=GEMINI_MODEL_NAME,
-                contents=title_prompt
-            )
+            title_response = generate_content(client, GEMINI_MODEL_NAME, title_prompt, operation="chat_title")
             new_title = title_response.text.strip().replace('"', '')
             if new_title:
                 chat_repo.rename(chat, new_title)
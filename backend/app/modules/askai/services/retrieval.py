@@ -0,0 +1,140 @@
+"""
+Retrieval pipeline for chat RAG: search, rerank, pack.
+
+1. Search: VectorStoreManager.query in RAG_RETRIEVAL_MODE. "hybrid" adds
+   Weaviate BM25 to the vector search, which finds exact tender terms (clause
+   numbers, EMD, item codes) that embeddings blur.
+2. Rerank (RAG_RERANK_ENABLED): a wider pool of RAG_CANDIDATE_POOL
+   candidates is scored by a small local cross-encoder against the question
+   and cut down to RAG_RERANK_TOP_K.
+3. Pack: chunks are taken best first while they fit RAG_CONTEXT_TOKEN_BUDGET,
+   so a few long table chunks cannot crowd the prompt past the model limit.
+
+Results keep VectorStoreManager's (content, properties, score) tuples; after
+reranking the score is the cross-encoder score.
+
+Usage:
+    from app.modules.askai.services.retrieval import retrieve
+
+    results = retrieve(vector_store, collection, "What is the EMD amount?")
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+Result = Tuple[str, dict, float]
+
+
+class CrossEncoderReranker:
+    """Lazily loads a sentence-transformers CrossEncoder and reorders candidates by it"""
+
+    def __init__(self, model_name: Optional[str] = None, batch_size: Optional[int] = None):
+        self.model_name = model_name or settings.RAG_RERANKER_MODEL
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        from sentence_transformers import CrossEncoder
+
+        start = time.perf_counter()
+        model = CrossEncoder(self.model_name, device="cpu", cache_folder=str(settings.EMBEDDING_CACHE_DIR))
+        print(f"✅ Reranker {self.model_name} loaded in {time.perf_counter() - start:.1f}s")
+        return model
+
+    def rerank(self, query: str, results: Sequence[Result], top_k: int) -> List[Result]:
+        """The `top_k` results with the highest cross-encoder score, best first"""
+        if not results:
+            return []
+        pairs = [(query, doc) for doc, _, _ in results]
+        scores = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        reranked = [(doc, meta, float(score)) for (doc, meta, _), score in zip(results, scores)]
+        reranked.sort(key=lambda r: r[2], reverse=True)
+        return reranked[:top_k]
+
+
+_reranker: Optional[CrossEncoderReranker] = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """The process-wide reranker (weights load on first rerank)"""
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = CrossEncoderReranker()
+    return _reranker
+
+
+def _default_token_counter() -> Callable[[str], int]:
+    from app.core.services import get_tokenizer
+
+    tokenizer = get_tokenizer()
+    return lambda text: len(tokenizer.encode(text, disallowed_special=()))
+
+
+def pack_context(
+    results: Sequence[Result],
+    token_budget: Optional[int] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> List[Result]:
+    """
+    Keep results in rank order while their content fits `token_budget`.
+
+    A chunk that does not fit is skipped rather than ending the packing, so a
+    shorter lower-ranked chunk can still use the remaining budget. A budget
+    of 0 keeps everything.
+    """
+    token_budget = settings.RAG_CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+    if token_budget <= 0:
+        return list(results)
+    count_tokens = count_tokens or _default_token_counter()
+
+    packed, used = [], 0
+    for result in results:
+        tokens = count_tokens(result[0])
+        if used + tokens > token_budget:
+            continue
+        packed.append(result)
+        used += tokens
+    return packed
+
+
+def retrieve(
+    vector_store,
+    collection,
+    query: str,
+    top_k: Optional[int] = None,
+    mode: Optional[str] = None,
+    rerank: Optional[bool] = None,
+    token_budget: Optional[int] = None,
+    reranker: Optional[CrossEncoderReranker] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> List[Result]:
+    """Search `collection`, optionally rerank, and pack the results to the token budget"""
+    rerank = settings.RAG_RERANK_ENABLED if rerank is None else rerank
+    if rerank:
+        top_k = top_k or settings.RAG_RERANK_TOP_K
+        candidates = vector_store.query(collection, query, n_results=max(settings.RAG_CANDIDATE_POOL, top_k), mode=mode)
+        try:
+            results = (reranker or get_reranker()).rerank(query, candidates, top_k)
+        except Exception as e:
+            # A missing or broken reranker must not take chat down
+            print(f"⚠️  Reranking failed, using search order: {e}")
+            results = candidates[:top_k]
+    else:
+        top_k = top_k or settings.RAG_TOP_K
+        results = vector_store.query(collection, query, n_results=top_k, mode=mode)
+    return pack_context(results, token_budget, count_tokens)
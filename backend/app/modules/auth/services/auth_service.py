@@ -34,10 +34,15 @@ def create_user(db: Session, user: UserCreate) -> User:
 # --- FastAPI Dependency Injection ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
-async def get_current_user(
+def get_current_user(
     db: Session = Depends(get_db_session),
     token: str = Depends(oauth2_scheme)
 ) -> User:
+    """
+    The user of the bearer token. A `def` dependency, so FastAPI runs its two
+    lookups in the threadpool instead of on the event loop; they use the
+    route's own Session (and connection), which the returned User belongs to.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
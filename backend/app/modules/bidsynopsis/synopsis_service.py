@@ -54,7 +54,7 @@ def _extract_qualification_requirements_only(analysis: Optional[TenderAnalysis],
     # Use LLM to extract qualification criteria from all analysis data
     try:
         from app.core.langchain_config import get_langchain_llm
-        from app.core.services import vector_store
+        from app.core.services import get_vector_store
         import json
         
         # Get LLM instance
@@ -63,6 +63,7 @@ def _extract_qualification_requirements_only(analysis: Optional[TenderAnalysis],
         # Query Weaviate for detailed content
         weaviate_content = []
         try:
+            vector_store = get_vector_store()
             if vector_store:
                 search_queries = [
                     "eligibility criteria requirements qualifications",
@@ -1,15 +1,33 @@
-from fastapi import APIRouter
-from app.modules.health.models.health import HealthResponse
+from fastapi import APIRouter, Response, status
+from app.modules.health.models.health import HealthResponse, ReadinessResponse
 from app.utils import get_consistent_timestamp
-from app.core.services import pdf_processor
+from app.core import metrics, services
+from app.modules.askai.services.answer_cache import get_answer_cache
 
 router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
 def health_check():
-    """Health check"""
+    """Liveness: the process is up; reports each dependency's state without blocking on it"""
+    readiness = services.readiness()
+    answer_cache = get_answer_cache()
     return {
-        "status": "healthy",
+        "status": "healthy" if readiness["ready"] else "degraded",
         "timestamp": get_consistent_timestamp(),
-        "llamaparse": "available" if pdf_processor.has_llamaparse else "unavailable"
+        "llamaparse": "available" if services.llamaparse_available() else "unavailable",
+        "services": readiness["services"],
+        "caches": {"answers": answer_cache.stats()} if answer_cache else {},
     }
+
+@router.get("/ready", response_model=ReadinessResponse, tags=["Health"])
+def readiness_check(response: Response):
+    """Readiness: 503 until every required dependency (Gemini, Weaviate, tokenizer) is initialised"""
+    readiness = services.readiness()
+    if not readiness["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {**readiness, "timestamp": get_consistent_timestamp()}
+
+@router.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics_endpoint():
+    """Pipeline metrics (stage latencies, token counts, queue depths) of this API worker, in the Prometheus text format"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,6 +1,22 @@
+from typing import Dict, Optional
+
 from pydantic import BaseModel
 
+class ServiceStatus(BaseModel):
+    state: str
+    required: bool
+    error: Optional[str] = None
+    last_attempt: Optional[float] = None
+    init_seconds: Optional[float] = None
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
     llamaparse: str
+    services: Dict[str, ServiceStatus] = {}
+    caches: Dict[str, Dict[str, float]] = {}
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    timestamp: str
+    services: Dict[str, ServiceStatus]
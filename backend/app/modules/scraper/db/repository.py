@@ -3,8 +3,8 @@ from datetime import datetime, timedelta, date as date_type
 
 from sqlalchemy.orm import Session, joinedload
 
-from typing import Tuple, Dict
-from app.modules.scraper.data_models import HomePageData, Tender
+from typing import Tuple, Dict, List
+from app.modules.scraper.data_models import HomePageData, Tender, TenderDetailPage
 from app.modules.scraper.db.schema import (
     ScrapeRun,
     ScrapedTender,
@@ -12,6 +12,7 @@ from app.modules.scraper.db.schema import (
     ScrapedTenderQuery,
     ScrapedEmailLog,
     EmailTemplateHash,
+    ImapSyncState,
 )
 
 
@@ -105,26 +106,7 @@ class ScraperRepository:
 
         if tender_data.details:
             details = tender_data.details
-            scraped_tender.tdr = details.notice.tdr
-            scraped_tender.tendering_authority = details.notice.tendering_authority
-            scraped_tender.tender_no = details.notice.tender_no
-            scraped_tender.tender_id_detail = details.notice.tender_id
-            scraped_tender.tender_brief = details.notice.tender_brief
-            scraped_tender.state = details.notice.state
-            scraped_tender.document_fees = details.notice.document_fees
-            scraped_tender.emd = details.notice.emd
-            scraped_tender.tender_value = details.notice.tender_value
-            scraped_tender.tender_type = details.notice.tender_type
-            scraped_tender.bidding_type = details.notice.bidding_type
-            scraped_tender.competition_type = details.notice.competition_type
-            scraped_tender.tender_details = details.details.tender_details
-            scraped_tender.publish_date = details.key_dates.publish_date
-            scraped_tender.last_date_of_bid_submission = details.key_dates.last_date_of_bid_submission
-            scraped_tender.tender_opening_date = details.key_dates.tender_opening_date
-            scraped_tender.company_name = details.contact_information.company_name
-            scraped_tender.contact_person = details.contact_information.contact_person
-            scraped_tender.address = details.contact_information.address
-            scraped_tender.information_source = details.other_detail.information_source
+            self.apply_tender_details(scraped_tender, details)
 
             for file_data in details.other_detail.files:
                 date_str = tender_release_date.strftime("%Y-%m-%d")
@@ -149,6 +131,53 @@ class ScraperRepository:
         self.db.refresh(scraped_tender)
         return scraped_tender
 
+    @staticmethod
+    def apply_tender_details(scraped_tender: ScrapedTender, details: TenderDetailPage) -> ScrapedTender:
+        """Copy the fields of a parsed detail page onto a ScrapedTender (files excluded)"""
+        scraped_tender.tdr = details.notice.tdr
+        scraped_tender.tendering_authority = details.notice.tendering_authority
+        scraped_tender.tender_no = details.notice.tender_no
+        scraped_tender.tender_id_detail = details.notice.tender_id
+        scraped_tender.tender_brief = details.notice.tender_brief
+        scraped_tender.state = details.notice.state
+        scraped_tender.document_fees = details.notice.document_fees
+        scraped_tender.emd = details.notice.emd
+        scraped_tender.tender_value = details.notice.tender_value
+        scraped_tender.tender_type = details.notice.tender_type
+        scraped_tender.bidding_type = details.notice.bidding_type
+        scraped_tender.competition_type = details.notice.competition_type
+        scraped_tender.tender_details = details.details.tender_details
+        scraped_tender.publish_date = details.key_dates.publish_date
+        scraped_tender.last_date_of_bid_submission = details.key_dates.last_date_of_bid_submission
+        scraped_tender.tender_opening_date = details.key_dates.tender_opening_date
+        scraped_tender.company_name = details.contact_information.company_name
+        scraped_tender.contact_person = details.contact_information.contact_person
+        scraped_tender.address = details.contact_information.address
+        scraped_tender.information_source = details.other_detail.information_source
+        return scraped_tender
+
+    def get_latest_scraped_tenders(self, tender_ids: List[str]) -> Dict[str, ScrapedTender]:
+        """
+        The most recently scraped row of each tender (by tender_id_str), in one query.
+
+        Rows come from the latest scrape run that saw the tender; rows without
+        a run come last.
+        """
+        if not tender_ids:
+            return {}
+        rows = (
+            self.db.query(ScrapedTender)
+            .outerjoin(ScrapedTenderQuery, ScrapedTender.query_id == ScrapedTenderQuery.id)
+            .outerjoin(ScrapeRun, ScrapedTenderQuery.scrape_run_id == ScrapeRun.id)
+            .filter(ScrapedTender.tender_id_str.in_(tender_ids))
+            .order_by(ScrapeRun.run_at.desc().nullslast())
+            .all()
+        )
+        latest: Dict[str, ScrapedTender] = {}
+        for row in rows:
+            latest.setdefault(row.tender_id_str, row)
+        return latest
+
     def has_email_been_processed(self, email_uid: str, tender_url: str) -> bool:
         """
         Check if an email+tender combination has already been processed.
@@ -270,25 +299,120 @@ class ScraperRepository:
             scrape_run_id: ScrapeRun ID if successfully processed
             priority: "low", "normal", or "high" - for conflict resolution
 
+        A retry of an email+tender pair that failed before updates its log,
+        keeping the pair unique.
+
         Returns:
             ScrapedEmailLog record
         """
-        email_log = ScrapedEmailLog(
-            email_uid=email_uid,
-            email_sender=email_sender,
-            email_received_at=email_received_at,
-            tender_url=tender_url,
-            tender_id=tender_id,
-            processing_status=processing_status,
-            error_message=error_message,
-            scrape_run_id=scrape_run_id,
-            priority=priority,
-        )
-        self.db.add(email_log)
+        email_log = self.db.query(ScrapedEmailLog).filter(
+            ScrapedEmailLog.email_uid == email_uid,
+            ScrapedEmailLog.tender_url == tender_url,
+            ScrapedEmailLog.processing_status == "failed",
+        ).first()
+        if email_log is None:
+            email_log = ScrapedEmailLog(email_uid=email_uid, tender_url=tender_url)
+            self.db.add(email_log)
+        email_log.email_sender = email_sender
+        email_log.email_received_at = email_received_at
+        email_log.tender_id = tender_id
+        email_log.processing_status = processing_status
+        email_log.error_message = error_message
+        email_log.scrape_run_id = scrape_run_id
+        email_log.priority = priority
+        email_log.processed_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(email_log)
         return email_log
 
+    def partition_unprocessed_emails(self, emails: list[dict], source_priority: str = "normal") -> tuple[list[dict], list[dict]]:
+        """
+        Batched deduplication for the email listener: one query over the logs
+        of all candidate tender URLs instead of one per email.
+
+        Applies the check_tender_duplicate_with_priority rule to every email
+        and returns (new_emails, duplicates):
+        - Emails whose (email_uid, tender_url) is already logged are dropped,
+          unless the log is a failure: those are retried.
+        - Duplicates are emails whose URL was processed (latest success or
+          superseded log) at the same or higher priority, or that repeat a URL
+          earlier in the batch. Each carries 'existing_priority' for
+          log_skipped_emails.
+        - New emails include those whose URL only has a lower-priority log;
+          scrape_link supersedes it.
+        """
+        if not emails:
+            return [], []
+
+        logs = self.db.query(
+            ScrapedEmailLog.email_uid,
+            ScrapedEmailLog.tender_url,
+            ScrapedEmailLog.processing_status,
+            ScrapedEmailLog.priority,
+        ).filter(
+            ScrapedEmailLog.tender_url.in_({email_info['tender_url'] for email_info in emails})
+        ).order_by(ScrapedEmailLog.processed_at).all()
+
+        logged_pairs = {(log.email_uid, log.tender_url) for log in logs if log.processing_status != "failed"}
+        latest_priority = {}  # tender_url -> priority of its latest success/superseded log
+        for log in logs:
+            if log.processing_status in ("success", "superseded"):
+                latest_priority[log.tender_url] = log.priority
+
+        priority_order = {"low": 0, "normal": 1, "high": 2}
+        source_level = priority_order.get(source_priority, 1)
+        new_emails, duplicates, batch_urls = [], [], set()
+        for email_info in emails:
+            tender_url = email_info['tender_url']
+            if (email_info['email_uid'], tender_url) in logged_pairs:
+                continue
+            if tender_url in batch_urls:
+                duplicates.append({**email_info, 'existing_priority': source_priority})
+            elif tender_url in latest_priority and priority_order.get(latest_priority[tender_url], 1) >= source_level:
+                duplicates.append({**email_info, 'existing_priority': latest_priority[tender_url]})
+            else:
+                new_emails.append(email_info)
+            batch_urls.add(tender_url)
+        return new_emails, duplicates
+
+    def log_skipped_emails(self, duplicates: list[dict], source_priority: str = "normal") -> int:
+        """
+        Log the duplicates from partition_unprocessed_emails as "skipped" in one commit.
+
+        Returns:
+            Number of logs written
+        """
+        self.db.add_all([
+            ScrapedEmailLog(
+                email_uid=email_info['email_uid'],
+                email_sender=email_info['email_sender'],
+                email_received_at=email_info['email_date'] or datetime.utcnow(),
+                tender_url=email_info['tender_url'],
+                processing_status="skipped",
+                error_message=f"Duplicate tender (existing priority: {email_info['existing_priority']}, new: {source_priority})",
+                priority=source_priority,
+            )
+            for email_info in duplicates
+        ])
+        self.db.commit()
+        return len(duplicates)
+
+    def get_imap_checkpoint(self, mailbox: str) -> Optional[ImapSyncState]:
+        """Get the email listener's sync checkpoint for a mailbox, if any"""
+        return self.db.query(ImapSyncState).filter(ImapSyncState.mailbox == mailbox).first()
+
+    def save_imap_checkpoint(self, mailbox: str, uid_validity: int, last_uid: int) -> ImapSyncState:
+        """Create or move the sync checkpoint of a mailbox"""
+        state = self.get_imap_checkpoint(mailbox)
+        if state is None:
+            state = ImapSyncState(mailbox=mailbox)
+            self.db.add(state)
+        state.uid_validity = uid_validity
+        state.last_uid = last_uid
+        state.updated_at = datetime.utcnow()
+        self.db.commit()
+        return state
+
     def get_emails_from_last_24_hours(self) -> list[ScrapedEmailLog]:
         """
         Get all email logs from the last 24 hours.
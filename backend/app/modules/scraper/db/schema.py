@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, date
 
-from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Text, Index, Boolean
+from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Text, Index, Boolean, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -54,6 +54,22 @@ class ScrapedEmailLog(Base):
     )
 
 
+class ImapSyncState(Base):
+    """
+    Incremental-sync checkpoint of the email listener, one row per mailbox.
+
+    Messages with a UID above last_uid are new. The checkpoint only holds
+    while the mailbox keeps its UIDVALIDITY; when the server reports a
+    different one, UIDs were reassigned and the listener re-syncs.
+    """
+    __tablename__ = 'imap_sync_state'
+
+    mailbox = Column(String, primary_key=True)  # "<account>/<mailbox name>"
+    uid_validity = Column(BigInteger, nullable=False)
+    last_uid = Column(BigInteger, nullable=False)  # Highest UID handed to the listener
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class ScrapeRun(Base):
     __tablename__ = 'scrape_runs'
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -1,21 +1,17 @@
-from typing import List, Optional
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-import requests
+import time
+from typing import List, Union
 
+from lxml.html import HtmlElement
+
+from app.core import metrics
 from app.core.helpers import get_number_from_currency_string
 
+from .http_client import http_get
+from .html_parsing import LabelValueTable, children, find, find_all, parse_html, text
 from .data_models import TenderDetailContactInformation, TenderDetailDetails, TenderDetailKeyDates, TenderDetailNotice, TenderDetailOtherDetail, TenderDetailPage, TenderDetailPageFile
 
-def notice_table_helper(search: str, rows: List[Tag]) -> str:
-    for row in rows:
-        if search in row.text:
-            return row.find_all('td')[1].text.strip()
-
-    return "N/A"
-
 
-def scrape_notice_table(table: Tag) -> TenderDetailNotice:
+def scrape_notice_table(table: HtmlElement) -> TenderDetailNotice:
     # up to 14 rows in the notice table
     # Row one is table name, Ignore
     # Remaining rows are as follows:
@@ -32,81 +28,64 @@ def scrape_notice_table(table: Tag) -> TenderDetailNotice:
     # 11. Tender Type
     # 12. Bidding Type
     # 13. Competition Type
-    # Note that some of these will not exist. 
-    # we have to smartly find the ones that do exist
-    rows = table.find_all('tr')
-    rows = rows[1:]
+    # Note that some of these will not exist; they are "N/A".
+    # The rows are read once, and every field is looked up by its label.
+    rows = LabelValueTable.from_table(table)
 
     return TenderDetailNotice(
-        tdr=notice_table_helper('TDR', rows),
-        tendering_authority=notice_table_helper('Tendering Authority', rows),
-        tender_no=notice_table_helper('Tender No', rows),
-        tender_id=notice_table_helper('Tender ID', rows),
-        tender_brief=notice_table_helper('Tender Brief', rows),
-        city=notice_table_helper('City', rows),
-        state=notice_table_helper('State', rows),
-        document_fees=notice_table_helper('Document Fees', rows),
-        emd=notice_table_helper('EMD', rows),
-        tender_value=get_number_from_currency_string(notice_table_helper('Tender Value', rows)),
-        tender_type=notice_table_helper('Tender Type', rows),
-        bidding_type=notice_table_helper('Bidding Type', rows),
-        competition_type=notice_table_helper('Competition Type', rows)
+        tdr=rows.get('TDR'),
+        tendering_authority=rows.get('Tendering Authority'),
+        tender_no=rows.get('Tender No'),
+        tender_id=rows.get('Tender ID'),
+        tender_brief=rows.get('Tender Brief'),
+        city=rows.get('City'),
+        state=rows.get('State'),
+        document_fees=rows.get('Document Fees'),
+        emd=rows.get('EMD'),
+        tender_value=get_number_from_currency_string(rows.get('Tender Value')),
+        tender_type=rows.get('Tender Type'),
+        bidding_type=rows.get('Bidding Type'),
+        competition_type=rows.get('Competition Type')
     )
 
-def scrape_details(table: Tag) -> TenderDetailDetails:
+def scrape_details(table: HtmlElement) -> TenderDetailDetails:
     # This table will have a paragraph that contains all the details
-    p = table.find('p')
-    if not p:
+    p = find(table, 'p')
+    if p is None:
         raise Exception("Tender details table does not have a paragraph")
-    return TenderDetailDetails(tender_details=p.text.strip())
-
-def key_dates_helper(search: str, rows: List[Tag]) -> str:
-    for row in rows:
-        if search in row.text:
-            return row.find_all('td')[1].text.strip()
-
-    return "N/A"
+    return TenderDetailDetails(tender_details=text(p).strip())
 
-def scrape_key_dates(table: Tag) -> TenderDetailKeyDates:
+def scrape_key_dates(table: HtmlElement) -> TenderDetailKeyDates:
     # This table has upto 4 rows:
     # 1. Table name
     # 2. Publish Date
     # 3. Last Date of Bid Submission
     # 4. Tender Opening Date
     # Note that some of these will not exist.
-    rows = table.find_all('tr')
-    rows = rows[1:]
+    rows = LabelValueTable.from_table(table)
 
     return TenderDetailKeyDates(
-        publish_date=key_dates_helper('Publish Date', rows),
-        last_date_of_bid_submission=key_dates_helper('Last Date of Bid Submission', rows),
-        tender_opening_date=key_dates_helper('Tender Opening Date', rows)
+        publish_date=rows.get('Publish Date'),
+        last_date_of_bid_submission=rows.get('Last Date of Bid Submission'),
+        tender_opening_date=rows.get('Tender Opening Date')
     )
 
-def contact_information_helper(search: str, rows: List[Tag]) -> str:
-    for row in rows:
-        if search in row.text:
-            return row.find_all('td')[1].text.strip()
-
-    return "N/A"
-
-def scrape_contact_information(table: Tag) -> TenderDetailContactInformation:
+def scrape_contact_information(table: HtmlElement) -> TenderDetailContactInformation:
     # This table has upto 4 rows:
     # 1. Table name
     # 2. Company Name
     # 3. Contact Person
     # 4. Address
     # Note that some of these will not exist.
-    rows = table.find_all('tr')
-    rows = rows[1:]
+    rows = LabelValueTable.from_table(table)
 
     return TenderDetailContactInformation(
-        company_name=contact_information_helper('Company Name', rows),
-        contact_person=contact_information_helper('Contact Person', rows),
-        address=contact_information_helper('Address', rows)
+        company_name=rows.get('Company Name'),
+        contact_person=rows.get('Contact Person'),
+        address=rows.get('Address')
     )
 
-def scrape_other_details(table: Tag) -> TenderDetailOtherDetail:
+def scrape_other_details(table: HtmlElement) -> TenderDetailOtherDetail:
     # This table has 4 rows:
     # 1. Table name
     # 2. Information source
@@ -117,18 +96,16 @@ def scrape_other_details(table: Tag) -> TenderDetailOtherDetail:
     #     4. File link
     #   The first row is the column names and should be ignored
     # 4. Empty row
-    rows = table.find_all('tr', recursive=False)
+    rows = children(table, 'tr')
     if not len(rows) == 4:
         raise Exception("Tender other details table has incorrect number of rows")
 
     # Information source
-    information_source = rows[1].find_all('td')[1].text.strip()
+    information_source = text(list(find_all(rows[1], 'td'))[1]).strip()
 
     # Another sub-table
     sub_table = rows[2]
-    if not sub_table:
-        raise Exception("Tender other details table does not have a sub-table")
-    sub_table_rows = sub_table.find_all('tr')
+    sub_table_rows = list(find_all(sub_table, 'tr'))
     if not len(sub_table_rows) > 0:
         raise Exception("Tender other details table sub-table has incorrect number of rows")
 
@@ -136,13 +113,14 @@ def scrape_other_details(table: Tag) -> TenderDetailOtherDetail:
     files: List[TenderDetailPageFile] = []
     for i in range(1, len(sub_table_rows)):
         file_row = sub_table_rows[i]
-        url_element = file_row.find('a')
-        if not url_element:
+        url_element = find(file_row, 'a')
+        if url_element is None or url_element.get('href') is None:
             raise Exception("Tender other details table sub-table does not have a link")
-        file_link = url_element.attrs['href']
-        file_name = file_row.find_all('td')[1].text.strip()
-        file_type = file_row.find_all('td')[2].text.strip()
-        file_size = file_row.find_all('td')[3].text.strip()
+        file_link = url_element.get('href')
+        cells = list(find_all(file_row, 'td'))
+        file_name = text(cells[1]).strip()
+        file_type = text(cells[2]).strip()
+        file_size = text(cells[3]).strip()
         files.append(TenderDetailPageFile(
             file_name=file_name,
             file_url=str(file_link),
@@ -158,12 +136,22 @@ def scrape_other_details(table: Tag) -> TenderDetailOtherDetail:
 
 def scrape_tender(tender_link) -> TenderDetailPage:
     # print("Scraping tender: " + tender_link)
-    page = requests.get(tender_link)
-    soup = BeautifulSoup(page.content, 'html.parser')
+    start = time.perf_counter()
+    try:
+        page = http_get(tender_link)
+    except Exception:
+        metrics.SCRAPE_DETAIL_FETCH_SECONDS.labels("error").observe(time.perf_counter() - start)
+        raise
+    metrics.SCRAPE_DETAIL_FETCH_SECONDS.labels("ok").observe(time.perf_counter() - start)
+    return parse_tender_page(page.content)
+
+
+def parse_tender_page(content: Union[bytes, str]) -> TenderDetailPage:
+    root = parse_html(content)
 
     # Every tender page will have a tender-details-home class that contains all the content
-    tender_details_home = soup.find('div', attrs={'class': 'tender-details-home'})
-    if not tender_details_home:
+    tender_details_home = find(root, 'div', 'tender-details-home')
+    if tender_details_home is None:
         raise Exception("Tender details home not found")
 
     # Tender details home will have 5 tables in the order:
@@ -172,7 +160,7 @@ def scrape_tender(tender_link) -> TenderDetailPage:
     # 3. Key Dates
     # 4. Contact Information
     # 5. Other Detail
-    tender_details_tables = tender_details_home.find_all('table', recursive=False)
+    tender_details_tables = children(tender_details_home, 'table')
     if not tender_details_tables:
         raise Exception("Tender details tables not found")
     if not len(tender_details_tables) == 5:
@@ -181,28 +169,18 @@ def scrape_tender(tender_link) -> TenderDetailPage:
 
     # Tender notice table
     tender_notice_table = tender_details_tables[0]
-    if not tender_notice_table:
-        raise Exception("Tender notice table not found")
 
     # Tender details table
     tender_details_table = tender_details_tables[1]
-    if not tender_details_table:
-        raise Exception("Tender details table not found")
 
     # Key dates table
     key_dates_table = tender_details_tables[2]
-    if not key_dates_table:
-        raise Exception("Key dates table not found")
 
     # Contact information table
     contact_information_table = tender_details_tables[3]
-    if not contact_information_table:
-        raise Exception("Contact information table not found")
 
     # Other details table
     other_details_table = tender_details_tables[4]
-    if not other_details_table:
-        raise Exception("Other details table not found")
 
     notice = scrape_notice_table(tender_notice_table)
     details = scrape_details(tender_details_table)
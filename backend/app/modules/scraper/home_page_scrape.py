@@ -1,22 +1,25 @@
-from typing import List, Tuple
-from bs4 import BeautifulSoup
-
-import requests
+from typing import List, Tuple, Union
 
 from app.core.helpers import remove_starting_numbers
 from app.modules.scraper.helpers import clean_text
 
+from .http_client import http_get
+from .html_parsing import children, find, find_all, parse_html, text
 from .data_models import HomePageData, HomePageHeader, Tender, TenderQuery
 
 def scrape_page(url) -> HomePageData:
-    page = requests.get(url)
-    soup = BeautifulSoup(page.content, 'html.parser')
+    page = http_get(url)
+    return parse_home_page(page.content)
+
+
+def parse_home_page(content: Union[bytes, str]) -> HomePageData:
+    root = parse_html(content)
 
     # There are two p-mr-date classes in the page. The first one contains the date, second one contains contact info
-    date_elem = soup.find('p', attrs={'class': 'm-r-date'})
-    if not date_elem:
+    date_elem = find(root, 'p', 'm-r-date')
+    if date_elem is None:
         raise Exception("Date not found")
-    date = clean_text(date_elem.text)
+    date = clean_text(text(date_elem))
     contact = "For customer support: (+91) 8115366981"
     name = "Shubham Kanojia"
     company = "RoadVision AI Pvt. Ltd."
@@ -24,10 +27,10 @@ def scrape_page(url) -> HomePageData:
     # For finding the number of new tenders, we need to find the m-main-count element.
     # This element will contain a string like "{{integer}} New Tenders Related to Your Business
     # We need to extract the integer from this string.
-    main_count_elem = soup.find('p', attrs={'class': 'm-main-count'})
-    if not main_count_elem:
+    main_count_elem = find(root, 'p', 'm-main-count')
+    if main_count_elem is None:
         raise Exception("Main count not found")
-    main_count = clean_text(main_count_elem.text)
+    main_count = clean_text(text(main_count_elem))
     no_of_new_tenders = main_count.split(' ')[0]
 
     header = HomePageHeader(
@@ -39,39 +42,38 @@ def scrape_page(url) -> HomePageData:
         )
 
     # The body contains a div of class container-fluid
-    container = soup.find('div', attrs={'class': 'container-fluid'})
-    if not container:
+    container = find(root, 'div', 'container-fluid')
+    if container is None:
         raise Exception("Container not found")
 
     # There are 5 row elements (direct children) in the page.
-    row_elements = container.find_all('div', attrs={'class': 'row'}, recursive=False)
+    row_elements = children(container, 'div', 'row')
     if not len(row_elements) == 5:
         raise Exception("Row elements not found")
 
     # The 4th one contains a table with query names and number of tenders.
     query_names_and_tenders_table = row_elements[3]
     # Get the table body
-    query_names_and_tenders_table_body = query_names_and_tenders_table.find('tbody')
-    if not query_names_and_tenders_table_body:
+    query_names_and_tenders_table_body = find(query_names_and_tenders_table, 'tbody')
+    if query_names_and_tenders_table_body is None:
         raise Exception("Table body not found")
     # There will be a variable numnber of tr elements in this table.
-    table_body_rows = query_names_and_tenders_table_body.find_all('tr', recursive=False)
+    table_body_rows = children(query_names_and_tenders_table_body, 'tr')
     queries_and_numbers: List[Tuple[str, str]] = []
     for row in table_body_rows:
         # Each tr element contains 3 td elements.
         # The first one is query name.
         # The second one is number of tenders.
         # Ignore the third one
-        td_elements = row.find_all('td')
-        query_name = td_elements[0].text
-        no_of_tenders = td_elements[1].text
+        td_elements = list(find_all(row, 'td'))
+        query_name = text(td_elements[0])
+        no_of_tenders = text(td_elements[1])
         queries_and_numbers.append((query_name, no_of_tenders))
-        print(row)
 
     # The last one is the list of queries, and their 
     # children tables are tender datas.
     # The last row will have a list of col-md-12 elements.
-    col_md_12_elements = row_elements[-1].find_all('div', attrs={'class': 'col-md-12'}, recursive=False)
+    col_md_12_elements = children(row_elements[-1], 'div', 'col-md-12')
     if not len(col_md_12_elements) % 2 == 0:
         raise Exception("Col-md-12 elements not found")
     # Every odd numbered col-md-12 element is a query name of the format "{{name}} ({{number of tenders}})"
@@ -88,7 +90,7 @@ def scrape_page(url) -> HomePageData:
     for column in col_md_12_elements:
         tender_query_list: List[Tender] = []
         # each column will contain a m-mainTR element.
-        mainTR_elements = column.find_all('div', attrs={'class': 'm-mainTR'}, recursive=False)
+        mainTR_elements = children(column, 'div', 'm-mainTR')
         for mainTR in mainTR_elements:
             # each m-mainTR element will contain the following:
             # 1. m-r-td-title
@@ -99,34 +101,34 @@ def scrape_page(url) -> HomePageData:
             #   3. Due date. We need to remove the <strong> element from here
             # 4. m-td-brief-link
             #   contains an <a> element with the tender link
-            title_elem = mainTR.find('p', attrs={'class': 'm-r-td-title'})
-            if not title_elem:
+            title_elem = find(mainTR, 'p', 'm-r-td-title')
+            if title_elem is None:
                 raise Exception("Title not found")
-            title = title_elem.text.strip()
+            title = text(title_elem).strip()
             title = remove_starting_numbers(title)
 
-            state_elem = mainTR.find('p', attrs={'class': 'm-td-state'})
-            if not state_elem:
+            state_elem = find(mainTR, 'p', 'm-td-state')
+            if state_elem is None:
                 raise Exception("State not found")
-            state = state_elem.text.strip()
+            state = text(state_elem).strip()
 
-            m_td_brief_elements = mainTR.find_all('p', attrs={'class': 'm-td-brief'})
+            m_td_brief_elements = list(find_all(mainTR, 'p', 'm-td-brief'))
             if not len(m_td_brief_elements) == 3:
                 raise Exception("m-td-brief elements not found")
 
             summary_elem = m_td_brief_elements[0]
-            tender_id_elem = summary_elem.find('strong')
-            if not tender_id_elem:
+            tender_id_elem = find(summary_elem, 'strong')
+            if tender_id_elem is None:
                 raise Exception("Tender ID not found")
-            tender_id = tender_id_elem.text.split(':')[1].strip()
+            tender_id = text(tender_id_elem).split(':')[1].strip()
 
-            tender_value = m_td_brief_elements[1].text.split(':')[1].strip()
-            due_date = m_td_brief_elements[2].text.split(':')[1].strip()
+            tender_value = text(m_td_brief_elements[1]).split(':')[1].strip()
+            due_date = text(m_td_brief_elements[2]).split(':')[1].strip()
 
-            link_elem = mainTR.find('a')
-            if not link_elem:
+            link_elem = find(mainTR, 'a')
+            if link_elem is None or link_elem.get('href') is None:
                 raise Exception("Link not found")
-            link = link_elem['href']
+            link = link_elem.get('href')
 
             tender_query_list.append(Tender(
                 tender_id=tender_id,
@@ -134,7 +136,7 @@ def scrape_page(url) -> HomePageData:
                 tender_url= "https://www.tenderdetail.com" + str(link),
                 drive_url=None,
                 city=state,
-                summary=summary_elem.text,
+                summary=text(summary_elem),
                 value=tender_value,
                 due_date=due_date,
                 details=None
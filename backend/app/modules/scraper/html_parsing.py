@@ -0,0 +1,101 @@
+"""
+HTML parsing layer for the tenderdetail.com scrapers.
+
+Pages are parsed with lxml (libxml2) rather than BeautifulSoup's pure-Python
+html.parser. The label/value tables of a tender page are read in one pass
+over their rows into a LabelValueTable, and every field is then looked up
+from it. The old helpers rescanned the whole text of every row once per field.
+
+The helpers mirror the BeautifulSoup calls that the scrapers used before:
+- find / find_all: the first or all descendants with a tag (and class)
+- children: direct children with a tag (and class), like recursive=False
+- text: the concatenated text of an element, like Tag.text
+
+Usage:
+    from app.modules.scraper.html_parsing import LabelValueTable, find, parse_html
+
+    root = parse_html(page.content)
+    notice = LabelValueTable.from_table(find(root, "table"))
+    notice.get("Tender ID")  # "N/A" when the row is missing
+"""
+
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from bs4 import UnicodeDammit
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
+
+
+def parse_html(content: Union[bytes, str]) -> HtmlElement:
+    """Parse a page (bytes as received, or text) into an lxml document"""
+    if isinstance(content, bytes):
+        # libxml2 assumes ISO-8859-1 for pages without a meta charset; decode
+        # the way BeautifulSoup did instead (UTF-8 first, then detection)
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            content = UnicodeDammit(content).unicode_markup
+    return lxml_html.document_fromstring(content)
+
+
+def _has_class(element: HtmlElement, css_class: Optional[str]) -> bool:
+    return css_class is None or css_class in (element.get("class") or "").split()
+
+
+def find_all(element: HtmlElement, tag: str, css_class: Optional[str] = None) -> Iterator[HtmlElement]:
+    """Descendants (not the element itself) with `tag` and, optionally, `css_class`"""
+    return (el for el in element.iterdescendants(tag) if _has_class(el, css_class))
+
+
+def find(element: HtmlElement, tag: str, css_class: Optional[str] = None) -> Optional[HtmlElement]:
+    return next(find_all(element, tag, css_class), None)
+
+
+def children(element: HtmlElement, tag: str, css_class: Optional[str] = None) -> List[HtmlElement]:
+    """Direct children with `tag` and, optionally, `css_class`"""
+    return [el for el in element.iterchildren(tag) if _has_class(el, css_class)]
+
+
+def text(element: HtmlElement) -> str:
+    return element.text_content()
+
+
+class LabelValueTable:
+    """
+    The label -> value rows of a two-column table, read in a single pass.
+
+    A row's label is the text of its first cell and its value the text of
+    its second, both stripped. Rows with fewer than two cells are skipped.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str]]):
+        self.rows = rows
+        self._by_label: Dict[str, str] = {}
+        for label, value in rows:
+            self._by_label.setdefault(label, value)
+
+    @classmethod
+    def from_table(cls, table: HtmlElement, skip_rows: int = 1) -> "LabelValueTable":
+        """Read every row of `table` after the first `skip_rows` (the table name)"""
+        rows = []
+        for row in islice(table.iterdescendants("tr"), skip_rows, None):
+            cells = list(islice(row.iterdescendants("td"), 2))
+            if len(cells) == 2:
+                rows.append((cells[0].text_content().strip(), cells[1].text_content().strip()))
+        return cls(rows)
+
+    def get(self, label: str, default: str = "N/A") -> str:
+        """
+        Value of the row labelled `label`.
+
+        An exact label wins; otherwise the first row whose label contains
+        `label` (e.g. "Tender Value (INR)" for "Tender Value").
+        """
+        value = self._by_label.get(label)
+        if value is not None:
+            return value
+        for row_label, value in self.rows:
+            if label in row_label:
+                return value
+        return default
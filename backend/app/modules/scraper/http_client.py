@@ -0,0 +1,49 @@
+"""
+Shared HTTP session for the scraper.
+
+Homepage and detail-page requests of every scrape job in the process go
+through one requests.Session. Connections to tenderdetail.com are kept alive
+and reused instead of being opened (with a TLS handshake) per page. The
+pool is sized by SCRAPER_HTTP_POOL_SIZE so that concurrent jobs
+(SCRAPER_WORKERS) do not queue for a connection, and requests time out
+after SCRAPER_HTTP_TIMEOUT_SECONDS.
+
+Usage:
+    from app.modules.scraper.http_client import http_get
+
+    page = http_get(url)
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=settings.SCRAPER_HTTP_POOL_SIZE,
+                    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET",)),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", settings.SCRAPER_HTTP_TIMEOUT_SECONDS)
+    return get_http_session().get(url, **kwargs)
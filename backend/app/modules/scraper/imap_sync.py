@@ -0,0 +1,437 @@
+"""
+Incremental IMAP sync for the tender email listener.
+
+Instead of searching the whole mailbox and downloading full RFC822 messages
+every cycle, the listener keeps a checkpoint per mailbox (UIDVALIDITY and the
+highest UID seen, stored in imap_sync_state) and only asks for what is new:
+
+- `UID SEARCH UID <last+1>:* FROM "<sender>"` for each target sender
+- one `UID FETCH` of BODYSTRUCTURE and the Date header for the new UIDs, then
+  `BODY.PEEK[<section>]` of just the text/html part, batched by section.
+  PEEK leaves the \\Seen flag alone, so reading the mail in a client is
+  unaffected.
+- Without a checkpoint, or when the server reports a different UIDVALIDITY
+  (UIDs were reassigned), the newest IMAP_BOOTSTRAP_MESSAGES per sender are
+  synced and the ScrapedEmailLog pre-filter drops those already processed.
+- Emails whose scrape failed keep the checkpoint below their UID
+  (`retry_checkpoint`) for IMAP_FAILED_RETRY_HOURS, so later syncs fetch
+  them again and the pre-filter hands them back for a retry.
+
+Between syncs the connection waits in IMAP IDLE (RFC 2177) until the server
+reports new mail, re-issuing it every IMAP_IDLE_TIMEOUT_SECONDS; servers
+without IDLE are synced every IMAP_POLL_INTERVAL_SECONDS.
+
+Usage:
+    from app.modules.scraper.imap_sync import InboxSync
+
+    inbox = InboxSync()
+    emails, checkpoint = inbox.fetch_new(repo.get_imap_checkpoint(inbox.mailbox_key))
+    ...  # process the emails
+    repo.save_imap_checkpoint(inbox.mailbox_key, *checkpoint)
+    inbox.wait_for_mail()
+"""
+
+import base64
+import email
+import email.utils
+import imaplib
+import itertools
+import quopri
+import re
+import select
+import ssl
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+from .email_sender import IMAP_PORT, IMAP_SERVER, SENDER_APP_PASSWORD, SENDER_EMAIL, TARGET_SENDERS, find_scrape_link
+from .email_template_validator import validate_email_template
+
+
+class Checkpoint(NamedTuple):
+    uid_validity: int
+    last_uid: int
+
+
+def retry_checkpoint(checkpoint: Checkpoint, failed_emails: List[dict], now: Optional[datetime] = None) -> Checkpoint:
+    """
+    The checkpoint to save after a sync: below the lowest UID of the emails
+    whose scrape failed and that arrived within IMAP_FAILED_RETRY_HOURS, so
+    the next sync fetches them again. Older failures (and emails without a
+    date) no longer hold it back.
+    """
+    now = now or datetime.now(timezone.utc)
+    retry_after = now - timedelta(hours=settings.IMAP_FAILED_RETRY_HOURS)
+    retry_uids = []
+    for email_info in failed_emails:
+        received = email_info.get('email_date')
+        if received is None:
+            continue
+        if received.tzinfo is None:
+            received = received.replace(tzinfo=timezone.utc)
+        if received >= retry_after:
+            retry_uids.append(int(email_info['email_uid']))
+    if not retry_uids:
+        return checkpoint
+    return Checkpoint(checkpoint.uid_validity, min(checkpoint.last_uid, min(retry_uids) - 1))
+
+
+class HtmlPart(NamedTuple):
+    section: str  # BODY[] section specifier, e.g. "2" or "1.2"
+    encoding: str  # Content-Transfer-Encoding
+    charset: str
+
+
+# ==================================================================================
+# FETCH RESPONSE PARSING
+# ==================================================================================
+
+_OPEN, _CLOSE = object(), object()
+# Section names like BODY[HEADER.FIELDS (DATE)] are one atom despite the parentheses
+_TOKEN = re.compile(
+    rb'\s*(?:(?P<open>\()|(?P<close>\))|"(?P<quoted>(?:[^"\\]|\\.)*)"'
+    rb'|\{(?P<literal>\d+)\}$|(?P<atom>[^\s()"\[]+(?:\[[^\]]*\](?:<\d+>)?)?))'
+)
+
+
+def _tokens(data: List[Any]):
+    for item in data:
+        if item is None:
+            continue
+        text, literal = item if isinstance(item, tuple) else (item, None)
+        pos = 0
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if match is None or match.end() == pos:
+                break
+            pos = match.end()
+            if match.group("open"):
+                yield _OPEN
+            elif match.group("close"):
+                yield _CLOSE
+            elif match.group("quoted") is not None:
+                yield re.sub(rb'\\(.)', rb'\1', match.group("quoted"))
+            elif match.group("literal"):
+                yield literal
+            elif match.group("atom"):
+                atom = match.group("atom")
+                yield None if atom.upper() == b"NIL" else int(atom) if atom.isdigit() else atom
+
+
+def parse_fetch_response(data: List[Any]) -> Dict[int, Dict[bytes, Any]]:
+    """
+    Parse the data of an imaplib `uid("FETCH", ...)` call.
+
+    Returns:
+        {uid: {item name (upper-cased bytes): value}}, where lists are nested
+        Python lists, strings and literals bytes, numbers int and NIL None
+    """
+    stack: List[list] = [[]]
+    for token in _tokens(data):
+        if token is _OPEN:
+            stack.append([])
+        elif token is _CLOSE and len(stack) > 1:
+            closed = stack.pop()
+            stack[-1].append(closed)
+        elif token is not _CLOSE:
+            stack[-1].append(token)
+
+    messages = {}
+    for entry in stack[0]:
+        if not isinstance(entry, list):
+            continue  # Message sequence number
+        items = {bytes(entry[i]).upper(): entry[i + 1] for i in range(0, len(entry) - 1, 2)}
+        if b"UID" in items:
+            messages[int(items[b"UID"])] = items
+    return messages
+
+
+def find_html_part(structure: Optional[list], section: str = "") -> Optional[HtmlPart]:
+    """
+    The first text/html part of a BODYSTRUCTURE, depth first, including parts of
+    attached or forwarded messages (message/rfc822).
+    """
+    if not isinstance(structure, list) or not structure:
+        return None
+
+    if isinstance(structure[0], list):  # multipart: child parts, then the subtype
+        children = itertools.takewhile(lambda part: isinstance(part, list), structure)
+        for number, child in enumerate(children, 1):
+            found = find_html_part(child, f"{section}.{number}" if section else str(number))
+            if found:
+                return found
+        return None
+
+    media_type = _text(structure[0]).lower()
+    subtype = _text(structure[1]).lower() if len(structure) > 1 else ""
+    if media_type == "text" and subtype == "html":
+        params = structure[2] if isinstance(structure[2], list) else []
+        charset = next(
+            (_text(params[i + 1]) for i in range(0, len(params) - 1, 2) if _text(params[i]).lower() == "charset"),
+            "utf-8",
+        )
+        return HtmlPart(section or "1", _text(structure[5]).lower() or "7bit", charset)
+
+    if media_type == "message" and subtype == "rfc822" and len(structure) > 8:
+        section = section or "1"
+        nested = structure[8]
+        # A multipart message's parts are numbered below its own section, a single part is <section>.1
+        if isinstance(nested, list) and nested and isinstance(nested[0], list):
+            return find_html_part(nested, section)
+        return find_html_part(nested, f"{section}.1")
+    return None
+
+
+def decode_part(raw: bytes, part: HtmlPart) -> str:
+    if part.encoding == "base64":
+        raw = base64.b64decode(raw)
+    elif part.encoding == "quoted-printable":
+        raw = quopri.decodestring(raw)
+    try:
+        return raw.decode(part.charset, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return "" if value is None else str(value)
+
+
+# ==================================================================================
+# INBOX SYNC
+# ==================================================================================
+
+def connect_imap() -> imaplib.IMAP4:
+    mail = imaplib.IMAP4_SSL(IMAP_SERVER, IMAP_PORT)
+    mail.login(SENDER_EMAIL, SENDER_APP_PASSWORD)
+    return mail
+
+
+_idle_tags = itertools.count(1)
+
+
+class InboxSync:
+    """One IMAP connection that syncs new tender emails and waits for more"""
+
+    def __init__(
+        self,
+        connect: Callable[[], imaplib.IMAP4] = connect_imap,
+        senders: Optional[List[str]] = None,
+        mailbox: str = "INBOX",
+        account: str = SENDER_EMAIL,
+    ):
+        self._connect = connect
+        self.senders = senders or TARGET_SENDERS
+        self.mailbox = mailbox
+        self.mailbox_key = f"{account}/{mailbox}"
+        self.mail: Optional[imaplib.IMAP4] = None
+        self.uid_validity: Optional[int] = None
+        self.idle_supported = False
+
+    def open(self) -> None:
+        if self.mail is not None:
+            return
+        mail = self._connect()
+        status, _ = mail.select(self.mailbox)
+        if status != "OK":
+            mail.logout()
+            raise imaplib.IMAP4.error(f"Could not select mailbox {self.mailbox}")
+        _, validity = mail.response("UIDVALIDITY")
+        self.uid_validity = int(validity[0])
+        mail.response("EXISTS")  # The SELECT count, not new mail
+        self.idle_supported = "IDLE" in mail.capabilities
+        self.mail = mail
+        print("✅ Email listener connected to inbox.")
+
+    def close(self) -> None:
+        mail, self.mail = self.mail, None
+        if mail is None:
+            return
+        try:
+            if mail.state == 'SELECTED':
+                mail.close()
+            mail.logout()
+            print("Listener disconnected (logged out).")
+        except Exception as e:
+            print(f"Error during IMAP cleanup: {e}")
+
+    def fetch_new(self, checkpoint: Optional[Any] = None) -> Tuple[List[dict], Checkpoint]:
+        """
+        Emails with a tender URL that arrived after `checkpoint` (anything with
+        uid_validity and last_uid, e.g. an ImapSyncState row).
+
+        Returns:
+            (emails, new checkpoint). Emails are newest first per sender, as
+            {'email_uid', 'email_sender', 'email_date', 'tender_url', 'html_body'}
+        """
+        self.open()
+        since = None
+        if checkpoint is not None:
+            if checkpoint.uid_validity == self.uid_validity:
+                since = checkpoint.last_uid
+            else:
+                print(f"ℹ️  UIDVALIDITY of {self.mailbox} changed ({checkpoint.uid_validity} → {self.uid_validity}). Re-syncing.")
+
+        last_uid = since or 0
+        emails = []
+        for sender in self.senders:
+            uids = self._search(sender, since)
+            if since is None:
+                uids = uids[-settings.IMAP_BOOTSTRAP_MESSAGES:]
+            if not uids:
+                print(f"ℹ️  No new emails from {sender}.")
+                continue
+            print(f"Found {len(uids)} new emails from {sender}. Processing...")
+            last_uid = max(last_uid, uids[-1])
+            emails.extend(self._fetch_emails(uids, sender))
+        return emails, Checkpoint(self.uid_validity, last_uid)
+
+    def _search(self, sender: str, since: Optional[int]) -> List[int]:
+        criteria = f'(UID {since + 1}:* FROM "{sender}")' if since is not None else f'(FROM "{sender}")'
+        status, data = self.mail.uid("SEARCH", criteria)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"UID SEARCH failed for {sender}: {data}")
+        uids = sorted(int(uid) for uid in (data[0] or b"").split())
+        # "n:*" always matches the last message, even when its UID is below n
+        return [uid for uid in uids if since is None or uid > since]
+
+    def _uid_fetch(self, uids: List[int], items: str) -> Dict[int, Dict[bytes, Any]]:
+        status, data = self.mail.uid("FETCH", ",".join(map(str, uids)), items)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"UID FETCH {items} failed: {data}")
+        return parse_fetch_response(data)
+
+    def _fetch_emails(self, uids: List[int], sender: str) -> List[dict]:
+        envelopes = self._uid_fetch(uids, "(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS (DATE)])")
+        parts: Dict[int, HtmlPart] = {}
+        by_section: Dict[str, List[int]] = {}
+        for uid, items in envelopes.items():
+            part = find_html_part(items.get(b"BODYSTRUCTURE"))
+            if part is None:
+                print(f"ℹ️  Email {uid} from {sender} has no HTML part.")
+                continue
+            parts[uid] = part
+            by_section.setdefault(part.section, []).append(uid)
+
+        bodies: Dict[int, bytes] = {}
+        for section, section_uids in by_section.items():
+            for uid, items in self._uid_fetch(section_uids, f"(BODY.PEEK[{section}])").items():
+                bodies[uid] = items.get(f"BODY[{section}]".encode())
+
+        emails = []
+        for uid in sorted(bodies, reverse=True):
+            if not bodies[uid]:
+                continue
+            try:
+                html_body = decode_part(bodies[uid], parts[uid])
+                email_info = self._extract(str(uid), sender, _email_date(envelopes[uid]), html_body)
+            except Exception as e:
+                print(f"⚠️  Error processing email {uid}: {e}")
+                continue
+            if email_info:
+                emails.append(email_info)
+        return emails
+
+    @staticmethod
+    def _extract(email_uid: str, sender: str, email_date, html_body: str) -> Optional[dict]:
+        # SECURITY CHECK: Validate email template structure
+        is_valid, _, error_msg = validate_email_template(html_body, sender)
+        if not is_valid:
+            print(f"🚨 SECURITY ALERT: Email template validation failed for email {email_uid}")
+            print(f"   Sender: {sender}")
+            print(f"   Error: {error_msg}")
+            print(f"   ⛔ Processing stopped for this email. No backend changes made.")
+            return None
+        if error_msg and "No template hash found" in error_msg:
+            print(f"⚠️  WARNING: {error_msg}")
+            print(f"   Consider setting up template hash for {sender} using set_template_hash()")
+
+        tender_url = find_scrape_link(html_body)
+        if not tender_url:
+            return None
+        print(f"✅ Extracted tender URL from email {email_uid}: {tender_url}")
+        return {
+            'email_uid': email_uid,
+            'email_sender': sender,
+            'email_date': email_date,
+            'tender_url': tender_url,
+            'html_body': html_body,
+        }
+
+    # ==================================================================================
+    # WAITING FOR NEW MAIL
+    # ==================================================================================
+
+    def wait_for_mail(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the server reports new mail (True) or the wait times out
+        (False). Falls back to sleeping IMAP_POLL_INTERVAL_SECONDS when IDLE is
+        disabled or unsupported. Connection errors propagate; close() and
+        retry.
+        """
+        self.open()
+        if not (settings.IMAP_IDLE_ENABLED and self.idle_supported):
+            time.sleep(settings.IMAP_POLL_INTERVAL_SECONDS if timeout is None else timeout)
+            return False
+        # Mail that arrived while the last sync ran was announced in its responses
+        _, exists = self.mail.response("EXISTS")
+        if exists and exists[0] is not None:
+            return True
+        return self._idle(settings.IMAP_IDLE_TIMEOUT_SECONDS if timeout is None else timeout)
+
+    def _idle(self, timeout: float) -> bool:
+        mail = self.mail
+        tag = b"IDLE%d" % next(_idle_tags)
+        mail.send(tag + b" IDLE\r\n")
+        line = mail.readline()
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE refused: {line!r}")
+
+        deadline = time.monotonic() + timeout
+        new_mail = False
+        while not new_mail:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not _data_ready(mail, remaining):
+                break
+            line = mail.readline()
+            if not line or line.startswith(b"* BYE"):
+                raise imaplib.IMAP4.abort("Server closed the connection during IDLE")
+            new_mail = line.startswith(b"*") and line.rstrip().upper().endswith(b"EXISTS")
+
+        mail.send(b"DONE\r\n")
+        while not line.startswith(tag):
+            line = mail.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("Server closed the connection while ending IDLE")
+        return new_mail
+
+
+def _data_ready(mail: imaplib.IMAP4, wait: float) -> bool:
+    """Whether a line can be read within `wait` seconds, counting bytes already buffered"""
+    sock = mail.sock
+    timeout = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        buffered = mail.file.peek(1)
+    except (BlockingIOError, ssl.SSLWantReadError):
+        buffered = b""
+    finally:
+        sock.settimeout(timeout)
+    if buffered:
+        return True
+    return bool(select.select([sock], [], [], wait)[0])
+
+
+def _email_date(items: Dict[bytes, Any]):
+    header = next((value for key, value in items.items() if key.startswith(b"BODY[HEADER")), None)
+    if not header:
+        return None
+    date = email.message_from_bytes(header)["Date"]
+    try:
+        return email.utils.parsedate_to_datetime(date) if date else None
+    except (TypeError, ValueError):
+        return None
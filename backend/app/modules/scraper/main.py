@@ -9,20 +9,27 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from datetime import datetime
 
+from app.config import settings
+
 import requests
 import re
 import json
 import os
 
 # Local modules
+from app.core import metrics
+from app.db.advisory_lock import advisory_lock
 from app.db.database import SessionLocal
 from app.modules.scraper.db.repository import ScraperRepository
 from app.modules.tenderiq.db.repository import TenderRepository
+from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
 from .detail_page_scrape import scrape_tender
 # from .process_tender import start_tender_processing
 # from .drive import authenticate_google_drive, download_folders, get_shareable_link, upload_folder_to_drive
-from .email_sender import listen_and_get_link, listen_and_get_unprocessed_emails, send_html_email
+from .email_sender import listen_and_get_link, send_html_email
 from .home_page_scrape import scrape_page
+from .imap_sync import InboxSync, retry_checkpoint
+from .orchestrator import run_scrape_jobs
 from .services.dms_integration_service import process_tenders_for_dms
 from .templater import generate_email, reformat_page
 from .progress_tracker import ProgressTracker, ScrapeSection, logger
@@ -49,7 +56,32 @@ def insert_drive_links(soup: BeautifulSoup):
     for tender1, tender2 in zip(soup1_tenders_links, soup2_tenders_links):
         tender1['href'] = tender2.find_all('a')[0]['href']
 
-def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bool = False, email_info: Optional[dict] = None):
+def scrape_link(
+    link: str,
+    source_priority: str = "normal",
+    skip_dedup_check: bool = False,
+    email_info: Optional[dict] = None,
+    tracker: Optional[ProgressTracker] = None,
+):
+    """
+    Scrape a digest link while holding the advisory lock for it.
+
+    The lock spans the duplicate check through the final ScrapedEmailLog
+    write, so concurrent jobs for the same link (parallel email jobs, or a
+    manual scrape in another process) resolve priorities one at a time: the
+    second sees the first one's log.
+    """
+    with advisory_lock(f"scrape_link:{link}"):
+        return _scrape_link(link, source_priority, skip_dedup_check, email_info, tracker)
+
+
+def _scrape_link(
+    link: str,
+    source_priority: str = "normal",
+    skip_dedup_check: bool = False,
+    email_info: Optional[dict] = None,
+    tracker: Optional[ProgressTracker] = None,
+):
     """
     Main scraping function with comprehensive progress tracking and logging.
     Supports both manual link pasting and email-based scraping with unified deduplication.
@@ -66,8 +98,9 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
         link: The tender URL to scrape
         source_priority: "low", "normal", or "high" - used for conflict resolution when same tender from multiple sources
         skip_dedup_check: If True, skip deduplication check (use with caution, mainly for testing)
+        tracker: Progress tracker for this job (a verbose one by default)
     """
-    tracker = ProgressTracker(verbose=True)
+    tracker = tracker or ProgressTracker(verbose=True)
     start_time = datetime.now()
 
     try:
@@ -146,16 +179,20 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
             # DMS Integration is done first to prepare folders and get the canonical release date
             with ScrapeSection(tracker, "DMS Integration"):
                 logger.info("🔄 Processing tenders for DMS integration...")
-                homepage, tender_release_date = process_tenders_for_dms(db, homepage)
+                # Jobs for digests of the same day get-or-create the same date folders
+                with advisory_lock("scraper:dms_folders"):
+                    homepage, tender_release_date = process_tenders_for_dms(db, homepage)
                 logger.info("✅ DMS integration completed.")
 
             # Create the main ScrapeRun and empty query records
             with ScrapeSection(tracker, "Initialize Scrape Run"):
                 scrape_run, query_map = scraper_repo.create_scrape_run_shell(homepage, tender_release_date)
-                logger.info(f"✅ ScrapeRun created with ID: {scrape_run.id}")
+                scrape_run_id = str(scrape_run.id)
+                logger.info(f"✅ ScrapeRun created with ID: {scrape_run_id}")
 
             # --- STAGE 1: Scrape Details & Populate Database ---
             total_tenders = sum(len(q.tenders) for q in homepage.query_table)
+            saved_tenders = []
             scrape_progress = tracker.create_detail_scrape_progress_bar(total_tenders)
 
             with ScrapeSection(tracker, "Detail Page Scraping & DB Save"):
@@ -181,53 +218,28 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
 
                             # 2. Populate scraped_tenders table
                             logger.debug(f"💾 Saving to 'scraped_tenders': {tender_data.tender_name}")
-                            scraped_tender_orm = scraper_repo.add_scraped_tender_details(query_orm, tender_data, tender_release_date)
+                            with metrics.SCRAPE_DB_SAVE_SECONDS.labels("scraped_tender").time():
+                                scraped_tender_orm = scraper_repo.add_scraped_tender_details(query_orm, tender_data, tender_release_date)
+                            saved_tenders.append(scraped_tender_orm)
                             logger.debug(f"✅ Saved to 'scraped_tenders'.")
                             
-                            # 2.5. Check for corrigendums (NEW TENDERS or UPDATED TENDERS)
-                            # This automatically detects when a tender has been re-scraped with changes
-                            logger.debug(f"🔍 Checking for corrigendum/changes in: {tender_data.tender_name}")
-                            try:
-                                from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
-                                from app.modules.tenderiq.db.repository import TenderRepository as TIQTenderRepository
-                                
-                                # Create corrigendum service
-                                corrigendum_service = CorrigendumTrackingService(scraper_repo.db)
-                                tender_ref = scraped_tender_orm.tender_id_str or scraped_tender_orm.tdr
-                                
-                                # Check if main tender exists
-                                tiq_repo = TIQTenderRepository(scraper_repo.db)
-                                main_tender = tiq_repo.get_by_tender_ref(tender_ref)
-                                
-                                if main_tender:
-                                    # Get previous scrapes (excluding the one we just added)
-                                    from sqlalchemy import and_
-                                    previous_scrapes = scraper_repo.db.query(type(scraped_tender_orm)).filter(
-                                        and_(
-                                            type(scraped_tender_orm).tender_id_str == tender_ref,
-                                            type(scraped_tender_orm).id != scraped_tender_orm.id  # Exclude current
-                                        )
-                                    ).order_by(type(scraped_tender_orm).id.desc()).limit(1).first()
-                                    
-                                    if previous_scrapes:
-                                        # Compare with previous version
-                                        changes = corrigendum_service.detect_changes(tender_ref, scraped_tender_orm)
-                                        
-                                        if changes:
-                                            logger.info(f"🔔 CORRIGENDUM DETECTED for {tender_ref}: {len(changes)} changes found")
-                                            for change in changes:
-                                                logger.info(f"   • {change.field}: {change.old_value} → {change.new_value}")
-                                            # Corrigendum will be stored in TenderActionHistory when apply_corrigendum is called
-                                            # For now, just log it - admin can review and apply if needed
-                                        else:
-                                            logger.debug(f"   ✓ No changes detected (same as previous scrape)")
-                            except Exception as corr_error:
-                                logger.debug(f"   ⚠️  Error checking for corrigendum: {str(corr_error)}")
-                                # Don't fail the main scraping if corrigendum detection fails
-
-                            # 3. Populate main tenders table
-                            logger.debug(f"💾 Saving to 'tenders': {tender_data.tender_name}")
-                            tender_repo.get_or_create_by_id(scraped_tender_orm)
+                            # 3. Record the scrape as a tender version and populate main tenders table
+                            logger.debug(f"💾 Saving to 'tender_versions' and 'tenders': {tender_data.tender_name}")
+                            # Parallel jobs can meet the same tender in different digests
+                            with metrics.SCRAPE_DB_SAVE_SECONDS.labels("tender_version").time(), \
+                                    advisory_lock(f"tender:{scraped_tender_orm.tender_id_str}"):
+                                # Unchanged content is skipped by its hash; changes become typed diff rows
+                                try:
+                                    version = CorrigendumTrackingService(scraper_repo.db).record_version(scraped_tender_orm)
+                                    if version and version.change_count:
+                                        logger.info(f"🔔 CORRIGENDUM DETECTED for {version.tender_ref_number}: {version.change_count} changes in version {version.version}")
+                                    elif not version:
+                                        logger.debug(f"   ✓ No changes detected (same as latest version)")
+                                except Exception as corr_error:
+                                    scraper_repo.db.rollback()
+                                    logger.debug(f"   ⚠️  Error recording tender version: {str(corr_error)}")
+                                    # Don't fail the main scraping if version tracking fails
+                                tender_repo.get_or_create_by_id(scraped_tender_orm)
                             logger.debug(f"✅ Saved to 'tenders'.")
 
                         except Exception as e:
@@ -246,6 +258,16 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
             if scrape_progress:
                 scrape_progress.close()
 
+            # --- STAGE 1.5: Update the cross-tender similarity index ---
+            with ScrapeSection(tracker, "Similarity Indexing"):
+                try:
+                    from app.modules.tenderiq.services.tender_similarity_service import index_scraped_tenders
+                    indexed_count = index_scraped_tenders(saved_tenders)
+                    logger.info(f"✅ Indexed {indexed_count} tenders for similarity search")
+                except Exception as index_error:
+                    # Don't fail the main scraping if similarity indexing fails
+                    logger.warning(f"⚠️  Similarity indexing failed: {str(index_error)}")
+
             # --- STAGE 2: Process Tender Files for Analysis ---
             total_tenders_to_analyze = sum(len(q.tenders) for q in homepage.query_table)
             analysis_progress = tracker.create_analysis_progress_bar(total_tenders_to_analyze)
@@ -285,7 +307,7 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
                     email_received_at=email_info['email_date'],
                     tender_url=link,
                     processing_status="success",
-                    scrape_run_id=str(scrape_run.id),
+                    scrape_run_id=scrape_run_id,
                     priority=source_priority
                 )
             else: # Manual run success
@@ -295,7 +317,7 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
                     email_received_at=datetime.utcnow(),
                     tender_url=link,
                     processing_status="success",
-                    scrape_run_id=str(scrape_run.id),
+                    scrape_run_id=scrape_run_id,
                     priority=source_priority
                 )
 
@@ -313,14 +335,16 @@ def scrape_link(link: str, source_priority: str = "normal", skip_dedup_check: bo
             logger.info("📧 Generating email template...")
             generated_template = generate_email(homepage)
 
+            # Jobs run concurrently (SCRAPER_WORKERS), so the files are named per scrape run
             logger.info("💾 Writing HTML files...")
-            with open("email.html", "w") as f:
-                f.write(generated_template.prettify())
+            with open(f"email_{scrape_run_id}.html", "w") as f:
+                f.write(generated_template)
 
             if removed_tenders:
-                with open("removed_tenders.json", "w") as f:
+                removed_path = f"removed_tenders_{scrape_run_id}.json"
+                with open(removed_path, "w") as f:
                     f.write(json.dumps(removed_tenders))
-                logger.info(f"📝 Wrote removed_tenders.json with {len(removed_tenders)} entries")
+                logger.info(f"📝 Wrote {removed_path} with {len(removed_tenders)} entries")
 
             logger.info("📤 Sending email...")
             send_html_email(generated_template)
@@ -376,109 +400,90 @@ def listen_email():
     Email listening loop with progress tracking and comprehensive logging.
 
     Flow:
-    1. Fetch ALL emails from tenders@tenderdetail.com (read or unread)
+    1. Sync emails from the target senders that arrived after the mailbox's
+       UID checkpoint (HTML part only, read or unread)
     2. For each email, extract the tender URL
-    3. Check if email+tender has been processed before (deduplication)
-    4. Check if tender URL has been processed from ANY email
-    5. If not processed, scrape it and log in database
-    6. Wait 5 minutes and repeat
+    3. Drop emails and tender URLs already in ScrapedEmailLog with one batched
+       query, logging the duplicates as skipped
+    4. Scrape the rest, SCRAPER_WORKERS links in parallel, and save the
+       checkpoint (held below recently failed emails, which are retried)
+    5. Wait in IMAP IDLE for new mail (or poll when unsupported) and repeat
 
     This avoids the "user reads email → listener can't find it" bug.
     """
     tracker = ProgressTracker(verbose=True)
+    inbox = InboxSync()
+    if settings.METRICS_PORT:
+        # The listener runs without the API, so it serves its own /metrics
+        metrics.start_metrics_server(settings.METRICS_PORT)
+        logger.info(f"📈 Serving metrics on port {settings.METRICS_PORT}")
     cycle_number = 0
 
     while True:
         cycle_number += 1
         cycle_start = datetime.now()
+        cycle_failed = False
 
-        with ScrapeSection(tracker, f"Email Polling Cycle #{cycle_number}"):
+        with ScrapeSection(tracker, f"Email Sync Cycle #{cycle_number}"):
             db = SessionLocal()
             try:
                 scraper_repo = ScraperRepository(db)
 
-                # 1. Get all emails from last 24 hours
-                logger.info("📧 Fetching unprocessed emails...")
-                emails_data = listen_and_get_unprocessed_emails()
-
-                if not emails_data:
-                    logger.info("ℹ️  No emails from target senders found.")
-                    db.close()
-                    continue  # Skip to sleep and retry in next cycle
-
-                logger.info(f"📊 Found {len(emails_data)} emails with tender URLs")
+                # 1. Get the emails that arrived since the last sync
+                logger.info("📧 Fetching new emails...")
+                checkpoint = scraper_repo.get_imap_checkpoint(inbox.mailbox_key)
+                emails_data, new_checkpoint = inbox.fetch_new(checkpoint)
 
-                # Create progress bar for email processing
-                email_progress = tracker.create_email_progress_bar(len(emails_data))
-
-                # 2. Process each email
-                processed_count = 0
-                skipped_count = 0
-                failed_count = 0
-
-                # Create deduplication progress bar
-                dedup_progress = tracker.create_deduplication_progress_bar(len(emails_data))
+                # 2. Batched deduplication against ScrapedEmailLog
+                emails_data, duplicates = scraper_repo.partition_unprocessed_emails(emails_data)
+                if duplicates:
+                    scraper_repo.log_skipped_emails(duplicates)
+                    logger.info(f"⏭️  Skipped {len(duplicates)} emails with already processed tenders")
+                db.close()
 
-                for email_info in emails_data:
-                    tender_url = email_info['tender_url']
-                    logger.info(f"🚀 Processing potential new tender from email: {tender_url}")
+                if emails_data:
+                    logger.info(f"📊 Found {len(emails_data)} emails with new tender URLs")
+                else:
+                    logger.info("ℹ️  No new tender emails from target senders.")
 
-                    try:
-                        # Close the session from this loop before calling scrape_link
-                        # scrape_link manages its own db sessions internally
-                        db.close()
+                # 3. Scrape the new links, SCRAPER_WORKERS at a time
+                failed_emails = []
+                counts = run_scrape_jobs(emails_data, tracker, failed_emails=failed_emails)
 
-                        # Call the unified scraping function
-                        # It will handle deduplication, scraping, DMS, db saving, and logging
-                        status = scrape_link(link=tender_url, email_info=email_info)
-
-                        if status == "success":
-                            processed_count += 1
-                        elif status == "skipped":
-                            skipped_count += 1
-
-                    except Exception as e:
-                        # scrape_link now handles its own error logging, so we just note it here
-                        logger.error(f"❌ Scrape for {tender_url} failed. See logs above for details.")
-                        failed_count += 1
-                    finally:
-                        # Re-open session for the next iteration of the loop
-                        db = SessionLocal()
-                        scraper_repo = ScraperRepository(db)
-
-                    if dedup_progress:
-                        dedup_progress.update(1)
-                    if email_progress:
-                        email_progress.update(1)
-
-                # Close progress bars
-                if dedup_progress:
-                    dedup_progress.close()
-                if email_progress:
-                    email_progress.close()
+                # 4. Move the checkpoint past everything handed to scrape_link,
+                #    except recent failures, which the next sync retries
+                db = SessionLocal()
+                ScraperRepository(db).save_imap_checkpoint(inbox.mailbox_key, *retry_checkpoint(new_checkpoint, failed_emails))
 
                 # Log cycle summary
                 cycle_duration = (datetime.now() - cycle_start).total_seconds()
                 tracker.log_stats({
-                    "Total Emails": len(emails_data),
-                    "Processed (New)": processed_count,
-                    "Skipped (Duplicates)": skipped_count,
-                    "Failed": failed_count,
+                    "Total Emails": len(emails_data) + len(duplicates),
+                    "Processed (New)": counts["success"],
+                    "Skipped (Duplicates)": counts["skipped"] + len(duplicates),
+                    "Failed": counts["failed"],
                     "Cycle Duration": f"{cycle_duration:.2f}s"
                 })
 
             except Exception as e:
                 logger.error(f"❌ Critical error in listen_email cycle", e)
                 db.rollback()
+                inbox.close()  # Reconnect on the next cycle
+                cycle_failed = True
             finally:
                 db.close()
 
-        # 7. Wait for 5 minutes before checking again
-        sleep_duration_seconds = 300
-        logger.info(f"\n{'='*60}")
-        logger.info(f"⏳ Next check in {sleep_duration_seconds / 60} minutes...")
-        logger.info(f"{'='*60}\n")
-        time.sleep(sleep_duration_seconds)
+        # 5. Wait for new mail
+        try:
+            if cycle_failed:
+                logger.info(f"⏳ Retrying in {settings.IMAP_POLL_INTERVAL_SECONDS} seconds...")
+                time.sleep(settings.IMAP_POLL_INTERVAL_SECONDS)
+            else:
+                logger.info("⏳ Waiting for new mail...")
+                inbox.wait_for_mail()
+        except Exception as e:
+            logger.warning(f"⚠️  Waiting for new mail failed ({e}). Reconnecting...")
+            inbox.close()
 
 
 def listen_email_old():
@@ -0,0 +1,96 @@
+"""
+Concurrent scrape orchestration for an email cycle.
+
+A cycle that finds several new digest links (for example a backlog after
+downtime) runs their scrape_link jobs in parallel on SCRAPER_WORKERS threads
+instead of one after another. Each job still runs the full pipeline
+(homepage, DMS, detail pages, DB save, email).
+
+- Per-URL advisory locks inside scrape_link keep the duplicate check and the
+  final ScrapedEmailLog write of one link atomic, across threads and across
+  processes (e.g. a manual scrape running at the same time).
+- All jobs share the scraper's pooled HTTP session (http_client).
+- Each job gets its own ProgressTracker labelled with the job, so section logs
+  stay attributable. The cycle's tracker shows one progress bar over jobs
+  and logs each job's outcome.
+
+Usage:
+    from app.modules.scraper.orchestrator import run_scrape_jobs
+
+    counts = run_scrape_jobs(emails_data, tracker)
+    # {"success": 3, "skipped": 1, "failed": 0}
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.core import metrics
+
+from .progress_tracker import ProgressTracker, logger
+
+
+def run_scrape_jobs(
+    emails: List[dict],
+    tracker: Optional[ProgressTracker] = None,
+    workers: Optional[int] = None,
+    scrape: Optional[Callable[..., str]] = None,
+    failed_emails: Optional[List[dict]] = None,
+) -> Dict[str, int]:
+    """
+    Scrape the tender link of every email, up to `workers` at a time.
+
+    Args:
+        emails: Email dicts from InboxSync / partition_unprocessed_emails
+        tracker: The cycle's tracker, for the job progress bar and outcomes
+        workers: Parallel jobs (default SCRAPER_WORKERS)
+        scrape: The job function (default scrape_link)
+        failed_emails: If given, the emails whose job failed are appended to it
+
+    Returns:
+        Number of jobs per outcome: "success", "skipped", "failed"
+    """
+    if scrape is None:
+        from .main import scrape_link as scrape
+    tracker = tracker or ProgressTracker(verbose=False)
+    workers = max(1, min(workers or settings.SCRAPER_WORKERS, len(emails) or 1))
+    counts = {"success": 0, "skipped": 0, "failed": 0}
+    if not emails:
+        return counts
+
+    waiting = metrics.QUEUE_DEPTH.labels("scrape_jobs")
+
+    def run(job: str, email_info: dict) -> str:
+        waiting.dec()
+        start = time.monotonic()
+        try:
+            status = scrape(
+                link=email_info['tender_url'],
+                email_info=email_info,
+                # Parallel jobs would interleave their progress bars; they log instead
+                tracker=ProgressTracker(verbose=workers == 1, job=job),
+            )
+            status = status if status in counts else "success"
+        except Exception:
+            # scrape_link has already logged the failure, also to ScrapedEmailLog
+            status = "failed"
+            if failed_emails is not None:
+                failed_emails.append(email_info)
+        tracker.log_job_status(job, email_info['tender_url'], status, time.monotonic() - start)
+        return status
+
+    logger.info(f"🧵 Scraping {len(emails)} links with {workers} workers")
+    job_progress = tracker.create_job_progress_bar(len(emails))
+    waiting.inc(len(emails))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-job") as executor:
+        futures = [
+            executor.submit(run, f"job {number}/{len(emails)}", email_info)
+            for number, email_info in enumerate(emails, 1)
+        ]
+        for future in as_completed(futures):
+            counts[future.result()] += 1
+            if job_progress:
+                job_progress.update(1)
+    tracker.close_progress_bar("jobs")
+    return counts
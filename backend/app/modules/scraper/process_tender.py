@@ -6,8 +6,8 @@ import uuid
 
 from app.modules.askai.models.document import ProcessingStage, ProcessingStatus, UploadJob
 from app.modules.scraper.data_models import TenderDetailPage
-from app.core.services import vector_store, pdf_processor, weaviate_client, excel_processor, llm_model
-from app.core.global_stores import upload_jobs
+from app.core.services import get_llm_model, get_pdf_processor, get_vector_store
+from app.core.job_store import get_job_store
 from app.db.database import SessionLocal
 from app.modules.scraper.db.schema import ScrapedTender
 from app.modules.tenderiq.db.repository import TenderRepository
@@ -28,6 +28,7 @@ def start_tender_processing(tender: TenderDetailPage):
         print("❌ Tender ID not found, cannot process.")
         return
     
+    vector_store = get_vector_store()
     if not vector_store:
         print("❌ Vector store is not initialized, cannot process.")
         return
@@ -57,7 +58,7 @@ def start_tender_processing(tender: TenderDetailPage):
                 doc_id = str(uuid.uuid4())
                 job_id = str(uuid.uuid4()) # For progress tracking within the processor
 
-                upload_jobs[job_id] = UploadJob(
+                get_job_store().create(UploadJob(
                     job_id = job_id,
                     status=ProcessingStatus.QUEUED,
                     chat_id=str(tender_id),
@@ -67,11 +68,11 @@ def start_tender_processing(tender: TenderDetailPage):
                     finished_at="",
                     chunks_added=0,
                     error=None
-                )
+                ))
 
                 # NOTE: Assuming all files are PDFs for now.
                 if file_info.file_name.lower().endswith('.pdf'):
-                    chunks, stats = pdf_processor.process_pdf(
+                    chunks, stats = get_pdf_processor().process_pdf(
                         job_id=job_id,
                         pdf_path=temp_file_path,
                         doc_id=doc_id,
@@ -148,7 +149,7 @@ QUESTION: {question}
 ANSWER:"""
 
             try:
-                response = llm_model.generate_content(prompt)
+                response = get_llm_model().generate_content(prompt)
                 answer = response.text.strip()
                 answer_stripped = answer[:100].replace('\n', ' ')
                 print(f"  🗣️ LLM Response: {answer_stripped}...")
@@ -16,11 +16,14 @@ Progress Bars:
 """
 
 import logging
+import re
 from typing import Optional
 from tqdm import tqdm
 from datetime import datetime
 import sys
 
+from app.core import metrics
+
 # ==================== Logging Configuration ====================
 
 
@@ -70,14 +73,17 @@ logger = setup_scraper_logger()
 class ProgressTracker:
     """Centralized progress tracking for all scraper operations"""
 
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, job: Optional[str] = None):
         """
         Initialize progress tracker.
 
         Args:
             verbose: Whether to show detailed progress output
+            job: Label prefixed to section logs when several scrape jobs run at once
         """
         self.verbose = verbose
+        self.job = job
+        self.prefix = f"[{job}] " if job else ""
         self.progress_bars = {}
 
     def create_email_progress_bar(self, total: int) -> tqdm:
@@ -224,6 +230,43 @@ class ProgressTracker:
         logger.info(f"Query Processing Started: {query_name} ({total} tenders)")
         return bar
 
+    def create_job_progress_bar(self, total: int) -> tqdm:
+        """
+        Create progress bar for concurrent scrape jobs.
+
+        Args:
+            total: Total number of scrape jobs
+
+        Returns:
+            tqdm progress bar instance
+        """
+        if total == 0:
+            return None
+
+        bar = tqdm(
+            total=total,
+            desc="🧵 Scrape Jobs",
+            unit="job",
+            bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
+            disable=not self.verbose,
+        )
+        self.progress_bars["jobs"] = bar
+        logger.info(f"Scrape Jobs Started: {total} jobs")
+        return bar
+
+    def log_job_status(self, job: str, link: str, status: str, duration: float):
+        """
+        Log the outcome of one scrape job.
+
+        Args:
+            job: Job label
+            link: The digest link it scraped
+            status: "success", "skipped" or "failed"
+            duration: Seconds the job ran
+        """
+        icon = {"success": "✅", "skipped": "⏭️ ", "failed": "❌"}.get(status, "ℹ️ ")
+        logger.info(f"{icon} [{job}] {status} in {duration:.2f}s: {link}")
+
     def create_deduplication_progress_bar(self, total: int) -> tqdm:
         """
         Create progress bar for deduplication check.
@@ -304,7 +347,7 @@ class ProgressTracker:
             section_name: Name of the section
         """
         logger.info(f"\n{'='*60}")
-        logger.info(f"📍 {section_name}")
+        logger.info(f"📍 {self.prefix}{section_name}")
         logger.info(f"{'='*60}")
 
     def log_info(self, message: str):
@@ -318,13 +361,13 @@ class ProgressTracker:
     def log_error(self, message: str, exc: Optional[Exception] = None):
         """Log error message with optional exception"""
         if exc:
-            logger.error(f"{message}\nException: {type(exc).__name__}: {str(exc)}")
+            logger.error(f"{self.prefix}{message}\nException: {type(exc).__name__}: {str(exc)}")
         else:
-            logger.error(message)
+            logger.error(f"{self.prefix}{message}")
 
     def log_success(self, message: str):
         """Log success message"""
-        logger.info(f"✅ {message}")
+        logger.info(f"✅ {self.prefix}{message}")
 
     def log_stats(self, stats: dict):
         """
@@ -345,7 +388,7 @@ class ProgressTracker:
             summary: Dictionary with execution summary data
         """
         logger.info(f"\n{'='*60}")
-        logger.info("✨ Execution Summary")
+        logger.info(f"✨ {self.prefix}Execution Summary")
         logger.info(f"{'='*60}")
         for key, value in summary.items():
             logger.info(f"{key}: {value}")
@@ -356,11 +399,13 @@ class ProgressTracker:
 
 
 class ScrapeSection:
-    """Context manager for tracking scraping sections"""
+    """Context manager for tracking scraping sections; durations also go to SCRAPE_SECTION_SECONDS"""
 
     def __init__(self, tracker: ProgressTracker, section_name: str):
         self.tracker = tracker
         self.section_name = section_name
+        # "Email Sync Cycle #12" is recorded as "Email Sync Cycle"
+        self.metric_section = re.sub(r"\s*#\d+$", "", section_name)
         self.start_time = None
 
     def __enter__(self):
@@ -370,6 +415,7 @@ class ScrapeSection:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         duration = (datetime.now() - self.start_time).total_seconds()
+        metrics.SCRAPE_SECTION_SECONDS.labels(self.metric_section, "error" if exc_type else "ok").observe(duration)
         if exc_type:
             self.tracker.log_error(
                 f"{self.section_name} failed", exc_val
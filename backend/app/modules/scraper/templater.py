@@ -1,11 +1,40 @@
-from bs4 import BeautifulSoup
-import copy
+"""
+Digest email rendering.
+
+template.html is compiled once per process into a Jinja2 template. The
+compile step fills one query row and one tender row with placeholders,
+runs the page through BeautifulSoup prettify and premailer (template.css
+inlined) exactly as a digest used to be rendered, and turns the result into
+a template with loops around the rows. Rendering a digest then only
+substitutes values. Placeholders are escaped and stripped the way
+BeautifulSoup printed them, so the output is unchanged. The template and
+CSS are found next to this module, whatever the working directory.
+
+Usage:
+    from app.modules.scraper.templater import generate_email, render_email_chunks
+
+    html = generate_email(homepage)          # the full email HTML
+    for chunk in render_email_chunks(homepage):
+        ...                                  # streamed rendering
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from bs4 import BeautifulSoup, Comment
+from bs4.formatter import HTMLFormatter
+import jinja2
 import premailer
 
 from .data_models import HomePageData
 
+TEMPLATE_DIR = Path(__file__).resolve().parent
+
 p = premailer.Premailer(
-        allow_loading_external_files=True
+        allow_loading_external_files=True,
+        base_path=str(TEMPLATE_DIR)
     )
 
 def apply_multi_column_table_layout(soup, container_element, align_last_right=False):
@@ -133,147 +162,167 @@ def reformat_page(soup: BeautifulSoup) -> BeautifulSoup:
     return soup
 
 
-def generate_email(data: HomePageData) -> BeautifulSoup:
+# ============================================================================
+# COMPILED DIGEST TEMPLATE
+# ============================================================================
+
+_formatter = HTMLFormatter.REGISTRY["minimal"]
+
+
+def _text_line(value: str, indent: str, closing_indent: str) -> str:
     """
-    Generates an email HTML string from a HomePageData object.
+    A text node as prettify printed it: stripped, on its own indented line
+    followed by the closing tag's indentation. Blank text prints nothing.
     """
-    # Import the exsiting HTML template
-    with open('./template.html', 'r') as f:
-        template_html = f.read()
+    text = _formatter.substitute(str(value)).strip()
+    return f"{indent}{text}\n{closing_indent}" if text else ""
+
+
+def _attribute(value: str) -> str:
+    return _formatter.quoted_attribute_value(_formatter.attribute_value(str(value)))
+
+
+def _set_text(element, expression: str):
+    element.string = f"@@text:{expression}@@"
+
+
+def _wrap_in_loop(element, loop: str):
+    element.insert_before(Comment(f"@@{loop}@@"))
+    element.insert_after(Comment("@@endfor@@"))
+
+
+def _build_skeleton() -> str:
+    """template.html with one placeholder row per loop, prettified and CSS-inlined"""
+    template_html = (TEMPLATE_DIR / "template.html").read_text()
 
     # Create a new BeautifulSoup object from the template HTML
     soup = BeautifulSoup(template_html, 'html.parser')
 
     # Get the elements
     ## Header section
-    date_elem = soup.find('td', attrs={'id': 'date'})
-    if not date_elem:
-        raise Exception("Date element not found")
-    contact_elem = soup.find('td', attrs={'id': 'contact'})
-    if not contact_elem:
-        raise Exception("Contact element not found")
-    name_elem = soup.find('h4', attrs={'id': 'name'})
-    if not name_elem:
-        raise Exception("Name element not found")
-    company_elem = soup.find('td', attrs={'id': 'company'})
-    if not company_elem:
-        raise Exception("Company element not found")
-    no_of_new_tenders_elem = soup.find('span', attrs={'id': 'no_of_new_tenders'})
-    if not no_of_new_tenders_elem:
-        raise Exception("No of new tenders element not found")
-
-    # Set the values
-    date_elem.string = data.header.date
-    contact_elem.string = data.header.contact
-    name_elem.string = data.header.name
-    company_elem.string = data.header.company
-    no_of_new_tenders_elem.string = data.header.no_of_new_tenders
-
-    # The queries table
+    header_elements = {
+        'date': soup.find('td', attrs={'id': 'date'}),
+        'contact': soup.find('td', attrs={'id': 'contact'}),
+        'name': soup.find('h4', attrs={'id': 'name'}),
+        'company': soup.find('td', attrs={'id': 'company'}),
+        'no_of_new_tenders': soup.find('span', attrs={'id': 'no_of_new_tenders'}),
+    }
+    for field, element in header_elements.items():
+        if not element:
+            raise Exception(f"{field} element not found")
+        _set_text(element, f"data.header.{field}")
+
+    # The queries table: one row per query
     queries_table_elem = soup.find('table', attrs={'id': 'queries'})
     if not queries_table_elem:
         raise Exception("Queries table not found")
     queries_table_body = queries_table_elem.find('tbody')
     if not queries_table_body:
         raise Exception("Queries table body not found")
-
-    # Inside queries_table_body, there will be a class query_tender_row.
-    # Grab the element, save it in memory for appending, decompose the original one
     query_tender_row_elem = queries_table_body.find('tr', attrs={'class': 'query_tender_row'})
     if not query_tender_row_elem:
         raise Exception("Query tender row not found")
-    # query_tender_row_elem.decompose()
-    # Now we can append the new tender rows to the table body
-    for tender in data.query_table:
-        new_query_tender_row = copy.copy(query_tender_row_elem)
-        # Classes available in new_query_tender_row:
-        #   query_tender_row_query
-        #   query_tender_row_no_of_tenders_found
-        query_tender_row_query = new_query_tender_row.find('td', attrs={'class': 'query_tender_row_query'})
-        if query_tender_row_query:
-            query_tender_row_query.string = tender.query_name
-        query_tender_row_no_of_tenders_found = new_query_tender_row.find('td', attrs={'class': 'query_tender_row_no_of_tenders_found'})
-        if query_tender_row_no_of_tenders_found:
-            query_tender_row_no_of_tenders_found.string = tender.number_of_tenders
-        queries_table_body.append(new_query_tender_row)
-    query_tender_row_elem.decompose()
-
-    # The tenders div
+    query_tender_row_query = query_tender_row_elem.find('td', attrs={'class': 'query_tender_row_query'})
+    if query_tender_row_query:
+        _set_text(query_tender_row_query, "query.query_name")
+    query_tender_row_no_of_tenders_found = query_tender_row_elem.find('td', attrs={'class': 'query_tender_row_no_of_tenders_found'})
+    if query_tender_row_no_of_tenders_found:
+        _set_text(query_tender_row_no_of_tenders_found, "query.number_of_tenders")
+    _wrap_in_loop(query_tender_row_elem, "for query in data.query_table")
+
+    # The tenders div: one table per query, one row per tender
     tenders_div_elem = soup.find('div', attrs={'id': 'tenders'})
     if not tenders_div_elem:
         raise Exception("Tenders div not found")
-
-    # Inside tenders_div_elem, there will be a table
-    # Grab the element, save it in memory for appending, decompose the original one
     tenders_table_elem = tenders_div_elem.find('table')
     if not tenders_table_elem:
         raise Exception("Tenders table not found")
-
-    for query in data.query_table:
-        new_query_table = copy.copy(tenders_table_elem)
-        # Classes available in new_tender_table:
-        #   tender_query_table_tender_name
-        #   tender_table
-        tender_query_table_tender_name = new_query_table.find('td', attrs={'class': 'tender_query_table_tender_name'})
-        if not tender_query_table_tender_name:
-            raise Exception("Tender query table tender name not found")
-        tender_query_table_tender_name.string = query.query_name
-
-        tender_query_table_body = new_query_table.find('tbody')
-        if not tender_query_table_body:
-            raise Exception("Tender query table body not found")
-        tender_table = tender_query_table_body.find('tr')
-        if not tender_table:
-            raise Exception("Tender table not found")
-        for tender_data in query.tenders:
-            new_tender_table = copy.copy(tender_table)
-            if not new_tender_table:
-                raise Exception("New tender table not found")
-            # Classes available in new_tender_table:
-            #   tender_table_tender_name_and_number
-            #   tender_table_tender_city
-            #   tender_table_tender_summary
-            #   tender_table_tender_value
-            #   tender_table_tender_due_date
-            #   tender_table_view_tender_link
-            tender_table_tender_name_and_number = new_tender_table.find('td', attrs={'class': 'tender_table_tender_name_and_number'})
-            if not tender_table_tender_name_and_number:
-                raise Exception("Tender table tender name and number not found")
-            tender_table_tender_name_and_number.string = tender_data.tender_name
-            tender_table_tender_city = new_tender_table.find('td', attrs={'class': 'tender_table_tender_city'})
-            if not tender_table_tender_city:
-                raise Exception("Tender table tender city not found")
-            tender_table_tender_city.string = tender_data.city
-            tender_table_tender_summary = new_tender_table.find('td', attrs={'class': 'tender_table_tender_summary'})
-            if not tender_table_tender_summary:
-                raise Exception("Tender table tender summary not found")
-            tender_table_tender_summary.string = tender_data.summary
-            tender_table_tender_value = new_tender_table.find('span', attrs={'class': 'tender_table_tender_value'})
-            if not tender_table_tender_value:
-                raise Exception("Tender table tender value not found")
-            tender_table_tender_value.string = tender_data.value
-            tender_table_tender_due_date = new_tender_table.find('span', attrs={'class': 'tender_table_tender_due_date'})
-            if not tender_table_tender_due_date:
-                raise Exception("Tender table tender due date not found")
-            tender_table_tender_due_date.string = tender_data.due_date
-            tender_table_view_tender_link = new_tender_table.find('a', attrs={'class': 'tender_table_view_tender_link'})
-            if not tender_table_view_tender_link:
-                raise Exception("Tender table view tender link not found")
-            tender_table_view_tender_link['href'] = tender_data.tender_url
-            tender_table_redirect_to_website = new_tender_table.find('a', attrs={'class': 'tender_table_redirect_to_website'})
-            if not tender_table_redirect_to_website:
-                raise Exception("Tender table redirect to website not found")
-            # TODO: Update this link to point to the DMSIQ frontend when available
-            tender_table_redirect_to_website['href'] = tender_data.tender_url
-
-            tender_query_table_body.append(new_tender_table)
-
-        tender_table.decompose()
-
-        tenders_div_elem.append(new_query_table)
-
-    tenders_table_elem.decompose()
+    tender_query_table_tender_name = tenders_table_elem.find('td', attrs={'class': 'tender_query_table_tender_name'})
+    if not tender_query_table_tender_name:
+        raise Exception("Tender query table tender name not found")
+    _set_text(tender_query_table_tender_name, "query.query_name")
+    tender_query_table_body = tenders_table_elem.find('tbody')
+    if not tender_query_table_body:
+        raise Exception("Tender query table body not found")
+    tender_table = tender_query_table_body.find('tr')
+    if not tender_table:
+        raise Exception("Tender table not found")
+
+    tender_fields = {
+        ('td', 'tender_table_tender_name_and_number'): "tender.tender_name",
+        ('td', 'tender_table_tender_city'): "tender.city",
+        ('td', 'tender_table_tender_summary'): "tender.summary",
+        ('span', 'tender_table_tender_value'): "tender.value",
+        ('span', 'tender_table_tender_due_date'): "tender.due_date",
+    }
+    for (tag, css_class), expression in tender_fields.items():
+        element = tender_table.find(tag, attrs={'class': css_class})
+        if not element:
+            raise Exception(f"Tender table {css_class} not found")
+        _set_text(element, expression)
+    # TODO: Point tender_table_redirect_to_website to the DMSIQ frontend when available
+    for css_class in ('tender_table_view_tender_link', 'tender_table_redirect_to_website'):
+        link = tender_table.find('a', attrs={'class': css_class})
+        if not link:
+            raise Exception(f"Tender table {css_class} not found")
+        link['href'] = "@@attr:tender.tender_url@@"
+    _wrap_in_loop(tender_table, "for tender in query.tenders")
+    _wrap_in_loop(tenders_table_elem, "for query in data.query_table")
 
     transformed = p.transform(soup.prettify())
+    return str(BeautifulSoup(transformed, 'html.parser'))
+
+
+_PLACEHOLDER = re.compile(
+    r'[ \t]*<!--@@(?P<statement>(?:for [\w. ]+|endfor))@@-->\n?'
+    r'|(?P<indent>[ \t]*)@@text:(?P<text>[\w.]+)@@\n(?P<closing_indent>[ \t]*)'
+    r'|"@@attr:(?P<attr>[\w.]+)@@"'
+)
+
+
+def _skeleton_to_jinja(skeleton: str) -> str:
+    parts = []
+    position = 0
+    for match in _PLACEHOLDER.finditer(skeleton):
+        static = skeleton[position:match.start()]
+        if static:
+            parts.append("{% raw %}" + static + "{% endraw %}")
+        if match.group("statement"):
+            parts.append("{% " + match.group("statement") + " %}")
+        elif match.group("text"):
+            indents = repr(match.group("indent")) + ", " + repr(match.group("closing_indent"))
+            parts.append("{{ " + match.group("text") + "|text_line(" + indents + ") }}")
+        else:
+            parts.append("{{ " + match.group("attr") + "|attribute }}")
+        position = match.end()
+    parts.append("{% raw %}" + skeleton[position:] + "{% endraw %}")
+    return "".join(parts)
+
+
+_template: Optional[jinja2.Template] = None
+_template_lock = threading.Lock()
+
+
+def get_digest_template() -> jinja2.Template:
+    """The compiled digest template, built on first use"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                environment = jinja2.Environment(autoescape=False, keep_trailing_newline=True)
+                environment.filters["text_line"] = _text_line
+                environment.filters["attribute"] = _attribute
+                _template = environment.from_string(_skeleton_to_jinja(_build_skeleton()))
+    return _template
 
-    return BeautifulSoup(transformed, 'html.parser')
+
+def render_email_chunks(data: HomePageData) -> Iterator[str]:
+    """Stream the digest email HTML in chunks"""
+    return get_digest_template().generate(data=data)
+
+
+def generate_email(data: HomePageData) -> str:
+    """
+    Generates an email HTML string from a HomePageData object.
+    """
+    return "".join(render_email_chunks(data))
@@ -1,11 +1,11 @@
 
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from dateutil import parser
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.modules.tenderiq.db.schema import Tender, TenderActionHistory, TenderActionEnum, TenderWishlist
+from sqlalchemy import desc, func
+from app.modules.tenderiq.db.schema import Tender, TenderActionHistory, TenderActionEnum, TenderWishlist, TenderVersion, TenderFieldChange, TenderPageFingerprint
 from app.modules.scraper.db.schema import ScrapedTender
 
 
@@ -72,6 +72,17 @@ class TenderRepository:
             # Re-raise to let the caller handle it
             raise
     
+    def get_deadlines_in_window(
+        self, deadline_after: datetime, deadline_before: datetime, statuses: Iterable[str]
+    ) -> List[Tuple[str, datetime]]:
+        """(tender_ref_number, submission_deadline) of open tenders in a window, nearest deadline first"""
+        return [tuple(row) for row in self.db.query(Tender.tender_ref_number, Tender.submission_deadline).filter(
+            Tender.tender_ref_number.isnot(None),
+            Tender.submission_deadline > deadline_after,
+            Tender.submission_deadline < deadline_before,
+            Tender.status.in_(list(statuses))
+        ).order_by(Tender.submission_deadline).all()]
+
     def get_tenders_by_flag(self, flag_name: str, flag_value: bool = True) -> list[Tender]:
         """
         Gets all Tenders where a specific boolean flag is set to the given value.
@@ -123,6 +134,62 @@ class TenderRepository:
         tender = self.db.query(Tender).filter(Tender.id == tender_id).first()
         return tender
 
+class TenderVersionRepository:
+    """Repository for the append-only tender version store"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_latest(self, tender_ref_number: str) -> Optional[TenderVersion]:
+        """The highest version of a tender (uq_tender_versions_ref_version index)"""
+        return self.db.query(TenderVersion).filter(
+            TenderVersion.tender_ref_number == tender_ref_number
+        ).order_by(desc(TenderVersion.version)).first()
+
+    def get_history(self, tender_ref_number: str) -> List[TenderVersion]:
+        """Versions that changed something, newest first"""
+        return self.db.query(TenderVersion).filter(
+            TenderVersion.tender_ref_number == tender_ref_number,
+            TenderVersion.change_count > 0
+        ).order_by(desc(TenderVersion.version)).all()
+
+    def get_latest_changes(self, tender_ref_number: str) -> List[TenderFieldChange]:
+        """Field changes of the latest version, in one query"""
+        latest_version = self.db.query(func.max(TenderVersion.version)).filter(
+            TenderVersion.tender_ref_number == tender_ref_number
+        ).scalar_subquery()
+        return self.db.query(TenderFieldChange).filter(
+            TenderFieldChange.tender_ref_number == tender_ref_number,
+            TenderFieldChange.version == latest_version
+        ).all()
+
+    def add(self, version: TenderVersion, changes: List[TenderFieldChange]) -> TenderVersion:
+        """Append a version with its field changes. Callers serialise per tender."""
+        version.changes = changes
+        self.db.add(version)
+        self.db.commit()
+        self.db.refresh(version)
+        return version
+
+class TenderPageFingerprintRepository:
+    """Repository for the detail-page state kept by the corrigendum check"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_many(self, tender_ref_numbers: List[str]) -> Dict[str, TenderPageFingerprint]:
+        """Fingerprints of a batch of tenders, in one query"""
+        if not tender_ref_numbers:
+            return {}
+        rows = self.db.query(TenderPageFingerprint).filter(
+            TenderPageFingerprint.tender_ref_number.in_(tender_ref_numbers)
+        ).all()
+        return {row.tender_ref_number: row for row in rows}
+
+    def save_all(self, fingerprints: List[TenderPageFingerprint]) -> None:
+        self.db.add_all(fingerprints)
+        self.db.commit()
+
 # ==================== NEW: WISHLIST REPOSITORY METHODS ====================
 
 class TenderWishlistRepository:
@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import datetime, timezone
 from sqlalchemy import (Column, String, DateTime, ForeignKey, Text, JSON,
-Integer, Boolean, Enum, Numeric, Float)
+Integer, Boolean, Enum, Numeric, Float, Index, UniqueConstraint)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -204,3 +204,83 @@ class TenderWishlist(Base):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'added_to_wishlist_at': self.added_to_wishlist_at.isoformat() if self.added_to_wishlist_at else None,
         }
+
+
+class TenderVersion(Base):
+    """
+    Append-only snapshot of a tender's tracked fields.
+
+    A row is added only when a scrape differs from the latest version
+    (compared by content_hash). Versions are numbered 1, 2, 3... per
+    tender_ref_number. The history columns (history_type, from_date/to_date,
+    note, change_count) are computed once when the version is written.
+    Versions migrated from note-only corrigendum logs have no snapshot or hash.
+    """
+    __tablename__ = 'tender_versions'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tender_ref_number = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    snapshot = Column(JSON, nullable=True)  # tracked field -> normalised value
+    scraped_tender_id = Column(UUID(as_uuid=True), ForeignKey('scraped_tenders.id', ondelete='SET NULL'), nullable=True)
+
+    change_count = Column(Integer, default=0, nullable=False)
+    history_type = Column(String(50), nullable=True)  # TenderHistoryType, None for the first version
+    from_date = Column(DateTime, nullable=True)
+    to_date = Column(DateTime, nullable=True)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    changes = relationship("TenderFieldChange", back_populates="tender_version", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        UniqueConstraint('tender_ref_number', 'version', name='uq_tender_versions_ref_version'),
+    )
+
+
+class TenderFieldChange(Base):
+    """
+    One field that changed between a tender version and the one before it.
+
+    Values are kept as text and, by kind, as a parsed amount or date.
+    """
+    __tablename__ = 'tender_field_changes'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tender_version_id = Column(UUID(as_uuid=True), ForeignKey('tender_versions.id', ondelete='CASCADE'), nullable=False)
+    tender_ref_number = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    field = Column(String(100), nullable=False)
+    change_type = Column(String(20), nullable=False)  # added, updated, removed
+    value_kind = Column(String(20), nullable=False)  # amount, date, text
+    old_value = Column(Text, nullable=True)
+    new_value = Column(Text, nullable=True)
+    old_amount = Column(Numeric, nullable=True)
+    new_amount = Column(Numeric, nullable=True)
+    old_date = Column(DateTime, nullable=True)
+    new_date = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    tender_version = relationship("TenderVersion", back_populates="changes")
+
+    __table_args__ = (
+        Index('ix_tender_field_changes_ref_version', 'tender_ref_number', 'version'),
+        Index('ix_tender_field_changes_ref_field', 'tender_ref_number', 'field'),
+    )
+
+
+class TenderPageFingerprint(Base):
+    """
+    Last seen state of a tender's detail page, for the periodic corrigendum check.
+
+    etag/last_modified are the validators the portal sent, replayed as
+    If-None-Match/If-Modified-Since. fingerprint is the hash of the page's
+    normalised text; a page with the same fingerprint is not parsed again.
+    """
+    __tablename__ = 'tender_page_fingerprints'
+    tender_ref_number = Column(String, primary_key=True)
+    url = Column(String, nullable=False)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)  # HTTP-date, as received
+    fingerprint = Column(String(64), nullable=True)
+    checked_at = Column(DateTime, nullable=True)
+    changed_at = Column(DateTime, nullable=True)  # Last time the fingerprint changed
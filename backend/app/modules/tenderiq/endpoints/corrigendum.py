@@ -20,7 +20,6 @@ from app.modules.auth.services.auth_service import get_current_active_user
 from app.modules.auth.db.schema import User
 from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
 from app.modules.tenderiq.models.pydantic_models import TenderHistoryItem
-from app.modules.scraper.db.schema import ScrapedTender
 
 
 router = APIRouter(prefix="/corrigendum", tags=["TenderIQ - Corrigendum Tracking"])
@@ -77,24 +76,13 @@ def get_tender_changes(
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get detected changes for a tender (compares with latest scraped data).
+    Get detected changes for a tender (the changes of its latest version).
     
     This endpoint is useful for showing "A corrigendum was detected" notifications.
     """
     service = CorrigendumTrackingService(db)
     
-    # Get latest scraped data for this tender
-    latest_scraped = db.query(ScrapedTender).filter(
-        ScrapedTender.tender_id_str == tender_id
-    ).order_by(ScrapedTender.scraped_at.desc()).first()
-    
-    if not latest_scraped:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No scraped data found for this tender"
-        )
-    
-    changes = service.detect_changes(tender_id, latest_scraped)
+    changes = service.get_latest_changes(tender_id)
     
     return [service._format_change(change) for change in changes]
 
@@ -109,24 +97,12 @@ def apply_corrigendum(
     """
     Apply corrigendum changes to a tender.
     
-    This updates the tender with new values and logs the changes.
+    This updates the tender with the values of its latest version and logs the changes.
     """
     service = CorrigendumTrackingService(db)
     
-    # Get latest scraped data
-    latest_scraped = db.query(ScrapedTender).filter(
-        ScrapedTender.tender_id_str == tender_id
-    ).order_by(ScrapedTender.scraped_at.desc()).first()
-    
-    if not latest_scraped:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No scraped data found for this tender"
-        )
-    
     result = service.apply_corrigendum(
         tender_id=tender_id,
-        new_scraped_data=latest_scraped,
         user_id=current_user.id,
         corrigendum_note=request.note
     )
@@ -166,24 +142,20 @@ def check_for_changes(
     """
     service = CorrigendumTrackingService(db)
     
-    # Get latest scraped data
-    latest_scraped = db.query(ScrapedTender).filter(
-        ScrapedTender.tender_id_str == tender_id
-    ).order_by(ScrapedTender.scraped_at.desc()).first()
+    # The latest version carries its change count
+    latest = service.versions.get_latest(tender_id)
     
-    if not latest_scraped:
+    if not latest:
         return {
             "has_changes": False,
             "change_count": 0,
             "message": "No scraped data available"
         }
     
-    changes = service.detect_changes(tender_id, latest_scraped)
-    
     return {
-        "has_changes": len(changes) > 0,
-        "change_count": len(changes),
-        "message": f"{len(changes)} field(s) changed" if changes else "No changes detected"
+        "has_changes": latest.change_count > 0,
+        "change_count": latest.change_count,
+        "message": f"{latest.change_count} field(s) changed" if latest.change_count else "No changes detected"
     }
 
 
@@ -212,18 +184,7 @@ def get_tender_comparison_view(
             detail="Tender not found"
         )
     
-    # Get latest scraped data
-    latest_scraped = db.query(ScrapedTender).filter(
-        ScrapedTender.tender_id_str == tender_id
-    ).order_by(ScrapedTender.scraped_at.desc()).first()
-    
-    if not latest_scraped:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No scraped data found"
-        )
-    
-    changes = service.detect_changes(tender_id, latest_scraped)
+    changes = service.get_latest_changes(tender_id)
     
     comparison = {
         "tender_id": tender_id,
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, Literal
 from uuid import UUID
 
+from app.config import settings
 from app.db.database import get_db_session
 from app.modules.auth.services.auth_service import get_current_active_user
 from app.modules.auth.db.schema import User
@@ -17,8 +18,9 @@ from app.modules.tenderiq.models.pydantic_models import (
     FilteredTendersResponse,
     TenderActionRequest,
     HistoryData,
+    SimilarTendersResponse,
 )
-from app.modules.tenderiq.services import tender_service
+from app.modules.tenderiq.services import tender_service, tender_similarity_service
 from app.modules.tenderiq.services.tender_filter_service import TenderFilterService
 from app.modules.tenderiq.services.tender_action_service import TenderActionService
 from app.modules.tenderiq.db.repository import TenderWishlistRepository
@@ -162,6 +164,42 @@ def get_full_tender_details(
         )
 
 
+@router.get(
+    "/tenders/{tender_id}/similar",
+    response_model=SimilarTendersResponse,
+    tags=["TenderIQ"],
+    summary="Find past tenders similar to a given tender",
+)
+def get_similar_tenders(
+    tender_id: UUID,
+    top_k: int = Query(settings.TENDER_SIMILARITY_TOP_K, ge=1, le=50, description="Number of similar tenders to return"),
+    state: Optional[str] = Query(None, description="Only return tenders from this state"),
+    min_value: Optional[float] = Query(None, description="Minimum tender value in crore"),
+    max_value: Optional[float] = Query(None, description="Maximum tender value in crore"),
+    published_after: Optional[str] = Query(None, description="Earliest publish date in YYYY-MM-DD format"),
+    published_before: Optional[str] = Query(None, description="Latest publish date in YYYY-MM-DD format"),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Returns the nearest neighbours of a tender in the cross-tender similarity index,
+    built from tender name, brief and details. Each tender appears at most once,
+    even if it was scraped several times.
+    """
+    try:
+        similar = tender_similarity_service.find_similar_tenders(
+            db, tender_id, top_k, state, min_value, max_value, published_after, published_before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not similar:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tender not found.",
+        )
+    return similar
+
+
 @router.get(
     "/wishlist",
     response_model=list[Tender],
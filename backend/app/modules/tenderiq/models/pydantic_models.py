@@ -559,3 +559,28 @@ class FilteredTendersResponse(BaseModel):
     available_dates: list[str]  # List of all available dates in YYYY-MM-DD format
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ==================== Similar Tenders Models ====================
+
+class SimilarTender(BaseModel):
+    """A neighbour returned by the cross-tender similarity index"""
+    id: UUID  # Latest ScrapedTender row for this tender
+    tender_id_str: str
+    tender_name: Optional[str] = None
+    tendering_authority: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    tender_value: Optional[str] = None
+    publish_date: Optional[str] = None
+    similarity: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SimilarTendersResponse(BaseModel):
+    """Response for GET /api/v1/tenderiq/tenders/{tender_id}/similar"""
+    tender_id: UUID
+    tender_id_str: str
+    results: list[SimilarTender]
+    filtered_by: dict  # Structured filters applied to the search
@@ -0,0 +1,258 @@
+"""
+Periodic corrigendum check of active tenders.
+
+check_active_tenders() re-fetches the tenderdetail.com detail page of every
+open tender whose submission deadline is in the next
+CORRIGENDUM_CHECK_WINDOW_DAYS, nearest deadline first. A changed page is
+recorded as a new tender version (CorrigendumTrackingService.record_version).
+
+Each page stops at the first check that settles it:
+1. A conditional GET replays the validators stored in tender_page_fingerprints
+   (If-None-Match / If-Modified-Since). On 304 Not Modified, nothing is read.
+2. The page's normalised text is hashed. This strips scripts, styles,
+   comments, form state and markup. If the hash equals the stored
+   fingerprint, the page is not parsed or diffed.
+3. Otherwise the page is parsed, copied onto the tender's latest
+   ScrapedTender row and recorded. A version is added only when a tracked
+   field actually changed.
+
+Tenders are processed in batches of CORRIGENDUM_CHECK_BATCH_SIZE. Each batch
+loads its scraped rows in one query and its fingerprints in another. Pages
+are fetched and parsed on CORRIGENDUM_CHECK_WORKERS threads over the
+scraper's pooled HTTP session. Those threads do no database work; all writes
+happen on the calling thread. No new batch starts after
+CORRIGENDUM_CHECK_TIME_BUDGET_SECONDS, so a slow portal delays the furthest
+deadlines rather than the nearest.
+
+Usage:
+    from app.modules.tenderiq.services.corrigendum_checker import CorrigendumChecker
+
+    counts = CorrigendumChecker(db).check_active_tenders()
+    # {"checked": 1840, "not_modified": 1512, "unchanged": 301, "changed": 27, "corrigendums": 19, ...}
+"""
+
+import hashlib
+import html
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Union
+
+import requests
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import metrics
+from app.db.advisory_lock import advisory_lock
+from app.modules.scraper.data_models import TenderDetailPage
+from app.modules.scraper.db.repository import ScraperRepository
+from app.modules.scraper.db.schema import ScrapedTender
+from app.modules.scraper.detail_page_scrape import parse_tender_page
+from app.modules.scraper.http_client import http_get
+from app.modules.tenderiq.db.repository import TenderPageFingerprintRepository, TenderRepository
+from app.modules.tenderiq.db.schema import TenderPageFingerprint, TenderVersion
+from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
+
+logger = logging.getLogger(__name__)
+
+# Statuses of tenders still worth watching for corrigendums
+ACTIVE_STATUSES = ('New', 'Reviewed', 'Shortlisted', 'Bid_Preparation')
+
+_CONTENT_MARKER = "tender-details-home"
+_IGNORED_BLOCKS = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_FORM_STATE = re.compile(r"<input\b[^>]*>", re.IGNORECASE)  # Hidden per-request tokens, e.g. __VIEWSTATE
+_TAGS = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def page_fingerprint(content: Union[bytes, str]) -> str:
+    """
+    Hash of a detail page's visible text, from the tender details onwards.
+
+    Markup, scripts, styles, comments, form inputs and whitespace runs are
+    dropped, so re-rendered pages with the same content get the same hash.
+    Uses regular expressions only; the page is not parsed.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    start = content.find(_CONTENT_MARKER)
+    if start != -1:
+        content = content[max(content.rfind("<", 0, start), 0):]
+    content = _FORM_STATE.sub(" ", _IGNORED_BLOCKS.sub(" ", content))
+    text = _WHITESPACE.sub(" ", html.unescape(_TAGS.sub(" ", content))).strip()
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+@dataclass
+class PageCheck:
+    """Outcome of re-fetching one detail page"""
+    tender_ref_number: str
+    status: str  # not_modified, unchanged, changed, failed
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprint: Optional[str] = None
+    page: Optional[TenderDetailPage] = None  # Only when changed
+    error: Optional[str] = None
+
+
+def fetch_page(
+    tender_ref_number: str,
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    get: Callable[..., requests.Response] = http_get,
+) -> PageCheck:
+    """
+    Conditionally fetch a detail page and parse it only if its fingerprint changed.
+
+    Safe to run on worker threads: it touches the network, not the database.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        response = get(url, headers=headers)
+        if response.status_code == 304:
+            return PageCheck(tender_ref_number, "not_modified", etag, last_modified, fingerprint)
+        response.raise_for_status()
+
+        check = PageCheck(
+            tender_ref_number, "unchanged",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fingerprint=page_fingerprint(response.content),
+        )
+        if check.fingerprint != fingerprint:
+            check.status = "changed"
+            check.page = parse_tender_page(response.content)
+        return check
+    except Exception as e:
+        return PageCheck(tender_ref_number, "failed", error=str(e))
+
+
+class CorrigendumChecker:
+    """Batched, concurrent re-check of tender detail pages for corrigendums"""
+
+    def __init__(
+        self,
+        db: Session,
+        get: Callable[..., requests.Response] = http_get,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None,
+    ):
+        self.db = db
+        self.get = get
+        self.workers = max(1, workers or settings.CORRIGENDUM_CHECK_WORKERS)
+        self.batch_size = max(1, batch_size or settings.CORRIGENDUM_CHECK_BATCH_SIZE)
+        self.time_budget_seconds = time_budget_seconds if time_budget_seconds is not None else settings.CORRIGENDUM_CHECK_TIME_BUDGET_SECONDS
+        self.scraper_repo = ScraperRepository(db)
+        self.fingerprints = TenderPageFingerprintRepository(db)
+        self.corrigendums = CorrigendumTrackingService(db)
+
+    def check_active_tenders(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Check every open tender whose submission deadline is within the window, nearest first"""
+        now = now or datetime.now(timezone.utc)
+        deadlines = TenderRepository(self.db).get_deadlines_in_window(
+            now, now + timedelta(days=settings.CORRIGENDUM_CHECK_WINDOW_DAYS), ACTIVE_STATUSES
+        )
+        logger.info(f"Found {len(deadlines)} active tenders to check")
+        return self.check([tender_ref for tender_ref, _ in deadlines])
+
+    def check(self, tender_refs: List[str]) -> Dict[str, int]:
+        """
+        Re-check the detail pages of `tender_refs`, in the given order.
+
+        Returns:
+            Number of tenders per outcome. "changed" pages were parsed;
+            "corrigendums" of them changed a tracked field. "no_url" tenders
+            have no scraped detail page. "deferred" ones were not reached
+            within the time budget.
+        """
+        counts = {
+            "checked": 0, "not_modified": 0, "unchanged": 0, "changed": 0,
+            "corrigendums": 0, "failed": 0, "no_url": 0, "deferred": 0,
+        }
+        started = time.monotonic()
+        remaining = metrics.QUEUE_DEPTH.labels("corrigendum_checks")
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="corrigendum-check") as executor:
+                for start in range(0, len(tender_refs), self.batch_size):
+                    if start and time.monotonic() - started > self.time_budget_seconds:
+                        counts["deferred"] = len(tender_refs) - start
+                        logger.warning(f"Corrigendum check time budget spent; {counts['deferred']} tenders deferred to the next run")
+                        break
+                    remaining.set(len(tender_refs) - start)
+                    self._check_batch(tender_refs[start:start + self.batch_size], executor, counts)
+        finally:
+            remaining.set(0)
+        return counts
+
+    def _check_batch(self, tender_refs: List[str], executor: ThreadPoolExecutor, counts: Dict[str, int]) -> None:
+        scraped = self.scraper_repo.get_latest_scraped_tenders(tender_refs)
+        fingerprints = self.fingerprints.get_many(tender_refs)
+
+        futures = []
+        for tender_ref in tender_refs:
+            row = scraped.get(tender_ref)
+            if row is None or not row.tender_url:
+                counts["no_url"] += 1
+                continue
+            previous = fingerprints.get(tender_ref)
+            futures.append(executor.submit(
+                fetch_page, tender_ref, row.tender_url,
+                previous.etag if previous else None,
+                previous.last_modified if previous else None,
+                previous.fingerprint if previous else None,
+                self.get,
+            ))
+
+        checked_at = datetime.now(timezone.utc)
+        updated = []
+        for future in as_completed(futures):
+            check = future.result()
+            counts["checked"] += 1
+            counts[check.status] += 1
+            if check.status == "failed":
+                logger.warning(f"Error checking tender {check.tender_ref_number}: {check.error}")
+                continue
+
+            row = scraped[check.tender_ref_number]
+            fingerprint = fingerprints.get(check.tender_ref_number) or TenderPageFingerprint(
+                tender_ref_number=check.tender_ref_number
+            )
+            if check.status == "changed":
+                try:
+                    version = self._record(row, check.page)
+                except Exception as e:
+                    # The fingerprint is not stored, so the page is parsed again next run
+                    self.db.rollback()
+                    counts["changed"] -= 1
+                    counts["failed"] += 1
+                    logger.error(f"Error recording tender {check.tender_ref_number}: {str(e)}")
+                    continue
+                fingerprint.changed_at = checked_at
+                if version and version.change_count:
+                    counts["corrigendums"] += 1
+                    logger.info(f"Corrigendum detected for tender {check.tender_ref_number}: {version.change_count} changes in version {version.version}")
+            fingerprint.url = row.tender_url
+            fingerprint.etag = check.etag
+            fingerprint.last_modified = check.last_modified
+            fingerprint.fingerprint = check.fingerprint
+            fingerprint.checked_at = checked_at
+            updated.append(fingerprint)
+        self.fingerprints.save_all(updated)
+
+    def _record(self, row: ScrapedTender, page: TenderDetailPage) -> Optional[TenderVersion]:
+        """Refresh the tender's scraped row from the page and record it as a version"""
+        # Same lock as the scraper, which may be saving this tender from a digest
+        with advisory_lock(f"tender:{row.tender_id_str}", engine=self.db.get_bind()):
+            ScraperRepository.apply_tender_details(row, page)
+            self.db.commit()
+            return self.corrigendums.record_version(row)
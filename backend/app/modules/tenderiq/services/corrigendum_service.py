@@ -3,27 +3,38 @@ Corrigendum and Tender Change Tracking Service
 
 This service tracks changes to tenders over time, particularly when corrigendums
 are issued. It compares tender versions and highlights what changed.
+
+Every scrape of a tender is recorded with record_version() in the append-only
+tender_versions store. A scrape whose content hash equals the latest
+version's is not stored. Otherwise it becomes the next version of its
+tender_ref_number, with one typed TenderFieldChange row per changed field.
+History, "has changes" and comparisons read these rows back; nothing is
+parsed from notes.
 """
 
-from typing import Dict, List, Optional, Any
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone
 from uuid import UUID
+from dateutil import parser
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 
-from app.modules.tenderiq.db.schema import Tender, TenderActionHistory, TenderActionEnum
-from app.modules.tenderiq.db.repository import TenderRepository
+from app.core.helpers import get_number_from_currency_string
+from app.modules.tenderiq.db.schema import Tender, TenderActionHistory, TenderActionEnum, TenderVersion, TenderFieldChange
+from app.modules.tenderiq.db.repository import TenderRepository, TenderVersionRepository
 from app.modules.scraper.db.schema import ScrapedTender
 
 
 class TenderChange:
     """Represents a single change in a tender field"""
-    def __init__(self, field: str, old_value: Any, new_value: Any, change_type: str = "updated"):
+    def __init__(self, field: str, old_value: Any, new_value: Any, change_type: str = "updated", timestamp: Optional[datetime] = None):
         self.field = field
         self.old_value = old_value
         self.new_value = new_value
         self.change_type = change_type  # updated, added, removed
-        self.timestamp = datetime.now(timezone.utc)
+        self.timestamp = timestamp or datetime.now(timezone.utc)
 
 
 class CorrigendumTrackingService:
@@ -62,10 +73,93 @@ class CorrigendumTrackingService:
         'state': 'State',
         'location': 'Location',
     }
+
+    # Typed fields: parsed into old/new_amount or old/new_date of the diff rows
+    AMOUNT_FIELDS = {'tender_value', 'estimated_cost', 'emd', 'document_fees'}
+    DATE_FIELDS = {
+        'submission_deadline', 'due_date', 'last_date_of_bid_submission',
+        'prebid_meeting_date', 'site_visit_deadline',
+    }
+
+    # History type of a version, by the first matching changed field
+    DATE_HISTORY_TYPES = {
+        'submission_deadline': 'bid_deadline_extension',
+        'due_date': 'due_date_extension',
+        'last_date_of_bid_submission': 'bid_deadline_extension',
+    }
+    AMENDMENT_FIELDS = {'tender_value', 'estimated_cost', 'emd'}
     
     def __init__(self, db: Session):
         self.db = db
         self.repo = TenderRepository(db)
+        self.versions = TenderVersionRepository(db)
+
+    # ==================== Version store ====================
+
+    def snapshot(self, scraped: ScrapedTender) -> Dict[str, Optional[str]]:
+        """The tracked fields that a scrape carries, as text (None when blank)"""
+        snapshot = {}
+        for field in self.TRACKED_FIELDS:
+            if not hasattr(ScrapedTender, field):
+                continue
+            value = getattr(scraped, field, None)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            snapshot[field] = None if value is None or str(value).strip() == "" else str(value)
+        return snapshot
+
+    def content_hash(self, snapshot: Dict[str, Optional[str]]) -> str:
+        """Hash of a snapshot; equal hashes mean _values_different is False for every field"""
+        normalized = {field: self._normalize_value(value) for field, value in snapshot.items()}
+        return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+    def record_version(self, scraped: ScrapedTender) -> Optional[TenderVersion]:
+        """
+        Append a scrape to the tender's versions unless nothing changed.
+
+        Callers serialise per tender (advisory_lock(f"tender:{ref}")), as two
+        writers would both pick the same next version number.
+
+        Returns:
+            The new TenderVersion, or None if the scrape matches the latest version
+        """
+        tender_ref = scraped.tender_id_str or scraped.tdr
+        if not tender_ref:
+            return None
+
+        snapshot = self.snapshot(scraped)
+        content_hash = self.content_hash(snapshot)
+        latest = self.versions.get_latest(tender_ref)
+        if latest and latest.content_hash == content_hash:
+            return None
+
+        version = TenderVersion(
+            tender_ref_number=tender_ref,
+            version=latest.version + 1 if latest else 1,
+            content_hash=content_hash,
+            snapshot=snapshot,
+            scraped_tender_id=scraped.id,
+            change_count=0,
+        )
+        rows = []
+        # The first version, and the first one after migrated note-only history, is a baseline
+        if latest and latest.snapshot is not None:
+            changes = self._diff_snapshots(latest.snapshot, snapshot)
+            rows = [self._field_change_row(change, tender_ref, version.version) for change in changes]
+            version.change_count = len(rows)
+            version.history_type, version.from_date, version.to_date = self._history_type_and_dates(rows)
+            version.note = self._format_changes_note(changes, "Detected on re-scrape")
+        return self.versions.add(version, rows)
+
+    def get_latest_changes(self, tender_id: str) -> List[TenderChange]:
+        """Changes introduced by the latest version of a tender"""
+        rows = self.versions.get_latest_changes(tender_id)
+        order = {field: i for i, field in enumerate(self.TRACKED_FIELDS)}
+        rows.sort(key=lambda row: order.get(row.field, len(order)))
+        return [
+            TenderChange(row.field, row.old_value, row.new_value, row.change_type, row.created_at)
+            for row in rows
+        ]
     
     def detect_changes(
         self,
@@ -73,7 +167,7 @@ class CorrigendumTrackingService:
         new_scraped_data: ScrapedTender
     ) -> List[TenderChange]:
         """
-        Compare current tender data with new scraped data to detect changes.
+        Compare new scraped data with the latest recorded version of the tender.
         
         Args:
             tender_id: The tender reference number
@@ -82,60 +176,38 @@ class CorrigendumTrackingService:
         Returns:
             List of TenderChange objects representing detected changes
         """
-        # Get existing tender
-        tender = self.db.query(Tender).filter(Tender.tender_ref_number == tender_id).first()
-        if not tender:
+        latest = self.versions.get_latest(tender_id)
+        if not latest:
             return []
-        
-        # Get previous scraped data
-        old_scraped = self.db.query(ScrapedTender).filter(
-            ScrapedTender.tender_id_str == tender_id
-        ).order_by(ScrapedTender.id.desc()).first()
-        
-        if not old_scraped:
+
+        # Already recorded: its changes are the ones this scrape introduced
+        if latest.scraped_tender_id == new_scraped_data.id:
+            return self.get_latest_changes(tender_id)
+
+        if latest.snapshot is None:
             return []
-        
-        changes = []
-        
-        # Compare each tracked field
-        for field in self.TRACKED_FIELDS:
-            old_value = getattr(old_scraped, field, None) if hasattr(old_scraped, field) else getattr(tender, field, None)
-            new_value = getattr(new_scraped_data, field, None)
-            
-            # Detect change
-            if self._values_different(old_value, new_value):
-                changes.append(TenderChange(
-                    field=field,
-                    old_value=old_value,
-                    new_value=new_value,
-                    change_type="updated"
-                ))
-        
-        return changes
+        return self._diff_snapshots(latest.snapshot, self.snapshot(new_scraped_data))
     
     def apply_corrigendum(
         self,
         tender_id: str,
-        new_scraped_data: ScrapedTender,
         user_id: UUID,
         corrigendum_note: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Apply corrigendum changes to a tender and log them.
+        Apply the changes of the tender's latest version to the tender and log them.
         
         Args:
             tender_id: The tender reference number
-            new_scraped_data: New scraped data with corrigendum changes
             user_id: User applying the corrigendum
             corrigendum_note: Optional note about the corrigendum
             
         Returns:
             Dictionary with summary of changes
         """
-        # Detect changes
-        changes = self.detect_changes(tender_id, new_scraped_data)
+        rows = self.versions.get_latest_changes(tender_id)
         
-        if not changes:
+        if not rows:
             return {
                 "status": "no_changes",
                 "message": "No changes detected in corrigendum",
@@ -152,13 +224,19 @@ class CorrigendumTrackingService:
                 "changes": []
             }
         
-        # Apply changes to tender
+        # Apply changes to tender, using the parsed amount or date where there is one
+        changes = self.get_latest_changes(tender_id)
         updates = {}
-        for change in changes:
+        for row in rows:
             # Map scraped fields to tender fields if needed
-            tender_field = self._map_to_tender_field(change.field)
+            tender_field = self._map_to_tender_field(row.field)
             if hasattr(tender, tender_field):
-                updates[tender_field] = change.new_value
+                if row.value_kind == "amount":
+                    updates[tender_field] = row.new_amount
+                elif row.value_kind == "date":
+                    updates[tender_field] = row.new_date
+                else:
+                    updates[tender_field] = row.new_value
         
         # Update tender
         if updates:
@@ -210,76 +288,105 @@ class CorrigendumTrackingService:
             if not tender:
                 return []
             
-            # Get all corrigendum actions from history
-            corrigendum_actions = self.db.query(TenderActionHistory).filter(
-                and_(
-                    TenderActionHistory.tender_id == tender.id,
-                    TenderActionHistory.action == TenderActionEnum.corrigendum_updated
-                )
-            ).order_by(TenderActionHistory.timestamp.desc()).all()
-            
-            history = []
-            for action in corrigendum_actions:
-                try:
-                    # Parse changes from notes to determine type and date changes
-                    changes = self._parse_changes_from_note(action.notes or "")
-                    history_type, date_change = self._determine_history_type_and_dates(changes)
-                    
-                    # Ensure date_change always has the required structure
-                    if date_change is None:
-                        date_change = {
-                            "from_date": None,
-                            "to_date": None
-                        }
-                    
-                    history_item = {
-                        "id": str(action.id),
-                        "tender_id": str(tender.id),
-                        "user_id": str(action.user_id) if action.user_id else None,
-                        "tdr": tender.tender_ref_number or "",  # Add tender reference number
-                        "type": history_type,
-                        "note": action.notes or "",
-                        "update_date": action.timestamp.isoformat() if action.timestamp else datetime.now(timezone.utc).isoformat(),
-                        "files_changed": [],  # TODO: Link to actual file changes
-                        "date_change": date_change
-                    }
-                    history.append(history_item)
-                except Exception as e:
-                    # Skip this history item if there's an error parsing it
-                    continue
-            
-            return history
+            return [
+                {
+                    "id": str(version.id),
+                    "tender_id": str(tender.id),
+                    "user_id": None,
+                    "tdr": tender.tender_ref_number or "",
+                    "type": version.history_type or "corrigendum",
+                    "note": version.note or "",
+                    "update_date": version.created_at.isoformat() if version.created_at else datetime.now(timezone.utc).isoformat(),
+                    "files_changed": [],  # TODO: Link to actual file changes
+                    "date_change": {
+                        "from_date": version.from_date.isoformat() if version.from_date else None,
+                        "to_date": version.to_date.isoformat() if version.to_date else None,
+                    },
+                }
+                for version in self.versions.get_history(tender.tender_ref_number)
+            ]
             
         except Exception as e:
             print(f"Error fetching corrigendum history for tender {tender_id}: {str(e)}")
             return []
     
+    def _normalize_value(self, value: Any) -> Optional[str]:
+        """Comparable form of a value: None when blank, numbers as floats, dates as ISO strings"""
+        if value is None or str(value).strip() == "":
+            return None
+        if isinstance(value, datetime):
+            return value.isoformat()
+        try:
+            return repr(float(value))
+        except (ValueError, TypeError):
+            pass
+        return str(value)
+
     def _values_different(self, old_value: Any, new_value: Any) -> bool:
         """Check if two values are different, handling None and type conversions"""
-        # Both None or empty
-        if (old_value is None or str(old_value).strip() == "") and \
-           (new_value is None or str(new_value).strip() == ""):
-            return False
-        
-        # One is None/empty, other isn't
-        if (old_value is None or str(old_value).strip() == "") or \
-           (new_value is None or str(new_value).strip() == ""):
-            return True
-        
-        # For dates, compare as strings
-        if isinstance(old_value, datetime) or isinstance(new_value, datetime):
-            old_str = old_value.isoformat() if isinstance(old_value, datetime) else str(old_value)
-            new_str = new_value.isoformat() if isinstance(new_value, datetime) else str(new_value)
-            return old_str != new_str
-        
-        # For numbers, compare as floats
+        return self._normalize_value(old_value) != self._normalize_value(new_value)
+
+    def _diff_snapshots(self, old: Dict[str, Optional[str]], new: Dict[str, Optional[str]]) -> List[TenderChange]:
+        changes = []
+        for field in self.TRACKED_FIELDS:
+            if field not in old and field not in new:
+                continue
+            old_value, new_value = old.get(field), new.get(field)
+            if self._values_different(old_value, new_value):
+                change_type = "added" if old_value is None else "removed" if new_value is None else "updated"
+                changes.append(TenderChange(field, old_value, new_value, change_type))
+        return changes
+
+    def _field_change_row(self, change: TenderChange, tender_ref: str, version: int) -> TenderFieldChange:
+        row = TenderFieldChange(
+            tender_ref_number=tender_ref,
+            version=version,
+            field=change.field,
+            change_type=change.change_type,
+            value_kind="text",
+            old_value=change.old_value,
+            new_value=change.new_value,
+        )
+        if change.field in self.AMOUNT_FIELDS:
+            row.value_kind = "amount"
+            row.old_amount = self._parse_amount(change.old_value)
+            row.new_amount = self._parse_amount(change.new_value)
+        elif change.field in self.DATE_FIELDS:
+            row.value_kind = "date"
+            row.old_date = self._parse_date(change.old_value)
+            row.new_date = self._parse_date(change.new_value)
+        return row
+
+    def _history_type_and_dates(
+        self,
+        rows: List[TenderFieldChange]
+    ) -> Tuple[str, Optional[datetime], Optional[datetime]]:
+        """History type of a version and, for deadline changes, the old and new dates"""
+        history_type = "corrigendum"
+        for row in rows:
+            if row.field in self.DATE_HISTORY_TYPES:
+                return self.DATE_HISTORY_TYPES[row.field], row.old_date, row.new_date
+            if row.field in self.AMENDMENT_FIELDS:
+                history_type = "amendment"
+        return history_type, None, None
+
+    def _parse_amount(self, value: Optional[str]) -> Optional[float]:
+        if not value or not re.search(r"\d", value):
+            return None
+        return get_number_from_currency_string(value)
+
+    def _parse_date(self, value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
         try:
-            return float(old_value) != float(new_value)
-        except (ValueError, TypeError):
+            return datetime.fromisoformat(value)
+        except ValueError:
             pass
-        
-        # Default: compare as strings
-        return str(old_value) != str(new_value)
+        try:
+            # Portal dates are day-first, e.g. "02-12-2025"
+            return parser.parse(value, dayfirst=True)
+        except (parser.ParserError, ValueError, OverflowError):
+            return None
     
     def _map_to_tender_field(self, scraped_field: str) -> str:
         """Map scraped tender field names to Tender model field names"""
@@ -326,97 +433,3 @@ class CorrigendumTrackingService:
             note_parts.append(f"• {field_label}: {old_val} → {new_val}")
         
         return "\n".join(note_parts)
-    
-    def _parse_changes_from_note(self, note: str) -> List[Dict[str, str]]:
-        """Parse changes from a formatted note"""
-        if not note or "Changes" not in note:
-            return []
-        
-        changes = []
-        lines = note.split('\n')
-        
-        for line in lines:
-            if line.startswith('•'):
-                # Parse format: "• Field Label: old_value → new_value"
-                try:
-                    # Split only on the FIRST colon to get field label
-                    parts = line[2:].split(':', 1)  # Split on first : only
-                    field_label = parts[0].strip()
-                    # Now split the value part on the arrow
-                    value_parts = parts[1].split('→')
-                    old_value = value_parts[0].strip()
-                    new_value = value_parts[1].strip() if len(value_parts) > 1 else None
-                    
-                    change = {
-                        "field": field_label,
-                        "old_value": old_value,
-                        "new_value": new_value
-                    }
-                    changes.append(change)
-                except (IndexError, AttributeError):
-                    continue
-        
-        return changes
-    
-    def _determine_history_type_and_dates(
-        self, 
-        changes: List[Dict[str, str]]
-    ) -> tuple[str, Optional[Dict[str, str]]]:
-        """
-        Determine the history type and extract date changes from parsed changes.
-        
-        Returns:
-            Tuple of (history_type, date_change_dict or None)
-        """
-        if not changes:
-            return "corrigendum", None
-            
-        # Date-related fields that indicate extensions
-        date_fields = {
-            'Submission Deadline': 'bid_deadline_extension',
-            'Due Date': 'due_date_extension',
-            'Last Date of Bid Submission': 'bid_deadline_extension',
-        }
-        
-        # Check if any changes are date-related
-        date_change = None
-        history_type = "corrigendum"  # Default
-        
-        for change in changes:
-            field = change.get("field", "")
-            
-            if field in date_fields:
-                history_type = date_fields[field]
-                old_val = change.get("old_value", "")
-                new_val = change.get("new_value", "")
-                if old_val and new_val:
-                    # Parse datetime strings to ISO format if needed
-                    from_date = self._normalize_date_string(old_val)
-                    to_date = self._normalize_date_string(new_val)
-                    date_change = {
-                        "from_date": from_date,
-                        "to_date": to_date
-                    }
-                break  # Use first date change found
-            elif field in ['Tender Value', 'Estimated Cost', 'EMD Amount']:
-                history_type = "amendment"
-        
-        return history_type, date_change
-    
-    def _normalize_date_string(self, date_str: str) -> str:
-        """Convert various date formats to ISO format string"""
-        if not date_str or date_str == "Not set" or date_str == "Removed":
-            return datetime.min.replace(tzinfo=timezone.utc).isoformat()
-        
-        # Try to parse common date formats
-        from dateutil import parser
-        try:
-            # Try parsing with dateutil (handles most formats)
-            dt = parser.parse(date_str)
-            # Ensure timezone awareness
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.isoformat()
-        except:
-            # If parsing fails, return the original string
-            return date_str
@@ -0,0 +1,251 @@
+"""
+Cross-Tender Similarity Service
+
+Maintains a global, tender-level vector index (one vector per tender, keyed by
+`tender_id_str`) and answers "find similar tenders" queries against it.
+
+- Records are built from the tender name, authority, brief and details
+- Indexing happens incrementally at scrape ingest, in batches
+- Re-scrapes of the same tender overwrite its vector instead of duplicating it
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from dateutil import parser as date_parser
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.helpers import get_number_from_currency_string
+from app.modules.scraper.db.schema import ScrapedTender
+from app.modules.tenderiq.models.pydantic_models import SimilarTender, SimilarTendersResponse
+
+logger = logging.getLogger(__name__)
+
+# Tender details can be several pages long; the embedder only sees the first
+# few hundred tokens anyway, so keep the indexed text bounded.
+MAX_DETAILS_CHARS = 2000
+CRORE = 10000000
+
+
+def build_similarity_text(tender: ScrapedTender) -> str:
+    """Builds the text that represents a tender in the similarity index."""
+    parts = []
+    if tender.tender_name:
+        parts.append(f"Tender: {tender.tender_name.strip()}")
+    if tender.tendering_authority:
+        parts.append(f"Authority: {tender.tendering_authority.strip()}")
+    brief = tender.tender_brief or tender.summary
+    if brief:
+        parts.append(f"Brief: {brief.strip()}")
+    if tender.tender_details:
+        parts.append(f"Details: {tender.tender_details.strip()[:MAX_DETAILS_CHARS]}")
+    return "\n".join(parts)
+
+
+def parse_publish_date(date_str: Optional[str]) -> Optional[datetime]:
+    """Parses a scraped DD-MM-YYYY style date into a UTC datetime, or None."""
+    if not date_str or not date_str.strip():
+        return None
+    try:
+        parsed = date_parser.parse(date_str.strip(), dayfirst=True)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def build_similarity_record(tender: ScrapedTender) -> Optional[Dict]:
+    """
+    Converts a ScrapedTender into a record for the similarity index.
+    Returns None for tenders without an ID or without any indexable text.
+    """
+    if not tender.tender_id_str:
+        return None
+    content = build_similarity_text(tender)
+    if not content:
+        return None
+
+    return {
+        "tender_id_str": tender.tender_id_str,
+        "scraped_tender_id": str(tender.id),
+        "content": content,
+        "tender_name": tender.tender_name or "",
+        "tendering_authority": tender.tendering_authority or "",
+        "state": tender.state or "",
+        "tender_value": get_number_from_currency_string(tender.tender_value or tender.value or ""),
+        "publish_date": parse_publish_date(tender.publish_date),
+    }
+
+
+def _get_vector_store():
+    # Imported lazily: app.core.services connects to external services on import.
+    from app.core.services import get_vector_store
+    return get_vector_store()
+
+
+def index_scraped_tenders(
+    tenders: Iterable[ScrapedTender],
+    batch_size: Optional[int] = None,
+    vector_store=None,
+) -> int:
+    """
+    Adds or refreshes tenders in the similarity index, embedding them in batches.
+    Within one call, the last record seen for a `tender_id_str` wins.
+
+    Returns:
+        Number of tenders indexed
+    """
+    vector_store = vector_store or _get_vector_store()
+    if not vector_store:
+        logger.warning("Vector store not available, skipping tender similarity indexing")
+        return 0
+
+    batch_size = batch_size or settings.TENDER_SIMILARITY_BATCH_SIZE
+
+    records: Dict[str, Dict] = {}
+    for tender in tenders:
+        record = build_similarity_record(tender)
+        if record:
+            records[record["tender_id_str"]] = record
+
+    unique_records = list(records.values())
+    indexed = 0
+    for start in range(0, len(unique_records), batch_size):
+        indexed += vector_store.upsert_tender_vectors(unique_records[start:start + batch_size])
+    return indexed
+
+
+def backfill_similarity_index(db: Session, batch_size: Optional[int] = None, vector_store=None) -> int:
+    """
+    Rebuilds the similarity index from every ScrapedTender in the database.
+    Intended for one-off backfills; regular updates happen at scrape ingest.
+    """
+    batch_size = batch_size or settings.TENDER_SIMILARITY_BATCH_SIZE
+    tenders = db.query(ScrapedTender).yield_per(batch_size)
+    return index_scraped_tenders(tenders, batch_size=batch_size, vector_store=vector_store)
+
+
+def _parse_filter_date(date_str: Optional[str]) -> Optional[datetime]:
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError as e:
+        raise ValueError(f"Invalid date format. Expected YYYY-MM-DD, got '{date_str}'") from e
+
+
+def find_similar_tenders(
+    db: Session,
+    tender_id: UUID,
+    top_k: Optional[int] = None,
+    state: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    published_after: Optional[str] = None,
+    published_before: Optional[str] = None,
+    vector_store=None,
+) -> Optional[SimilarTendersResponse]:
+    """
+    Returns the top-k tenders most similar to the given ScrapedTender.
+
+    Args:
+        tender_id: UUID of the ScrapedTender to find neighbours for
+        top_k: Number of neighbours to return
+        state: Only return tenders from this state
+        min_value: Minimum tender value in crore
+        max_value: Maximum tender value in crore
+        published_after: Earliest publish date (YYYY-MM-DD)
+        published_before: Latest publish date (YYYY-MM-DD)
+
+    Returns:
+        SimilarTendersResponse, or None if the tender does not exist
+
+    Raises:
+        ValueError: If a date filter is not in YYYY-MM-DD format
+    """
+    tender = db.query(ScrapedTender).filter(ScrapedTender.id == tender_id).first()
+    if not tender:
+        return None
+
+    filtered_by = {
+        key: value
+        for key, value in {
+            "state": state,
+            "min_value": min_value,
+            "max_value": max_value,
+            "published_after": published_after,
+            "published_before": published_before,
+        }.items()
+        if value is not None
+    }
+    response = SimilarTendersResponse(
+        tender_id=tender.id,
+        tender_id_str=tender.tender_id_str or "",
+        results=[],
+        filtered_by=filtered_by,
+    )
+
+    after = _parse_filter_date(published_after)
+    before = _parse_filter_date(published_before)
+
+    vector_store = vector_store or _get_vector_store()
+    if not vector_store:
+        logger.warning("Vector store not available, returning no similar tenders")
+        return response
+
+    # Prefer the stored vector; fall back to embedding the tender text if it
+    # has not been indexed yet (e.g. scraped before the index existed).
+    vector = vector_store.get_tender_vector(tender.tender_id_str) if tender.tender_id_str else None
+    query_text = None if vector is not None else build_similarity_text(tender)
+
+    neighbours = vector_store.query_similar_tenders(
+        query=query_text,
+        vector=vector,
+        n_results=top_k or settings.TENDER_SIMILARITY_TOP_K,
+        state=state,
+        min_value=min_value * CRORE if min_value is not None else None,
+        max_value=max_value * CRORE if max_value is not None else None,
+        published_after=after,
+        published_before=before,
+        exclude_tender_id_str=tender.tender_id_str,
+    )
+    if not neighbours:
+        return response
+
+    # Resolve all neighbours in a single query rather than one per result.
+    candidates = []
+    for properties, similarity in neighbours:
+        try:
+            candidates.append((UUID(properties.get("scraped_tender_id", "")), properties, similarity))
+        except (ValueError, TypeError):
+            continue
+    row_ids = [row_id for row_id, _, _ in candidates]
+    rows = {
+        row.id: row
+        for row in db.query(ScrapedTender).filter(ScrapedTender.id.in_(row_ids)).all()
+    } if row_ids else {}
+
+    results: List[SimilarTender] = []
+    seen = {tender.tender_id_str}
+    for row_id, properties, similarity in candidates:
+        tender_id_str = properties.get("tender_id_str")
+        row = rows.get(row_id)
+        if row is None or tender_id_str in seen:
+            continue
+        seen.add(tender_id_str)
+        results.append(SimilarTender(
+            id=row.id,
+            tender_id_str=tender_id_str,
+            tender_name=row.tender_name,
+            tendering_authority=row.tendering_authority,
+            city=row.city,
+            state=row.state,
+            tender_value=row.tender_value,
+            publish_date=row.publish_date,
+            similarity=round(similarity, 4),
+        ))
+
+    response.results = results
+    return response
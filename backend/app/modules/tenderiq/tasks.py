@@ -5,16 +5,15 @@ This module contains background tasks that periodically check for
 corrigendums and amendments to active tenders.
 """
 
-from datetime import datetime, timedelta, timezone
-from typing import List
+from datetime import timedelta
 from uuid import UUID
 import logging
 
 from app.celery_app import celery_app
 from app.db.database import SessionLocal
 from app.modules.tenderiq.db.schema import Tender
+from app.modules.tenderiq.services.corrigendum_checker import CorrigendumChecker
 from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
-from app.modules.scraper.db.schema import ScrapedTender
 
 logger = logging.getLogger(__name__)
 
@@ -25,68 +24,27 @@ def check_active_tenders_for_corrigendums():
     Periodic task to check all active tenders for corrigendums.
     
     This task:
-    1. Identifies tenders with upcoming deadlines (within next 30 days)
-    2. Re-scrapes tender data from source portals
-    3. Detects changes and logs them as corrigendums
+    1. Identifies tenders with upcoming deadlines (within CORRIGENDUM_CHECK_WINDOW_DAYS), nearest first
+    2. Re-fetches their detail pages in concurrent batches, conditionally (ETag/Last-Modified)
+    3. Parses only pages whose fingerprint changed, and records changes as tender versions
     
+    See services/corrigendum_checker.py.
     Schedule: Should run every 6-12 hours via Celery Beat
     """
     db = SessionLocal()
     try:
         logger.info("Starting corrigendum check for active tenders...")
-        
-        # Get active tenders (upcoming deadlines within next 30 days)
-        cutoff_date = datetime.now(timezone.utc) + timedelta(days=30)
-        active_tenders = db.query(Tender).filter(
-            Tender.submission_deadline > datetime.now(timezone.utc),
-            Tender.submission_deadline < cutoff_date,
-            Tender.status.in_(['New', 'Reviewed', 'Shortlisted', 'Bid_Preparation'])
-        ).all()
-        
-        logger.info(f"Found {len(active_tenders)} active tenders to check")
-        
-        corrigendum_service = CorrigendumTrackingService(db)
-        corrigendums_found = 0
-        
-        for tender in active_tenders:
-            try:
-                # Get latest scraped data for this tender
-                latest_scraped = db.query(ScrapedTender).filter(
-                    ScrapedTender.tender_id_str == tender.tender_ref_number
-                ).order_by(ScrapedTender.scraped_at.desc()).first()
-                
-                if not latest_scraped:
-                    logger.warning(f"No scraped data found for tender {tender.tender_ref_number}")
-                    continue
-                
-                # TODO: Implement re-scraping logic here
-                # For now, we'll use the existing latest scraped data
-                # In production, you would trigger a re-scrape of the tender portal
-                
-                # Detect changes
-                changes = corrigendum_service.detect_changes(
-                    tender.tender_ref_number,
-                    latest_scraped
-                )
-                
-                if changes:
-                    logger.info(f"Corrigendum detected for tender {tender.tender_ref_number}: {len(changes)} changes")
-                    
-                    # TODO: Auto-apply changes or flag for review?
-                    # For now, we'll just log them
-                    # You could add: corrigendum_service.apply_corrigendum(...)
-                    
-                    corrigendums_found += 1
-                    
-            except Exception as e:
-                logger.error(f"Error checking tender {tender.tender_ref_number}: {str(e)}")
-                continue
-        
-        logger.info(f"Corrigendum check complete. Found {corrigendums_found} tenders with changes")
+        counts = CorrigendumChecker(db).check_active_tenders()
+        logger.info(
+            f"Corrigendum check complete. {counts['checked']} pages checked "
+            f"({counts['not_modified']} not modified, {counts['unchanged']} unchanged, {counts['changed']} changed). "
+            f"Found {counts['corrigendums']} tenders with changes"
+        )
         return {
             "status": "success",
-            "tenders_checked": len(active_tenders),
-            "corrigendums_found": corrigendums_found
+            "tenders_checked": counts["checked"],
+            "corrigendums_found": counts["corrigendums"],
+            **{key: value for key, value in counts.items() if key not in ("checked", "corrigendums")},
         }
         
     except Exception as e:
@@ -126,19 +84,9 @@ def check_single_tender_for_corrigendum(tender_id: str):
             logger.error(f"Tender {tender_id} not found")
             return {"status": "error", "error": "Tender not found"}
         
-        # Get latest scraped data
-        latest_scraped = db.query(ScrapedTender).filter(
-            ScrapedTender.tender_id_str == tender.tender_ref_number
-        ).order_by(ScrapedTender.scraped_at.desc()).first()
-        
-        if not latest_scraped:
-            return {"status": "error", "error": "No scraped data found"}
-        
-        # Detect changes
-        changes = corrigendum_service.detect_changes(
-            tender.tender_ref_number,
-            latest_scraped
-        )
+        # Re-check the detail page first; an unchanged page leaves the latest version as it is
+        CorrigendumChecker(db, workers=1).check([tender.tender_ref_number])
+        changes = corrigendum_service.get_latest_changes(tender.tender_ref_number)
         
         if changes:
             logger.info(f"Found {len(changes)} changes for tender {tender.tender_ref_number}")
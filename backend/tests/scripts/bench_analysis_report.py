@@ -0,0 +1,95 @@
+"""
+Benchmark: rendering the analysis report per download vs serving the stored one.
+
+A synthetic analysis is built with --sections RFP sections and a one-pager,
+scope of work and data sheet of matching size. The "legacy" path calls the
+renderer on every download, as download_analysis_report did before. The
+"stored" path is analysis_report_service.get_report, which renders on the
+first call and afterwards only hashes the inputs and checks the file. It
+uses the Excel renderer (openpyxl), which needs no optional dependencies.
+Storage goes to a temporary DMS root and tables to in-memory SQLite.
+
+Usage:
+    python -m tests.scripts.bench_analysis_report                  # 200 sections, 20 downloads
+    python -m tests.scripts.bench_analysis_report --sections 1000 --downloads 50
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.analyze.db.schema import AnalysisDocumentTemplate, AnalysisRFPSection, AnalysisStatusEnum, TenderAnalysis
+from app.modules.analyze.services import analysis_report_service as report_service
+from app.modules.analyze.services import analysis_rfp_service as rfp_service
+from app.modules.analyze.services import analysis_template_service as template_service
+from app.modules.analyze.services.analysis_report_renderers import generate_excel_report
+from app.modules.dmsiq.services import file_storage
+
+
+def build_analysis(db, sections: int) -> TenderAnalysis:
+    analysis = TenderAnalysis(
+        tender_id="89453821", status=AnalysisStatusEnum.completed, progress=100,
+        analysis_completed_at=datetime(2025, 11, 20, 10, 0),
+        one_pager_json={"project_overview": "Construction of 2-lane road with paved shoulders " * 20,
+                        "key_highlights": [f"Highlight {i}" for i in range(sections // 10)]},
+        scope_of_work_json={"work_packages": [{"name": f"Package {i}", "description": "Earthwork and pavement " * 5}
+                                              for i in range(sections // 4)]},
+        data_sheet_json={"key_facts": [{"label": f"Fact {i}", "value": f"{i} km"} for i in range(sections // 2)]},
+    )
+    db.add(analysis)
+    db.flush()
+    for number in range(sections):
+        db.add(AnalysisRFPSection(
+            analysis_id=analysis.id, section_number=str(number), section_title=f"Section {number}",
+            summary="The contractor shall maintain the road for five years " * 4,
+            key_requirements=[f"Requirement {number}.{i}" for i in range(5)],
+            compliance_issues=[f"Issue {number}"], page_references=[number, number + 1],
+        ))
+    db.commit()
+    return analysis
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=200)
+    parser.add_argument("--downloads", type=int, default=20)
+    args = parser.parse_args()
+
+    file_storage.DMS_ROOT = Path(tempfile.mkdtemp(prefix="bench_reports_"))
+    engine = create_engine("sqlite://")
+    TenderAnalysis.metadata.create_all(engine, tables=[
+        TenderAnalysis.__table__, AnalysisRFPSection.__table__, AnalysisDocumentTemplate.__table__,
+    ])
+    db = sessionmaker(bind=engine)()
+    analysis = build_analysis(db, args.sections)
+
+    start = time.perf_counter()
+    for _ in range(args.downloads):
+        content, _, _ = generate_excel_report(
+            analysis, rfp_service.get_rfp_sections(db, analysis.id), template_service.get_templates(db, analysis.id)
+        )
+    legacy = (time.perf_counter() - start) / args.downloads
+
+    start = time.perf_counter()
+    report = report_service.get_report(db, analysis, "excel")
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.downloads):
+        report_service.get_report(db, analysis, "excel")
+    stored = (time.perf_counter() - start) / args.downloads
+
+    print(f"{args.sections} RFP sections, {len(content) / 1024:.0f} KB workbook, {args.downloads} downloads")
+    print(f"{'path':22} {'ms per download':>16}")
+    print(f"{'legacy (render)':22} {legacy * 1000:>16.1f}")
+    print(f"{'stored, first render':22} {first * 1000:>16.1f}")
+    print(f"{'stored, cached':22} {stored * 1000:>16.1f}")
+    print(f"speedup {legacy / max(stored, 1e-9):.1f}x, stored at {report.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: ORM chat listing vs the aggregate, keyset-paginated listing.
+
+The "legacy" path mirrors the old chat_service.get_all_chats: load every Chat,
+then touch chat.messages, chat.documents and doc.chunks to count them. The
+"aggregate" path is one page from ChatRepository.get_page_with_counts plus
+DocumentRepository.get_metadata_for_chats (what get_all_chats now runs).
+
+Usage:
+    python -m tests.scripts.bench_chat_listing                      # SQLite in-memory
+    python -m tests.scripts.bench_chat_listing postgresql://...     # scratch Postgres DB (tables are created)
+    python -m tests.scripts.bench_chat_listing sqlite:// 5000 300000
+"""
+
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.askai.db.models import Chat, Document, DocumentChunk, Message, chat_document_association
+from app.modules.askai.db.repository import ChatRepository, DocumentRepository
+
+TABLES = [Chat.__table__, Message.__table__, Document.__table__, DocumentChunk.__table__, chat_document_association]
+
+
+def seed(engine, n_chats: int, n_chunks: int, messages_per_chat: int = 20, docs_per_chat: int = 2):
+    n_docs = n_chats * docs_per_chat
+    chunks_per_doc = max(1, n_chunks // n_docs)
+    base = datetime(2025, 1, 1)
+    chats, messages, docs, links, chunks = [], [], [], [], []
+    for c in range(n_chats):
+        chat_id = uuid.uuid4()
+        chats.append({"id": chat_id, "title": f"Chat {c}", "created_at": base, "updated_at": base + timedelta(minutes=c), "drive_folders": []})
+        messages.extend({"id": uuid.uuid4(), "chat_id": chat_id, "sender": "user", "text": "What is the EMD amount?", "timestamp": base}
+                        for _ in range(messages_per_chat))
+        for d in range(docs_per_chat):
+            doc_id = uuid.uuid4()
+            docs.append({"id": doc_id, "filename": f"tender_{c}_{d}.pdf", "doc_type": "pdf", "file_hash": f"{c}-{d}",
+                         "file_size": 1024, "status": "active", "uploaded_at": base, "chunk_count": chunks_per_doc})
+            links.append({"chat_id": chat_id, "document_id": doc_id})
+            chunks.extend({"id": uuid.uuid4(), "document_id": doc_id, "content": "Clause text " * 40, "chunk_metadata": {}}
+                          for _ in range(chunks_per_doc))
+
+    with engine.begin() as conn:
+        conn.execute(insert(Chat.__table__), chats)
+        conn.execute(insert(Message.__table__), messages)
+        conn.execute(insert(Document.__table__), docs)
+        conn.execute(insert(chat_document_association), links)
+        for start in range(0, len(chunks), 50_000):
+            conn.execute(insert(DocumentChunk.__table__), chunks[start:start + 50_000])
+    return len(chunks)
+
+
+def legacy_listing(db):
+    result = []
+    for chat in db.query(Chat).order_by(Chat.updated_at.desc()).all():
+        pdf_list = [(doc.filename, len(doc.chunks), doc.status) for doc in chat.documents]
+        result.append((chat.id, len(chat.messages), len(chat.documents), pdf_list))
+    return result
+
+
+def aggregate_listing(db, limit: int = 100):
+    rows = ChatRepository(db).get_page_with_counts(limit)
+    docs = DocumentRepository(db).get_metadata_for_chats([r.id for r in rows])
+    return rows, docs
+
+
+def aggregate_listing_all_pages(db, limit: int = 100):
+    repo, before, pages = ChatRepository(db), None, 0
+    while rows := repo.get_page_with_counts(limit, before):
+        DocumentRepository(db).get_metadata_for_chats([r.id for r in rows])
+        before = (rows[-1].updated_at, rows[-1].id)
+        pages += 1
+    return pages
+
+
+def timed(engine, fn):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    db = sessionmaker(bind=engine)()
+    try:
+        start = time.perf_counter()
+        fn(db)
+        return time.perf_counter() - start, len(statements)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "sqlite://"
+    n_chats = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    n_chunks = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+
+    engine = create_engine(url)
+    Chat.metadata.drop_all(engine, tables=TABLES)
+    Chat.metadata.create_all(engine, tables=TABLES)
+    print(f"Seeding {n_chats} chats / {n_chunks} chunks into {engine.url.render_as_string(hide_password=True)}...")
+    seed(engine, n_chats, n_chunks)
+
+    legacy_time, legacy_queries = timed(engine, legacy_listing)
+    page_time, page_queries = timed(engine, aggregate_listing)
+    all_pages_time, all_pages_queries = timed(engine, aggregate_listing_all_pages)
+
+    print(f"{'path':28} {'seconds':>9} {'queries':>8}")
+    print(f"{'legacy (all chats)':28} {legacy_time:>9.3f} {legacy_queries:>8}")
+    print(f"{'aggregate (first page)':28} {page_time:>9.3f} {page_queries:>8}")
+    print(f"{'aggregate (every page)':28} {all_pages_time:>9.3f} {all_pages_queries:>8}")
+    print(f"Speedup (first page): {legacy_time / max(page_time, 1e-9):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
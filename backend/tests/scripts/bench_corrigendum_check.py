@@ -0,0 +1,134 @@
+"""
+Benchmark: one-by-one corrigendum re-check vs the batched, conditional checker.
+
+A simulated portal serves the saved detail page after --latency-ms per
+request. On a second visit it answers conditional requests for unchanged
+pages with 304; --changed of the pages are amended between runs. The
+"legacy" path re-checks tenders one after another, with one query, a full
+download, a parse and a version diff per tender. The "checker" path is
+CorrigendumChecker, measured on its first run (no fingerprints yet) and on
+a steady-state run. Tenders and versions live in in-memory SQLite.
+
+Usage:
+    python -m tests.scripts.bench_corrigendum_check                     # 1,000 tenders, 150 ms latency
+    python -m tests.scripts.bench_corrigendum_check --tenders 5000 --latency-ms 300 --workers 16
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.modules.scraper.db.repository import ScraperRepository
+from app.modules.scraper.db.schema import ScrapedTender, ScrapedTenderFile, ScrapedTenderQuery, ScrapeRun
+from app.modules.scraper.detail_page_scrape import parse_tender_page
+from app.modules.tenderiq.db.schema import Tender, TenderFieldChange, TenderPageFingerprint, TenderVersion
+from app.modules.tenderiq.services.corrigendum_checker import CorrigendumChecker
+from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
+
+PAGE = (Path(__file__).resolve().parents[1] / "unit" / "fixtures" / "tenderdetail" / "detail_full.html").read_bytes()
+NOW = datetime(2025, 11, 10)
+
+
+class Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class SimulatedPortal:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.pages = {}
+
+    def get(self, url, headers=None, **kwargs):
+        time.sleep(self.latency)
+        page = self.pages[url]
+        etag = f'"{hash(page)}"'
+        if headers and headers.get("If-None-Match") == etag:
+            return Response(304)
+        return Response(200, page, {"ETag": etag})
+
+
+def setup(tenders: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Tender.metadata.create_all(engine, tables=[
+        ScrapeRun.__table__, ScrapedTenderQuery.__table__, ScrapedTender.__table__, ScrapedTenderFile.__table__,
+        Tender.__table__, TenderVersion.__table__, TenderFieldChange.__table__, TenderPageFingerprint.__table__,
+    ])
+    db = sessionmaker(bind=engine)()
+    details = parse_tender_page(PAGE)
+    for number in range(tenders):
+        ref = f"T{number:06d}"
+        scraped = ScrapedTender(tender_id_str=ref, tender_url=f"https://www.tenderdetail.com/Tender/{ref}")
+        ScraperRepository.apply_tender_details(scraped, details)
+        db.add_all([scraped, Tender(tender_ref_number=ref, status="New",
+                                    submission_deadline=NOW + timedelta(hours=1 + number % 600))])
+    db.commit()
+    service = CorrigendumTrackingService(db)
+    for scraped in db.query(ScrapedTender).all():
+        service.record_version(scraped)
+    return db
+
+
+def legacy_check(db, portal: SimulatedPortal) -> int:
+    service = CorrigendumTrackingService(db)
+    found = 0
+    for tender in db.query(Tender).all():
+        scraped = db.query(ScrapedTender).filter(ScrapedTender.tender_id_str == tender.tender_ref_number).first()
+        page = parse_tender_page(portal.get(scraped.tender_url).content)
+        ScraperRepository.apply_tender_details(scraped, page)
+        version = service.record_version(scraped)
+        found += bool(version and version.change_count)
+    return found
+
+
+def amend(portal: SimulatedPortal, count: int):
+    for url in list(portal.pages)[:count]:
+        portal.pages[url] = portal.pages[url].replace(b"INR 48,75,000.00", b"INR 52,00,000.00", 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--changed", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for name in ("legacy", "checker"):
+        db = setup(args.tenders)
+        portal = SimulatedPortal(args.latency_ms / 1000)
+        portal.pages = {f"https://www.tenderdetail.com/Tender/T{n:06d}": PAGE for n in range(args.tenders)}
+        checker = CorrigendumChecker(db, get=portal.get, workers=args.workers, time_budget_seconds=float("inf"))
+        run = (lambda: legacy_check(db, portal)) if name == "legacy" else \
+            (lambda: checker.check_active_tenders(now=NOW)["corrigendums"])
+
+        start = time.perf_counter()
+        run()
+        first = time.perf_counter() - start
+        amend(portal, args.changed)
+        start = time.perf_counter()
+        found = run()
+        steady = time.perf_counter() - start
+        rows.append((name, first, steady, found))
+        db.close()
+
+    print(f"{args.tenders} tenders, {args.latency_ms:.0f} ms per request, {args.workers} workers, {args.changed} amended")
+    print(f"{'path':10} {'first run s':>12} {'steady run s':>13} {'corrigendums':>13}")
+    for name, first, steady, found in rows:
+        print(f"{name:10} {first:>12.1f} {steady:>13.1f} {found:>13}")
+    print(f"steady-state speedup {rows[0][2] / max(rows[1][2], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: BeautifulSoup per-field parsing vs the lxml single-pass parser.
+
+The "legacy" path mirrors the old detail_page_scrape behaviour. It parses
+with BeautifulSoup's html.parser, and each label/value field rescans the text
+of every table row. The "lxml" path is detail_page_scrape.parse_tender_page
+(html_parsing.LabelValueTable). Home pages are measured the same way against
+home_page_scrape.parse_home_page. Both paths are checked to produce the same
+models before timing.
+
+Usage:
+    python -m tests.scripts.bench_detail_parser                       # saved pages in tests/unit/fixtures/tenderdetail
+    python -m tests.scripts.bench_detail_parser /path/to/saved/pages  # detail pages; files named home*.html are home pages
+    python -m tests.scripts.bench_detail_parser --repeat 200
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.core.helpers import get_number_from_currency_string, remove_starting_numbers
+from app.modules.scraper.data_models import (
+    HomePageHeader,
+    TenderDetailContactInformation,
+    TenderDetailDetails,
+    TenderDetailKeyDates,
+    TenderDetailNotice,
+    TenderDetailOtherDetail,
+    TenderDetailPage,
+    TenderDetailPageFile,
+)
+from app.modules.scraper.detail_page_scrape import parse_tender_page
+from app.modules.scraper.helpers import clean_text
+from app.modules.scraper.home_page_scrape import parse_home_page
+
+FIXTURES = Path(__file__).resolve().parents[1] / "unit" / "fixtures" / "tenderdetail"
+
+
+def legacy_field(search, rows):
+    for row in rows:
+        if search in row.text:
+            return row.find_all('td')[1].text.strip()
+    return "N/A"
+
+
+def legacy_parse_tender(content: bytes) -> TenderDetailPage:
+    soup = BeautifulSoup(content, 'html.parser')
+    tables = soup.find('div', attrs={'class': 'tender-details-home'}).find_all('table', recursive=False)
+    notice, dates, contact = (table.find_all('tr')[1:] for table in (tables[0], tables[2], tables[3]))
+    other_rows = tables[4].find_all('tr', recursive=False)
+    files = []
+    for file_row in other_rows[2].find_all('tr')[1:]:
+        cells = file_row.find_all('td')
+        files.append(TenderDetailPageFile(
+            file_name=cells[1].text.strip(),
+            file_url=str(file_row.find('a').attrs['href']),
+            file_description=cells[2].text.strip(),
+            file_size=cells[3].text.strip(),
+        ))
+    return TenderDetailPage(
+        notice=TenderDetailNotice(
+            tdr=legacy_field('TDR', notice),
+            tendering_authority=legacy_field('Tendering Authority', notice),
+            tender_no=legacy_field('Tender No', notice),
+            tender_id=legacy_field('Tender ID', notice),
+            tender_brief=legacy_field('Tender Brief', notice),
+            city=legacy_field('City', notice),
+            state=legacy_field('State', notice),
+            document_fees=legacy_field('Document Fees', notice),
+            emd=legacy_field('EMD', notice),
+            tender_value=get_number_from_currency_string(legacy_field('Tender Value', notice)),
+            tender_type=legacy_field('Tender Type', notice),
+            bidding_type=legacy_field('Bidding Type', notice),
+            competition_type=legacy_field('Competition Type', notice),
+        ),
+        details=TenderDetailDetails(tender_details=tables[1].find('p').text.strip()),
+        key_dates=TenderDetailKeyDates(
+            publish_date=legacy_field('Publish Date', dates),
+            last_date_of_bid_submission=legacy_field('Last Date of Bid Submission', dates),
+            tender_opening_date=legacy_field('Tender Opening Date', dates),
+        ),
+        contact_information=TenderDetailContactInformation(
+            company_name=legacy_field('Company Name', contact),
+            contact_person=legacy_field('Contact Person', contact),
+            address=legacy_field('Address', contact),
+        ),
+        other_detail=TenderDetailOtherDetail(
+            information_source=other_rows[1].find_all('td')[1].text.strip(),
+            files=files,
+        ),
+    )
+
+
+def legacy_parse_home(content: bytes):
+    """The header and (tender_id, title) pairs, found with the old find_all calls"""
+    soup = BeautifulSoup(content, 'html.parser')
+    header = HomePageHeader(
+        date=clean_text(soup.find('p', attrs={'class': 'm-r-date'}).text),
+        name="", contact="", company="",
+        no_of_new_tenders=clean_text(soup.find('p', attrs={'class': 'm-main-count'}).text).split(' ')[0],
+    )
+    rows = soup.find('div', attrs={'class': 'container-fluid'}).find_all('div', attrs={'class': 'row'}, recursive=False)
+    tenders = []
+    for column in rows[-1].find_all('div', attrs={'class': 'col-md-12'}, recursive=False)[1::2]:
+        for main_tr in column.find_all('div', attrs={'class': 'm-mainTR'}, recursive=False):
+            briefs = main_tr.find_all('p', attrs={'class': 'm-td-brief'})
+            tenders.append((
+                briefs[0].find('strong').text.split(':')[1].strip(),
+                remove_starting_numbers(main_tr.find('p', attrs={'class': 'm-r-td-title'}).text.strip()),
+            ))
+    return header, tenders
+
+
+def time_per_page(parse, content: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?", default=str(FIXTURES))
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    pages = sorted(Path(args.directory).glob("*.html"))
+    print(f"{'page':32} {'KB':>6} {'legacy ms':>10} {'lxml ms':>8} {'speedup':>8}  output")
+    total_legacy = total_lxml = 0.0
+    for page in pages:
+        content = page.read_bytes()
+        if page.name.startswith("home"):
+            legacy, new = legacy_parse_home, parse_home_page
+            home = parse_home_page(content)
+            header, tenders = legacy_parse_home(content)
+            same = (header.date, header.no_of_new_tenders) == (home.header.date, home.header.no_of_new_tenders) and all(
+                (t.tender_id, t.tender_name) in tenders for query in home.query_table for t in query.tenders
+            )
+        else:
+            legacy, new = legacy_parse_tender, parse_tender_page
+            same = legacy_parse_tender(content) == parse_tender_page(content)
+        legacy_ms = time_per_page(legacy, content, args.repeat)
+        lxml_ms = time_per_page(new, content, args.repeat)
+        total_legacy += legacy_ms
+        total_lxml += lxml_ms
+        print(f"{page.name[:32]:32} {len(content) / 1024:>6.1f} {legacy_ms:>10.2f} {lxml_ms:>8.2f} "
+              f"{legacy_ms / max(lxml_ms, 1e-9):>7.1f}x  {'same' if same else 'DIFFERENT'}")
+    if pages:
+        print(f"{'total':32} {'':>6} {total_legacy:>10.2f} {total_lxml:>8.2f} {total_legacy / max(total_lxml, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: DOM-copy + premailer digest rendering vs the compiled template.
+
+The "legacy" path mirrors the old templater.generate_email. It parses
+template.html with BeautifulSoup, copy.copy()s a row per query and tender,
+prettifies, inlines CSS with premailer, and reparses the result. The
+"compiled" path is templater.generate_email after the one-off compile
+(timed separately). Peak memory is measured with tracemalloc, and both
+outputs are checked to be identical.
+
+Usage:
+    python -m tests.scripts.bench_digest_render                 # 1,000 tenders over 10 queries
+    python -m tests.scripts.bench_digest_render --tenders 5000 --queries 20
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+import premailer
+from bs4 import BeautifulSoup
+
+from app.modules.scraper import templater
+from app.modules.scraper.data_models import HomePageData, HomePageHeader, Tender, TenderQuery
+
+
+def build_digest(tenders: int, queries: int) -> HomePageData:
+    per_query = [tenders // queries + (1 if i < tenders % queries else 0) for i in range(queries)]
+    query_table = []
+    number = 0
+    for q, count in enumerate(per_query):
+        rows = []
+        for _ in range(count):
+            number += 1
+            rows.append(Tender(
+                tender_id=str(89450000 + number),
+                tender_name=f"Construction and upgradation of road package {number} & allied works",
+                tender_url=f"https://www.tenderdetail.com/Tender/{89450000 + number}/road-package?src=mail&id={number}",
+                city="Lucknow, Uttar Pradesh",
+                summary=f"TDR : {89450000 + number} Widening and strengthening of SH-{number % 90} including "
+                        f"culverts, drains <CD works> and five years maintenance",
+                value=f"Rs. {1 + number % 50}.25 Crore",
+                due_date=f"{1 + number % 28}-12-2025",
+                details=None,
+            ))
+        query_table.append(TenderQuery(query_name=f"Civil Works - Query {q}", number_of_tenders=str(count), tenders=rows))
+    header = HomePageHeader(date="Sunday Nov 02 2025", name="Shubham Kanojia", contact="For customer support: (+91) 8115366981",
+                            no_of_new_tenders=str(tenders), company="RoadVision AI Pvt. Ltd.")
+    return HomePageData(header=header, query_table=query_table)
+
+
+def legacy_generate_email(data: HomePageData) -> str:
+    soup = BeautifulSoup((templater.TEMPLATE_DIR / "template.html").read_text(), 'html.parser')
+    soup.find('td', attrs={'id': 'date'}).string = data.header.date
+    soup.find('td', attrs={'id': 'contact'}).string = data.header.contact
+    soup.find('h4', attrs={'id': 'name'}).string = data.header.name
+    soup.find('td', attrs={'id': 'company'}).string = data.header.company
+    soup.find('span', attrs={'id': 'no_of_new_tenders'}).string = data.header.no_of_new_tenders
+
+    queries_table_body = soup.find('table', attrs={'id': 'queries'}).find('tbody')
+    query_row = queries_table_body.find('tr', attrs={'class': 'query_tender_row'})
+    for query in data.query_table:
+        row = copy.copy(query_row)
+        row.find('td', attrs={'class': 'query_tender_row_query'}).string = query.query_name
+        row.find('td', attrs={'class': 'query_tender_row_no_of_tenders_found'}).string = query.number_of_tenders
+        queries_table_body.append(row)
+    query_row.decompose()
+
+    tenders_div = soup.find('div', attrs={'id': 'tenders'})
+    tenders_table = tenders_div.find('table')
+    for query in data.query_table:
+        query_table = copy.copy(tenders_table)
+        query_table.find('td', attrs={'class': 'tender_query_table_tender_name'}).string = query.query_name
+        body = query_table.find('tbody')
+        tender_row = body.find('tr')
+        for tender in query.tenders:
+            row = copy.copy(tender_row)
+            row.find('td', attrs={'class': 'tender_table_tender_name_and_number'}).string = tender.tender_name
+            row.find('td', attrs={'class': 'tender_table_tender_city'}).string = tender.city
+            row.find('td', attrs={'class': 'tender_table_tender_summary'}).string = tender.summary
+            row.find('span', attrs={'class': 'tender_table_tender_value'}).string = tender.value
+            row.find('span', attrs={'class': 'tender_table_tender_due_date'}).string = tender.due_date
+            row.find('a', attrs={'class': 'tender_table_view_tender_link'})['href'] = tender.tender_url
+            row.find('a', attrs={'class': 'tender_table_redirect_to_website'})['href'] = tender.tender_url
+            body.append(row)
+        tender_row.decompose()
+        tenders_div.append(query_table)
+    tenders_table.decompose()
+
+    inliner = premailer.Premailer(allow_loading_external_files=True, base_path=str(templater.TEMPLATE_DIR))
+    return str(BeautifulSoup(inliner.transform(soup.prettify()), 'html.parser'))
+
+
+def measure(fn, data: HomePageData):
+    tracemalloc.start()
+    start = time.perf_counter()
+    html = fn(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return html, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    data = build_digest(args.tenders, args.queries)
+
+    start = time.perf_counter()
+    templater._template = None
+    templater.get_digest_template()
+    compile_time = time.perf_counter() - start
+
+    legacy_html, legacy_time, legacy_peak = measure(legacy_generate_email, data)
+    compiled_html, compiled_time, compiled_peak = measure(templater.generate_email, data)
+
+    print(f"{args.tenders} tenders in {args.queries} queries, {len(compiled_html) / 1024:.0f} KB of HTML")
+    print(f"one-off template compile: {compile_time * 1000:.1f} ms")
+    print(f"{'renderer':10} {'seconds':>8} {'peak MB':>8}")
+    print(f"{'legacy':10} {legacy_time:>8.3f} {legacy_peak:>8.1f}")
+    print(f"{'compiled':10} {compiled_time:>8.3f} {compiled_peak:>8.1f}")
+    print(f"speedup {legacy_time / max(compiled_time, 1e-9):.1f}x, "
+          f"output {'identical' if legacy_html == compiled_html else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: full-sheet pandas extraction vs read-only streaming extraction.
+
+The "legacy" path mirrors the old ExcelProcessor behaviour: pd.read_excel per
+sheet, ffill/bfill over the whole frame and text built with iterrows(), then a
+second read_excel pass for table chunks. The "stream" path is
+excel_stream.iter_row_blocks(). Peak memory is measured with tracemalloc.
+
+Usage:
+    python -m tests.scripts.bench_excel_stream /path/to/sample/boq/workbooks
+    python -m tests.scripts.bench_excel_stream            # synthetic 50k-row .xlsx (+ .xls if xlwt is installed)
+    python -m tests.scripts.bench_excel_stream --rows 200000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+from app.modules.askai.services.excel_stream import WorkbookBudget, iter_row_blocks
+
+
+def legacy_extract(excel_path: str) -> int:
+    engine = "xlrd" if excel_path.lower().endswith(".xls") else None
+    excel_file = pd.ExcelFile(excel_path, engine=engine)
+    lines = 0
+    for sheet_name in excel_file.sheet_names:
+        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        df = df.ffill(axis=0).bfill().fillna('')
+        text_parts = [f"Sheet: {sheet_name}\n", " | ".join(str(col) for col in df.columns)]
+        for _, row in df.iterrows():
+            row_text = " | ".join(str(val) for val in row.values if str(val).strip())
+            if row_text.strip():
+                text_parts.append(row_text)
+                lines += 1
+        "\n".join(text_parts)
+    for sheet_name in excel_file.sheet_names:
+        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        table_text = ""
+        for _, row in df.iterrows():
+            table_text += " | ".join(str(val) if pd.notna(val) else "" for val in row.values) + "\n"
+    return lines
+
+
+def stream_extract(excel_path: str) -> int:
+    # Unbounded budget so both paths read every row
+    budget = WorkbookBudget(limit_bytes=1 << 62)
+    return sum(len(block.lines) for block in iter_row_blocks(excel_path, budget=budget))
+
+
+def measure(fn, path: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    lines = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lines, elapsed, peak / (1024 * 1024)
+
+
+def boq_rows(rows: int):
+    """BOQ-shaped rows: section cells blank below their first row, as in real workbooks"""
+    for i in range(rows):
+        section = f"Section {i // 500}" if i % 500 == 0 else None
+        yield [section, f"{i // 500}.{i % 500}", f"Supply and laying of item {i} as per specification",
+               "cum", i % 97 + 1, round(150.5 + i % 1000, 2), round((i % 97 + 1) * (150.5 + i % 1000), 2), None]
+
+
+HEADERS = ["Section", "Item No", "Description", "Unit", "Qty", "Rate", "Amount", "Remarks"]
+
+
+def build_synthetic_xlsx(path: Path, rows: int):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("BOQ")
+    sheet.append(HEADERS)
+    for row in boq_rows(rows):
+        sheet.append(row)
+    workbook.save(str(path))
+
+
+def build_synthetic_xls(path: Path, rows: int) -> bool:
+    try:
+        import xlwt
+    except ImportError:
+        return False
+    workbook = xlwt.Workbook()
+    rows = min(rows, 65535 - 1)  # .xls row limit
+    sheet = workbook.add_sheet("BOQ")
+    for col, header in enumerate(HEADERS):
+        sheet.write(0, col, header)
+    for r, row in enumerate(boq_rows(rows), start=1):
+        for col, value in enumerate(row):
+            if value is not None:
+                sheet.write(r, col, value)
+    workbook.save(str(path))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    if args.directory:
+        workbooks = sorted(p for p in Path(args.directory).glob("**/*") if p.suffix.lower() in (".xlsx", ".xls"))
+    else:
+        tmp_dir = Path(tempfile.mkdtemp())
+        workbooks = [tmp_dir / f"synthetic_boq_{args.rows}.xlsx"]
+        print(f"Building synthetic workbooks in {tmp_dir}...")
+        build_synthetic_xlsx(workbooks[0], args.rows)
+        xls = tmp_dir / f"synthetic_boq_{min(args.rows, 65534)}.xls"
+        if build_synthetic_xls(xls, args.rows):
+            workbooks.append(xls)
+        else:
+            print("xlwt not installed, skipping the synthetic .xls workbook")
+
+    print(f"{'file':36} {'rows':>7} {'legacy s':>9} {'legacy MB':>10} {'stream s':>9} {'stream MB':>10} {'speedup':>8}")
+    for workbook in workbooks:
+        try:
+            legacy_lines, legacy_time, legacy_peak = measure(legacy_extract, str(workbook))
+            stream_lines, stream_time, stream_peak = measure(stream_extract, str(workbook))
+        except ImportError as e:
+            print(f"{workbook.name[:36]:36} skipped: {e}")
+            continue
+        mismatch = "" if legacy_lines == stream_lines else f"  (legacy produced {legacy_lines} rows)"
+        print(f"{workbook.name[:36]:36} {stream_lines:>7} {legacy_time:>9.2f} {legacy_peak:>10.1f} "
+              f"{stream_time:>9.2f} {stream_peak:>10.1f} {legacy_time / max(stream_time, 1e-9):>7.1f}x{mismatch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: two-pass PDF parsing vs the single-pass, page-parallel pipeline.
+
+The "legacy" path mirrors the old PDFProcessor behaviour: a PyMuPDF pass for
+text, then a second pdfplumber pass running extract_tables() on every page.
+The "pipeline" path is pdf_pipeline.iter_page_extractions().
+
+Usage:
+    python -m tests.scripts.bench_pdf_pipeline /path/to/sample/tender/pdfs
+    python -m tests.scripts.bench_pdf_pipeline            # synthetic 300-page BOQ PDF
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+import pdfplumber
+
+from app.modules.askai.services.pdf_pipeline import iter_page_extractions
+
+
+def legacy_extract(pdf_path: str):
+    texts = {}
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(doc.page_count):
+            texts[page_num + 1] = doc[page_num].get_text()
+    tables = 0
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            tables += len(page.extract_tables() or [])
+    return len(texts), tables
+
+
+def pipeline_extract(pdf_path: str):
+    pages = 0
+    tables = 0
+    for page in iter_page_extractions(pdf_path):
+        pages += 1
+        tables += len(page.tables)
+    return pages, tables
+
+
+def build_synthetic_pdf(path: Path, pages: int = 300, table_every: int = 5):
+    """Mostly prose pages with a ruled BOQ table on every `table_every`-th page"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        for line in range(40):
+            page.insert_text((50, 50 + line * 18), f"Clause {i}.{line}: The contractor shall comply with the specification.")
+        if i % table_every == 0:
+            for r in range(21):
+                page.draw_line((50, 420 + r * 18), (550, 420 + r * 18))
+            for c in range(6):
+                page.draw_line((50 + c * 100, 420), (50 + c * 100, 780))
+            for r in range(20):
+                for c in range(5):
+                    page.insert_text((55 + c * 100, 433 + r * 18), f"{r}.{c}")
+    doc.save(str(path))
+    doc.close()
+
+
+def main():
+    if len(sys.argv) > 1:
+        pdfs = sorted(Path(sys.argv[1]).glob("**/*.pdf"))
+    else:
+        tmp_dir = Path(tempfile.mkdtemp())
+        synthetic = tmp_dir / "synthetic_boq_300p.pdf"
+        print(f"Building synthetic corpus at {synthetic}...")
+        build_synthetic_pdf(synthetic)
+        pdfs = [synthetic]
+
+    print(f"{'file':40} {'pages':>6} {'tables':>7} {'legacy s':>9} {'pipeline s':>11} {'speedup':>8}")
+    total_legacy = total_pipeline = 0.0
+    for pdf in pdfs:
+        start = time.perf_counter()
+        pages, legacy_tables = legacy_extract(str(pdf))
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, pipeline_tables = pipeline_extract(str(pdf))
+        pipeline_time = time.perf_counter() - start
+
+        total_legacy += legacy_time
+        total_pipeline += pipeline_time
+        mismatch = "" if legacy_tables == pipeline_tables else f"  (legacy found {legacy_tables} tables)"
+        print(f"{pdf.name[:40]:40} {pages:>6} {pipeline_tables:>7} {legacy_time:>9.2f} {pipeline_time:>11.2f} "
+              f"{legacy_time / max(pipeline_time, 1e-9):>7.1f}x{mismatch}")
+
+    print(f"\nTotal: legacy {total_legacy:.2f}s, pipeline {total_pipeline:.2f}s, "
+          f"speedup {total_legacy / max(total_pipeline, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: import-time cost of the application and time to readiness.
+
+Each module is imported in a fresh interpreter (so caches from earlier runs in
+this process do not count) and the median wall time is compared against
+STARTUP_IMPORT_BUDGET_SECONDS. Importing must not touch the network, so the
+budget holds even with Gemini/Weaviate unreachable. With --ready the script
+also runs start_services(wait=True) and prints how long each dependency took.
+
+Exits with status 1 when a module is over budget (usable as a CI check).
+
+Usage:
+    python -m tests.scripts.bench_startup
+    python -m tests.scripts.bench_startup --runs 5 --ready
+    python -m tests.scripts.bench_startup --modules app.core.services app.main
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from app.config import settings
+
+DEFAULT_MODULES = ["app.config", "app.core.services", "app.main"]
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def time_import(module: str, runs: int):
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+            capture_output=True, text=True, timeout=300,
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings), None
+
+
+def time_ready():
+    import time
+    from app.core import services
+
+    start = time.perf_counter()
+    services.start_services(wait=True)
+    elapsed = time.perf_counter() - start
+    print(f"\nstart_services(wait=True): {elapsed:.2f}s")
+    for name, status in services.readiness()["services"].items():
+        init = f"{status['init_seconds']:.2f}s" if status["init_seconds"] is not None else "-"
+        print(f"  {name:12} {status['state']:9} {init:>8}  {status['error'] or ''}")
+    services.shutdown_services()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=settings.STARTUP_IMPORT_BUDGET_SECONDS)
+    parser.add_argument("--ready", action="store_true", help="Also time concurrent service initialisation")
+    args = parser.parse_args()
+
+    print(f"{'module':32} {'median s':>9} {'budget s':>9}  result")
+    over_budget = False
+    for module in args.modules:
+        median, error = time_import(module, args.runs)
+        if error:
+            print(f"{module:32} {'-':>9} {args.budget:>9.2f}  skipped ({error})")
+            continue
+        ok = median <= args.budget
+        over_budget |= not ok
+        print(f"{module:32} {median:>9.2f} {args.budget:>9.2f}  {'ok' if ok else 'OVER BUDGET'}")
+
+    if args.ready:
+        time_ready()
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: local vector backend (exact and IVF) against Weaviate.
+
+Generates clustered synthetic vectors (embedding-like: unit length, grouped
+around topics), ingests them into a temporary local collection and, with
+--weaviate, into a temporary Weaviate collection, then runs the same queries
+everywhere. Reports ingest rate, index build time, p50/p95 query latency and
+recall@k against brute-force ground truth. Raw vectors are used throughout,
+so no embedding model is needed.
+
+Usage:
+    python -m tests.scripts.bench_vector_backends
+    python -m tests.scripts.bench_vector_backends --vectors 200000 --nprobe 4 8 16 --spread 3
+    python -m tests.scripts.bench_vector_backends --weaviate
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.db.local_vector_store import LocalCollection
+
+
+def make_vectors(n: int, dim: int, topics: int, spread: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(topics, dim))
+    vectors = centres[rng.integers(0, topics, n)] + spread * rng.normal(size=(n, dim))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+    queries = centres[rng.integers(0, topics, 200)] + spread * rng.normal(size=(200, dim))
+    return vectors, (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+
+def ground_truth(vectors, queries, k):
+    return [set(np.argpartition(-(vectors @ q), k)[:k].tolist()) for q in queries]
+
+
+def measure(search, queries, truth, k):
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        found = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(expected & set(found[:k])) / k)
+    ordered = sorted(latencies)
+    return statistics.mean(recalls), ordered[len(ordered) // 2], ordered[int(len(ordered) * 0.95)]
+
+
+def row(name, recall, p50, p95, note=""):
+    print(f"{name:22} {recall:>9.3f} {p50:>9.2f} {p95:>9.2f}  {note}")
+
+
+def bench_weaviate(vectors, queries, truth, k):
+    import weaviate
+    import weaviate.classes.config as wvc
+
+    client = weaviate.connect_to_local()
+    name = f"Bench_{uuid.uuid4().hex[:10]}"
+    try:
+        collection = client.collections.create(
+            name=name,
+            properties=[wvc.Property(name="row", data_type=wvc.DataType.INT)],
+            vectorizer_config=wvc.Configure.Vectorizer.none(),
+        )
+        start = time.perf_counter()
+        with collection.batch.dynamic() as batch:
+            for i, vector in enumerate(vectors):
+                batch.add_object(properties={"row": i}, vector=vector.tolist())
+        ingest = time.perf_counter() - start
+
+        def search(query):
+            response = collection.query.near_vector(near_vector=query.tolist(), limit=k)
+            return [obj.properties["row"] for obj in response.objects]
+
+        row("weaviate hnsw", *measure(search, queries, truth, k), note=f"ingest {len(vectors) / ingest:,.0f}/s")
+    finally:
+        client.collections.delete(name)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--spread", type=float, default=2.5, help="Noise around topic centres (higher = harder)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--weaviate", action="store_true", help="Also benchmark a local Weaviate")
+    args = parser.parse_args()
+
+    vectors, queries = make_vectors(args.vectors, args.dim, args.topics, args.spread)
+    truth = ground_truth(vectors, queries, args.k)
+    root = Path(tempfile.mkdtemp(prefix="bench_vectors_"))
+    properties = [{"row": i} for i in range(len(vectors))]
+
+    def local_search(collection):
+        return lambda query: [hit.properties["row"] for hit in collection.search(query, args.k)]
+
+    print(f"{args.vectors:,} vectors x {args.dim}, {len(queries)} queries, k={args.k}\n")
+    print(f"{'backend':22} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    try:
+        settings.LOCAL_VECTOR_IVF_MIN_VECTORS = args.vectors + 1
+        exact = LocalCollection(root / "exact")
+        start = time.perf_counter()
+        exact.add(vectors, properties)
+        ingest = time.perf_counter() - start
+        row("local exact", *measure(local_search(exact), queries, truth, args.k), note=f"ingest {len(vectors) / ingest:,.0f}/s")
+
+        settings.LOCAL_VECTOR_IVF_MIN_VECTORS = 1
+        start = time.perf_counter()
+        ivf = LocalCollection(root / "exact")  # Reopening builds the IVF index over the same files
+        build = time.perf_counter() - start
+        for nprobe in args.nprobe:
+            settings.LOCAL_VECTOR_IVF_NPROBE = nprobe
+            row(f"local ivf nprobe={nprobe}", *measure(local_search(ivf), queries, truth, args.k),
+                note=f"{len(ivf._ivf.centroids)} lists, build {build:.1f}s")
+
+        if args.weaviate:
+            bench_weaviate(vectors, queries, truth, args.k)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Offline retrieval evaluation: recall@k and latency per retrieval configuration.
+
+Loads the tender Q&A fixture (tests/scripts/tender_qa_fixture.py) into a throwaway
+Weaviate chat collection, then runs every question through the retrieval
+pipeline for each configuration: pure vector, hybrid at several alphas, and
+each of those with cross-encoder reranking. For every configuration it prints
+recall@k (share of the relevant chunks found in the first k results, averaged
+over questions), the mean packed context size and p50/p95 latency.
+
+Needs a local Weaviate and the embedding (and, for the rerank rows, the
+cross-encoder) weights; the collection is deleted afterwards.
+
+Usage:
+    python -m tests.scripts.eval_retrieval
+    python -m tests.scripts.eval_retrieval --alphas 0.3 0.5 0.7 --no-rerank
+    python -m tests.scripts.eval_retrieval --fixture my_tender_qa.json --k 1 5 10
+
+A --fixture file is JSON with the fixture module's layout:
+{"chunks": [{"id", "source", "page", "type", "content"}], "questions": [{"question", "relevant"}]}
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from app.config import settings
+from tests.scripts import tender_qa_fixture
+
+
+def recall_at_k(retrieved_ids: Sequence[str], relevant_ids: Sequence[str], k: int) -> float:
+    relevant = set(relevant_ids)
+    if not relevant:
+        return 0.0
+    return len(relevant & set(retrieved_ids[:k])) / len(relevant)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_fixture(vector_store, path: Optional[Path]):
+    if path is None:
+        fixture = {"chunks": tender_qa_fixture.CHUNKS, "questions": tender_qa_fixture.QUESTIONS}
+    else:
+        fixture = json.loads(path.read_text())
+    collection = vector_store.get_or_create_collection(f"eval{uuid.uuid4().hex[:12]}")
+    chunks = [
+        {
+            "content": chunk["content"],
+            "metadata": {
+                "source": chunk["source"],
+                "page": chunk.get("page", "unknown"),
+                "doc_id": chunk["id"],  # Used to match results against the expected chunk ids
+                "doc_type": Path(chunk["source"]).suffix.lstrip(".") or "unknown",
+                "type": chunk.get("type", "text"),
+            },
+        }
+        for chunk in fixture["chunks"]
+    ]
+    vector_store.add_chunks(collection, chunks)
+    return collection, fixture["questions"]
+
+
+def evaluate(vector_store, collection, questions, ks: List[int], mode: str, alpha: float, rerank: bool, count_tokens) -> Dict:
+    from app.modules.askai.services.retrieval import retrieve
+
+    original_alpha = settings.RAG_HYBRID_ALPHA
+    settings.RAG_HYBRID_ALPHA = alpha
+    try:
+        recalls = {k: [] for k in ks}
+        latencies, context_tokens = [], []
+        for item in questions:
+            start = time.perf_counter()
+            results = retrieve(
+                vector_store, collection, item["question"],
+                top_k=max(ks), mode=mode, rerank=rerank, count_tokens=count_tokens,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            ids = [meta.get("doc_id") for _, meta, _ in results]
+            for k in ks:
+                recalls[k].append(recall_at_k(ids, item["relevant"], k))
+            context_tokens.append(sum(count_tokens(doc) for doc, _, _ in results))
+    finally:
+        settings.RAG_HYBRID_ALPHA = original_alpha
+
+    return {
+        "recall": {k: statistics.mean(values) for k, values in recalls.items()},
+        "tokens": statistics.mean(context_tokens),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture", type=Path, help="JSON Q&A set (default: the bundled tender fixture)")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--alphas", type=float, nargs="+", default=[0.25, 0.5, 0.75])
+    parser.add_argument("--no-rerank", action="store_true", help="Skip the cross-encoder rows")
+    args = parser.parse_args()
+
+    import weaviate
+    from app.core.services import get_tokenizer
+    from app.db.vector_store import VectorStoreManager
+
+    tokenizer = get_tokenizer()
+    count_tokens = lambda text: len(tokenizer.encode(text, disallowed_special=()))
+    client = weaviate.connect_to_local()
+    vector_store = VectorStoreManager(client)
+    collection, questions = load_fixture(vector_store, args.fixture)
+
+    configs = [("vector", 1.0)] + [("hybrid", alpha) for alpha in args.alphas]
+    rerank_options = [False] if args.no_rerank else [False, True]
+    ks = sorted(set(args.k))
+
+    try:
+        # Loads the models so the first configuration's latency is not skewed
+        evaluate(vector_store, collection, questions[:1], ks, "vector", 1.0, not args.no_rerank, count_tokens)
+
+        header = f"{'mode':8} {'alpha':>5} {'rerank':>6} " + " ".join(f"{'R@' + str(k):>6}" for k in ks)
+        print(f"\n{len(questions)} questions, {args.fixture.name if args.fixture else 'tender_qa_fixture'}\n")
+        print(header + f" {'ctx tok':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for rerank in rerank_options:
+            for mode, alpha in configs:
+                row = evaluate(vector_store, collection, questions, ks, mode, alpha, rerank, count_tokens)
+                recalls = " ".join(f"{row['recall'][k]:>6.2f}" for k in ks)
+                alpha_label = f"{alpha:.2f}" if mode == "hybrid" else "-"
+                print(
+                    f"{mode:8} {alpha_label:>5} {'yes' if rerank else 'no':>6} {recalls} "
+                    f"{row['tokens']:>8.0f} {row['p50']:>8.1f} {row['p95']:>8.1f}"
+                )
+    finally:
+        client.collections.delete(collection.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
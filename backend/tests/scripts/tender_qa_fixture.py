@@ -0,0 +1,51 @@
+"""
+Tender chunks and questions for the offline retrieval evaluation
+(tests/scripts/eval_retrieval.py). Each question lists the ids of the chunks
+that answer it.
+"""
+
+CHUNKS = [
+    {'id': 'nit-01', 'source': 'NIT.pdf', 'page': 1, 'type': 'text', 'content': 'Notice Inviting Tender No. PWD/RD/2024/117. Online e-tenders are invited from eligible contractors for the widening and strengthening of the Rampur-Sitapur road (SH-24) from km 12.000 to km 38.500, including cross drainage works.'},
+    {'id': 'nit-02', 'source': 'NIT.pdf', 'page': 1, 'type': 'text', 'content': 'Estimated cost of the work: Rs. 48.75 crore (excluding GST). Period of completion: 18 months including the monsoon season, reckoned from the date of issue of the letter of acceptance.'},
+    {'id': 'nit-03', 'source': 'NIT.pdf', 'page': 2, 'type': 'text', 'content': 'Earnest Money Deposit (EMD): Rs. 48,75,000 to be submitted online through the e-procurement portal or as a Bank Guarantee from a scheduled commercial bank valid for 45 days beyond bid validity. Micro and small enterprises registered with NSIC are exempted from EMD.'},
+    {'id': 'nit-04', 'source': 'NIT.pdf', 'page': 2, 'type': 'text', 'content': 'Cost of tender document: Rs. 25,000 (non-refundable) payable online. Bids not accompanied by the tender fee shall be summarily rejected.'},
+    {'id': 'nit-05', 'source': 'NIT.pdf', 'page': 3, 'type': 'text', 'content': 'Critical dates: Pre-bid meeting on 12.03.2024 at 11:00 hrs in the office of the Superintending Engineer. Last date and time for online bid submission: 28.03.2024 up to 15:00 hrs. Technical bids will be opened on 29.03.2024 at 15:30 hrs.'},
+    {'id': 'elig-01', 'source': 'ITB.pdf', 'page': 7, 'type': 'text', 'content': "Clause 4.2 Financial eligibility: the bidder's average annual construction turnover during the last three financial years shall not be less than Rs. 36.5 crore, certified by a chartered accountant."},
+    {'id': 'elig-02', 'source': 'ITB.pdf', 'page': 7, 'type': 'text', 'content': 'Clause 4.3 Similar work experience: the bidder should have satisfactorily completed at least one similar work of road construction costing not less than 80% of the estimated cost, or two similar works each costing not less than 50%, in the last seven years.'},
+    {'id': 'elig-03', 'source': 'ITB.pdf', 'page': 8, 'type': 'text', 'content': 'Clause 4.5 Bid capacity: the available bid capacity computed as (A x N x 2.5 - B) shall be more than the estimated cost, where A is the maximum annual turnover in the last five years, N the completion period in years and B the value of existing commitments.'},
+    {'id': 'elig-04', 'source': 'ITB.pdf', 'page': 8, 'type': 'text', 'content': 'Joint ventures are permitted with not more than two partners. The lead partner shall meet at least 60% of the financial and technical eligibility criteria and the other partner at least 25%.'},
+    {'id': 'pbg-01', 'source': 'GCC.pdf', 'page': 21, 'type': 'text', 'content': 'Clause 17 Performance Security: within 21 days of the letter of acceptance the contractor shall furnish a performance bank guarantee of 5% of the contract value, valid until 60 days after the end of the defect liability period.'},
+    {'id': 'pbg-02', 'source': 'GCC.pdf', 'page': 22, 'type': 'text', 'content': 'Clause 18 Defect Liability Period: the contractor shall rectify any defects noticed within five years from the date of completion. Five percent of each running bill is retained as security deposit and released after the defect liability period.'},
+    {'id': 'pay-01', 'source': 'GCC.pdf', 'page': 25, 'type': 'text', 'content': 'Clause 23 Mobilisation advance: an interest-bearing mobilisation advance up to 10% of the contract price may be paid in two instalments against an unconditional bank guarantee of 110% of the advance amount.'},
+    {'id': 'pay-02', 'source': 'GCC.pdf', 'page': 26, 'type': 'text', 'content': 'Clause 24 Payments: running account bills shall be submitted monthly and paid within 30 days of certification by the Engineer-in-Charge after deduction of retention money, income tax and labour cess at 1%.'},
+    {'id': 'ld-01', 'source': 'GCC.pdf', 'page': 29, 'type': 'text', 'content': 'Clause 31 Liquidated Damages: for delay in completion the contractor shall pay compensation at 0.05% of the contract value per day of delay, subject to a maximum of 10% of the contract value.'},
+    {'id': 'pva-01', 'source': 'GCC.pdf', 'page': 31, 'type': 'text', 'content': 'Clause 33 Price Variation: price adjustment applies for bitumen, cement, steel and fuel using the indices published by the Office of the Economic Adviser, only for contracts with a completion period exceeding 12 months.'},
+    {'id': 'boq-01', 'source': 'BOQ.xlsx', 'page': 'unknown', 'type': 'table', 'content': 'Item 2.01 | Dense Bituminous Macadam (DBM) grade II, 50 mm compacted thickness | Unit: cum | Quantity: 14,250 | Rate: Rs. 9,840'},
+    {'id': 'boq-02', 'source': 'BOQ.xlsx', 'page': 'unknown', 'type': 'table', 'content': 'Item 2.04 | Bituminous Concrete (BC) grade II, 40 mm compacted thickness | Unit: cum | Quantity: 9,100 | Rate: Rs. 11,260'},
+    {'id': 'boq-03', 'source': 'BOQ.xlsx', 'page': 'unknown', 'type': 'table', 'content': 'Item 3.12 | RCC box culvert 2 x 2 m including wing walls, M30 grade concrete | Unit: no | Quantity: 18 | Rate: Rs. 14,85,000'},
+    {'id': 'boq-04', 'source': 'BOQ.xlsx', 'page': 'unknown', 'type': 'table', 'content': 'Item 1.07 | Wet Mix Macadam (WMM) base course, 250 mm thickness in two layers | Unit: cum | Quantity: 31,400 | Rate: Rs. 2,310'},
+    {'id': 'spec-01', 'source': 'Specifications.pdf', 'page': 44, 'type': 'text', 'content': 'Section 507: Bituminous Concrete shall use VG-40 bitumen with a binder content of not less than 5.4% by weight of the total mix. The mix shall be designed by the Marshall method.'},
+    {'id': 'spec-02', 'source': 'Specifications.pdf', 'page': 46, 'type': 'text', 'content': 'Quality control: field density of bituminous layers shall be at least 98% of the laboratory Marshall density. Cores shall be taken at a frequency of one per 700 square metres.'},
+    {'id': 'corr-01', 'source': 'Corrigendum-1.pdf', 'page': 1, 'type': 'text', 'content': 'Corrigendum No. 1: the last date for online bid submission is extended from 28.03.2024 to 08.04.2024 up to 15:00 hrs. The technical bids will now be opened on 09.04.2024. All other terms remain unchanged.'},
+]
+
+QUESTIONS = [
+    {'question': 'What is the EMD amount and how can it be paid?', 'relevant': ['nit-03']},
+    {'question': 'Are MSEs exempted from earnest money?', 'relevant': ['nit-03']},
+    {'question': 'What is the bid submission deadline?', 'relevant': ['nit-05', 'corr-01']},
+    {'question': 'Was the last date extended by a corrigendum?', 'relevant': ['corr-01']},
+    {'question': 'What turnover does a bidder need to qualify?', 'relevant': ['elig-01']},
+    {'question': 'How is bid capacity calculated?', 'relevant': ['elig-03']},
+    {'question': 'Can two companies bid as a joint venture?', 'relevant': ['elig-04']},
+    {'question': 'How much is the performance bank guarantee?', 'relevant': ['pbg-01']},
+    {'question': 'What is the defect liability period?', 'relevant': ['pbg-02']},
+    {'question': 'What is the penalty for late completion?', 'relevant': ['ld-01']},
+    {'question': 'Is there a mobilisation advance?', 'relevant': ['pay-01']},
+    {'question': 'What is the quantity of DBM in the BOQ?', 'relevant': ['boq-01']},
+    {'question': 'Item 3.12 box culvert rate', 'relevant': ['boq-03']},
+    {'question': 'Which bitumen grade is specified for BC?', 'relevant': ['spec-01']},
+    {'question': 'Does the contract have a price variation clause?', 'relevant': ['pva-01']},
+    {'question': 'What is the estimated cost and completion period?', 'relevant': ['nit-02']},
+    {'question': 'When is the pre-bid meeting?', 'relevant': ['nit-05']},
+    {'question': 'How often are running bills paid?', 'relevant': ['pay-02']},
+]
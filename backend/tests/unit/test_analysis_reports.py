@@ -0,0 +1,173 @@
+"""
+Unit tests for pre-rendered analysis reports.
+
+Tests for:
+- get_report rendering once per analysis version and format
+- Concurrent requests for the same report sharing one render
+- download_analysis_report serving ETag, If-None-Match and Range requests
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import get_db_session
+from app.modules.analyze.db.schema import AnalysisDocumentTemplate, AnalysisRFPSection, AnalysisStatusEnum, TenderAnalysis
+from app.modules.analyze.endpoints import endpoints
+from app.modules.analyze.services import analysis_report_service as report_service
+from app.modules.auth.services.auth_service import get_current_active_user
+from app.modules.dmsiq.services import file_storage
+from app.modules.tenderiq.db.schema import Tender
+
+REPORT = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+class CountingRenderer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, analysis, rfp_sections, templates):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return REPORT + analysis.one_pager_json["summary"].encode(), "ignored.pdf", "application/pdf"
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_storage, "DMS_ROOT", tmp_path)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TenderAnalysis.metadata.create_all(engine, tables=[
+        Tender.__table__, TenderAnalysis.__table__, AnalysisRFPSection.__table__, AnalysisDocumentTemplate.__table__,
+    ])
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    renderer = CountingRenderer()
+    monkeypatch.setitem(report_service.FORMATS, "pdf", report_service.ReportFormat("pdf", "application/pdf", renderer))
+    return renderer
+
+
+def add_analysis(db, summary="Road works, 19.45 km"):
+    tender = Tender(id=uuid.uuid4(), tender_ref_number="89453821")
+    analysis = TenderAnalysis(
+        tender_id="89453821", status=AnalysisStatusEnum.completed, progress=100,
+        analysis_completed_at=datetime(2025, 11, 20, 10, 0), one_pager_json={"summary": summary},
+    )
+    db.add_all([tender, analysis])
+    db.commit()
+    return tender, analysis
+
+
+class TestGetReport:
+    def test_rendered_once_per_version(self, db, renderer, tmp_path):
+        _, analysis = add_analysis(db)
+
+        first = report_service.get_report(db, analysis, "pdf")
+        second = report_service.get_report(db, analysis, "PDF")
+
+        assert renderer.calls == 1
+        assert first.path == second.path
+        assert first.path.parent == tmp_path / "analysis_reports" / str(analysis.id)
+        assert first.etag == f'"{first.path.stem}"'
+        assert first.path.read_bytes().startswith(REPORT)
+        assert first.filename.startswith("Tender_Analysis_89453821_") and first.filename.endswith(".pdf")
+
+    def test_new_analysis_results_replace_the_report(self, db, renderer):
+        _, analysis = add_analysis(db)
+        old = report_service.get_report(db, analysis)
+
+        analysis.one_pager_json = {"summary": "Road works, 21 km"}
+        db.commit()
+        new = report_service.get_report(db, analysis)
+
+        assert renderer.calls == 2
+        assert new.etag != old.etag
+        assert not old.path.exists()
+        assert new.path.read_bytes().endswith(b"21 km")
+
+    def test_concurrent_requests_share_one_render(self, session_factory, monkeypatch):
+        renderer = CountingRenderer(delay=0.2)
+        monkeypatch.setitem(report_service.FORMATS, "pdf", report_service.ReportFormat("pdf", "application/pdf", renderer))
+        with session_factory() as db:
+            _, analysis = add_analysis(db)
+            analysis_id = analysis.id
+        paths = []
+
+        def download():
+            with session_factory() as session:
+                paths.append(report_service.get_report(session, session.get(TenderAnalysis, analysis_id)).path)
+
+        threads = [threading.Thread(target=download) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert renderer.calls == 1
+        assert len(set(paths)) == 1
+
+    def test_unknown_formats_are_pdf(self):
+        assert report_service.resolve_format("xlsx") == "excel"
+        assert report_service.resolve_format("docx") == "word"
+        assert report_service.resolve_format("odt") == "pdf"
+
+
+class TestDownloadEndpoint:
+    @pytest.fixture
+    def client(self, session_factory):
+        app = FastAPI()
+        app.include_router(endpoints.router)
+
+        def session():
+            with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db_session] = session
+        app.dependency_overrides[get_current_active_user] = lambda: object()
+        return TestClient(app)
+
+    def test_etag_not_modified_and_range(self, client, db, renderer):
+        tender, _ = add_analysis(db)
+        url = f"/report/download/{tender.id}?format=pdf"
+
+        full = client.get(url)
+        assert full.status_code == 200
+        assert full.headers["etag"].startswith('"')
+        assert full.headers["accept-ranges"] == "bytes"
+        assert full.content.startswith(REPORT)
+
+        etag = full.headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        part = client.get(url, headers={"Range": "bytes=9-18"})
+        assert part.status_code == 206
+        assert part.content == full.content[9:19]
+        assert renderer.calls == 1
+
+    def test_missing_analysis(self, client):
+        assert client.get(f"/report/download/{uuid.uuid4()}").status_code == 404
+
+    def test_by_tender_reference(self, client, db, renderer):
+        add_analysis(db)
+
+        assert client.get("/report/download/89453821").status_code == 200
@@ -0,0 +1,189 @@
+"""
+Unit tests for the semantic answer cache.
+
+Tests for:
+- Document-set keys built from content hashes
+- Exact and similarity hits, threshold, TTL and LRU eviction
+- Chat invalidation and hit/miss stats
+- send_message_to_chat serving a hit without retrieval or a Gemini call, and
+  answering follow-up questions from the chat history instead of the cache
+"""
+
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from app.core.cache import LRUTTLCache
+from app.modules.askai.services.answer_cache import SemanticAnswerCache, document_content_key
+
+VOCABULARY = ["emd", "earnest", "amount", "deposit", "completion", "period", "eligibility", "turnover"]
+
+
+def bag_of_words(text):
+    words = text.lower().replace("?", "").split()
+    return np.array([words.count(term) for term in VOCABULARY], dtype=np.float32)
+
+
+def doc(file_hash):
+    return SimpleNamespace(id=uuid4(), file_hash=file_hash)
+
+
+@pytest.fixture
+def cache():
+    return SemanticAnswerCache(max_entries=16, ttl_seconds=60, threshold=0.9, embed=Mock(side_effect=bag_of_words))
+
+
+SOURCES = [{"id": 1, "source": "NIT.pdf", "page": "2"}]
+
+
+class TestDocumentContentKey:
+    def test_keyed_by_content_hash_not_document_id(self):
+        # The same files uploaded to two chats share a key
+        assert document_content_key([doc("a"), doc("b")]) == document_content_key([doc("b"), doc("a")])
+        assert document_content_key([doc("a")]) != document_content_key([doc("a"), doc("b")])
+
+
+class TestSemanticAnswerCache:
+    def test_exact_question_hits_without_embedding(self, cache):
+        docs = [doc("nit")]
+        cache.store(docs, "What is the EMD amount?", "Rs. 48,75,000", SOURCES)
+        cache._embed.reset_mock()
+
+        hit = cache.lookup(docs, "  what is the  EMD amount? ")
+
+        assert hit.answer == "Rs. 48,75,000" and hit.sources == SOURCES
+        cache._embed.assert_not_called()
+
+    def test_similar_question_hits_above_threshold(self, cache):
+        docs = [doc("nit")]
+        cache.store(docs, "EMD amount?", "Rs. 48,75,000", SOURCES)
+
+        hit = cache.lookup(docs, "What is the amount of EMD")
+
+        assert hit is not None and hit.similarity >= 0.9
+        assert cache.lookup(docs, "What is the completion period?") is None
+
+    def test_other_document_set_misses(self, cache):
+        cache.store([doc("nit")], "EMD amount?", "Rs. 48,75,000", SOURCES)
+        assert cache.lookup([doc("nit"), doc("corrigendum")], "EMD amount?") is None
+
+    def test_entries_expire(self):
+        cache = SemanticAnswerCache(max_entries=4, ttl_seconds=0.05, threshold=0.9, embed=bag_of_words)
+        docs = [doc("nit")]
+        cache.store(docs, "EMD amount?", "answer", SOURCES)
+        time.sleep(0.06)
+        assert cache.lookup(docs, "EMD amount") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_answer_evicted(self):
+        cache = SemanticAnswerCache(max_entries=2, ttl_seconds=60, threshold=0.9, embed=bag_of_words)
+        docs = [doc("nit")]
+        cache.store(docs, "EMD amount?", "emd", SOURCES)
+        cache.store(docs, "completion period?", "18 months", SOURCES)
+        cache.lookup(docs, "EMD amount?")
+        cache.store(docs, "eligibility turnover?", "36.5 crore", SOURCES)
+
+        assert cache.lookup(docs, "completion period?") is None
+        assert cache.lookup(docs, "EMD amount?").answer == "emd"
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_chat_drops_its_document_sets(self, cache):
+        chat_a, chat_b = uuid4(), uuid4()
+        docs_a, docs_b = [doc("a")], [doc("b")]
+        cache.store(docs_a, "EMD amount?", "a", SOURCES, chat_id=chat_a)
+        cache.store(docs_b, "EMD amount?", "b", SOURCES, chat_id=chat_b)
+
+        assert cache.invalidate_chat(chat_a) == 1
+        assert cache.lookup(docs_a, "EMD amount?") is None
+        assert cache.lookup(docs_b, "EMD amount?").answer == "b"
+
+    def test_stats_report_hits_and_misses(self, cache):
+        docs = [doc("nit")]
+        cache.lookup(docs, "EMD amount?")
+        cache.store(docs, "EMD amount?", "answer", SOURCES)
+        cache.lookup(docs, "EMD amount?")
+        cache.lookup(docs, "amount of EMD?")
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["semantic_hits"], stats["misses"], stats["stores"]) == (2, 1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_embedding_failure_is_a_miss(self):
+        cache = SemanticAnswerCache(max_entries=4, ttl_seconds=60, embed=Mock(side_effect=RuntimeError("no model")))
+        docs = [doc("nit")]
+        cache.store(docs, "EMD amount?", "answer", SOURCES)
+        assert cache.lookup(docs, "EMD amount?") is None
+
+
+def test_peek_leaves_recency_untouched():
+    lru = LRUTTLCache(max_entries=2, ttl_seconds=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.peek("a") == 1
+    lru.set("c", 3)
+    assert lru.get("a") is None
+    assert lru.stats()["hits"] == 0
+
+
+class TestSendMessageToChat:
+    def test_hit_skips_retrieval_and_gemini(self, cache):
+        from app.modules.askai.services import rag_service
+
+        docs = [doc("nit")]
+        cache.store(docs, "EMD amount?", "Rs. 48,75,000", SOURCES)
+        chat = SimpleNamespace(id=uuid4(), documents=docs, messages=[])
+        repo = Mock(get_by_id=Mock(return_value=chat))
+
+        with patch.object(rag_service, "ChatRepository", return_value=repo), \
+             patch.object(rag_service, "get_answer_cache", return_value=cache), \
+             patch.object(rag_service, "get_llm_client"), \
+             patch.object(rag_service, "_generate_answer") as generate_answer:
+            result = rag_service.send_message_to_chat(Mock(), chat.id, "EMD amount?")
+
+        assert result["reply"] == "Rs. 48,75,000" and result["sources"] == SOURCES
+        generate_answer.assert_not_called()
+        assert [call.kwargs["sender"] for call in repo.add_message.call_args_list] == ["user", "bot"]
+
+    def test_miss_generates_and_stores(self, cache):
+        from app.modules.askai.services import rag_service
+
+        docs = [doc("nit")]
+        chat = SimpleNamespace(id=uuid4(), documents=docs, messages=[])
+        repo = Mock(get_by_id=Mock(return_value=chat))
+        client = Mock()
+        client.models.generate_content.return_value = SimpleNamespace(text="18 months")
+        vector_store = Mock()
+
+        with patch.object(rag_service, "ChatRepository", return_value=repo), \
+             patch.object(rag_service, "get_answer_cache", return_value=cache), \
+             patch.object(rag_service, "get_llm_client", return_value=client), \
+             patch.object(rag_service, "get_vector_store", return_value=vector_store), \
+             patch.object(rag_service, "retrieve", return_value=[("Completion: 18 months", {"doc_type": "pdf", "source": "NIT.pdf", "page": "1"}, 0.9)]):
+            result = rag_service.send_message_to_chat(Mock(), chat.id, "completion period?")
+
+        assert result["reply"] == "18 months"
+        hit = cache.lookup(docs, "completion period?")
+        assert hit.answer == "18 months" and hit.sources[0]["source"] == "NIT.pdf"
+
+    def test_follow_up_question_bypasses_the_cache(self, cache):
+        from app.modules.askai.services import rag_service
+
+        docs = [doc("nit")]
+        cache.store(docs, "and the EMD?", "Rs. 48,75,000", SOURCES)
+        earlier = [SimpleNamespace(sender="user", text="Bid security for package 2?", timestamp=0)]
+        chat = SimpleNamespace(id=uuid4(), documents=docs, messages=earlier)
+        repo = Mock(get_by_id=Mock(return_value=chat))
+
+        with patch.object(rag_service, "ChatRepository", return_value=repo), \
+             patch.object(rag_service, "get_answer_cache", return_value=cache), \
+             patch.object(rag_service, "_generate_answer", return_value=("Rs. 12,00,000", SOURCES, True)) as generate_answer:
+            result = rag_service.send_message_to_chat(Mock(), chat.id, "and the EMD?")
+            rag_service.send_message_to_chat(Mock(), chat.id, "and the completion period?")
+
+        assert result["reply"] == "Rs. 12,00,000"
+        assert generate_answer.call_count == 2
+        assert cache.lookup(docs, "and the completion period?") is None
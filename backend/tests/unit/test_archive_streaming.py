@@ -0,0 +1,176 @@
+"""
+Unit tests for streaming archive processing.
+
+Tests for:
+- Member selection from archive listings (unsupported / oversized skipped)
+- Streaming extraction of selected members only (zip, tar.gz)
+- Unsafe member paths
+- Parallel member processing, nested archives and failure isolation
+- Members parsed without process pools of their own
+"""
+
+import io
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.modules.askai.services import archive_utils, pdf_pipeline
+from app.modules.askai.services.document_service import ArchiveProcessor
+
+
+def build_zip(path: Path, members: dict) -> str:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return str(path)
+
+
+class FakeProcessor:
+    """Records calls and returns one chunk per file; sleeps to expose concurrency"""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.seen = []
+        self.active = 0
+        self.max_active = 0
+        self.worker_limits = []
+        self.lock = threading.Lock()
+
+    def _process(self, job_id, path, doc_id, filename):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.seen.append((filename, Path(path).read_bytes()))
+            self.worker_limits.append(pdf_pipeline.worker_limit(8))
+        try:
+            time.sleep(self.delay)
+            if filename == self.fail_on:
+                raise RuntimeError("corrupt member")
+            return [{"content": filename, "metadata": {"filename": filename}}], {}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    process_pdf = process_excel = process_html = _process
+
+
+@pytest.fixture
+def processor():
+    pdf = FakeProcessor(delay=0.1)
+    excel = FakeProcessor()
+    html = FakeProcessor()
+    archive = ArchiveProcessor(None, None, pdf, excel, html)
+    archive.archive_processor = archive
+    return archive
+
+
+class TestMemberSelection:
+    def test_skips_dirs_unsupported_and_oversized(self, processor):
+        members = [
+            {"path": "docs/", "size": 0, "is_dir": True},
+            {"path": "docs/nit.pdf", "size": 1024, "is_dir": False},
+            {"path": "docs/boq.xlsx", "size": 1024, "is_dir": False},
+            {"path": "setup.exe", "size": 1024, "is_dir": False},
+            {"path": "drawings.pdf", "size": (settings.MAX_PDF_SIZE_MB + 1) * 1024 * 1024, "is_dir": False},
+        ]
+
+        selected, skipped = processor.select_members(members)
+
+        assert [(m["path"], m["kind"]) for m in selected] == [("docs/nit.pdf", "pdf"), ("docs/boq.xlsx", "excel")]
+        assert len(skipped) == 2
+        assert any("setup.exe" in reason for reason in skipped)
+        assert any("drawings.pdf" in reason and "limit" in reason for reason in skipped)
+
+
+class TestStreamingExtraction:
+    def test_zip_writes_only_selected_members_lazily(self, tmp_path):
+        archive = build_zip(tmp_path / "bundle.zip", {"a.pdf": b"A", "b.pdf": b"B", "big.bin": b"x" * 1000})
+        out = tmp_path / "out"
+
+        stream = archive_utils.iter_extract_members(archive, str(out), ["a.pdf", "b.pdf"])
+        first = next(stream)
+
+        assert first.read_bytes() == b"A"
+        assert not (out / "b.pdf").exists()
+        assert [p.name for p in stream] == ["b.pdf"]
+        assert not (out / "big.bin").exists()
+
+    def test_tar_gz_single_pass(self, tmp_path):
+        path = tmp_path / "bundle.tar.gz"
+        with tarfile.open(path, "w:gz") as tf:
+            for name, data in {"x/a.pdf": b"A", "x/skip.txt": b"S", "x/b.html": b"<p>B</p>"}.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        paths = list(archive_utils.iter_extract_members(str(path), str(tmp_path / "out"), ["x/a.pdf", "x/b.html"]))
+
+        assert [p.name for p in paths] == ["a.pdf", "b.html"]
+        assert not (tmp_path / "out" / "x" / "skip.txt").exists()
+
+    def test_unsafe_member_paths_are_skipped(self, tmp_path):
+        archive = build_zip(tmp_path / "evil.zip", {"../escape.pdf": b"E", "ok.pdf": b"O"})
+
+        paths = list(archive_utils.iter_extract_members(archive, str(tmp_path / "out"), ["../escape.pdf", "ok.pdf"]))
+
+        assert [p.name for p in paths] == ["ok.pdf"]
+        assert not (tmp_path / "escape.pdf").exists()
+
+
+class TestArchiveProcessor:
+    def test_members_processed_in_parallel_and_merged(self, tmp_path, processor):
+        members = {f"tender/doc{i}.pdf": f"PDF{i}".encode() for i in range(6)}
+        members["tender/boq.xlsx"] = b"XLSX"
+        members["tender/readme.txt"] = b"skip me"
+        archive = build_zip(tmp_path / "bundle.zip", members)
+
+        with patch.object(settings, "ARCHIVE_MAX_WORKERS", 3):
+            chunks, stats = processor.process_archive(None, archive, "doc-1", "bundle.zip")
+
+        assert stats["files_processed"] == 7
+        assert stats["files_skipped"] == 1
+        assert stats["files_failed"] == 0
+        assert processor.pdf_processor.max_active > 1
+        assert processor.pdf_processor.max_active <= 3
+        assert sorted(c["metadata"]["archive_path"] for c in chunks) == sorted(p for p in members if not p.endswith(".txt"))
+        assert all(c["metadata"]["archive_filename"] == "bundle.zip" for c in chunks)
+
+    def test_members_are_parsed_without_process_pools(self, tmp_path, processor):
+        archive = build_zip(tmp_path / "bundle.zip", {f"doc{i}.pdf": b"PDF" for i in range(3)})
+
+        processor.process_archive(None, archive, "doc-1", "bundle.zip")
+
+        assert processor.pdf_processor.worker_limits == [1, 1, 1]
+        # The scope ends with the member
+        assert pdf_pipeline.worker_limit(8) == 8
+
+    def test_nested_archive_and_failed_member(self, tmp_path, processor):
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("inner.html", b"<p>inner</p>")
+        archive = build_zip(tmp_path / "outer.zip", {"nested.zip": inner.getvalue(), "bad.pdf": b"?", "good.pdf": b"ok"})
+        processor.pdf_processor.fail_on = "bad.pdf"
+
+        chunks, stats = processor.process_archive(None, archive, "doc-1", "outer.zip")
+
+        assert stats["files_processed"] == 2
+        assert stats["files_failed"] == 1
+        depths = {c["content"]: c["metadata"]["extraction_depth"] for c in chunks}
+        assert depths == {"good.pdf": 1, "inner.html": 1}
+        assert processor.html_processor.seen == [("inner.html", b"<p>inner</p>")]
+
+    def test_too_many_members_rejected_before_extraction(self, tmp_path, processor):
+        archive = build_zip(tmp_path / "bomb.zip", {f"{i}.pdf": b"x" for i in range(5)})
+
+        with patch.object(settings, "MAX_FILES_PER_ARCHIVE", 3), \
+             patch.object(archive_utils, "_stream_member") as stream_member:
+            with pytest.raises(ValueError):
+                processor.process_archive(None, archive, "doc-1", "bomb.zip")
+        stream_member.assert_not_called()
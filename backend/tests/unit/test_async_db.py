@@ -0,0 +1,177 @@
+"""
+Unit tests for the connection pools and the async session used by async routes.
+
+Tests for:
+- Pool options taken from settings (pre-ping, recycle, sizing)
+- get_current_user looking the user up on the route's own sync Session
+- upload_pdf's chat checks and the docs SSE snapshot on an AsyncSession
+
+The async engine runs on aiosqlite against a temporary SQLite file that a
+sync engine seeds.
+"""
+
+import asyncio
+import io
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.core.security import create_access_token
+from app.db import database
+from app.db.database import get_async_db_session, get_db_session
+from app.modules.askai.db.models import Chat, Document, Message, chat_document_association
+from app.modules.auth.db.schema import TokenBlocklist, User
+from app.modules.auth.services.auth_service import get_current_active_user
+
+TABLES = [User.__table__, TokenBlocklist.__table__, Chat.__table__, Message.__table__,
+          Document.__table__, chat_document_association]
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    """(ids of the seeded rows, async session factory) on one SQLite file"""
+    path = tmp_path / "app.db"
+    engine = create_engine(f"sqlite:///{path}")
+    User.metadata.create_all(engine, tables=TABLES)
+    with sessionmaker(bind=engine)() as db:
+        user = User(email="engineer@ceigall.com", full_name="Site Engineer", is_active=True)
+        chat = Chat(title="NHAI tender", created_at=datetime(2025, 11, 1), updated_at=datetime(2025, 11, 1))
+        chat.documents.append(Document(
+            filename="rfp.pdf", doc_type="pdf", file_hash="abc", file_size=10, status="active",
+            uploaded_at=datetime(2025, 11, 1), chunk_count=42,
+        ))
+        db.add_all([user, chat, TokenBlocklist(jti="revoked-jti")])
+        db.commit()
+        ids = {"user": user.id, "chat": chat.id}
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    yield ids, async_sessionmaker(async_engine, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def sync_factory(tmp_path, seeded):
+    """Sync session factory on the seeded SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", poolclass=NullPool)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def make_client(session_factory, *routers, sync_factory=None):
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    app.state.sync_sessions = []
+
+    @app.get("/me")
+    def me(user: User = Depends(get_current_active_user), db: Session = Depends(get_db_session)):
+        return {"id": str(user.id), "email": user.email, "same_session": user in db}
+
+    async def override():
+        async with session_factory() as db:
+            yield db
+
+    def override_sync():
+        with sync_factory() as db:
+            app.state.sync_sessions.append(db)
+            yield db
+
+    app.dependency_overrides[get_async_db_session] = override
+    if sync_factory is not None:
+        app.dependency_overrides[get_db_session] = override_sync
+    return TestClient(app)
+
+
+class TestPoolOptions:
+    def test_postgres_pools_use_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_POOL_RECYCLE_SECONDS", 600)
+        options = database.pool_options("postgresql+asyncpg://u:p@db:5432/app", pool_size=7, max_overflow=3)
+
+        assert options == {
+            "pool_size": 7, "max_overflow": 3, "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle": 600, "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+
+    def test_sqlite_keeps_the_default_pool(self):
+        assert database.pool_options("sqlite://", pool_size=7, max_overflow=3) == {}
+
+    def test_async_url_follows_database_url(self):
+        assert settings.ASYNC_DATABASE_URL.startswith("postgresql+asyncpg://")
+        assert settings.ASYNC_DATABASE_URL.split("://", 1)[1] == settings.DATABASE_URL.split("://", 1)[1]
+
+
+class TestCurrentUser:
+    def test_token_resolves_to_user_on_the_route_session(self, seeded, sync_factory):
+        ids, factory = seeded
+        token = create_access_token({"sub": "engineer@ceigall.com"})
+        client = make_client(factory, sync_factory=sync_factory)
+
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json() == {"id": str(ids["user"]), "email": "engineer@ceigall.com", "same_session": True}
+        # One session, so one connection, per request
+        assert len(client.app.state.sync_sessions) == 1
+
+    def test_unknown_user_is_rejected(self, seeded, sync_factory):
+        _, factory = seeded
+        token = create_access_token({"sub": "nobody@ceigall.com"})
+
+        response = make_client(factory, sync_factory=sync_factory).get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+
+    def test_revoked_token_is_rejected(self, seeded, sync_factory, monkeypatch):
+        _, factory = seeded
+        monkeypatch.setattr("app.core.security.uuid.uuid4", lambda: "revoked-jti")
+        token = create_access_token({"sub": "engineer@ceigall.com"})
+
+        response = make_client(factory, sync_factory=sync_factory).get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
+
+class TestDocuments:
+    @pytest.fixture(autouse=True)
+    def documents(self):
+        # The documents router imports the Drive client (google-auth)
+        pytest.importorskip("google.auth")
+        from app.modules.askai.endpoints import documents
+        self.module = documents
+
+    def upload(self, factory, chat_id, filename):
+        files = {"pdf": (filename, io.BytesIO(b"%PDF-1.4"), "application/pdf")}
+        return make_client(factory, self.module.router).post(f"/chats/{chat_id}/upload-pdf", files=files)
+
+    def test_upload_to_missing_chat(self, seeded):
+        _, factory = seeded
+
+        response = self.upload(factory, "00000000-0000-0000-0000-000000000000", "boq.pdf")
+
+        assert response.status_code == 404
+
+    def test_duplicate_upload_checks_loaded_documents(self, seeded):
+        ids, factory = seeded
+
+        response = self.upload(factory, ids["chat"], "rfp.pdf")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "PDF 'rfp.pdf' already uploaded"
+
+    def test_docs_snapshot_on_async_session(self, seeded, monkeypatch):
+        ids, factory = seeded
+        monkeypatch.setattr(self.module, "AsyncSessionLocal", factory)
+
+        snapshot = asyncio.run(self.module._load_chat_docs_snapshot(ids["chat"]))
+
+        assert snapshot["pdfs"] == [{"name": "rfp.pdf", "chunks": 42, "status": "active"}]
+        assert snapshot["total_docs"] == 1
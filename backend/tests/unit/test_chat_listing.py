@@ -0,0 +1,87 @@
+"""
+Unit tests for the aggregate, keyset-paginated chat listing queries.
+
+Runs against an in-memory SQLite database holding only the AskAI tables.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.askai.db.models import Chat, Document, DocumentChunk, Message, chat_document_association
+from app.modules.askai.db.repository import ChatRepository, DocumentRepository
+
+TABLES = [Chat.__table__, Message.__table__, Document.__table__, DocumentChunk.__table__, chat_document_association]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Chat.metadata.create_all(engine, tables=TABLES)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def chats(db):
+    base = datetime(2025, 11, 1)
+    chats = []
+    for i in range(5):
+        chat = Chat(title=f"Chat {i}", created_at=base, updated_at=base + timedelta(hours=i))
+        for m in range(i):
+            chat.messages.append(Message(sender="user", text=f"m{m}", timestamp=base))
+        if i % 2 == 0:
+            doc = Document(filename=f"doc{i}.pdf", file_hash=f"h{i}", file_size=10, uploaded_at=base, chunk_count=i * 10)
+            doc.chunks = [DocumentChunk(content="x") for _ in range(i * 10)]
+            chat.documents.append(doc)
+        chats.append(chat)
+    # Two chats share an updated_at so the id tie-breaker is exercised
+    chats[3].updated_at = chats[4].updated_at
+    db.add_all(chats)
+    db.commit()
+    return chats
+
+
+def count_queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestChatPage:
+    def test_page_has_counts_newest_first(self, db, chats):
+        rows = ChatRepository(db).get_page_with_counts(limit=10)
+
+        assert [r.title for r in rows][:2] in (["Chat 4", "Chat 3"], ["Chat 3", "Chat 4"])
+        assert [r.title for r in rows][2:] == ["Chat 2", "Chat 1", "Chat 0"]
+        assert {r.title: r.message_count for r in rows} == {f"Chat {i}": i for i in range(5)}
+
+    def test_keyset_pages_cover_all_chats_once(self, db, chats):
+        repo = ChatRepository(db)
+        seen, before = [], None
+        while True:
+            rows = repo.get_page_with_counts(limit=2, before=before)
+            if not rows:
+                break
+            seen.extend(r.id for r in rows)
+            before = (rows[-1].updated_at, rows[-1].id)
+
+        assert sorted(seen, key=str) == sorted((c.id for c in chats), key=str)
+        assert len(seen) == len(set(seen))
+
+    def test_listing_uses_fixed_number_of_queries(self, db, chats):
+        statements = count_queries(db)
+        rows = ChatRepository(db).get_page_with_counts(limit=10)
+        docs = DocumentRepository(db).get_metadata_for_chats([r.id for r in rows])
+
+        assert len(statements) == 2
+        assert all("document_chunks" not in s for s in statements)
+        assert sorted((d.filename, d.chunk_count) for d in docs) == [("doc0.pdf", 0), ("doc2.pdf", 20), ("doc4.pdf", 40)]
+
+    def test_no_chats(self, db):
+        assert ChatRepository(db).get_page_with_counts(limit=10) == []
+        assert DocumentRepository(db).get_metadata_for_chats([]) == []
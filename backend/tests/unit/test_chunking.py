@@ -0,0 +1,136 @@
+"""
+Unit tests for the shared token-aware chunker.
+
+Tests for:
+- Token windows sliced from the original text with overlap
+- tiktoken offsets (single encode per text)
+- Hugging Face fast tokenizer offsets (the embedder's WordPiece tokens)
+- Metadata cleaned once and chunk_index added per chunk
+- Progress throttling
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.modules.askai.models.document import ProcessingStage
+from app.modules.askai.services import chunking
+from app.modules.askai.services.chunking import ProgressThrottle, TokenChunker
+
+
+def numbered_words(n):
+    return " ".join(f"w{i}" for i in range(n))
+
+
+class TestTokenChunker:
+    def test_short_text_is_single_chunk_without_index(self):
+        chunks = TokenChunker(chunk_size=10, chunk_overlap=2).chunk("Bid due date 12-11-2025", {"page": 1})
+
+        assert len(chunks) == 1
+        assert chunks[0]["content"] == "Bid due date 12-11-2025"
+        assert chunks[0]["metadata"] == {"page": "1"}
+        assert chunks[0]["token_count"] == 4
+
+    def test_empty_text_has_no_chunks(self):
+        assert TokenChunker(chunk_size=10, chunk_overlap=2).chunk("   ", {"page": 1}) == []
+
+    def test_windows_overlap_and_cover_text(self):
+        chunks = TokenChunker(chunk_size=10, chunk_overlap=3).chunk(numbered_words(25), {"doc_id": "d1"})
+
+        contents = [c["content"].split() for c in chunks]
+        assert contents[0] == [f"w{i}" for i in range(10)]
+        assert contents[1][:3] == contents[0][-3:]
+        assert contents[-1][-1] == "w24"
+        assert [c["metadata"]["chunk_index"] for c in chunks] == [str(i) for i in range(len(chunks))]
+        assert all(c["token_count"] <= 10 for c in chunks)
+
+    def test_chunks_preserve_original_spacing(self):
+        text = "Clause 1.\nThe contractor  shall\tcomply. " * 10
+        chunks = TokenChunker(chunk_size=8, chunk_overlap=0).chunk(text, {})
+
+        assert "".join(c["content"] for c in chunks).replace(" ", "").replace("\n", "").replace("\t", "") == \
+            text.replace(" ", "").replace("\n", "").replace("\t", "")
+
+    def test_metadata_cleaned_once(self):
+        with patch.object(chunking, "clean_metadata", wraps=chunking.clean_metadata) as clean:
+            chunks = TokenChunker(chunk_size=5, chunk_overlap=1).chunk(numbered_words(40), {"filename": "BOQ (final).pdf"})
+
+        clean.assert_called_once()
+        assert len(chunks) > 1
+        assert all(c["metadata"]["filename"] == "BOQ _final_.pdf" for c in chunks)
+
+    def test_tiktoken_offsets(self):
+        tiktoken = pytest.importorskip("tiktoken")
+        # Byte-level encoding so the test runs without downloading cl100k_base
+        encoding = tiktoken.Encoding(
+            name="bytes",
+            pat_str=r"\S+|\s+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={},
+        )
+        text = "EMD ₹25,00,000 payable. " * 20
+        chunker = TokenChunker(encoding, chunk_size=32, chunk_overlap=4)
+
+        with patch.object(encoding, "encode", wraps=encoding.encode) as encode:
+            chunks = chunker.chunk(text, {})
+
+        encode.assert_called_once()
+        assert len(chunks) > 1
+        assert all(c["token_count"] <= 32 and c["content"] in text for c in chunks)
+        assert chunks[0]["content"].startswith("EMD ₹25")
+
+    def test_fast_tokenizer_offsets(self):
+        class WordPiece:
+            """Splits words into 3-character pieces, like subword tokenizers do"""
+            is_fast = True
+
+            def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False, verbose=True):
+                assert not add_special_tokens and return_offsets_mapping
+                pieces = [(m.start() + i, min(m.start() + i + 3, m.end()))
+                          for m in chunking._WHITESPACE_TOKEN.finditer(text)
+                          for i in range(0, m.end() - m.start(), 3)]
+                return {"offset_mapping": pieces}
+
+        text = "Performance security of 5 percent of contract value. " * 10
+        chunks = TokenChunker(WordPiece(), chunk_size=30, chunk_overlap=5).chunk(text, {})
+
+        # 8 words but 18 pieces per sentence: sized by pieces, not words
+        assert len(chunks) == 7
+        assert all(c["token_count"] <= 30 and c["content"] in text for c in chunks)
+        assert chunks[0]["content"].startswith("Performance security")
+
+    def test_count_tokens_matches_chunk_sizes(self):
+        text = numbered_words(30)
+        chunker = TokenChunker(chunk_size=100)
+
+        assert chunker.count_tokens(text) == 30
+        assert chunker.chunk(text, {})[0]["token_count"] == 30
+
+    def test_overlap_must_be_smaller_than_size(self):
+        with pytest.raises(ValueError):
+            TokenChunker(chunk_size=10, chunk_overlap=10)
+
+
+class TestProgressThrottle:
+    def test_small_updates_are_dropped(self):
+        throttle = ProgressThrottle(min_interval=60, min_delta=5)
+        stage = ProcessingStage.CREATING_CHUNKS
+
+        assert throttle.should_report("job", stage, 0)
+        assert not throttle.should_report("job", stage, 1)
+        assert not throttle.should_report("job", stage, 4.9)
+        assert throttle.should_report("job", stage, 5)
+
+    def test_stage_change_and_completion_always_reported(self):
+        throttle = ProgressThrottle(min_interval=60, min_delta=50)
+
+        assert throttle.should_report("job", ProcessingStage.CREATING_CHUNKS, 10)
+        assert throttle.should_report("job", ProcessingStage.EXTRACTING_TABLES, 11)
+        assert throttle.should_report("job", ProcessingStage.EXTRACTING_TABLES, 100)
+
+    def test_jobs_are_tracked_independently(self):
+        throttle = ProgressThrottle(min_interval=60, min_delta=50)
+        stage = ProcessingStage.CREATING_CHUNKS
+
+        assert throttle.should_report("a", stage, 10)
+        assert throttle.should_report("b", stage, 11)
+        assert not throttle.should_report("a", stage, 12)
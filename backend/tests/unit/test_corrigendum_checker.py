@@ -0,0 +1,180 @@
+"""
+Unit tests for the periodic corrigendum check.
+
+Tests for:
+- page_fingerprint ignoring markup, scripts and form state
+- fetch_page sending validators and parsing only changed pages
+- CorrigendumChecker ordering by deadline, skipping unchanged pages and recording changes
+- The time budget deferring the furthest deadlines
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.scraper.db.repository import ScraperRepository
+from app.modules.scraper.db.schema import ScrapedTender, ScrapedTenderFile, ScrapedTenderQuery, ScrapeRun
+from app.modules.scraper.detail_page_scrape import parse_tender_page
+from app.modules.tenderiq.db.schema import Tender, TenderFieldChange, TenderPageFingerprint, TenderVersion
+from app.modules.tenderiq.services.corrigendum_checker import CorrigendumChecker, fetch_page, page_fingerprint
+from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
+
+PAGE = (Path(__file__).parent / "fixtures" / "tenderdetail" / "detail_full.html").read_bytes()
+AMENDED_PAGE = PAGE.replace(b"INR 48,75,000.00", b"INR 52,00,000.00")
+NOW = datetime(2025, 11, 10)
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakePortal:
+    """Serves detail pages by URL and records the requests"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, dict(headers or {})))
+        page = self.pages[url]
+        if isinstance(page, FakeResponse):
+            return page
+        return FakeResponse(200, page, {"ETag": f'"{len(page)}"'})
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Tender.metadata.create_all(engine, tables=[
+        ScrapeRun.__table__, ScrapedTenderQuery.__table__, ScrapedTender.__table__, ScrapedTenderFile.__table__,
+        Tender.__table__, TenderVersion.__table__, TenderFieldChange.__table__, TenderPageFingerprint.__table__,
+    ])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_tender(db, ref, deadline, status="New"):
+    """A tender scraped from PAGE, with its baseline version, as the scraper leaves it"""
+    scraped = ScrapedTender(tender_id_str=ref, tender_url=f"https://www.tenderdetail.com/Tender/{ref}", city="Lucknow, Uttar Pradesh")
+    ScraperRepository.apply_tender_details(scraped, parse_tender_page(PAGE))
+    db.add_all([scraped, Tender(tender_ref_number=ref, submission_deadline=deadline, status=status)])
+    db.commit()
+    CorrigendumTrackingService(db).record_version(scraped)
+
+
+class TestPageFingerprint:
+    def test_ignores_markup_scripts_and_form_state(self):
+        page = b"<div class='tender-details-home'><td>EMD</td><td>INR 50,000</td></div>"
+        rerendered = (b"<html><script>var t = 1;</script><div class=\"tender-details-home\">\n"
+                      b"  <td>EMD</td>\n  <td>INR&nbsp;50,000</td><input type=hidden name=__VIEWSTATE value=x1>"
+                      b"<!-- rendered in 12ms --></div>")
+        assert page_fingerprint(page) == page_fingerprint(rerendered)
+
+    def test_detects_text_changes(self):
+        assert page_fingerprint(PAGE) != page_fingerprint(AMENDED_PAGE)
+
+
+class TestFetchPage:
+    def test_sends_validators_and_keeps_them_on_304(self):
+        portal = FakePortal({"u": FakeResponse(304)})
+
+        check = fetch_page("T1", "u", etag='"abc"', last_modified="Mon, 03 Nov 2025 10:00:00 GMT", fingerprint="f", get=portal.get)
+
+        assert portal.requests == [("u", {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 03 Nov 2025 10:00:00 GMT"})]
+        assert (check.status, check.etag, check.fingerprint) == ("not_modified", '"abc"', "f")
+
+    def test_same_fingerprint_is_not_parsed(self):
+        portal = FakePortal({"u": b"<p>not a tender page</p>"})
+
+        check = fetch_page("T1", "u", fingerprint=page_fingerprint(b"<p>not a tender page</p>"), get=portal.get)
+
+        assert (check.status, check.page) == ("unchanged", None)
+
+    def test_changed_page_is_parsed(self):
+        check = fetch_page("T1", "u", fingerprint=page_fingerprint(PAGE), get=FakePortal({"u": AMENDED_PAGE}).get)
+
+        assert check.status == "changed"
+        assert check.page.notice.emd == "INR 52,00,000.00"
+
+    def test_errors_are_reported(self):
+        check = fetch_page("T1", "u", get=FakePortal({"u": FakeResponse(503)}).get)
+
+        assert (check.status, check.error) == ("failed", "HTTP 503")
+
+
+class TestCorrigendumChecker:
+    def test_nearest_deadlines_first_and_window(self, db):
+        add_tender(db, "T-LATE", datetime(2025, 12, 1))
+        add_tender(db, "T-SOON", datetime(2025, 11, 12))
+        add_tender(db, "T-OUT", datetime(2026, 3, 1))
+        add_tender(db, "T-LOST", datetime(2025, 11, 11), status="Lost")
+        portal = FakePortal({f"https://www.tenderdetail.com/Tender/{ref}": PAGE for ref in ("T-LATE", "T-SOON")})
+
+        counts = CorrigendumChecker(db, get=portal.get, workers=1).check_active_tenders(now=NOW)
+
+        assert [url.rsplit("/", 1)[1] for url, _ in portal.requests] == ["T-SOON", "T-LATE"]
+        # First check: no fingerprint yet, parsed, but identical to the baseline version
+        assert (counts["checked"], counts["changed"], counts["corrigendums"]) == (2, 2, 0)
+        assert db.query(TenderVersion).count() == 4
+
+    def test_unchanged_pages_skip_parsing_and_changes_become_versions(self, db):
+        for ref in ("T1", "T2", "T3"):
+            add_tender(db, ref, datetime(2025, 11, 20))
+        url = "https://www.tenderdetail.com/Tender/{}".format
+        portal = FakePortal({url(ref): PAGE for ref in ("T1", "T2", "T3")})
+        checker = CorrigendumChecker(db, get=portal.get, workers=2, batch_size=2)
+        checker.check_active_tenders(now=NOW)
+
+        portal.pages.update({url("T1"): FakeResponse(304), url("T3"): AMENDED_PAGE})
+        counts = checker.check_active_tenders(now=NOW)
+
+        assert {key: counts[key] for key in ("checked", "not_modified", "unchanged", "changed", "corrigendums")} == {
+            "checked": 3, "not_modified": 1, "unchanged": 1, "changed": 1, "corrigendums": 1,
+        }
+        sent = {u: headers for u, headers in portal.requests[3:]}
+        assert sent[url("T1")] == {"If-None-Match": f'"{len(PAGE)}"'}
+        changes = CorrigendumTrackingService(db).get_latest_changes("T3")
+        assert [(c.field, c.new_value) for c in changes] == [("emd", "INR 52,00,000.00")]
+        fingerprint = db.get(TenderPageFingerprint, "T3")
+        assert fingerprint.fingerprint == page_fingerprint(AMENDED_PAGE)
+        assert fingerprint.etag == f'"{len(AMENDED_PAGE)}"'
+
+    def test_failed_pages_are_retried_from_the_old_state(self, db):
+        add_tender(db, "T1", datetime(2025, 11, 20))
+        url = "https://www.tenderdetail.com/Tender/T1"
+        portal = FakePortal({url: FakeResponse(500)})
+
+        counts = CorrigendumChecker(db, get=portal.get).check_active_tenders(now=NOW)
+
+        assert counts["failed"] == 1
+        assert db.get(TenderPageFingerprint, "T1") is None
+
+    def test_time_budget_defers_later_batches(self, db):
+        for day in (12, 13, 14):
+            add_tender(db, f"T{day}", datetime(2025, 11, day))
+        portal = FakePortal({f"https://www.tenderdetail.com/Tender/T{day}": PAGE for day in (12, 13, 14)})
+
+        counts = CorrigendumChecker(db, get=portal.get, batch_size=1, time_budget_seconds=0).check_active_tenders(now=NOW)
+
+        assert (counts["checked"], counts["deferred"]) == (1, 2)
+        assert portal.requests[0][0].endswith("/T12")
+
+    def test_tenders_without_a_scraped_page(self, db):
+        db.add(Tender(tender_ref_number="T-MANUAL", submission_deadline=datetime(2025, 11, 20), status="New"))
+        db.commit()
+
+        counts = CorrigendumChecker(db, get=FakePortal({}).get).check_active_tenders(now=NOW)
+
+        assert (counts["checked"], counts["no_url"]) == (0, 1)
@@ -0,0 +1,185 @@
+"""
+Golden-output tests for the tenderdetail.com page parsers.
+
+The saved pages in fixtures/tenderdetail are parsed with the lxml parsing
+layer. The results must equal the model dumps that the previous
+BeautifulSoup parser produced for the same pages.
+
+Tests for:
+- parse_tender_page on a complete and a sparse detail page
+- parse_home_page on a daily digest page
+- LabelValueTable lookups
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.modules.scraper.detail_page_scrape import parse_tender_page
+from app.modules.scraper.home_page_scrape import parse_home_page
+from app.modules.scraper.html_parsing import LabelValueTable, find, parse_html
+
+FIXTURES = Path(__file__).parent / "fixtures" / "tenderdetail"
+
+
+def read_page(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+GOLDEN_DETAIL_FULL = {
+    'contact_information': {
+        'address': 'Nirman Bhawan, 96 M.G. Marg, Lucknow, Uttar Pradesh – 226001',
+        'company_name': 'Public Works Department',
+        'contact_person': 'Executive Engineer, PWD Construction Division-2',
+    },
+    'details': {
+        'tender_details': 'Construction of 2-lane road with paved shoulders from Km 12.400 to Km 31.850 '
+                          '(Design Length 19.450 km) on the Lucknow – Sitapur section of SH-25 under '
+                          'EPC mode, including culverts, minor bridges and road safety works & five '
+                          'years maintenance.',
+    },
+    'key_dates': {
+        'last_date_of_bid_submission': '24 Nov 2025 15:00',
+        'publish_date': '02 Nov 2025',
+        'tender_opening_date': '26 Nov 2025 11:00',
+    },
+    'notice': {
+        'bidding_type': 'Two Bid System',
+        'city': 'Lucknow',
+        'competition_type': 'National Competitive Bidding',
+        'document_fees': 'INR 11,800.00',
+        'emd': 'INR 48,75,000.00',
+        'state': 'Uttar Pradesh',
+        'tdr': '89453821',
+        'tender_brief': 'Construction of 2-lane road with paved shoulders from Km 12.400 to Km 31.850 on '
+                        'Lucknow – Sitapur section',
+        'tender_id': '2025_PWD_870112_1',
+        'tender_no': 'PWD/UP/LKO/2025-26/1143',
+        'tender_type': 'Open',
+        'tender_value': 487500000.0,
+        'tendering_authority': 'Public Works Department - Uttar Pradesh',
+    },
+    'other_detail': {
+        'files': [
+            {'file_description': 'Tender Notice', 'file_name': 'NIT_1143.pdf', 'file_size': '412 KB',
+             'file_url': 'https://www.tenderdetail.com/Documents/89453821/NIT_1143.pdf'},
+            {'file_description': 'Tender Document', 'file_name': 'RFP_Volume_I.pdf', 'file_size': '6.8 MB',
+             'file_url': 'https://www.tenderdetail.com/Documents/89453821/RFP_Volume_I.pdf'},
+            {'file_description': 'BOQ', 'file_name': 'BOQ_Schedule_B.xlsx', 'file_size': '1.1 MB',
+             'file_url': 'https://www.tenderdetail.com/Documents/89453821/BOQ_Schedule_B.xlsx'},
+            {'file_description': 'Drawings', 'file_name': 'Drawings.zip', 'file_size': '24.6 MB',
+             'file_url': 'https://www.tenderdetail.com/Documents/89453821/Drawings.zip'},
+        ],
+        'information_source': 'https://etender.up.nic.in',
+    },
+}
+
+GOLDEN_DETAIL_SPARSE = {
+    'contact_information': {'address': 'N/A', 'company_name': 'Rural Works Department', 'contact_person': 'N/A'},
+    'details': {'tender_details': 'Periodic maintenance of rural roads under PMGSY package BR-36-112.'},
+    'key_dates': {
+        'last_date_of_bid_submission': '17 Nov 2025 17:00',
+        'publish_date': '03 Nov 2025',
+        'tender_opening_date': 'N/A',
+    },
+    'notice': {
+        'bidding_type': 'N/A',
+        'city': 'N/A',
+        'competition_type': 'N/A',
+        'document_fees': 'N/A',
+        'emd': 'N/A',
+        'state': 'Bihar',
+        'tdr': '89460177',
+        'tender_brief': 'Periodic maintenance of rural roads under PMGSY package BR-36-112',
+        'tender_id': '2025_RWD_44120_3',
+        'tender_no': 'N/A',
+        'tender_type': 'Open',
+        'tender_value': 0.0,
+        'tendering_authority': 'Rural Engineering Department - Bihar',
+    },
+    'other_detail': {
+        'files': [
+            {'file_description': 'Tender Document', 'file_name': 'Tender_Document.pdf', 'file_size': '2.3 MB',
+             'file_url': 'https://www.tenderdetail.com/Documents/89460177/Tender_Document.pdf'},
+        ],
+        'information_source': 'https://etender.up.nic.in',
+    },
+}
+
+# (query, [(tender_id, city, value, due_date), ...]) of the "Civil" queries only
+GOLDEN_HOME_QUERIES = [
+    ('Civil Works - Roads', '4', [
+        ('89453958', 'Lucknow, Uttar Pradesh', 'Rs. 1.50 Crore', '20-11-2025'),
+        ('89454095', 'Patna, Bihar', 'Rs. 3.75 Crore', '21-11-2025'),
+        ('89454232', 'Bhopal, Madhya Pradesh', 'Rs. 6.00 Crore', '22-11-2025'),
+        ('89454369', 'Jaipur, Rajasthan', 'Rs. 8.25 Crore', '23-11-2025'),
+    ]),
+    ('Civil Works - Bridges', '3', [
+        ('89454780', 'Bhopal, Madhya Pradesh', 'Rs. 1.50 Crore', '20-11-2025'),
+        ('89454917', 'Jaipur, Rajasthan', 'Rs. 3.75 Crore', '21-11-2025'),
+        ('89455054', 'Lucknow, Uttar Pradesh', 'Rs. 6.00 Crore', '22-11-2025'),
+    ]),
+]
+
+
+@pytest.mark.parametrize("page, golden", [
+    ("detail_full.html", GOLDEN_DETAIL_FULL),
+    ("detail_sparse.html", GOLDEN_DETAIL_SPARSE),
+])
+def test_detail_page_matches_golden(page, golden):
+    assert parse_tender_page(read_page(page)).model_dump() == golden
+
+
+def test_detail_page_parses_decoded_text():
+    page = read_page("detail_full.html")
+    assert parse_tender_page(page.decode("utf-8")) == parse_tender_page(page)
+
+
+def test_detail_page_without_tables_is_rejected():
+    with pytest.raises(Exception, match="Tender details home not found"):
+        parse_tender_page(b"<html><body><div class='tender-details'></div></body></html>")
+
+
+def test_home_page_matches_golden():
+    home = parse_home_page(read_page("home.html"))
+
+    assert home.header.date == 'Sunday Nov 02 2025'
+    assert home.header.no_of_new_tenders == '9'
+    queries = [
+        (query.query_name, query.number_of_tenders,
+         [(t.tender_id, t.city, t.value, t.due_date) for t in query.tenders])
+        for query in home.query_table
+    ]
+    assert queries == GOLDEN_HOME_QUERIES
+
+    first = home.query_table[0].tenders[0]
+    assert first.tender_name == ' Construction and upgradation of road package 958 under Civil Works - Roads'
+    assert first.summary == ('TDR : 89453958 Construction and upgradation of road package 958 '
+                             'including drainage & protection works')
+    assert first.tender_url == 'https://www.tenderdetail.com/Tender/89453958/construction-road-package'
+
+
+class TestLabelValueTable:
+    def table(self, rows_html: str) -> LabelValueTable:
+        root = parse_html(f"<table><tr><th>Tender Notice</th></tr>{rows_html}</table>")
+        return LabelValueTable.from_table(find(root, "table"))
+
+    def test_exact_label_then_contained_label(self):
+        rows = self.table(
+            "<tr><td>Tender No</td><td> 11 </td></tr>"
+            "<tr><td>Tender Value (INR)</td><td>5 Crore</td></tr>"
+        )
+        assert rows.get("Tender No") == "11"
+        assert rows.get("Tender Value") == "5 Crore"
+        assert rows.get("EMD") == "N/A"
+
+    def test_values_do_not_match_other_labels(self):
+        rows = self.table(
+            "<tr><td>Tender Brief</td><td>Road works, EMD exempted for MSEs</td></tr>"
+            "<tr><td>EMD</td><td>INR 50,000</td></tr>"
+        )
+        assert rows.get("EMD") == "INR 50,000"
+
+    def test_rows_without_a_value_cell_are_skipped(self):
+        rows = self.table("<tr><td colspan='2'>City</td></tr><tr><td>City</td><td>Patna</td></tr>")
+        assert rows.rows == [("City", "Patna")]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the process-wide embedding provider.
+
+Tests for:
+- One model load per provider, including under concurrent first use
+- SentenceTransformer-style and LangChain-style encoding calls
+- The chunking copy of the model's tokenizer
+- Warm-up hook
+- VectorStoreManager defaulting to the shared provider
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.core import embeddings
+from app.core.embeddings import EmbeddingProvider, get_embedding_provider, warm_up_embeddings
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, **kwargs):
+        self.calls.append((sentences, batch_size, show_progress_bar))
+        if isinstance(sentences, str):
+            return np.full(4, len(sentences), dtype=np.float32)
+        return np.array([[len(s)] * 4 for s in sentences], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    @property
+    def tokenizer(self):
+        return {"name": "wordpiece"}
+
+
+@pytest.fixture
+def provider():
+    provider = EmbeddingProvider(model_name="test-model", backend="torch", batch_size=8)
+    loads = []
+
+    def fake_load():
+        time.sleep(0.05)  # Widen the race window for the concurrency test
+        loads.append(1)
+        return FakeModel()
+
+    provider._load = fake_load
+    provider.loads = loads
+    return provider
+
+
+class TestEmbeddingProvider:
+    def test_model_loaded_once_under_concurrent_first_use(self, provider):
+        threads = [threading.Thread(target=provider.encode, args=(["chunk"],)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(provider.loads) == 1
+        assert len(provider.model.calls) == 8
+
+    def test_encode_defaults_batch_size_and_disables_progress_bar(self, provider):
+        vectors = provider.encode(["a", "bb"])
+
+        assert vectors.shape == (2, 4)
+        assert provider.model.calls[-1] == (["a", "bb"], 8, False)
+
+    def test_langchain_style_calls(self, provider):
+        assert provider.embed_documents([]) == []
+        assert provider.embed_documents(["a", "bb"]) == [[1.0] * 4, [2.0] * 4]
+        assert provider.embed_query("ccc") == [3.0] * 4
+        assert provider.dimension == 4
+
+    def test_warm_up_loads_and_encodes(self, provider):
+        assert not provider.is_loaded
+        provider.warm_up()
+        assert provider.is_loaded
+        assert provider.model.calls
+
+    def test_tokenizer_is_one_copy_of_the_models(self, provider):
+        tokenizer = provider.tokenizer
+
+        assert tokenizer == provider.model.tokenizer and tokenizer is not provider.model.tokenizer
+        assert provider.tokenizer is tokenizer
+        assert len(provider.loads) == 1
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            EmbeddingProvider(backend="tpu")
+
+
+class TestProcessWideProvider:
+    def test_singleton(self):
+        assert get_embedding_provider() is get_embedding_provider()
+
+    def test_warm_up_hook_respects_setting_and_never_raises(self):
+        failing = EmbeddingProvider()
+        failing._load = lambda: (_ for _ in ()).throw(RuntimeError("no weights"))
+
+        with patch.object(embeddings, "get_embedding_provider", return_value=failing):
+            with patch.object(embeddings.settings, "EMBEDDING_WARMUP", False):
+                warm_up_embeddings()
+                assert not failing.is_loaded
+            with patch.object(embeddings.settings, "EMBEDDING_WARMUP", True):
+                warm_up_embeddings()  # Logs the failure instead of raising
+
+    def test_vector_store_defaults_to_shared_provider(self):
+        from app.db.vector_store import VectorStoreManager
+
+        manager = VectorStoreManager(None)
+        assert manager.embedding_model is get_embedding_provider()
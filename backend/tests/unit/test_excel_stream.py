@@ -0,0 +1,122 @@
+"""
+Unit tests for read-only, streaming Excel extraction.
+
+Tests for:
+- Vectorised row formatting (blank rows, forward-fill carried across blocks)
+- Row blocks streamed from a read-only workbook
+- Per-workbook memory ceiling
+- ExcelProcessor streaming text and table chunks
+"""
+
+import pytest
+from unittest.mock import patch
+
+pd = pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+from app.modules.askai.services import excel_stream
+from app.modules.askai.services.chunking import TokenChunker
+from app.modules.askai.services.document_service import ExcelProcessor
+from app.modules.askai.services.excel_stream import WorkbookBudget, format_rows, iter_row_blocks
+
+
+@pytest.fixture
+def boq_xlsx(tmp_path):
+    """'BOQ': header after a blank row, section cells left blank below their first row; 'Notes': two rows"""
+    path = tmp_path / "boq.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "BOQ"
+    sheet.append([])
+    sheet.append(["Section", "Item", "Qty", None])
+    for i in range(10):
+        sheet.append(["Earthwork" if i == 0 else None, f"Excavation {i}", i * 10])
+        if i == 4:
+            sheet.append([None, None, None])
+    notes = workbook.create_sheet("Notes")
+    notes.append(["Note"])
+    notes.append(["Rates include GST"])
+    workbook.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def processor():
+    processor = ExcelProcessor.__new__(ExcelProcessor)
+    processor.job_id = None
+    processor.has_excel_libs = True
+    processor.chunker = TokenChunker()
+    return processor
+
+
+class TestFormatRows:
+    def test_blank_rows_dropped_and_cells_forward_filled(self):
+        lines, raw_lines, carry = format_rows([("A", "x", 1), (None, "y", None), (None, None, None), (" ", "z")])
+
+        assert lines == ["A | x | 1", "A | y | 1", "A | z | 1"]
+        assert raw_lines == ["A | x | 1", " | y | ", " | z | "]
+        assert carry.tolist() == ["A", "z", "1"]
+
+    def test_carry_fills_next_block(self):
+        _, _, carry = format_rows([("A", "x")])
+        lines, _, _ = format_rows([(None, "y")], carry)
+        assert lines == ["A | y"]
+
+    def test_leading_blanks_back_filled_within_block(self):
+        lines, _, _ = format_rows([(None, "x"), ("B", "y")])
+        assert lines == ["B | x", "B | y"]
+
+
+class TestRowBlocks:
+    def test_streams_blocks_with_headers_and_row_numbers(self, boq_xlsx):
+        blocks = list(iter_row_blocks(boq_xlsx, rows_per_block=4))
+
+        boq = [b for b in blocks if b.sheet == "BOQ"]
+        assert boq[0].headers == ["Section", "Item", "Qty"]
+        assert [(b.first_row, b.last_row) for b in boq] == [(3, 6), (7, 10), (11, 13)]
+        assert sum(len(b.lines) for b in boq) == 10
+        assert all(line.startswith("Earthwork | ") for b in boq for line in b.lines)
+        assert boq[-1].lines[-1] == "Earthwork | Excavation 9 | 90"
+
+        notes = [b for b in blocks if b.sheet == "Notes"]
+        assert notes[0].lines == ["Rates include GST"]
+        assert {b.sheet_count for b in blocks} == {2}
+        assert blocks[-1].progress == pytest.approx(1.0)
+
+    def test_workbook_opened_read_only(self, boq_xlsx):
+        with patch.object(excel_stream, "load_workbook", wraps=excel_stream.load_workbook) as load:
+            list(iter_row_blocks(boq_xlsx))
+        assert load.call_args.kwargs["read_only"] is True
+
+    def test_budget_stops_reading(self, boq_xlsx):
+        budget = WorkbookBudget(limit_bytes=1)
+        blocks = list(iter_row_blocks(boq_xlsx, rows_per_block=4, budget=budget))
+
+        assert len(blocks) == 1
+        assert budget.exhausted
+
+
+class TestExcelProcessorStreaming:
+    def test_process_excel_emits_text_and_table_chunks(self, boq_xlsx, processor):
+        chunks, stats = processor.process_excel("job", boq_xlsx, "doc-1", "boq.xlsx")
+
+        text = [c for c in chunks if c["metadata"]["type"] == "text"]
+        tables = [c for c in chunks if c["metadata"]["type"] == "table"]
+        assert {c["metadata"]["sheet"] for c in text} == {"BOQ", "Notes"}
+        assert text[0]["content"].startswith("Sheet: BOQ Headers: Section")
+        assert len(tables) == 1
+        assert tables[0]["metadata"]["rows"] == "3-13"
+        assert stats["sheets"] == 2
+        assert stats["tables"] == 1
+        assert stats["rows"] == 11
+        assert stats["total_chunks"] == len(chunks)
+        assert all(set(c) == {"content", "metadata", "token_count"} for c in chunks)
+        assert not stats["truncated"]
+
+    def test_chunk_limit_stops_stream(self, boq_xlsx, processor):
+        with patch.object(excel_stream.settings, "EXCEL_ROWS_PER_BLOCK", 2), \
+             patch.object(excel_stream.settings, "MAX_CHUNKS_PER_DOCUMENT", 3):
+            chunks, stats = processor.process_excel("job", boq_xlsx, "doc-1", "boq.xlsx")
+
+        assert len(chunks) == 3
+        assert stats["truncated"]
@@ -0,0 +1,353 @@
+"""
+Unit tests for the incremental IMAP sync of the email listener.
+
+Runs InboxSync against a local IMAP stand-in (a small threaded server that
+speaks enough IMAP4rev1 for imaplib: LOGIN, SELECT, UID SEARCH, UID FETCH of
+BODYSTRUCTURE / BODY.PEEK[...] and IDLE).
+
+Tests for:
+- Bootstrap and incremental syncs fetching only new UIDs and only the HTML part
+- Forwarded (message/rfc822) emails and quoted-printable / base64 bodies
+- UIDVALIDITY changes
+- IDLE waking on new mail and timing out
+- The batched ScrapedEmailLog pre-filter and the checkpoint table
+"""
+
+import imaplib
+import re
+import socketserver
+import threading
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+
+from app.modules.scraper.db.repository import ScraperRepository
+from app.modules.scraper.db.schema import ImapSyncState, ScrapedEmailLog, ScrapeRun
+from app.modules.scraper.imap_sync import Checkpoint, InboxSync, retry_checkpoint
+
+TENDERS = "tenders@tenderdetail.com"
+
+
+def tender_email(number, sender=TENDERS, cte="quoted-printable"):
+    message = EmailMessage()
+    message["From"] = sender
+    message["Subject"] = "Daily Tenders"
+    message["Date"] = format_datetime(datetime(2025, 11, number, 8, 0))
+    message.set_content("Plain text version")
+    message.add_alternative(
+        f'<html><body><p>{"Tenders " * 20}</p>'
+        f'<a href="https://www.tenderdetail.com/dailytenders/{number}/abc">Click Here To View All</a></body></html>',
+        subtype="html",
+        cte=cte,
+    )
+    return message
+
+
+def forwarded(inner):
+    message = EmailMessage()
+    message["From"] = TENDERS
+    message["Date"] = inner["Date"]
+    message.set_content("FYI, see below")
+    message.add_attachment(inner)
+    return message
+
+
+# ==================================================================================
+# LOCAL IMAP STAND-IN
+# ==================================================================================
+
+def _quote(value):
+    return "NIL" if value is None else '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _body_bytes(part):
+    return part.get_payload().encode() if isinstance(part.get_payload(), str) else part.as_bytes()
+
+
+def bodystructure(part):
+    if part.is_multipart() and part.get_content_maintype() == "multipart":
+        children = "".join(bodystructure(child) for child in part.get_payload())
+        return f"({children} {_quote(part.get_content_subtype().upper())})"
+    params = [(key, value) for key, value in part.get_params()[1:]] if part.get_params() else []
+    param_list = "(" + " ".join(f"{_quote(k.upper())} {_quote(v)}" for k, v in params) + ")" if params else "NIL"
+    encoding = _quote((part.get("Content-Transfer-Encoding") or "7bit").upper())
+    head = f"{_quote(part.get_content_maintype().upper())} {_quote(part.get_content_subtype().upper())} {param_list} NIL NIL {encoding}"
+    if part.get_content_type() == "message/rfc822":
+        inner = part.get_payload()[0]
+        envelope = f"(NIL {_quote(inner['Subject'])} NIL NIL NIL NIL NIL NIL NIL NIL)"
+        return f"({head} {len(inner.as_bytes())} {envelope} {bodystructure(inner)} 10)"
+    body = _body_bytes(part)
+    lines = " %d" % body.count(b"\n") if part.get_content_maintype() == "text" else ""
+    return f"({head} {len(body)}{lines})"
+
+
+def section_part(message, section):
+    part = message
+    for number in section.split("."):
+        if part.get_content_type() == "message/rfc822":
+            part = part.get_payload()[0]
+            if not part.is_multipart():
+                continue  # <section>.1 of a single-part message is its body
+        part = part.get_payload()[int(number) - 1] if part.is_multipart() else part
+    return part
+
+
+class StubMailbox:
+    def __init__(self, uid_validity=1):
+        self.uid_validity = uid_validity
+        self.messages = []  # [uid, sender, EmailMessage, seen]
+        self.commands = []
+        self.idlers = []
+        self.lock = threading.Lock()
+        self.next_uid = 101
+
+    def deliver(self, message):
+        with self.lock:
+            self.messages.append([self.next_uid, message["From"], message, False])
+            self.next_uid += 1
+            for write in list(self.idlers):
+                write(f"* {len(self.messages)} EXISTS\r\n".encode())
+
+
+class IMAPStubHandler(socketserver.StreamRequestHandler):
+    def write(self, data):
+        with self.write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def handle(self):
+        box: StubMailbox = self.server.mailbox
+        self.write_lock = threading.Lock()
+        self.write(b"* OK IMAP4rev1 stand-in ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, command, *rest = line.decode().rstrip("\r\n").split(" ", 2)
+            args = rest[0] if rest else ""
+            command = command.upper()
+            box.commands.append(f"{command} {args}".strip())
+            if command == "CAPABILITY":
+                self.write(b"* CAPABILITY IMAP4rev1 IDLE\r\n")
+            elif command == "SELECT":
+                self.write(f"* {len(box.messages)} EXISTS\r\n* OK [UIDVALIDITY {box.uid_validity}] UIDs valid\r\n".encode())
+            elif command == "UID":
+                self.uid_command(box, args)
+            elif command == "IDLE":
+                self.write(b"+ idling\r\n")
+                box.idlers.append(self.write)
+                self.rfile.readline()  # DONE
+                box.idlers.remove(self.write)
+            elif command == "LOGOUT":
+                self.write(b"* BYE\r\n" + tag.encode() + b" OK LOGOUT completed\r\n")
+                return
+            self.write(f"{tag} OK {command} completed\r\n".encode())
+
+    def uid_command(self, box, args):
+        sub, rest = args.split(" ", 1)
+        if sub.upper() == "SEARCH":
+            sender = re.search(r'FROM "([^"]+)"', rest).group(1)
+            low = re.search(r"UID (\d+):\*", rest)
+            uids = [m[0] for m in box.messages if m[1] == sender]
+            if low and box.messages:
+                # Like real servers, n:* always includes the highest UID
+                uids = [u for u in uids if u >= int(low.group(1)) or u == box.messages[-1][0]]
+            self.write(("* SEARCH " + " ".join(map(str, uids))).rstrip().encode() + b"\r\n")
+            return
+        uid_set, items = rest.split(" ", 1)
+        wanted = {int(u) for u in uid_set.split(",")}
+        for seq, entry in enumerate(box.messages, 1):
+            uid, _, message, _ = entry
+            if uid not in wanted:
+                continue
+            out = f"* {seq} FETCH (UID {uid}".encode()
+            if "BODYSTRUCTURE" in items:
+                out += b" BODYSTRUCTURE " + bodystructure(message).encode()
+            if "HEADER.FIELDS (DATE)" in items:
+                header = f"Date: {message['Date']}\r\n\r\n".encode()
+                out += b" BODY[HEADER.FIELDS (DATE)] {%d}\r\n" % len(header) + header
+            for peek, section in re.findall(r"BODY(\.PEEK)?\[([\d.]+)\]", items):
+                body = _body_bytes(section_part(message, section))
+                out += b" BODY[%s] {%d}\r\n" % (section.encode(), len(body)) + body
+                entry[3] = entry[3] or not peek
+            self.write(out + b")\r\n")
+
+
+class IMAPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def mailbox():
+    box = StubMailbox()
+    server = IMAPStubServer(("127.0.0.1", 0), IMAPStubHandler)
+    server.mailbox = box
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def connect():
+        mail = imaplib.IMAP4("127.0.0.1", server.server_address[1])
+        mail.login("listener@example.com", "app-password")
+        return mail
+
+    box.connect = connect
+    yield box
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def inbox(mailbox):
+    sync = InboxSync(connect=mailbox.connect, senders=[TENDERS], account="listener@example.com")
+    with patch("app.modules.scraper.imap_sync.validate_email_template", return_value=(True, "hash", None)):
+        yield sync
+    sync.close()
+
+
+# ==================================================================================
+# TESTS
+# ==================================================================================
+
+class TestFetchNew:
+    def test_bootstrap_fetches_only_html_parts_of_target_senders(self, mailbox, inbox):
+        mailbox.deliver(tender_email(1))
+        mailbox.deliver(tender_email(2, sender="someone@example.com"))
+        mailbox.deliver(tender_email(3, cte="base64"))
+
+        emails, checkpoint = inbox.fetch_new(None)
+
+        assert [e["email_uid"] for e in emails] == ["103", "101"]
+        assert emails[0]["tender_url"] == "https://www.tenderdetail.com/dailytenders/3/abc"
+        assert emails[1]["email_date"] == datetime(2025, 11, 1, 8, 0)
+        assert "Click Here To View All" in emails[1]["html_body"]
+        assert checkpoint == Checkpoint(1, 103)
+        fetches = [c for c in mailbox.commands if c.startswith("UID FETCH")]
+        assert all("RFC822" not in c for c in fetches)
+        assert fetches[-1] == "UID FETCH 101,103 (BODY.PEEK[2])"  # Both HTML parts in one command
+        assert not any(seen for *_, seen in mailbox.messages)
+
+    def test_incremental_sync_fetches_only_new_uids(self, mailbox, inbox):
+        mailbox.deliver(tender_email(1))
+        _, checkpoint = inbox.fetch_new(None)
+        mailbox.commands.clear()
+
+        assert inbox.fetch_new(checkpoint) == ([], checkpoint)  # "102:*" still matches UID 101
+        mailbox.deliver(tender_email(2))
+        emails, checkpoint = inbox.fetch_new(checkpoint)
+
+        assert [e["email_uid"] for e in emails] == ["102"] and checkpoint.last_uid == 102
+        assert 'UID SEARCH (UID 102:* FROM "tenders@tenderdetail.com")' in mailbox.commands
+        assert all(c.split()[2] == "102" for c in mailbox.commands if c.startswith("UID FETCH"))
+
+    def test_forwarded_email_html_is_found(self, mailbox, inbox):
+        mailbox.deliver(forwarded(tender_email(4)))
+
+        emails, _ = inbox.fetch_new(None)
+
+        assert emails[0]["tender_url"].endswith("/dailytenders/4/abc")
+        assert "UID FETCH 101 (BODY.PEEK[2.2])" in mailbox.commands
+
+    def test_uidvalidity_change_resyncs(self, mailbox, inbox):
+        mailbox.deliver(tender_email(1))
+
+        emails, checkpoint = inbox.fetch_new(Checkpoint(uid_validity=99, last_uid=500))
+
+        assert [e["email_uid"] for e in emails] == ["101"] and checkpoint == Checkpoint(1, 101)
+
+    def test_invalid_template_is_skipped_but_checkpointed(self, mailbox, inbox):
+        mailbox.deliver(tender_email(1))
+        with patch("app.modules.scraper.imap_sync.validate_email_template", return_value=(False, "x", "Template mismatch")):
+            emails, checkpoint = inbox.fetch_new(None)
+        assert emails == [] and checkpoint.last_uid == 101
+
+
+class TestIdle:
+    def test_new_mail_ends_idle(self, mailbox, inbox):
+        inbox.open()
+        threading.Timer(0.2, mailbox.deliver, args=[tender_email(5)]).start()
+
+        assert inbox.wait_for_mail(timeout=5) is True
+        emails, _ = inbox.fetch_new(Checkpoint(1, 100))
+        assert [e["email_uid"] for e in emails] == ["101"]
+
+    def test_timeout_leaves_connection_usable(self, mailbox, inbox):
+        inbox.open()
+        assert inbox.wait_for_mail(timeout=0.2) is False
+        mailbox.deliver(tender_email(1))
+        assert len(inbox.fetch_new(None)[0]) == 1
+
+
+# ==================================================================================
+# SCRAPED EMAIL LOG PRE-FILTER AND CHECKPOINTS
+# ==================================================================================
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    ScrapedEmailLog.metadata.create_all(engine, tables=[ScrapeRun.__table__, ScrapedEmailLog.__table__, ImapSyncState.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def candidate(uid, url):
+    return {"email_uid": uid, "email_sender": TENDERS, "email_date": datetime(2025, 11, 1), "tender_url": url}
+
+
+class TestRepository:
+    def test_partition_in_one_query(self, db):
+        repo = ScraperRepository(db)
+        repo.log_email_processing("1", TENDERS, datetime(2025, 11, 1), "https://t/done")
+        repo.log_email_processing("2", TENDERS, datetime(2025, 11, 1), "https://t/low", priority="low")
+        repo.log_email_processing("3", TENDERS, datetime(2025, 11, 1), "https://t/failed", processing_status="failed")
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        new, duplicates = repo.partition_unprocessed_emails([
+            candidate("1", "https://t/done"),     # Already logged pair: dropped
+            candidate("9", "https://t/done"),     # Same tender, new email: duplicate
+            candidate("10", "https://t/low"),     # Supersedes a low-priority log
+            candidate("3", "https://t/failed"),   # Logged pair, but failed: retried
+            candidate("11", "https://t/new"),
+            candidate("12", "https://t/new"),     # Repeat within the batch
+        ])
+
+        assert len(statements) == 1
+        assert [e["email_uid"] for e in new] == ["10", "3", "11"]
+        assert [(e["email_uid"], e["existing_priority"]) for e in duplicates] == [("9", "normal"), ("12", "normal")]
+
+        assert repo.log_skipped_emails(duplicates) == 2
+        assert db.query(ScrapedEmailLog).filter(ScrapedEmailLog.processing_status == "skipped").count() == 2
+
+    def test_retry_updates_the_failed_log(self, db):
+        repo = ScraperRepository(db)
+        repo.log_email_processing("3", TENDERS, datetime(2025, 11, 1), "https://t/x", processing_status="failed", error_message="timeout")
+        repo.log_email_processing("3", TENDERS, datetime(2025, 11, 1), "https://t/x", tender_id="T-1")
+
+        [log] = db.query(ScrapedEmailLog).all()
+        assert (log.processing_status, log.error_message, log.tender_id) == ("success", None, "T-1")
+
+    def test_checkpoint_held_below_recent_failures(self):
+        now = datetime(2025, 11, 2, 12, 0, tzinfo=timezone.utc)
+        recent = {**candidate("105", "https://t/a"), "email_date": datetime(2025, 11, 2, 9, 0, tzinfo=timezone.utc)}
+        stale = {**candidate("101", "https://t/b"), "email_date": datetime(2025, 10, 30)}
+
+        assert retry_checkpoint(Checkpoint(7, 120), [recent, stale], now=now) == Checkpoint(7, 104)
+        assert retry_checkpoint(Checkpoint(7, 120), [stale], now=now) == Checkpoint(7, 120)
+        assert retry_checkpoint(Checkpoint(7, 120), [], now=now) == Checkpoint(7, 120)
+
+    def test_checkpoint_round_trip(self, db):
+        repo = ScraperRepository(db)
+        assert repo.get_imap_checkpoint("me/INBOX") is None
+
+        repo.save_imap_checkpoint("me/INBOX", *Checkpoint(7, 120))
+        repo.save_imap_checkpoint("me/INBOX", 7, 130)
+
+        state = repo.get_imap_checkpoint("me/INBOX")
+        assert (state.uid_validity, state.last_uid) == (7, 130)
+        assert InboxSync(connect=None, account="me").mailbox_key == "me/INBOX"
@@ -0,0 +1,224 @@
+"""
+Unit tests for the embedded local vector store.
+
+Tests for:
+- Chat collections: add/query round trip, doc_id/type filters, hybrid BM25 fusion
+- Persistence: reopening a collection, rows appended by another handle, torn appends,
+  collections dropped and recreated under a reader
+- Tender similarity: upserts by tender id, value/date/state filters, exclusion
+- IVF index recall against exact search
+- services.get_vector_store selecting the local backend
+"""
+
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from app.config import settings
+from app.db.local_vector_store import IVFIndex, LocalCollection, LocalVectorStoreManager
+
+VOCABULARY = ["emd", "deposit", "turnover", "eligibility", "culvert", "bitumen", "penalty", "delay", "road", "bridge"]
+
+
+class KeywordEmbedding:
+    """Deterministic bag-of-words embedding over a small vocabulary"""
+
+    def encode(self, texts, show_progress_bar=False, batch_size=32):
+        rows = []
+        for text in texts:
+            words = text.lower().replace("?", "").replace(".", "").split()
+            rows.append([words.count(term) + 0.01 for term in VOCABULARY])
+        return np.array(rows, dtype=np.float32)
+
+
+def chunk(content, doc_id="doc-1", type_="text", page=1):
+    return {"content": content, "metadata": {"source": "NIT.pdf", "page": page, "doc_id": doc_id, "doc_type": "pdf", "type": type_}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStoreManager(root_dir=tmp_path, embedding_model=KeywordEmbedding())
+
+
+class TestChatCollections:
+    def test_query_returns_best_match_first(self, store):
+        collection = store.get_or_create_collection("1234-abcd")
+        store.add_chunks(collection, [
+            chunk("EMD deposit of Rs. 5 lakh"),
+            chunk("Turnover eligibility of 36 crore"),
+            chunk("Penalty for delay is 0.05% per day"),
+        ])
+
+        results = store.query(collection, "What is the EMD deposit?", n_results=2, mode="vector")
+
+        assert results[0][0] == "EMD deposit of Rs. 5 lakh"
+        assert results[0][1]["doc_id"] == "doc-1" and results[0][1]["page"] == "1"
+        assert len(results) == 2 and results[0][2] >= results[1][2]
+
+    def test_filters_on_doc_id_and_type(self, store):
+        collection = store.get_or_create_collection("chat")
+        store.add_chunks(collection, [
+            chunk("EMD deposit text", doc_id="nit"),
+            chunk("EMD deposit table", doc_id="boq", type_="table"),
+            chunk("EMD deposit again", doc_id="boq"),
+        ])
+
+        by_doc = store.query(collection, "EMD", mode="vector", filters={"doc_id": "boq"})
+        by_type = store.query(collection, "EMD", mode="vector", filters={"doc_id": ["nit", "boq"], "type": "table"})
+
+        assert {meta["doc_id"] for _, meta, _ in by_doc} == {"boq"}
+        assert [doc for doc, _, _ in by_type] == ["EMD deposit table"]
+
+    def test_hybrid_surfaces_exact_keyword_match(self, store):
+        collection = store.get_or_create_collection("chat")
+        store.add_chunks(collection, [
+            chunk("Clause 4.2 culvert works on the road"),
+            chunk("Road and bridge culvert road road"),
+        ])
+
+        results = store.query(collection, "clause 4.2", mode="hybrid", alpha=0.2)
+
+        assert results[0][0].startswith("Clause 4.2")
+
+    def test_delete_collection(self, store, tmp_path):
+        collection = store.get_or_create_collection("chat")
+        store.add_chunks(collection, [chunk("EMD deposit")])
+        store.delete_collection("chat")
+        assert not (tmp_path / collection.name).exists()
+        assert store.query(store.get_or_create_collection("chat"), "EMD") == []
+
+
+class TestPersistence:
+    def test_reopened_store_sees_existing_rows(self, tmp_path):
+        first = LocalVectorStoreManager(root_dir=tmp_path, embedding_model=KeywordEmbedding())
+        first.add_chunks(first.get_or_create_collection("chat"), [chunk("Bitumen grade VG-40")])
+
+        second = LocalVectorStoreManager(root_dir=tmp_path, embedding_model=KeywordEmbedding())
+        results = second.query(second.get_or_create_collection("chat"), "bitumen", mode="vector")
+
+        assert results[0][0] == "Bitumen grade VG-40"
+
+    def test_rows_appended_by_another_process_are_picked_up(self, tmp_path):
+        reader = LocalCollection(tmp_path / "shared")
+        writer = LocalCollection(tmp_path / "shared")
+        writer.add(np.eye(3, dtype=np.float32)[:2], [{"content": "a"}, {"content": "b"}])
+
+        hits = reader.search(np.array([0, 1, 0], dtype=np.float32), limit=1)
+
+        assert hits[0].properties["content"] == "b"
+
+    def test_collection_recreated_by_another_process_is_reloaded(self, tmp_path):
+        vectors = np.eye(5, dtype=np.float32)
+        reader = LocalCollection(tmp_path / "shared")
+        LocalCollection(tmp_path / "shared").add(vectors[:3], [{"content": f"x{i}"} for i in range(3)])
+        assert [hit.properties["content"] for hit in reader.search(vectors[0], limit=1)] == ["x0"]
+
+        # Another process drops the collection and writes more rows than the reader has seen
+        shutil.rmtree(tmp_path / "shared")
+        LocalCollection(tmp_path / "shared").add(vectors, [{"content": f"y{i}"} for i in range(5)])
+
+        assert [hit.properties["content"] for hit in reader.search(vectors[0], limit=1)] == ["y0"]
+        assert [p["content"] for p in reader.properties] == ["y0", "y1", "y2", "y3", "y4"]
+
+    def test_dropped_collection_can_be_written_through_an_old_handle(self, tmp_path):
+        stale = LocalCollection(tmp_path / "c")
+        stale.add(np.eye(2, dtype=np.float32), [{"content": "a"}, {"content": "b"}])
+        shutil.rmtree(tmp_path / "c")
+
+        stale.add(np.eye(3, dtype=np.float32)[:1], [{"content": "new"}])
+
+        assert [p["content"] for p in LocalCollection(tmp_path / "c").properties] == ["new"]
+
+    def test_torn_append_is_repaired(self, tmp_path):
+        collection = LocalCollection(tmp_path / "c")
+        collection.add(np.eye(2, dtype=np.float32), [{"content": "a"}, {"content": "b"}])
+        # Crash after the vector write, mid-way through the object line
+        with open(collection.path / "vectors.f32", "ab") as handle:
+            handle.write(np.ones(2, dtype=np.float32).tobytes())
+        with open(collection.path / "objects.jsonl", "ab") as handle:
+            handle.write(b'{"uuid": "x", "prop')
+
+        collection.add(np.array([[1.0, 1.0]], dtype=np.float32), [{"content": "c"}])
+
+        reopened = LocalCollection(tmp_path / "c")
+        assert [p["content"] for p in reopened.properties] == ["a", "b", "c"]
+        hit = reopened.search(np.array([1.0, 1.0], dtype=np.float32), limit=1)[0]
+        assert hit.properties["content"] == "c" and hit.score == pytest.approx(1.0)
+
+
+class TestTenderSimilarity:
+    def records(self):
+        return [
+            {"tender_id_str": "T1", "content": "road bitumen", "state": "UP", "tender_value": 5e7, "publish_date": datetime(2024, 3, 1)},
+            {"tender_id_str": "T2", "content": "road bitumen road", "state": "MP", "tender_value": 2e8, "publish_date": datetime(2024, 5, 1)},
+            {"tender_id_str": "T3", "content": "bridge culvert", "state": "UP", "tender_value": 9e7, "publish_date": datetime(2024, 4, 1)},
+        ]
+
+    def test_upsert_replaces_by_tender_id(self, store):
+        store.upsert_tender_vectors(self.records())
+        store.upsert_tender_vectors([{"tender_id_str": "T1", "content": "bridge", "state": "UP", "tender_value": 1}])
+
+        collection = store.get_or_create_tender_similarity_collection()
+        assert len(collection) == 3
+        assert store.get_tender_vector("T1") is not None
+        assert store.get_tender_vector("missing") is None
+
+    def test_filters_and_exclusion(self, store):
+        store.upsert_tender_vectors(self.records())
+
+        up_only = store.query_similar_tenders(query="road bitumen", state="UP")
+        value_band = store.query_similar_tenders(query="road", min_value=1e8)
+        dated = store.query_similar_tenders(query="road", published_after=datetime(2024, 3, 15), published_before=datetime(2024, 4, 15))
+        others = store.query_similar_tenders(vector=store.get_tender_vector("T1"), exclude_tender_id_str="T1")
+
+        assert {p["tender_id_str"] for p, _ in up_only} == {"T1", "T3"}
+        assert [p["tender_id_str"] for p, _ in value_band] == ["T2"]
+        assert [p["tender_id_str"] for p, _ in dated] == ["T3"]
+        assert others[0][0]["tender_id_str"] == "T2" and "T1" not in {p["tender_id_str"] for p, _ in others}
+
+
+class TestIVF:
+    def test_ivf_recall_close_to_exact(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "LOCAL_VECTOR_IVF_MIN_VECTORS", 2000)
+        monkeypatch.setattr(settings, "LOCAL_VECTOR_IVF_NPROBE", 8)
+        rng = np.random.default_rng(1)
+        centres = rng.normal(size=(20, 32))
+        vectors = (centres[rng.integers(0, 20, 4000)] + 0.3 * rng.normal(size=(4000, 32))).astype(np.float32)
+        collection = LocalCollection(tmp_path / "big")
+        collection.add(vectors, [{"content": str(i)} for i in range(len(vectors))])
+        assert collection._ivf is not None and (tmp_path / "big" / "ivf.npz").exists()
+
+        normalised = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        recalls = []
+        for query in rng.normal(size=(20, 32)).astype(np.float32):
+            exact = set(np.argsort(-(normalised @ (query / np.linalg.norm(query))))[:10].tolist())
+            found = {int(hit.properties["content"]) for hit in collection.search(query, limit=10)}
+            recalls.append(len(exact & found) / 10)
+
+        assert np.mean(recalls) >= 0.9
+
+    def test_index_round_trips(self, tmp_path):
+        vectors = np.random.default_rng(0).normal(size=(200, 8)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index = IVFIndex.build(vectors, n_lists=16)
+        index.save(tmp_path / "ivf.npz")
+        loaded = IVFIndex.load(tmp_path / "ivf.npz")
+        assert loaded.indexed_rows == 200
+        assert sorted(loaded.candidates(vectors[0], 16).tolist()) == list(range(200))
+
+
+def test_services_use_local_backend(tmp_path, monkeypatch):
+    from app.core import services
+
+    monkeypatch.setattr(settings, "VECTOR_STORE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_VECTOR_STORE_DIR", tmp_path)
+    monkeypatch.setattr(services, "vector_store", None)
+    with patch.object(services, "get_embedding_model", return_value=KeywordEmbedding()), \
+         patch.object(services, "get_weaviate_client") as get_weaviate_client:
+        store = services.get_vector_store()
+        assert isinstance(store, LocalVectorStoreManager)
+        assert services.get_vector_store() is store
+    get_weaviate_client.assert_not_called()
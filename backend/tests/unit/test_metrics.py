@@ -0,0 +1,199 @@
+"""
+Unit tests for the pipeline metrics registry.
+
+Tests for:
+- Counter, Gauge and Histogram samples in the Prometheus text format
+- Callback gauges, timed_iter and Histogram.time
+- The /metrics endpoint and the standalone metrics server
+- Instrumented call sites: LLM calls, scrape sections and embedding calls
+"""
+
+import urllib.request
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.metrics import CollectorRegistry, Counter, Gauge, Histogram
+
+
+@pytest.fixture
+def registry():
+    return CollectorRegistry()
+
+
+def samples(metric_name, registry=None):
+    """{sample line without value: value} for one metric family"""
+    found = {}
+    for line in metrics.render(registry).splitlines():
+        if line.startswith(metric_name) and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            found[name] = float(value)
+    return found
+
+
+class TestExposition:
+    def test_counter_and_gauge(self, registry):
+        pages = Counter("pages_total", "Pages read", ["parser"], registry=registry)
+        depth = Gauge("queue_depth", "Waiting items", ["queue"], registry=registry)
+        pages.labels("pymupdf").inc(3)
+        pages.labels(parser="pymupdf").inc()
+        depth.labels("scrape_jobs").inc(5)
+        depth.labels("scrape_jobs").dec(2)
+
+        text = metrics.render(registry)
+
+        assert "# HELP pages Pages read\n# TYPE pages counter\n" in text
+        assert 'pages_total{parser="pymupdf"} 4.0' in text
+        assert "# TYPE queue_depth gauge" in text
+        assert 'queue_depth{queue="scrape_jobs"} 3.0' in text
+        assert text.endswith("\n")
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        latency = Histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0), registry=registry)
+        for value in (0.05, 0.5, 0.7, 3.0):
+            latency.labels("extract").observe(value)
+
+        assert samples("latency_seconds", registry) == {
+            'latency_seconds_bucket{stage="extract",le="0.1"}': 1,
+            'latency_seconds_bucket{stage="extract",le="1.0"}': 3,
+            'latency_seconds_bucket{stage="extract",le="+Inf"}': 4,
+            'latency_seconds_sum{stage="extract"}': pytest.approx(4.25),
+            'latency_seconds_count{stage="extract"}': 4,
+        }
+
+    def test_label_values_are_escaped(self, registry):
+        Counter("sections_total", "Sections", ["section"], registry=registry).labels('Say "hi"\\\n').inc()
+
+        assert 'sections_total{section="Say \\"hi\\"\\\\\\n"} 1.0' in metrics.render(registry)
+
+    def test_label_mistakes_are_rejected(self, registry):
+        counter = Counter("calls_total", "Calls", ["model", "status"], registry=registry)
+        with pytest.raises(ValueError):
+            counter.labels("gemini")
+        with pytest.raises(ValueError):
+            counter.labels(model="gemini", outcome="ok")
+        with pytest.raises(ValueError):
+            counter.inc()
+        with pytest.raises(ValueError):
+            Counter("calls_total", "Again", registry=registry)
+
+
+class TestHelpers:
+    def test_callback_gauge_failures_leave_the_sample_out(self, registry):
+        depth = Gauge("depth", "Depth", ["queue"], registry=registry)
+        depth.labels("celery").set_function(lambda: 7)
+        depth.labels("broken").set_function(Mock(side_effect=ConnectionError("redis down")))
+
+        assert samples("depth", registry) == {'depth{queue="celery"}': 7}
+
+    def test_time_observes_failed_blocks(self, registry):
+        latency = Histogram("block_seconds", "Block", registry=registry)
+        with pytest.raises(RuntimeError):
+            with latency.time():
+                raise RuntimeError("boom")
+
+        assert latency.labels().count == 1
+
+    def test_timed_iter_excludes_consumer_time(self, registry, monkeypatch):
+        clock = iter(range(100))
+        monkeypatch.setattr(metrics.time, "perf_counter", lambda: next(clock))
+        latency = Histogram("produce_seconds", "Produce", registry=registry)
+
+        # Each next() takes one tick; the consumer's own ticks are not counted
+        for _ in metrics.timed_iter(["a", "b"], latency.labels()):
+            metrics.time.perf_counter()
+
+        assert (latency.labels().count, latency.labels().sum) == (1, 3)
+
+
+class TestEndpoints:
+    def test_metrics_endpoint(self):
+        from app.modules.health.health import router
+
+        app = FastAPI()
+        app.include_router(router)
+        metrics.QUEUE_DEPTH.labels("test_queue").set(2)
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        assert 'tenderiq_queue_depth{queue="test_queue"} 2.0' in response.text
+        assert "# TYPE tenderiq_llm_request_seconds histogram" in response.text
+
+    def test_standalone_server(self, registry):
+        Counter("served_total", "Served", registry=registry).inc()
+        server = metrics.start_metrics_server(0, addr="127.0.0.1", registry=registry)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+
+        assert "served_total 1.0" in body
+
+
+class TestInstrumentation:
+    def test_llm_calls_record_latency_and_tokens(self):
+        from app.core import services
+
+        client = Mock()
+        client.models.generate_content.return_value = SimpleNamespace(
+            text="ok", usage_metadata=SimpleNamespace(prompt_token_count=120, candidates_token_count=30),
+        )
+        tokens = metrics.LLM_TOKENS_TOTAL.labels("test-model", "one_pager", "prompt")
+        before = tokens.value
+        calls = metrics.LLM_REQUEST_SECONDS.labels("test-model", "one_pager", "ok")
+        before_calls = calls.count
+
+        services.GenerativeModelWrapper(client, "test-model").generate_content("prompt", operation="one_pager")
+
+        assert tokens.value - before == 120
+        assert metrics.LLM_TOKENS_TOTAL.labels("test-model", "one_pager", "completion").value >= 30
+        assert calls.count == before_calls + 1
+
+    def test_failed_llm_calls_are_labelled(self):
+        from app.core import services
+
+        client = Mock()
+        client.models.generate_content.side_effect = TimeoutError("deadline exceeded")
+        failed = metrics.LLM_REQUEST_SECONDS.labels("test-model", "chat", "error")
+        before = failed.count
+
+        with pytest.raises(TimeoutError):
+            services.generate_content(client, "test-model", "hi", operation="chat")
+
+        assert failed.count == before + 1
+
+    def test_scrape_sections_drop_cycle_numbers(self):
+        from app.modules.scraper.progress_tracker import ProgressTracker, ScrapeSection
+
+        tracker = ProgressTracker(verbose=False)
+        ok = metrics.SCRAPE_SECTION_SECONDS.labels("Email Sync Cycle", "ok")
+        failed = metrics.SCRAPE_SECTION_SECONDS.labels("Homepage Scraping", "error")
+        before_ok, before_failed = ok.count, failed.count
+
+        with ScrapeSection(tracker, "Email Sync Cycle #12"):
+            pass
+        with pytest.raises(ValueError):
+            with ScrapeSection(tracker, "Homepage Scraping"):
+                raise ValueError("no tenders")
+
+        assert (ok.count, failed.count) == (before_ok + 1, before_failed + 1)
+
+    def test_embedding_batch_sizes(self):
+        from app.core.embeddings import EmbeddingProvider
+
+        provider = EmbeddingProvider(model_name="test", backend="torch")
+        provider._model = Mock()
+        batches = metrics.EMBEDDING_BATCH_SIZE.labels()
+        before_count, before_sum = batches.count, batches.sum
+
+        provider.encode(["a", "b", "c"])
+        provider.encode("query")
+
+        assert (batches.count - before_count, batches.sum - before_sum) == (2, 4)
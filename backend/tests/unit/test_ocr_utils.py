@@ -0,0 +1,77 @@
+"""
+Unit tests for page-level OCR routing.
+
+Tests for:
+- Empty / garbage text-layer detection
+- Adaptive DPI selection
+- OCR result cache and its age / size eviction
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+from app.config import settings
+from app.modules.askai.services import ocr_utils
+from app.modules.askai.services.ocr_utils import choose_ocr_dpi, needs_ocr
+
+
+class TestNeedsOcr:
+    def test_empty_page_needs_ocr(self):
+        assert needs_ocr(None)
+        assert needs_ocr("")
+        assert needs_ocr("   12  ")
+
+    def test_readable_page_does_not_need_ocr(self):
+        assert not needs_ocr("The bidder shall submit EMD of Rs. 25,00,000 before 12-11-2025.")
+
+    def test_cid_glyph_runs_need_ocr(self):
+        assert needs_ocr("(cid:12)(cid:45)(cid:78) " * 20)
+
+    def test_mojibake_needs_ocr(self):
+        assert needs_ocr("ÿþ¤¥¦§¨©ª«¬®¯°±²³´µ¶·¸¹º»¼½¾¿" * 3)
+
+
+class TestChooseOcrDpi:
+    def test_a4_page_uses_mid_range_dpi(self):
+        dpi = choose_ocr_dpi(595, 842)  # A4 in points
+        assert settings.OCR_MIN_DPI < dpi < settings.OCR_MAX_DPI
+
+    def test_small_page_is_capped_at_max(self):
+        assert choose_ocr_dpi(200, 200) == settings.OCR_MAX_DPI
+
+    def test_large_drawing_is_floored_at_min(self):
+        assert choose_ocr_dpi(2384, 3370) == settings.OCR_MIN_DPI  # A0
+
+
+class TestOcrCache:
+    def test_cache_round_trip(self, tmp_path):
+        with patch.object(settings, "OCR_CACHE_DIR", tmp_path):
+            assert ocr_utils._read_cache("abcdef") is None
+            ocr_utils._write_cache("abcdef", "scanned text")
+            assert ocr_utils._read_cache("abcdef") == "scanned text"
+
+    def test_prune_evicts_stale_then_least_recently_used(self, tmp_path):
+        now = time.time()
+        with patch.object(settings, "OCR_CACHE_DIR", tmp_path):
+            for image_hash, age_days in [("aa01", 200), ("bb02", 3), ("cc03", 2), ("dd04", 1)]:
+                ocr_utils._write_cache(image_hash, "x" * 100)
+                mtime = now - age_days * 86400
+                os.utime(ocr_utils._cache_path(image_hash), (mtime, mtime))
+            # Reading bb02 makes it the most recently used
+            assert ocr_utils._read_cache("bb02") is not None
+
+            removed = ocr_utils.prune_ocr_cache(max_bytes=250, max_age_seconds=90 * 86400)
+
+            assert removed == 2
+            remaining = sorted(p.stem for p in tmp_path.glob("*/*.txt"))
+            assert remaining == ["bb02", "dd04"]
+
+    def test_zero_limits_keep_everything(self, tmp_path):
+        with patch.object(settings, "OCR_CACHE_DIR", tmp_path):
+            ocr_utils._write_cache("aa01", "old scan")
+            os.utime(ocr_utils._cache_path("aa01"), (0, 0))
+
+            assert ocr_utils.prune_ocr_cache(max_bytes=0, max_age_seconds=0) == 0
+            assert ocr_utils._read_cache("aa01") == "old scan"
+
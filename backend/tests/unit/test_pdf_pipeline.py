@@ -0,0 +1,208 @@
+"""
+Unit tests for the single-pass, page-parallel PDF pipeline.
+
+Tests for:
+- Ruling-line table pre-screen
+- Page range extraction (text + tables in one pass)
+- Parallel and inline extraction returning the same pages, in page order
+- Unreadable files and failing ranges skipped instead of failing the document
+- No process pool inside in_process_parsing()
+- PDFProcessor streaming chunks and routing empty or garbled pages to OCR
+"""
+
+from concurrent.futures import Future
+
+import pytest
+from unittest.mock import patch
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("pdfplumber")
+
+from app.modules.askai.services import pdf_pipeline
+from app.modules.askai.services.chunking import TokenChunker
+from app.modules.askai.services import document_service
+from app.modules.askai.services.document_service import PDFProcessor
+
+
+def draw_table(page, rows=4, cols=3, x0=72, y0=200, w=120, h=24):
+    for r in range(rows + 1):
+        page.draw_line((x0, y0 + r * h), (x0 + cols * w, y0 + r * h))
+    for c in range(cols + 1):
+        page.draw_line((x0 + c * w, y0), (x0 + c * w, y0 + rows * h))
+    for r in range(rows):
+        for c in range(cols):
+            page.insert_text((x0 + c * w + 5, y0 + r * h + 16), f"R{r}C{c}")
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Page 1: text, page 2: text + ruled table, page 3: blank (scanned)"""
+    path = tmp_path / "tender.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Notice inviting tender for construction of a bridge over the river.")
+    page = doc.new_page()
+    page.insert_text((72, 72), "Bill of quantities for the civil works package.")
+    draw_table(page)
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def long_pdf(tmp_path):
+    path = tmp_path / "long.pdf"
+    doc = fitz.open()
+    for i in range(40):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} of the general conditions of contract.")
+        if i % 10 == 0:
+            draw_table(page)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class InlineExecutor:
+    """ProcessPoolExecutor stand-in that runs each task on submit"""
+
+    def __init__(self, max_workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def processor():
+    processor = PDFProcessor.__new__(PDFProcessor)
+    processor.job_id = None
+    processor.has_llamaparse = False
+    processor.chunker = TokenChunker()
+    return processor
+
+
+class TestTablePrescreen:
+    def test_only_ruled_pages_are_candidates(self, sample_pdf):
+        with fitz.open(sample_pdf) as doc:
+            assert not pdf_pipeline.is_table_candidate(doc[0])
+            assert pdf_pipeline.is_table_candidate(doc[1])
+            assert not pdf_pipeline.is_table_candidate(doc[2])
+
+
+class TestPageExtraction:
+    def test_single_pass_returns_text_and_tables(self, sample_pdf):
+        pages = pdf_pipeline.extract_page_range(sample_pdf, 0, 3)
+
+        assert [p.page_num for p in pages] == [1, 2, 3]
+        assert "bridge" in pages[0].text
+        assert pages[0].tables == []
+        assert len(pages[1].tables) == 1
+        assert pages[1].tables[0][0] == ["R0C0", "R0C1", "R0C2"]
+        assert pages[2].text.strip() == ""
+
+    def test_pdfplumber_skipped_without_candidates(self, sample_pdf):
+        with patch.object(pdf_pipeline.pdfplumber, "open") as plumber_open:
+            pdf_pipeline.extract_page_range(sample_pdf, 0, 1)
+        plumber_open.assert_not_called()
+
+    def test_parallel_matches_inline(self, long_pdf):
+        inline = list(pdf_pipeline.iter_page_extractions(long_pdf, max_workers=1))
+        parallel = list(pdf_pipeline.iter_page_extractions(long_pdf, max_workers=2, pages_per_task=8))
+
+        by_page = lambda pages: {p.page_num: (p.text, p.tables) for p in pages}
+        assert len(parallel) == 40
+        assert by_page(parallel) == by_page(inline)
+
+    def test_ranges_finishing_out_of_order_yield_in_page_order(self, long_pdf):
+        # The last range finishes first
+        with patch.object(pdf_pipeline, "ProcessPoolExecutor", InlineExecutor), \
+                patch.object(pdf_pipeline, "as_completed", lambda futures: reversed(list(futures))):
+            pages = list(pdf_pipeline.iter_page_extractions(long_pdf, max_workers=4, pages_per_task=8))
+
+        assert [p.page_num for p in pages] == list(range(1, 41))
+
+    def test_unreadable_pdf_yields_nothing(self, tmp_path):
+        path = tmp_path / "broken.pdf"
+        path.write_bytes(b"not a pdf at all")
+
+        assert list(pdf_pipeline.iter_page_extractions(str(path))) == []
+
+    def test_range_failing_in_worker_and_inline_is_skipped(self, long_pdf):
+        real_extract = pdf_pipeline.extract_page_range
+
+        def extract(pdf_path, start, end):
+            if start == 8:
+                raise RuntimeError("corrupt page stream")
+            return real_extract(pdf_path, start, end)
+
+        with patch.object(pdf_pipeline, "extract_page_range", side_effect=extract), \
+                patch.object(pdf_pipeline, "ProcessPoolExecutor", InlineExecutor):
+            pages = list(pdf_pipeline.iter_page_extractions(long_pdf, max_workers=4, pages_per_task=8))
+
+        assert [p.page_num for p in pages] == list(range(1, 9)) + list(range(17, 41))
+
+    def test_in_process_parsing_opens_no_pool(self, long_pdf):
+        with pdf_pipeline.in_process_parsing(), \
+                patch.object(pdf_pipeline, "ProcessPoolExecutor") as pool:
+            pages = list(pdf_pipeline.iter_page_extractions(long_pdf, max_workers=4, pages_per_task=8))
+
+        pool.assert_not_called()
+        assert len(pages) == 40
+
+
+class TestPDFProcessorStreaming:
+    def test_process_pdf_streams_text_tables_and_ocr(self, sample_pdf, processor):
+        with patch.object(PDFProcessor, "extract_with_tesseract", return_value={3: "Scanned annexure form"}) as ocr:
+            chunks, stats = processor.process_pdf("job", sample_pdf, "doc-1", "tender.pdf")
+
+        ocr.assert_called_once_with(sample_pdf, [3])
+        types = [(c["metadata"]["page"], c["metadata"]["type"]) for c in chunks]
+        assert ("1", "text") in types
+        assert ("2", "table") in types
+        assert ("3", "text") in types
+        assert stats["pages"] == 3
+        assert stats["tables"] == 1
+        assert stats["table_candidate_pages"] == 1
+        assert all(set(c) == {"content", "metadata", "token_count"} for c in chunks)
+
+    def test_llamaparse_text_preferred_over_text_layer(self, sample_pdf, processor):
+        with patch.object(PDFProcessor, "extract_with_llamaparse", return_value={1: "Markdown text from LlamaParse"}), \
+             patch.object(PDFProcessor, "extract_with_tesseract", return_value={}):
+            chunks, _ = processor.process_pdf("job", sample_pdf, "doc-1", "tender.pdf")
+
+        page_one = [c["content"] for c in chunks if c["metadata"]["page"] == "1"]
+        assert page_one == ["Markdown text from LlamaParse"]
+
+    def test_llamaparse_text_kept_when_pymupdf_cannot_open(self, tmp_path, processor):
+        path = tmp_path / "odd.pdf"
+        path.write_bytes(b"%PDF-1.4 truncated upload")
+        with patch.object(PDFProcessor, "extract_with_llamaparse", return_value={1: "Notice inviting tender from LlamaParse"}), \
+             patch.object(PDFProcessor, "extract_with_tesseract", return_value={}) as ocr:
+            chunks, stats = processor.process_pdf("job", str(path), "doc-1", "odd.pdf")
+
+        assert [c["content"] for c in chunks] == ["Notice inviting tender from LlamaParse"]
+        assert stats["pages"] == 1
+        ocr.assert_not_called()
+
+    def test_garbled_text_layer_is_sent_to_ocr(self, sample_pdf, processor):
+        # A font without a Unicode map; cleaning alone would leave letters and spaces
+        garbled = pdf_pipeline.PageExtraction(page_num=1, text="Ä■◆□ Ç▪◇▫ " * 40 + "Tender notice")
+        with patch.object(document_service, "iter_page_extractions", return_value=iter([garbled])), \
+             patch.object(PDFProcessor, "extract_with_tesseract", return_value={1: "Tender notice for bridge works"}) as ocr:
+            chunks, _ = processor.process_pdf("job", sample_pdf, "doc-1", "tender.pdf")
+
+        ocr.assert_called_once_with(sample_pdf, [1])
+        assert [c["content"] for c in chunks] == ["Tender notice for bridge works"]
@@ -0,0 +1,143 @@
+"""
+Unit tests for per-request SQL instrumentation.
+
+Tests for:
+- Statement normalisation and per-block counting
+- N+1 detection with the originating call site
+- Slow-query logging with parameters redacted
+- QueryTimingMiddleware's Server-Timing header and sampling
+- The query_budget test helper
+"""
+
+import logging
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.db.query_instrumentation import (
+    QueryTimingMiddleware,
+    instrument_engine,
+    normalize_statement,
+    query_budget,
+    track_queries,
+)
+from app.modules.askai.db.models import Chat, Document, Message, chat_document_association
+
+TABLES = [Chat.__table__, Message.__table__, Document.__table__, chat_document_association]
+
+
+@pytest.fixture
+def session_factory():
+    engine = instrument_engine(create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool))
+    Chat.metadata.create_all(engine, tables=TABLES)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        for i in range(12):
+            chat = Chat(title=f"Chat {i}", created_at=datetime(2025, 11, 1), updated_at=datetime(2025, 11, 1))
+            chat.messages.append(Message(sender="user", text=f"Question {i}", timestamp=datetime(2025, 11, 1)))
+            db.add(chat)
+        db.commit()
+    return factory
+
+
+def message_counts(db: Session):
+    """Loads each chat's messages lazily: one statement per chat"""
+    return {chat.title: len(chat.messages) for chat in db.query(Chat).all()}
+
+
+class TestTracking:
+    def test_placeholder_lists_are_collapsed(self):
+        assert normalize_statement("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (...)"
+        assert normalize_statement("WHERE id IN (%(id_1)s, %(id_2)s)") == "WHERE id IN (...)"
+
+    def test_counts_statements_per_block(self, session_factory):
+        with session_factory() as db, track_queries() as stats:
+            message_counts(db)
+
+        assert stats.count == 13
+        assert stats.seconds > 0
+        assert max(s.count for s in stats.statements.values()) == 12
+
+    def test_n_plus_one_reported_once_with_call_site(self, session_factory, caplog):
+        with session_factory() as db, track_queries(n_plus_one_threshold=5) as stats, \
+                caplog.at_level(logging.WARNING, logger="app.db.query_instrumentation"):
+            message_counts(db)
+
+        warnings = [r.getMessage() for r in caplog.records if "Likely N+1" in r.getMessage()]
+        assert len(warnings) == 1
+        assert "repeated at tests/unit/test_query_instrumentation.py:" in warnings[0]
+        [(statement, repeated)] = stats.repeated
+        assert repeated.count == 12 and "FROM messages" in statement
+
+    def test_slow_queries_are_logged_without_values(self, session_factory, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 1e-9)
+        with session_factory() as db, caplog.at_level(logging.WARNING, logger="app.db.query_instrumentation"):
+            db.execute(text("SELECT :password"), {"password": "hunter2"})
+
+        [record] = [r for r in caplog.records if "Slow query" in r.getMessage()]
+        assert "parameters=['str']" in record.getMessage()
+        assert "hunter2" not in record.getMessage()
+
+    def test_outside_a_block_nothing_is_counted(self, session_factory):
+        with session_factory() as db:
+            db.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            pass
+
+        assert stats.count == 0
+
+
+class TestMiddleware:
+    def make_client(self, session_factory, sample_rate=1.0):
+        app = FastAPI()
+        app.add_middleware(QueryTimingMiddleware, sample_rate=sample_rate)
+
+        def get_db():
+            with session_factory() as db:
+                yield db
+
+        @app.get("/chats")
+        def list_chats(db: Session = Depends(get_db)):
+            return message_counts(db)
+
+        @app.get("/chats/count")
+        def count_chats(db: Session = Depends(get_db)):
+            return db.query(Chat).count()
+
+        return TestClient(app)
+
+    def test_server_timing_header(self, session_factory):
+        response = self.make_client(session_factory).get("/chats/count")
+
+        assert response.json() == 12
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+    def test_unsampled_requests_have_no_header(self, session_factory):
+        response = self.make_client(session_factory, sample_rate=0).get("/chats/count")
+
+        assert "server-timing" not in response.headers
+
+
+class TestQueryBudget:
+    def test_within_budget(self, session_factory):
+        client = TestMiddleware().make_client(session_factory, sample_rate=0)
+        with session_factory() as db, query_budget(1) as collected:
+            db.query(Chat).count()
+            client.get("/chats/count")
+
+        # The block's own statements, then one entry per request
+        assert [stats.count for stats in collected] == [1, 1]
+
+    def test_endpoint_over_budget_fails(self, session_factory):
+        client = TestMiddleware().make_client(session_factory, sample_rate=0)
+
+        with pytest.raises(AssertionError, match=r"13 queries exceed the budget of 5"):
+            with query_budget(5):
+                client.get("/chats")
@@ -0,0 +1,155 @@
+"""
+Unit tests for the process-wide RAG component cache.
+
+Tests for:
+- LRUTTLCache: LRU and TTL eviction, single build per key, invalidation
+- RAGComponentCache: document-set keys, vector store swaps, chat invalidation
+- LangChainRAGService sharing chains across request-scoped DB sessions
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from unittest.mock import Mock, patch
+
+from app.core.cache import LRUTTLCache
+from app.modules.askai.services.rag_cache import RAGComponentCache, document_set_key
+
+
+class TestLRUTTLCache:
+    def test_least_recently_used_entry_evicted(self):
+        cache = LRUTTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        cache = LRUTTLCache(max_entries=4, ttl_seconds=0.05)
+        cache.set("a", 1)
+        time.sleep(0.06)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_expired_entries_make_room_before_live_ones_are_evicted(self):
+        cache = LRUTTLCache(max_entries=2, ttl_seconds=0.05)
+        cache.set("old", 1)
+        time.sleep(0.06)
+        cache.ttl_seconds = 60
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1 and cache.get("b") == 2
+        assert cache.stats()["evictions"] == 0
+
+    def test_get_or_create_builds_once_under_concurrency(self):
+        cache = LRUTTLCache(max_entries=4, ttl_seconds=60)
+        builds = []
+
+        def factory():
+            time.sleep(0.05)
+            builds.append(1)
+            return object()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", factory))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        assert len({id(r) for r in results}) == 1
+
+    def test_invalidate_by_predicate(self):
+        cache = LRUTTLCache(max_entries=4, ttl_seconds=60)
+        cache.set(("chat-1", "x"), 1)
+        cache.set(("chat-2", "x"), 2)
+        assert cache.invalidate(lambda key: key[0] == "chat-1") == 1
+        assert cache.get(("chat-1", "x")) is None
+        assert cache.get(("chat-2", "x")) == 2
+
+
+class TestRAGComponentCache:
+    def test_document_set_key_is_order_independent(self):
+        a, b = SimpleNamespace(id=uuid4()), SimpleNamespace(id=uuid4())
+        assert document_set_key([a, b]) == document_set_key([b, a])
+        assert document_set_key([a]) != document_set_key([a, b])
+
+    def test_components_shared_until_document_set_changes(self):
+        cache = RAGComponentCache(max_chats=8, ttl_seconds=60)
+        chat_id, store = uuid4(), object()
+        build = Mock(side_effect=lambda: object())
+
+        first = cache.chain(chat_id, "docs-v1", store, build)
+        assert cache.chain(chat_id, "docs-v1", store, build) is first
+        assert cache.chain(chat_id, "docs-v2", store, build) is not first
+        assert build.call_count == 2
+
+    def test_vector_store_swap_rebuilds(self):
+        cache = RAGComponentCache(max_chats=8, ttl_seconds=60)
+        chat_id = uuid4()
+        build = Mock(side_effect=lambda: object())
+
+        first = cache.retriever(chat_id, "docs", object(), build)
+        second = cache.retriever(chat_id, "docs", object(), build)
+        assert first is not second
+
+    def test_invalidate_chat_only_drops_that_chat(self):
+        cache = RAGComponentCache(max_chats=8, ttl_seconds=60)
+        store, chat_a, chat_b = object(), uuid4(), uuid4()
+        build = Mock(side_effect=lambda: object())
+        a = cache.chain(chat_a, "docs", store, build)
+        b = cache.chain(chat_b, "docs", store, build)
+
+        cache.invalidate_chat(chat_a)
+
+        assert cache.chain(chat_a, "docs", store, build) is not a
+        assert cache.chain(chat_b, "docs", store, build) is b
+
+    def test_llm_created_once(self):
+        cache = RAGComponentCache(max_chats=8, ttl_seconds=60)
+        fake_config = SimpleNamespace(get_langchain_llm=Mock(side_effect=lambda: object()))
+        with patch.dict("sys.modules", {"app.core.langchain_config": fake_config}):
+            assert cache.llm() is cache.llm()
+        assert fake_config.get_langchain_llm.call_count == 1
+
+
+class TestLangChainRAGServiceSharing:
+    def test_chain_shared_across_requests_with_each_requests_session(self):
+        pytest.importorskip("langchain_core")
+        from langchain_core.runnables import RunnableLambda
+        from app.modules.askai.services import langchain_rag_service as module
+
+        cache = RAGComponentCache(max_chats=8, ttl_seconds=60)
+        cache._llm = RunnableLambda(lambda prompt: "answer")
+        sessions_seen = []
+
+        class History:
+            def __init__(self, db, chat_id):
+                sessions_seen.append(db)
+                self.messages = []
+
+            def add_messages(self, messages):
+                pass
+
+        chat_id = uuid4()
+        chat = SimpleNamespace(id=chat_id, documents=[SimpleNamespace(id=uuid4())])
+        retriever = RunnableLambda(lambda query: [])
+        with patch.object(module, "get_rag_cache", return_value=cache), \
+             patch.object(module, "get_answer_cache", return_value=None), \
+             patch.object(module, "SQLAlchemyChatMessageHistory", History), \
+             patch.object(module, "create_weaviate_retriever", return_value=retriever) as create_retriever:
+            for db in ("session-1", "session-2"):
+                service = module.LangChainRAGService(Mock(), db)
+                service.chat_repo = Mock(get_by_id=Mock(return_value=chat))
+                assert service.send_message(chat_id, "What is the EMD?")["response"] == "answer"
+
+        assert create_retriever.call_count == 1
+        assert sessions_seen[0] == "session-1" and sessions_seen[-1] == "session-2"
@@ -0,0 +1,140 @@
+"""
+Unit tests for hybrid retrieval, reranking and context packing.
+
+Tests for:
+- VectorStoreManager.query: near_vector vs hybrid search, alpha, de-duplication
+- CrossEncoderReranker ordering and top-k cut
+- pack_context token budget
+- retrieve(): candidate pool when reranking, fallback when the reranker fails
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from app.config import settings
+from app.db.vector_store import VectorStoreManager
+from app.modules.askai.services.retrieval import CrossEncoderReranker, pack_context, retrieve
+
+
+def make_object(content, distance=None, score=None, **properties):
+    return SimpleNamespace(
+        properties={"content": content, **properties},
+        metadata=SimpleNamespace(distance=distance, score=score),
+    )
+
+
+class FakeQuery:
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+
+    def near_vector(self, **kwargs):
+        self.calls.append(("near_vector", kwargs))
+        return SimpleNamespace(objects=self.objects)
+
+    def hybrid(self, **kwargs):
+        self.calls.append(("hybrid", kwargs))
+        return SimpleNamespace(objects=self.objects)
+
+
+@pytest.fixture
+def embedding_model():
+    return Mock(encode=Mock(return_value=np.ones((1, 4), dtype=np.float32)))
+
+
+class TestVectorStoreQuery:
+    def test_vector_mode_scores_by_similarity(self, embedding_model):
+        query = FakeQuery([make_object("far", distance=0.6), make_object("near", distance=0.1)])
+        store = VectorStoreManager(Mock(), embedding_model)
+
+        results = store.query(SimpleNamespace(query=query), "EMD amount", n_results=5, mode="vector")
+
+        assert [doc for doc, _, _ in results] == ["near", "far"]
+        assert results[0][2] == pytest.approx(0.9)
+        assert query.calls[0][0] == "near_vector"
+
+    def test_hybrid_mode_passes_query_vector_and_alpha(self, embedding_model):
+        query = FakeQuery([make_object("bm25 hit", score=0.8), make_object("other", score=0.3)])
+        store = VectorStoreManager(Mock(), embedding_model)
+
+        results = store.query(SimpleNamespace(query=query), "Clause 4.2", n_results=7, mode="hybrid", alpha=0.3)
+
+        name, kwargs = query.calls[0]
+        assert name == "hybrid"
+        assert kwargs["query"] == "Clause 4.2" and kwargs["alpha"] == 0.3 and kwargs["limit"] == 7
+        assert len(kwargs["vector"]) == 4
+        assert [(doc, score) for doc, _, score in results] == [("bm25 hit", 0.8), ("other", 0.3)]
+
+    def test_mode_defaults_to_settings(self, embedding_model, monkeypatch):
+        monkeypatch.setattr(settings, "RAG_RETRIEVAL_MODE", "hybrid")
+        monkeypatch.setattr(settings, "RAG_HYBRID_ALPHA", 0.6)
+        query = FakeQuery([])
+        VectorStoreManager(Mock(), embedding_model).query(SimpleNamespace(query=query), "q")
+        assert query.calls[0][0] == "hybrid" and query.calls[0][1]["alpha"] == 0.6
+
+    def test_duplicate_content_dropped(self, embedding_model):
+        query = FakeQuery([make_object("same text", score=0.9), make_object("same text", score=0.5)])
+        results = VectorStoreManager(Mock(), embedding_model).query(SimpleNamespace(query=query), "q", mode="hybrid")
+        assert len(results) == 1
+
+
+class TestReranker:
+    def test_reorders_and_cuts_to_top_k(self):
+        reranker = CrossEncoderReranker(model_name="test")
+        reranker._model = Mock(predict=Mock(return_value=np.array([0.1, 2.0, 0.7])))
+        candidates = [("a", {}, 0.9), ("b", {}, 0.8), ("c", {}, 0.7)]
+
+        results = reranker.rerank("q", candidates, top_k=2)
+
+        assert [doc for doc, _, _ in results] == ["b", "c"]
+        assert results[0][2] == pytest.approx(2.0)
+        pairs = reranker._model.predict.call_args[0][0]
+        assert pairs == [("q", "a"), ("q", "b"), ("q", "c")]
+
+
+class TestPackContext:
+    def test_stops_adding_at_budget_but_fills_with_smaller_chunks(self):
+        results = [("x" * 6, {}, 0.9), ("y" * 10, {}, 0.8), ("z" * 3, {}, 0.7)]
+        packed = pack_context(results, token_budget=10, count_tokens=len)
+        assert [doc[0] for doc, _, _ in packed] == ["x", "z"]
+
+    def test_zero_budget_keeps_everything(self):
+        results = [("x" * 100, {}, 0.9)]
+        assert pack_context(results, token_budget=0, count_tokens=len) == results
+
+
+class TestRetrieve:
+    def test_without_rerank_fetches_top_k(self):
+        store = Mock(query=Mock(return_value=[("a", {}, 0.9)]))
+        results = retrieve(store, "collection", "q", top_k=4, rerank=False, token_budget=0)
+        assert results == [("a", {}, 0.9)]
+        assert store.query.call_args.kwargs["n_results"] == 4
+
+    def test_rerank_fetches_candidate_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, "RAG_CANDIDATE_POOL", 40)
+        candidates = [(f"doc {i}", {}, 1.0 - i / 100) for i in range(40)]
+        store = Mock(query=Mock(return_value=candidates))
+        reranker = Mock(rerank=Mock(return_value=candidates[:3][::-1]))
+
+        results = retrieve(store, "collection", "q", top_k=3, rerank=True, token_budget=0, reranker=reranker)
+
+        assert store.query.call_args.kwargs["n_results"] == 40
+        assert reranker.rerank.call_args[0] == ("q", candidates, 3)
+        assert [doc for doc, _, _ in results] == ["doc 2", "doc 1", "doc 0"]
+
+    def test_failed_reranker_falls_back_to_search_order(self):
+        candidates = [("a", {}, 0.9), ("b", {}, 0.8), ("c", {}, 0.7)]
+        store = Mock(query=Mock(return_value=candidates))
+        reranker = Mock(rerank=Mock(side_effect=ImportError("sentence_transformers")))
+
+        results = retrieve(store, "collection", "q", top_k=2, rerank=True, token_budget=0, reranker=reranker)
+
+        assert results == candidates[:2]
+
+    def test_results_packed_to_budget(self):
+        store = Mock(query=Mock(return_value=[("a" * 8, {}, 0.9), ("b" * 8, {}, 0.8)]))
+        results = retrieve(store, "collection", "q", top_k=2, rerank=False, token_budget=10, count_tokens=len)
+        assert len(results) == 1
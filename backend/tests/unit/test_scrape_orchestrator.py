@@ -0,0 +1,155 @@
+"""
+Unit tests for concurrent scrape orchestration.
+
+Tests for:
+- run_scrape_jobs running jobs in parallel and counting outcomes
+- advisory_lock serialising one name across threads, and the PostgreSQL calls
+- Priority resolution staying correct when two jobs race for the same link
+- The shared, pooled HTTP session
+"""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.advisory_lock import _local_locks, advisory_lock, lock_key
+from app.modules.scraper.db.repository import ScraperRepository
+from app.modules.scraper.db.schema import ScrapedEmailLog, ScrapeRun
+from app.modules.scraper.orchestrator import run_scrape_jobs
+
+
+def email(number):
+    return {
+        "email_uid": str(number),
+        "email_sender": "tenders@tenderdetail.com",
+        "email_date": datetime(2025, 11, 1),
+        "tender_url": f"https://www.tenderdetail.com/dailytenders/{number}/abc",
+    }
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    ScrapedEmailLog.metadata.create_all(engine, tables=[ScrapeRun.__table__, ScrapedEmailLog.__table__])
+    return engine
+
+
+class TestRunScrapeJobs:
+    def test_jobs_run_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def scrape(link, email_info, tracker):
+            barrier.wait()  # Only passes if all three jobs are running at once
+            return "success"
+
+        counts = run_scrape_jobs([email(1), email(2), email(3)], workers=3, scrape=scrape)
+
+        assert counts == {"success": 3, "skipped": 0, "failed": 0}
+
+    def test_outcomes_are_counted_and_jobs_labelled(self):
+        labels = []
+
+        def scrape(link, email_info, tracker):
+            labels.append(tracker.job)
+            if email_info["email_uid"] == "2":
+                raise RuntimeError("homepage down")
+            return "skipped" if email_info["email_uid"] == "3" else "success"
+
+        failed = []
+        counts = run_scrape_jobs([email(1), email(2), email(3)], workers=2, scrape=scrape, failed_emails=failed)
+
+        assert counts == {"success": 1, "skipped": 1, "failed": 1}
+        assert [e["email_uid"] for e in failed] == ["2"]
+        assert sorted(labels) == ["job 1/3", "job 2/3", "job 3/3"]
+
+    def test_no_emails(self):
+        assert run_scrape_jobs([], scrape=MagicMock()) == {"success": 0, "skipped": 0, "failed": 0}
+
+
+class TestAdvisoryLock:
+    def test_same_name_is_serialised_other_names_are_not(self, sqlite_engine):
+        active, peak = {"a": 0, "b": 0}, {"a": 0, "b": 0}
+        overlapped = []
+        guard = threading.Lock()
+
+        def hold(name):
+            with advisory_lock(name, engine=sqlite_engine):
+                with guard:
+                    active[name] += 1
+                    peak[name] = max(peak[name], active[name])
+                    overlapped.append(bool(active["a"] and active["b"]))
+                time.sleep(0.05)
+                with guard:
+                    active[name] -= 1
+
+        threads = [threading.Thread(target=hold, args=(name,)) for name in "aaabbb"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == {"a": 1, "b": 1}
+        assert any(overlapped)
+        assert _local_locks == {}
+
+    def test_postgres_takes_and_releases_session_lock(self):
+        engine = MagicMock()
+        engine.dialect.name = "postgresql"
+        connection = engine.connect.return_value.__enter__.return_value
+
+        with advisory_lock("scrape_link:https://t/1", engine=engine):
+            sql = [str(call.args[0]) for call in connection.execute.call_args_list]
+            assert sql == ["SELECT pg_advisory_lock(:key)"]
+
+        sql = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert sql[-1] == "SELECT pg_advisory_unlock(:key)"
+        assert connection.execute.call_args.args[1] == {"key": lock_key("scrape_link:https://t/1")}
+
+    def test_lock_key_is_stable_signed_64_bit(self):
+        key = lock_key("scrape_link:https://t/1")
+        assert key == lock_key("scrape_link:https://t/1") != lock_key("scrape_link:https://t/2")
+        assert -(2 ** 63) <= key < 2 ** 63
+
+    def test_racing_jobs_for_one_link_scrape_it_once(self, sqlite_engine):
+        """Two jobs for the same link: the second sees the first one's log"""
+        Session = sessionmaker(bind=sqlite_engine)
+        scraped = []
+
+        def scrape(link, email_info, tracker):
+            with advisory_lock(f"scrape_link:{link}", engine=sqlite_engine):
+                db = Session()
+                repo = ScraperRepository(db)
+                try:
+                    is_duplicate, _ = repo.check_tender_duplicate_with_priority(link)
+                    if is_duplicate:
+                        return "skipped"
+                    time.sleep(0.05)  # The scrape
+                    scraped.append(email_info["email_uid"])
+                    repo.log_email_processing(email_info["email_uid"], "tenders@tenderdetail.com", datetime(2025, 11, 1), link)
+                    return "success"
+                finally:
+                    db.close()
+
+        same_link = [email(1), {**email(1), "email_uid": "9"}]
+        counts = run_scrape_jobs(same_link, workers=2, scrape=scrape)
+
+        assert counts == {"success": 1, "skipped": 1, "failed": 0}
+        assert len(scraped) == 1
+
+
+def test_http_session_is_shared_and_pooled(monkeypatch):
+    from app.config import settings
+    from app.modules.scraper import http_client
+
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_POOL_SIZE", 12)
+    session = http_client.get_http_session()
+
+    assert http_client.get_http_session() is session
+    assert session.get_adapter("https://www.tenderdetail.com")._pool_maxsize == 12
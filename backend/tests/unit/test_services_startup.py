@@ -0,0 +1,144 @@
+"""
+Unit tests for lazy, failure-tolerant service startup.
+
+Tests for:
+- Importing app.core.services without touching external dependencies
+- LazyService single initialisation, failure recording and retry back-off
+- Background health checks reconnecting failed or broken clients
+- Readiness aggregation and concurrent start_services()
+"""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.core import services
+from app.core.services import LazyService, ServiceState, ServiceUnavailable
+
+
+class Flaky:
+    """Factory that fails `failures` times, then returns a fresh object"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise ConnectionError("connection refused")
+        return object()
+
+
+@pytest.fixture(autouse=True)
+def fast_retry():
+    with patch.object(services.settings, "SERVICE_RECONNECT_INTERVAL_SECONDS", 0.05):
+        yield
+
+
+class TestImport:
+    def test_import_initialises_nothing(self):
+        code = (
+            "import sys\n"
+            "import app.core.services as s\n"
+            "assert all(v.health.state.value == 'pending' for v in s.SERVICES.values())\n"
+            "assert 'tiktoken' not in sys.modules and 'google.genai' not in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+
+
+class TestLazyService:
+    def test_concurrent_first_use_initialises_once(self):
+        factory = Flaky(delay=0.05)
+        service = LazyService("dep", factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get())) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert factory.calls == 1
+        assert len({id(r) for r in results}) == 1
+        assert service.health.state == ServiceState.READY
+
+    def test_failure_recorded_and_backed_off(self):
+        factory = Flaky(failures=1)
+        service = LazyService("dep", factory)
+
+        assert service.try_get() is None
+        assert service.health.state == ServiceState.FAILED
+        assert "connection refused" in service.health.error
+
+        with pytest.raises(ServiceUnavailable):
+            service.get()
+        assert factory.calls == 1  # Within the back-off window: no new attempt
+
+        time.sleep(0.06)
+        assert service.get() is not None
+        assert factory.calls == 2
+        assert service.health.error is None
+
+    def test_check_reconnects_broken_client(self):
+        closed = []
+        healthy = {"ok": True}
+
+        def probe(_):
+            if not healthy["ok"]:
+                raise ConnectionError("gone")
+
+        factory = Flaky()
+        service = LazyService("dep", factory, probe=probe, close=closed.append)
+        first = service.get()
+
+        healthy["ok"] = False
+        service.check()
+        healthy["ok"] = True
+
+        assert closed == [first]
+        assert factory.calls == 2
+        assert service.peek() is not first
+        assert service.health.state == ServiceState.READY
+
+    def test_check_retries_failed_service(self):
+        service = LazyService("dep", Flaky(failures=1))
+        service.try_get()
+        time.sleep(0.06)
+        service.check()
+        assert service.health.state == ServiceState.READY
+
+
+class TestStartup:
+    def test_start_services_initialises_concurrently_and_reports_readiness(self):
+        fake = {
+            "a": LazyService("a", Flaky(delay=0.2)),
+            "b": LazyService("b", Flaky(delay=0.2)),
+            "c": LazyService("c", Flaky(failures=99), required=False),
+        }
+        with patch.object(services, "SERVICES", fake), patch.object(services, "_monitor_loop", lambda: None):
+            start = time.perf_counter()
+            services.start_services(wait=True)
+            elapsed = time.perf_counter() - start
+            readiness = services.readiness()
+
+        assert elapsed < 0.35  # Run side by side, not one after another
+        assert readiness["ready"] is True
+        assert readiness["services"]["c"]["state"] == "failed"
+
+    def test_required_failure_means_not_ready(self):
+        fake = {"a": LazyService("a", Flaky(failures=99))}
+        with patch.object(services, "SERVICES", fake), patch.object(services, "_monitor_loop", lambda: None):
+            services.start_services(wait=True)
+            assert services.readiness()["ready"] is False
+
+    def test_vector_store_none_while_weaviate_down(self):
+        down = LazyService("weaviate", Flaky(failures=99))
+        with patch.object(services, "weaviate_service", down):
+            assert services.get_vector_store() is None
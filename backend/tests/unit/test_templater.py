@@ -0,0 +1,79 @@
+"""
+Unit tests for the compiled digest email renderer.
+
+fixtures/digest/digest_golden.html is the email that the previous
+BeautifulSoup + premailer renderer produced for sample_digest(). The
+compiled template must render it byte for byte.
+
+Tests for:
+- generate_email matching the golden email
+- Streamed chunks joining to the same email
+- Rendering independent of the working directory
+"""
+
+from pathlib import Path
+
+from app.modules.scraper import templater
+from app.modules.scraper.data_models import HomePageData, HomePageHeader, Tender, TenderQuery
+
+GOLDEN = Path(__file__).parent / "fixtures" / "digest" / "digest_golden.html"
+
+
+def tender(number, **overrides):
+    fields = dict(
+        tender_id=str(89453821 + number),
+        tender_name=f" Construction of road package {number} ",
+        tender_url=f"https://www.tenderdetail.com/Tender/{89453821 + number}/road?ref=mail&q={number}",
+        city="Lucknow, Uttar Pradesh",
+        summary=f"TDR : {89453821 + number} Widening & strengthening of <SH-25> \"Lucknow–Sitapur\" section",
+        value="Rs. 4.50 Crore",
+        due_date="24-11-2025",
+        details=None,
+    )
+    fields.update(overrides)
+    return Tender(**fields)
+
+
+def sample_digest() -> HomePageData:
+    """Escaping, stripping, empty values, quotes in URLs and a query without tenders"""
+    return HomePageData(
+        header=HomePageHeader(
+            date="Sunday Nov 02 2025",
+            name="Shubham Kanojia",
+            contact="For customer support: (+91) 8115366981",
+            no_of_new_tenders="5",
+            company="RoadVision AI Pvt. Ltd.",
+        ),
+        query_table=[
+            TenderQuery(query_name="Civil Works - Roads", number_of_tenders="3", tenders=[
+                tender(1),
+                tender(2, summary="Multi-line\nsummary with 'quotes'", value=""),
+                tender(3, tender_url='https://t.example/x?name="quoted"'),
+            ]),
+            TenderQuery(query_name="Civil Works - Bridges", number_of_tenders="0", tenders=[]),
+            TenderQuery(query_name="Civil & Structural", number_of_tenders="2", tenders=[
+                tender(4, city="  "),
+                tender(5),
+            ]),
+        ],
+    )
+
+
+def test_matches_golden_email():
+    assert templater.generate_email(sample_digest()) == GOLDEN.read_text()
+
+
+def test_streamed_chunks_join_to_the_email():
+    chunks = list(templater.render_email_chunks(sample_digest()))
+    assert len(chunks) > 1
+    assert "".join(chunks) == GOLDEN.read_text()
+
+
+def test_compiles_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(templater, "_template", None)
+
+    html = templater.generate_email(sample_digest())
+
+    assert html == GOLDEN.read_text()
+    assert "color:#0572af" in html  # template.css was inlined
@@ -0,0 +1,157 @@
+"""
+Unit tests for the cross-tender similarity service.
+
+Tests for:
+- Similarity record building from ScrapedTender rows
+- Batched, de-duplicated indexing
+- Filter translation and result de-duplication in find_similar_tenders
+"""
+
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import Mock
+
+from app.modules.scraper.db.schema import ScrapedTender
+from app.modules.tenderiq.services.tender_similarity_service import (
+    CRORE,
+    build_similarity_record,
+    build_similarity_text,
+    find_similar_tenders,
+    index_scraped_tenders,
+)
+
+
+def make_tender(tender_id_str="TEN-1", **overrides):
+    tender = ScrapedTender(
+        id=uuid4(),
+        tender_id_str=tender_id_str,
+        tender_name="Construction of 4-lane highway",
+        tendering_authority="NHAI",
+        tender_brief="Widening of NH-44",
+        tender_details="Detailed scope of work",
+        state="Maharashtra",
+        tender_value="1500000000.0",
+        publish_date="05-11-2025",
+    )
+    for key, value in overrides.items():
+        setattr(tender, key, value)
+    return tender
+
+
+@pytest.fixture
+def vector_store():
+    store = Mock()
+    store.upsert_tender_vectors.side_effect = lambda records: len(records)
+    store.get_tender_vector.return_value = [0.1, 0.2]
+    return store
+
+
+class TestSimilarityRecord:
+    def test_text_contains_name_brief_and_details(self):
+        text = build_similarity_text(make_tender())
+        assert "Construction of 4-lane highway" in text
+        assert "NHAI" in text
+        assert "Widening of NH-44" in text
+        assert "Detailed scope of work" in text
+
+    def test_record_parses_value_and_date(self):
+        record = build_similarity_record(make_tender())
+        assert record["tender_value"] == 1500000000.0
+        assert record["publish_date"] == datetime(2025, 11, 5, tzinfo=timezone.utc)
+        assert record["state"] == "Maharashtra"
+
+    def test_record_tolerates_unparseable_fields(self):
+        record = build_similarity_record(make_tender(tender_value="Refer Document", publish_date="N/A"))
+        assert record["tender_value"] == 0.0
+        assert record["publish_date"] is None
+
+    def test_record_skipped_without_tender_id(self):
+        assert build_similarity_record(make_tender(tender_id_str=None)) is None
+
+
+class TestIndexing:
+    def test_deduplicates_rescrapes_keeping_latest(self, vector_store):
+        first = make_tender("TEN-1")
+        rescrape = make_tender("TEN-1", tender_brief="Revised brief")
+        other = make_tender("TEN-2")
+
+        indexed = index_scraped_tenders([first, rescrape, other], vector_store=vector_store)
+
+        assert indexed == 2
+        records = vector_store.upsert_tender_vectors.call_args.args[0]
+        by_id = {r["tender_id_str"]: r for r in records}
+        assert by_id["TEN-1"]["scraped_tender_id"] == str(rescrape.id)
+
+    def test_indexes_in_batches(self, vector_store):
+        tenders = [make_tender(f"TEN-{i}") for i in range(5)]
+
+        indexed = index_scraped_tenders(tenders, batch_size=2, vector_store=vector_store)
+
+        assert indexed == 5
+        assert vector_store.upsert_tender_vectors.call_count == 3
+
+
+class TestFindSimilar:
+    def _db(self, tender, rows):
+        db = Mock()
+        db.query.return_value.filter.return_value.first.return_value = tender
+        db.query.return_value.filter.return_value.all.return_value = rows
+        return db
+
+    def test_converts_filters_and_excludes_self(self, vector_store):
+        tender = make_tender("TEN-1")
+        neighbour = make_tender("TEN-2")
+        vector_store.query_similar_tenders.return_value = [
+            ({"tender_id_str": "TEN-2", "scraped_tender_id": str(neighbour.id)}, 0.91),
+        ]
+        db = self._db(tender, [neighbour])
+
+        response = find_similar_tenders(
+            db, tender.id, top_k=5, state="Maharashtra", min_value=100, max_value=500,
+            published_after="2025-01-01", vector_store=vector_store,
+        )
+
+        kwargs = vector_store.query_similar_tenders.call_args.kwargs
+        assert kwargs["vector"] == [0.1, 0.2]
+        assert kwargs["n_results"] == 5
+        assert kwargs["min_value"] == 100 * CRORE
+        assert kwargs["max_value"] == 500 * CRORE
+        assert kwargs["published_after"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert kwargs["exclude_tender_id_str"] == "TEN-1"
+        assert [r.tender_id_str for r in response.results] == ["TEN-2"]
+        assert response.filtered_by["state"] == "Maharashtra"
+
+    def test_embeds_text_when_tender_not_indexed(self, vector_store):
+        tender = make_tender("TEN-1")
+        vector_store.get_tender_vector.return_value = None
+        vector_store.query_similar_tenders.return_value = []
+
+        find_similar_tenders(self._db(tender, []), tender.id, vector_store=vector_store)
+
+        kwargs = vector_store.query_similar_tenders.call_args.kwargs
+        assert kwargs["vector"] is None
+        assert "Construction of 4-lane highway" in kwargs["query"]
+
+    def test_drops_duplicate_and_unknown_neighbours(self, vector_store):
+        tender = make_tender("TEN-1")
+        neighbour = make_tender("TEN-2")
+        vector_store.query_similar_tenders.return_value = [
+            ({"tender_id_str": "TEN-2", "scraped_tender_id": str(neighbour.id)}, 0.9),
+            ({"tender_id_str": "TEN-2", "scraped_tender_id": str(neighbour.id)}, 0.8),
+            ({"tender_id_str": "TEN-3", "scraped_tender_id": str(uuid4())}, 0.7),
+        ]
+
+        response = find_similar_tenders(self._db(tender, [neighbour]), tender.id, vector_store=vector_store)
+
+        assert len(response.results) == 1
+
+    def test_invalid_date_raises(self, vector_store):
+        tender = make_tender("TEN-1")
+        with pytest.raises(ValueError):
+            find_similar_tenders(
+                self._db(tender, []), tender.id, published_before="05/11/2025", vector_store=vector_store
+            )
+
+    def test_missing_tender_returns_none(self, vector_store):
+        assert find_similar_tenders(self._db(None, []), uuid4(), vector_store=vector_store) is None
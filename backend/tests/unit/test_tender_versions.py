@@ -0,0 +1,157 @@
+"""
+Unit tests for the tender version store.
+
+Tests for:
+- record_version storing a baseline, skipping unchanged scrapes and diffing changed ones
+- Typed amount/date values and the history type of a version
+- Reading changes, history and "has changes" back without parsing notes
+- apply_corrigendum applying the typed values to the tender
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.scraper.db.schema import ScrapedTender, ScrapedTenderQuery, ScrapeRun
+from app.modules.tenderiq.db.schema import Tender, TenderActionHistory, TenderFieldChange, TenderVersion
+from app.modules.tenderiq.services.corrigendum_service import CorrigendumTrackingService
+
+TDR = "89453821"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Tender.metadata.create_all(engine, tables=[
+        ScrapeRun.__table__, ScrapedTenderQuery.__table__, ScrapedTender.__table__,
+        Tender.__table__, TenderActionHistory.__table__,
+        TenderVersion.__table__, TenderFieldChange.__table__,
+    ])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def scrape(db, **fields):
+    values = dict(
+        tender_id_str=TDR, tdr=TDR, city="Lucknow", state="Uttar Pradesh",
+        tender_brief="Construction of 2-lane road", tender_value="487500000.0",
+        emd="INR 48,75,000.00", last_date_of_bid_submission="24 Nov 2025 15:00",
+    )
+    values.update(fields)
+    scraped = ScrapedTender(**values)
+    db.add(scraped)
+    db.commit()
+    return scraped
+
+
+class TestRecordVersion:
+    def test_first_scrape_is_a_baseline(self, db):
+        service = CorrigendumTrackingService(db)
+
+        version = service.record_version(scrape(db))
+
+        assert version.version == 1
+        assert version.change_count == 0
+        assert version.snapshot["city"] == "Lucknow"
+        assert db.query(TenderFieldChange).count() == 0
+
+    def test_unchanged_scrape_is_not_stored(self, db):
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+
+        # Same values, formatted differently
+        assert service.record_version(scrape(db, tender_value="487500000")) is None
+        assert db.query(TenderVersion).count() == 1
+
+    def test_changes_are_stored_as_typed_rows(self, db):
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+
+        version = service.record_version(scrape(
+            db, emd="INR 52,00,000.00", last_date_of_bid_submission="02-12-2025 15:00", state=None,
+        ))
+
+        assert version.version == 2
+        rows = {row.field: row for row in version.changes}
+        assert set(rows) == {"emd", "last_date_of_bid_submission", "state"}
+        assert rows["emd"].value_kind == "amount"
+        assert rows["emd"].new_amount == Decimal("5200000")
+        assert rows["last_date_of_bid_submission"].new_date == datetime(2025, 12, 2, 15, 0)
+        assert rows["state"].change_type == "removed"
+        assert version.history_type == "bid_deadline_extension"
+        assert (version.from_date, version.to_date) == (datetime(2025, 11, 24, 15, 0), datetime(2025, 12, 2, 15, 0))
+
+    def test_amount_change_is_an_amendment(self, db):
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+
+        version = service.record_version(scrape(db, tender_value="500000000.0"))
+
+        assert version.history_type == "amendment"
+        assert version.from_date is None
+
+    def test_version_after_legacy_history_is_a_baseline(self, db):
+        db.add(TenderVersion(tender_ref_number=TDR, version=1, change_count=1, note="Corrigendum applied"))
+        db.commit()
+        service = CorrigendumTrackingService(db)
+
+        version = service.record_version(scrape(db))
+
+        assert (version.version, version.change_count) == (2, 0)
+
+
+class TestReadingChanges:
+    def test_latest_changes_in_tracked_field_order(self, db):
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+        service.record_version(scrape(db, city="Sitapur", tender_value="1"))
+        service.record_version(scrape(db, city="Kanpur", tender_value="1"))
+
+        changes = service.get_latest_changes(TDR)
+
+        assert [(c.field, c.old_value, c.new_value) for c in changes] == [("city", "Sitapur", "Kanpur")]
+        assert service.versions.get_latest(TDR).change_count == 1
+
+    def test_detect_changes_of_a_recorded_scrape(self, db):
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+        scraped = scrape(db, tender_value="1", city="Sitapur")
+        service.record_version(scraped)
+
+        assert [c.field for c in service.detect_changes(TDR, scraped)] == ["tender_value", "city"]
+        assert [c.field for c in service.detect_changes(TDR, scrape(db, tender_value="1", city="Sitapur", state="Bihar"))] == ["state"]
+
+    def test_history_lists_versions_with_changes(self, db):
+        tender = Tender(tender_ref_number=TDR)
+        db.add(tender)
+        db.commit()
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+        service.record_version(scrape(db, last_date_of_bid_submission="02-12-2025 15:00"))
+        service.record_version(scrape(db, last_date_of_bid_submission="02-12-2025 15:00", emd="INR 1.00"))
+
+        history = service.get_tender_change_history(str(tender.id))
+
+        assert [item["type"] for item in history] == ["amendment", "bid_deadline_extension"]
+        assert history[1]["date_change"]["to_date"] == "2025-12-02T15:00:00"
+
+    def test_apply_corrigendum_uses_typed_values(self, db):
+        tender = Tender(tender_ref_number=TDR, state="Uttar Pradesh")
+        db.add(tender)
+        db.commit()
+        service = CorrigendumTrackingService(db)
+        service.record_version(scrape(db))
+        service.record_version(scrape(db, tender_value="500000000.0", last_date_of_bid_submission="02-12-2025 15:00", state="Bihar"))
+
+        result = service.apply_corrigendum(TDR, uuid4())
+
+        assert result["status"] == "success"
+        db.refresh(tender)
+        assert tender.estimated_cost == Decimal("500000000")
+        assert tender.submission_deadline == datetime(2025, 12, 2, 15, 0)
+        assert tender.state == "Bihar"
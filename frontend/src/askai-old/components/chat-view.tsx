@@ -223,11 +223,20 @@ export function ChatView({ chatId: initialChatId, initialMessages = [], initialD
   useEffect(() => {
     const api_base = api.getApiBase();
     const eventSource = new EventSource(`${api_base}/chats/${chatId}/docs-sse`);
-    eventSource.onmessage = (event) => {
-      const data = JSON.parse(event.data) as DocsSSEMessage;
-      setDocuments(data.pdfs.concat(data.xslx));
+    // A full `snapshot` event first, then `job`/`document` deltas; refetch on a delta
+    eventSource.addEventListener('snapshot', (event) => {
+      const data = JSON.parse((event as MessageEvent).data) as DocsSSEMessage;
+      setDocuments(data.pdfs.concat(data.xlsx));
       setProcessingDocs(data.processing);
+    });
+    const refresh = async () => {
+      if (!chatId) return;
+      const { documents, processing } = await api.getChatDocs(chatId);
+      setDocuments(documents);
+      setProcessingDocs(processing);
     };
+    eventSource.addEventListener('job', refresh);
+    eventSource.addEventListener('document', refresh);
     eventSource.onerror = (error) => {
       console.error('EventSource error:', error);
       eventSource.close();
@@ -38,8 +38,16 @@ async function handleResponse<T>(response: Response): Promise<T> {
 // --- CHAT-RELATED API CALLS ---
 
 export const getChats = async (): Promise<Chat[]> => {
-  const response = await fetch(`${API_BASE}/chats`);
-  return handleResponse<Chat[]>(response);
+  // The chat list is paged; follow X-Next-Cursor until the last page
+  const chats: Chat[] = [];
+  let cursor: string | null = null;
+  do {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE}/chats${query}`);
+    chats.push(...(await handleResponse<Chat[]>(response)));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return chats;
 };
 
 export const createNewChat = async (driveUrl?: string): Promise<Chat> => {
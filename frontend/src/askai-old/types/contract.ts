@@ -3,7 +3,7 @@ import { Document, ProcessingDocument } from ".";
 // /chats/{chatId}/docs-sse
 export interface DocsSSEMessage {
   pdfs: Document[];
-  xslx: Document[];
+  xlsx: Document[];
   processing: ProcessingDocument[];
   total_docs: number;
   chat_id: string;
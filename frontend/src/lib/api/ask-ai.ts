@@ -3,15 +3,26 @@ import {
   Message,
   NewMessageResponse,
   ChatDocumentsResponse,
+  DocumentMetadata,
+  ProcessingJob,
 } from "@/lib/types/ask-ai";
 import { API_BASE_URL } from "@/lib/config/api";
 import { getAuthHeaders, getTokenFromRedux } from "@/lib/api/authHelper";
 import { apiRequest, apiRequestWithoutBody } from "@/lib/api/apiClient";
 
+// The chat list is paged; follow X-Next-Cursor until the last page
 export async function getChats(): Promise<ChatMetadata[]> {
-  return apiRequest<ChatMetadata[]>(`${API_BASE_URL}/askai/chats`, {
-    headers: getAuthHeaders(),
-  });
+  const chats: ChatMetadata[] = [];
+  let cursor: string | null = null;
+  do {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const response = await apiRequestWithoutBody(`${API_BASE_URL}/askai/chats${query}`, {
+      headers: getAuthHeaders(),
+    });
+    chats.push(...((await response.json()) as ChatMetadata[]));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return chats;
 }
 
 export async function createChat(driveUrl?: string | null, tenderId?: string | null): Promise<ChatMetadata> {
@@ -127,6 +138,34 @@ export function uploadFileWithProgress(
   return { promise, xhr };
 }
 
+type ChatDocumentsEvent =
+  | { type: "job"; job: ProcessingJob }
+  | { type: "document"; action: "added" | "removed"; doc_type: string; document: DocumentMetadata };
+
+// Applies one delta from the docs stream to the last known state
+function applyChatDocumentsEvent(state: ChatDocumentsResponse, event: ChatDocumentsEvent): ChatDocumentsResponse {
+  let { pdfs, xlsx, processing } = state;
+  if (event.type === "job") {
+    const known = processing.some((job) => job.job_id === event.job.job_id);
+    processing = known
+      ? processing.map((job) => (job.job_id === event.job.job_id ? event.job : job))
+      : [...processing, event.job];
+  } else {
+    const apply = (docs: DocumentMetadata[]) => {
+      const others = docs.filter((doc) => doc.name !== event.document.name);
+      return event.action === "added" ? [...others, event.document] : others;
+    };
+    if (event.doc_type === "excel") xlsx = apply(xlsx);
+    else pdfs = apply(pdfs);
+  }
+  return { ...state, pdfs, xlsx, processing, total_docs: pdfs.length + xlsx.length + processing.length };
+}
+
+/**
+ * Streams a chat's documents. The server sends one `snapshot` event with the
+ * full ChatDocumentsResponse, then `job` and `document` deltas; they are
+ * merged here, so `onUpdate` always receives the full state.
+ */
 export function subscribeToChatDocuments(
   chatId: string,
   onUpdate: (data: ChatDocumentsResponse) => void,
@@ -134,16 +173,27 @@ export function subscribeToChatDocuments(
 ): EventSource {
   const token = getTokenFromRedux();
   const eventSource = new EventSource(`${API_BASE_URL}/askai/chats/${chatId}/docs-sse?token=${token}`);
-
-  eventSource.onmessage = (event) => {
-    try {
-      const data = JSON.parse(event.data) as ChatDocumentsResponse;
-      onUpdate(data);
-    } catch (error) {
-      if (onError) onError(new Error("Failed to parse SSE data"));
-    }
+  let state: ChatDocumentsResponse | null = null;
+
+  const listen = (type: string, handle: (data: unknown) => ChatDocumentsResponse | null) => {
+    eventSource.addEventListener(type, (event) => {
+      try {
+        const next = handle(JSON.parse((event as MessageEvent).data));
+        if (next) {
+          state = next;
+          onUpdate(next);
+        }
+      } catch (error) {
+        if (onError) onError(new Error("Failed to parse SSE data"));
+      }
+    });
   };
 
+  listen("snapshot", (data) => data as ChatDocumentsResponse);
+  // Deltas only arrive after the snapshot
+  listen("job", (data) => state && applyChatDocumentsEvent(state, data as ChatDocumentsEvent));
+  listen("document", (data) => state && applyChatDocumentsEvent(state, data as ChatDocumentsEvent));
+
   eventSource.onerror = (error) => {
     if (onError) onError(new Error("SSE connection error"));
     eventSource.close();